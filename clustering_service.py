@@ -15,6 +15,7 @@ from dataclasses import dataclass
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database.production_db_client import ProductionDBClient
+from utils.reduction import VectorReducer
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,8 @@ class ClusteringService:
     def __init__(self, db_client: ProductionDBClient = None):
         self.db = db_client or ProductionDBClient()
         self.config = ClusterConfig()
+        # Projection ahead of HDBSCAN (CLUSTER_REDUCTION*)
+        self.reducer = VectorReducer()
 
         # Choose HDBSCAN implementation
         self._init_clustering_backend()
@@ -94,12 +97,17 @@ class ClusteringService:
                 logger.warning(f"Not enough articles ({len(recent_articles)}) for clustering")
                 return {'trends': [], 'total_articles': len(recent_articles)}
 
-            # Extract embeddings
-            embeddings = np.array([article['embedding'] for article in recent_articles])
+            # Bulk-load embeddings by chunk id (binary COPY into one float32 matrix)
+            embeddings, found = self.db.load_embeddings([a['chunk_id'] for a in recent_articles])
+            recent_articles = [a for a, ok in zip(recent_articles, found) if ok]
+            embeddings = embeddings[found]
+            if len(recent_articles) < self.config.min_cluster_size:
+                logger.warning(f"Not enough articles with embeddings ({len(recent_articles)}) for clustering")
+                return {'trends': [], 'total_articles': len(recent_articles)}
 
-            # Perform clustering
+            # Perform clustering on the reduced vectors
             clusterer = self.create_clusterer()
-            cluster_labels = clusterer.fit_predict(embeddings)
+            cluster_labels = clusterer.fit_predict(self.reducer.transform(embeddings))
 
             # Analyze clusters
             trends = self._analyze_clusters(recent_articles, cluster_labels, clusterer)
@@ -131,7 +139,8 @@ class ClusteringService:
                         ai.clean_text,
                         ai.source,
                         ai.published_at,
-                        ac.embedding
+                        ac.id,
+                        ai.text_hash
                     FROM articles_index ai
                     JOIN article_chunks ac ON ai.article_id = ac.article_id
                     WHERE ai.published_at >= NOW() - INTERVAL '%s hours'
@@ -151,10 +160,14 @@ class ClusteringService:
                         'text': row[2],
                         'source': row[3],
                         'published_at': row[4],
-                        'embedding': row[5]  # pgvector array
+                        'chunk_id': row[5],
+                        'text_hash': row[6]
                     })
 
-                return articles
+            # Bodies moved to the compressed fulltext store come back by text_hash
+            if hasattr(self.db, 'hydrate_fulltext'):
+                self.db.hydrate_fulltext(articles, field='text')
+            return articles
 
         except Exception as e:
             logger.error(f"Failed to get recent articles: {e}")
@@ -94,11 +94,42 @@ def classify_stance(
         return "niche"
 
 
+def domain_stats_from_docs(
+    docs: List[Dict[str, Any]]
+) -> Tuple[Counter, Dict[str, Set[str]]]:
+    """
+    Article counts and topic keywords per domain from retrieved docs
+
+    Returns:
+        (domain -> article count, domain -> keyword set)
+    """
+    domain_counts = Counter()
+    domain_topics = defaultdict(set)
+
+    for doc in docs:
+        url = doc.get("url", "")
+        domain = extract_domain(url)
+        if not domain:
+            continue
+        domain_counts[domain] += 1
+
+        # Extract keywords (simple approach)
+        title = doc.get("title", "").lower()
+        snippet = doc.get("snippet", "").lower()
+        words = f"{title} {snippet}".split()
+        # Filter common words
+        keywords = [w for w in words if len(w) > 4 and w.isalpha()]
+        domain_topics[domain].update(keywords[:10])  # Top 10 keywords per doc
+
+    return domain_counts, dict(domain_topics)
+
+
 async def run_competitor_news(
     docs: List[Dict[str, Any]],
     domains: Optional[List[str]],
     niche: Optional[str],
-    correlation_id: str
+    correlation_id: str,
+    aggregates: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Execute competitor news analysis
@@ -108,6 +139,8 @@ async def run_competitor_news(
         domains: List of specific domains to analyze (optional)
         niche: Niche/topic for semantic domain discovery (optional)
         correlation_id: Correlation ID for telemetry
+        aggregates: Optional share of voice over all matching articles
+            (PgClient.share_of_voice); replaces counting the retrieved docs
 
     Returns:
         CompetitorsResult dict
@@ -117,23 +150,22 @@ async def run_competitor_news(
     )
 
     try:
-        # Extract domains from docs
-        domain_docs = defaultdict(list)
-        domain_counts = Counter()
-
-        for doc in docs:
-            url = doc.get("url", "")
-            domain = extract_domain(url)
-
-            if domain:
-                domain_docs[domain].append(doc)
-                domain_counts[domain] += 1
+        if aggregates and aggregates.get("domains"):
+            # Counted in SQL over every matching article, not just the retrieved ones
+            domain_counts = Counter({row["domain"]: row["articles"] for row in aggregates["domains"]})
+            domain_topics = {row["domain"]: set(row.get("terms") or []) for row in aggregates["domains"]}
+            total_articles = aggregates.get("total") or sum(domain_counts.values())
+            domain_count = aggregates.get("domain_count") or len(domain_counts)
+        else:
+            domain_counts, domain_topics = domain_stats_from_docs(docs)
+            total_articles = len(docs)
+            domain_count = len(domain_counts)
 
         # Filter domains
         if domains:
             # Use specified domains
             target_domains = [d.lower() for d in domains]
-            domain_docs = {d: domain_docs[d] for d in target_domains if d in domain_docs}
+            target_domains = [d for d in target_domains if d in domain_topics]
         else:
             # Auto-detect top domains (frequency threshold ≥ 3)
             target_domains = [d for d, count in domain_counts.items() if count >= 3]
@@ -144,23 +176,6 @@ async def run_competitor_news(
 
         logger.info(f"[{correlation_id}] Analyzing {len(target_domains)} domains")
 
-        # Build topic sets per domain (simple keyword extraction)
-        domain_topics = {}
-        for domain in target_domains:
-            topics = set()
-            for doc in domain_docs[domain]:
-                title = doc.get("title", "").lower()
-                snippet = doc.get("snippet", "").lower()
-                text = f"{title} {snippet}"
-
-                # Extract keywords (simple approach)
-                words = text.split()
-                # Filter common words
-                keywords = [w for w in words if len(w) > 4 and w.isalpha()]
-                topics.update(keywords[:10])  # Top 10 keywords per doc
-
-            domain_topics[domain] = topics
-
         # Compute overlap matrix
         overlap_matrix = []
         all_topics = set()
@@ -202,7 +217,6 @@ async def run_competitor_news(
 
         # Classify positioning
         positioning = []
-        total_articles = len(docs)
         for domain in target_domains:
             article_count = domain_counts[domain]
             topic_diversity = len(domain_topics[domain])
@@ -218,7 +232,7 @@ async def run_competitor_news(
         # Compute sentiment deltas (simple: based on article count as proxy)
         # In production, would use actual sentiment scores
         sentiment_delta = []
-        avg_coverage = sum(domain_counts.values()) / len(domain_counts) if domain_counts else 1
+        avg_coverage = total_articles / domain_count if domain_count else 1
 
         for domain in target_domains:
             count = domain_counts[domain]
@@ -1,11 +1,15 @@
 """
 Sentiment & Emotion Analysis Agent — Analyze sentiment using GPT-5
 Primary: gpt-5, Fallback: claude-4.5
+Overall score and timeline come from the ingest-time lexicon rollups when
+available; the LLM is then only needed to explain emotions and aspects.
 """
 
 import logging
 import json
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional
+
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +57,71 @@ RULES:
 6. Be objective and grounded in the text
 7. Return ONLY valid JSON, no additional text"""
 
+# Analysis window -> hours of sentiment rollups read
+SENTIMENT_LOOKBACK = {
+    "6h": 6,
+    "12h": 12,
+    "24h": 24,
+    "1d": 24,
+    "3d": 72,
+    "7d": 168,
+    "1w": 168,
+    "2w": 336,
+    "1m": 720,
+    "3m": 2160,
+}
+# Trailing spans reported in the timeline (labels as in TimelineSentiment)
+TIMELINE_WINDOWS = (("6h", 6), ("12h", 12), ("24h", 24), ("3d", 72), ("1w", 168),
+                    ("2w", 336), ("1m", 720), ("3m", 2160))
+# Scored articles needed before the rollups answer on their own
+SENTIMENT_MIN_ARTICLES = 3
+
+
+def sentiment_lookback(window: str) -> int:
+    """Hours of hourly sentiment rollups to read for an analysis window"""
+    return SENTIMENT_LOOKBACK.get((window or "24h").lower(), 24)
+
+
+def _clamp(score: float) -> float:
+    return round(max(-1.0, min(1.0, score)), 3)
+
+
+def sentiment_trend(series: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Overall score and trailing-window timeline from hourly rollup sums
+
+    Args:
+        series: {"kind", "term", "scored", "sentiment"} from
+            VolumeRollups.topic_sentiment (hourly, oldest first)
+
+    Returns:
+        {"overall", "timeline", "n_docs", "series"}, or None when fewer than
+        SENTIMENT_MIN_ARTICLES articles were scored
+    """
+    scored, sums = series["scored"], series["sentiment"]
+    n_docs = sum(scored)
+    if n_docs < SENTIMENT_MIN_ARTICLES:
+        return None
+    timeline = []
+    for label, hours in TIMELINE_WINDOWS:
+        if hours > len(scored):
+            break
+        docs = sum(scored[-hours:])
+        if docs:
+            timeline.append({"window": label, "score": _clamp(sum(sums[-hours:]) / docs), "n_docs": docs})
+    return {
+        "overall": _clamp(sum(sums) / n_docs),
+        "timeline": timeline,
+        "n_docs": n_docs,
+        "series": f"{series['kind']}:{series['term']}",
+    }
+
 
 async def run_sentiment_emotion(
     docs: List[Dict[str, Any]],
-    correlation_id: str
+    correlation_id: str,
+    series: Optional[Dict[str, Any]] = None,
+    explain: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Run sentiment & emotion analysis agent
@@ -64,10 +129,23 @@ async def run_sentiment_emotion(
     Args:
         docs: Retrieved documents
         correlation_id: Tracking ID
+        series: Hourly sentiment rollups for the query (VolumeRollups.topic_sentiment)
+        explain: Ask the LLM for emotions and aspects even when the rollups
+            answer; None follows SENTIMENT_LLM (auto|always)
 
     Returns:
         Result dict with sentiment analysis
     """
+    trend = sentiment_trend(series) if series else None
+    if explain is None:
+        explain = os.getenv("SENTIMENT_LLM", "auto").lower() == "always"
+    if trend is not None and not explain:
+        logger.info(
+            f"Sentiment from rollups ({trend['series']}): overall={trend['overall']:+.2f} "
+            f"over {trend['n_docs']} articles, LLM skipped"
+        )
+        return _lexicon_result(trend)
+
     try:
         from core.ai_models.model_manager import ModelManager
 
@@ -77,7 +155,15 @@ async def run_sentiment_emotion(
         context = _build_sentiment_context(docs)
 
         # Build prompt
-        prompt = f"{SENTIMENT_SYSTEM_PROMPT}\n\nDOCUMENTS:\n{context}\n\nAnalyze sentiment now:"
+        prompt = f"{SENTIMENT_SYSTEM_PROMPT}\n\nDOCUMENTS:\n{context}\n\n"
+        if trend is not None:
+            timeline = ", ".join(f"{t['window']}: {t['score']:+.2f} ({t['n_docs']} docs)" for t in trend["timeline"])
+            prompt += (
+                f"LEXICON SENTIMENT over all {trend['n_docs']} matching articles: "
+                f"overall {trend['overall']:+.2f}; {timeline}\n"
+                "Explain the emotions and aspects behind it.\n\n"
+            )
+        prompt += "Analyze sentiment now:"
 
         # Call model via ModelManager
         model_manager = ModelManager(correlation_id=correlation_id)
@@ -106,6 +192,12 @@ async def run_sentiment_emotion(
             logger.warning(f"Overall sentiment {result['overall']} out of range, clamping")
             result["overall"] = max(-1.0, min(1.0, result["overall"]))
 
+        # Overall and timeline cover every scored article, not just the top docs
+        if trend is not None:
+            result["overall"] = trend["overall"]
+            result["timeline"] = trend["timeline"]
+            result["n_docs"] = trend["n_docs"]
+
         # Add metadata
         result["success"] = True
         result["warnings"] = warnings
@@ -117,6 +209,8 @@ async def run_sentiment_emotion(
 
     except Exception as e:
         logger.error(f"Sentiment analysis failed: {e}", exc_info=True)
+        if trend is not None:
+            return _lexicon_result(trend, warnings=[f"LLM explanation unavailable: {e}"])
         return {
             "success": False,
             "error": str(e),
@@ -132,6 +226,26 @@ async def run_sentiment_emotion(
         }
 
 
+def _lexicon_result(trend: Dict[str, Any], warnings: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Sentiment answered from the rollups alone (no emotions or aspects)"""
+    return {
+        "success": True,
+        "overall": trend["overall"],
+        "emotions": {
+            "joy": 0.0,
+            "fear": 0.0,
+            "anger": 0.0,
+            "sadness": 0.0,
+            "surprise": 0.0
+        },
+        "aspects": [],
+        "timeline": trend["timeline"],
+        "n_docs": trend["n_docs"],
+        "warnings": warnings or [],
+        "model_used": "lexicon"
+    }
+
+
 def _build_sentiment_context(docs: List[Dict[str, Any]], max_chars: int = 3500) -> str:
     """Build context for sentiment analysis"""
     context_parts = []
@@ -86,6 +86,20 @@ def compute_ewma(
     # Build time series
     series = [date_counts.get(d, 0) for d in date_range]
 
+    return compute_series_ewma(series, alpha=alpha)
+
+
+def compute_series_ewma(series: List[float], alpha: float = 0.3) -> Tuple[float, float]:
+    """
+    Compute EWMA and slope of an evenly spaced count series (oldest first)
+
+    Args:
+        series: Article counts per period
+        alpha: Smoothing factor (0-1)
+
+    Returns:
+        (ewma_value, slope per period)
+    """
     if len(series) < 2:
         return float(series[0]) if series else 0.0, 0.0
 
@@ -99,15 +113,54 @@ def compute_ewma(
     # Compute slope (simple linear fit)
     x = np.arange(len(ewma_values))
     y = np.array(ewma_values)
-
-    if len(x) >= 2:
-        slope = np.polyfit(x, y, 1)[0]
-    else:
-        slope = 0.0
+    slope = np.polyfit(x, y, 1)[0]
 
     return ewma_values[-1], slope
 
 
+# Volume rollup lookback per horizon: (hours read, hours per EWMA period)
+VOLUME_LOOKBACK = {
+    "6h": (48, 1),
+    "12h": (48, 2),
+    "1d": (72, 3),
+    "3d": (144, 6),
+    "1w": (336, 24),
+    "2w": (336, 24),
+    "1m": (720, 24),
+}
+# Volume series need at least this many articles to be forecast from
+VOLUME_MIN_ARTICLES = 3
+# Fitted change across the lookback, relative to its mean volume, for "up"/"down"
+VOLUME_CHANGE_THRESHOLD = 0.2
+
+
+def volume_lookback(window: str) -> Tuple[int, int]:
+    """(hours of hourly volumes to read, hours per EWMA period) for a horizon"""
+    return VOLUME_LOOKBACK.get(window, VOLUME_LOOKBACK["1w"])
+
+
+def bucket_series(hourly: List[int], bucket_hours: int) -> List[int]:
+    """Sum an hourly series into periods ending at its last hour (a partial
+    oldest period is dropped)"""
+    bucket_hours = max(1, bucket_hours)
+    start = len(hourly) % bucket_hours
+    return [sum(hourly[i:i + bucket_hours]) for i in range(start, len(hourly), bucket_hours)]
+
+
+def volume_signal(hourly: List[int], window: str) -> Tuple[float, float, List[int]]:
+    """
+    EWMA over a dense hourly volume series, bucketed for the horizon
+
+    Returns:
+        (ewma_value, change, periods) where change is the fitted slope across
+        the whole lookback relative to the mean period volume
+    """
+    periods = bucket_series(hourly, volume_lookback(window)[1])
+    ewma_value, slope = compute_series_ewma(periods, alpha=0.3)
+    mean = max(sum(periods) / len(periods), 1.0) if periods else 1.0
+    return ewma_value, float(slope) * len(periods) / mean, periods
+
+
 def determine_direction(slope: float, threshold: float = 0.1) -> str:
     """
     Determine trend direction from slope
@@ -162,7 +215,8 @@ async def run_trend_forecaster(
     docs: List[Dict[str, Any]],
     topic: Optional[str],
     window: str,
-    correlation_id: str
+    correlation_id: str,
+    volume: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Execute trend forecasting
@@ -172,6 +226,9 @@ async def run_trend_forecaster(
         topic: Optional specific topic to forecast
         window: Time window (e.g., "1w", "1m")
         correlation_id: Correlation ID for telemetry
+        volume: Optional hourly volume series from the rollups
+            ({"kind", "term", "hourly"}, see core.history.volume_rollups);
+            the EWMA then runs over it and docs only supply evidence
 
     Returns:
         ForecastResult dict
@@ -190,7 +247,11 @@ async def run_trend_forecaster(
                 except Exception:
                     pass
 
-        if len(dates) < 3:
+        hourly = list((volume or {}).get("hourly") or [])
+        if sum(hourly) < VOLUME_MIN_ARTICLES:
+            hourly = []
+
+        if not hourly and len(dates) < 3:
             logger.warning(f"Insufficient data for forecast: {len(dates)} docs with dates")
             # Return flat forecast
             return {
@@ -216,38 +277,70 @@ async def run_trend_forecaster(
                 "success": True
             }
 
-        # Compute EWMA and slope
-        ewma_value, slope = compute_ewma(dates, alpha=0.3, periods=min(len(dates), 14))
-
-        direction = determine_direction(slope, threshold=0.1)
-        confidence_interval = estimate_confidence_interval(slope, ewma_value, len(docs))
-
-        logger.info(
-            f"[{correlation_id}] EWMA={ewma_value:.2f}, slope={slope:.3f}, direction={direction}"
-        )
-
-        # Build drivers from statistical signals
-        drivers = []
-
-        # Driver 1: EWMA trend
         # Find recent article as evidence
         recent_docs = sorted(docs, key=lambda d: d.get("date", ""), reverse=True)[:3]
-        if recent_docs:
+        drivers = []
+
+        if hourly:
+            # Compute EWMA over the rolled-up volumes (relative change, so busy
+            # and quiet topics share one threshold)
+            ewma_value, change, periods = volume_signal(hourly, window)
+            n_articles = sum(hourly)
+            direction = determine_direction(change, threshold=VOLUME_CHANGE_THRESHOLD)
+            confidence_interval = estimate_confidence_interval(change, ewma_value, n_articles)
+            recent = sum(hourly[-24:]) > 0
+
+            logger.info(
+                f"[{correlation_id}] Volume {volume.get('kind')}:{volume.get('term')!r} "
+                f"{n_articles} articles/{len(hourly)}h, EWMA={ewma_value:.2f}, "
+                f"change={change:+.2f}, direction={direction}"
+            )
+
+            # Driver 1: volume trend
+            evidence = recent_docs[0] if recent_docs else {}
             drivers.append({
-                "signal": "ewma_trend",
-                "rationale": f"EWMA shows {direction} trend with slope {slope:.3f}",
+                "signal": "volume_trend",
+                "rationale": (
+                    f"{n_articles} articles on {volume.get('kind')} '{volume.get('term')}' over the last "
+                    f"{len(hourly)}h; EWMA over {len(periods)} periods shows {direction} trend "
+                    f"({change:+.0%} across the window)"
+                ),
                 "evidence_ref": {
-                    "article_id": recent_docs[0].get("article_id"),
-                    "url": recent_docs[0].get("url"),
-                    "date": recent_docs[0].get("date", "2025-09-30")
+                    "article_id": evidence.get("article_id"),
+                    "url": evidence.get("url"),
+                    "date": evidence.get("date", "2025-09-30")
                 }
             })
+        else:
+            # Compute EWMA and slope
+            ewma_value, slope = compute_ewma(dates, alpha=0.3, periods=min(len(dates), 14))
+            n_articles = len(docs)
+            direction = determine_direction(slope, threshold=0.1)
+            confidence_interval = estimate_confidence_interval(slope, ewma_value, n_articles)
+            recent_date = dates[-1] if dates else datetime.now()
+            recent = (datetime.now() - recent_date).days <= 1
+
+            logger.info(
+                f"[{correlation_id}] EWMA={ewma_value:.2f}, slope={slope:.3f}, direction={direction}"
+            )
+
+            # Driver 1: EWMA trend
+            if recent_docs:
+                drivers.append({
+                    "signal": "ewma_trend",
+                    "rationale": f"EWMA shows {direction} trend with slope {slope:.3f}",
+                    "evidence_ref": {
+                        "article_id": recent_docs[0].get("article_id"),
+                        "url": recent_docs[0].get("url"),
+                        "date": recent_docs[0].get("date", "2025-09-30")
+                    }
+                })
 
         # Driver 2: Volume signal
-        if len(docs) > 10:
+        if n_articles > 10 and recent_docs:
             drivers.append({
                 "signal": "high_volume",
-                "rationale": f"High article volume ({len(docs)} articles) indicates sustained interest",
+                "rationale": f"High article volume ({n_articles} articles) indicates sustained interest",
                 "evidence_ref": {
                     "article_id": recent_docs[1].get("article_id") if len(recent_docs) > 1 else recent_docs[0].get("article_id"),
                     "url": recent_docs[1].get("url") if len(recent_docs) > 1 else recent_docs[0].get("url"),
@@ -256,9 +349,7 @@ async def run_trend_forecaster(
             })
 
         # Driver 3: Recent activity
-        recent_date = dates[-1] if dates else datetime.now()
-        days_since = (datetime.now() - recent_date).days
-        if days_since <= 1:
+        if recent and recent_docs:
             drivers.append({
                 "signal": "recent_activity",
                 "rationale": "Recent articles published within last 24 hours",
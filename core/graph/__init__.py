@@ -2,5 +2,9 @@
 
 from core.graph.graph_builder import GraphBuilder, create_graph_builder
 from core.graph.graph_traversal import GraphTraversal, create_traversal
+from core.graph.entity_index import EntityIndex, create_entity_index
 
-__all__ = ["GraphBuilder", "create_graph_builder", "GraphTraversal", "create_traversal"]
+__all__ = [
+    "GraphBuilder", "create_graph_builder", "GraphTraversal", "create_traversal",
+    "EntityIndex", "create_entity_index",
+]
@@ -0,0 +1,133 @@
+"""
+Entity Index — read side of the ingest-time entity index.
+Serves entity postings and co-occurrence counts so graphs can be built without NER.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+
+class EntityIndex:
+    """
+    Reads the entities / article_entities / entity_cooccurrence tables
+    written by services/entity_index_service.py.
+    """
+
+    def __init__(self, db_dsn: str):
+        """
+        Initialize entity index reader
+
+        Args:
+            db_dsn: PostgreSQL connection string
+        """
+        self.db_dsn = db_dsn
+        self.db_pool = None  # Lazy initialization
+
+    async def _ensure_pool(self):
+        """Ensure database connection pool exists"""
+        if self.db_pool is None:
+            if asyncpg is None:
+                raise RuntimeError("asyncpg not installed")
+            self.db_pool = await asyncpg.create_pool(
+                dsn=self.db_dsn,
+                min_size=1,
+                max_size=5
+            )
+            logger.info("Entity index connection pool created")
+
+    async def lookup(self, article_ids: List[str]) -> Dict[str, Any]:
+        """
+        Fetch indexed entities for a set of articles
+
+        Args:
+            article_ids: Article IDs (as returned by retrieval)
+
+        Returns:
+            {
+                "postings": {article_id: [entity_norm, ...]},
+                "entities": {entity_norm: {"name", "type", "doc_freq"}},
+                "pairs": {(entity_a, entity_b): corpus_doc_count}
+            }
+            Articles absent from "postings" have not been indexed yet.
+        """
+        ids = [str(a) for a in article_ids if a]
+        result: Dict[str, Any] = {"postings": {}, "entities": {}, "pairs": {}}
+        if not ids:
+            return result
+
+        await self._ensure_pool()
+        async with self.db_pool.acquire() as conn:
+            # Indexed-but-empty articles still count as indexed
+            indexed = await conn.fetch(
+                """
+                SELECT COALESCE(article_id, COALESCE(url_hash_v2, url_hash)) AS article_id
+                FROM articles_index
+                WHERE entities_indexed IS TRUE
+                  AND (article_id = ANY($1::text[])
+                       OR (article_id IS NULL AND (url_hash_v2 = ANY($1::text[]) OR url_hash = ANY($1::text[]))))
+                """,
+                ids
+            )
+            for row in indexed:
+                result["postings"].setdefault(row["article_id"], [])
+
+            rows = await conn.fetch(
+                """
+                SELECT p.article_id, p.entity_norm, e.display_name, e.label, e.doc_freq
+                FROM article_entities p
+                JOIN entities e ON e.entity_norm = p.entity_norm
+                WHERE p.article_id = ANY($1::text[])
+                ORDER BY p.article_id, p.mentions DESC
+                """,
+                ids
+            )
+            for row in rows:
+                result["postings"].setdefault(row["article_id"], []).append(row["entity_norm"])
+                result["entities"].setdefault(row["entity_norm"], {
+                    "name": row["display_name"],
+                    "type": row["label"] or "entity",
+                    "doc_freq": row["doc_freq"] or 0,
+                })
+
+            norms = list(result["entities"])
+            if len(norms) > 1:
+                pair_rows = await conn.fetch(
+                    """
+                    SELECT entity_a, entity_b, doc_count
+                    FROM entity_cooccurrence
+                    WHERE entity_a = ANY($1::text[]) AND entity_b = ANY($1::text[])
+                    """,
+                    norms
+                )
+                result["pairs"] = {
+                    (row["entity_a"], row["entity_b"]): row["doc_count"] for row in pair_rows
+                }
+
+        logger.info(
+            f"Entity index lookup: {len(result['postings'])}/{len(ids)} articles indexed, "
+            f"{len(result['entities'])} entities, {len(result['pairs'])} pairs"
+        )
+        return result
+
+
+def create_entity_index(db_dsn: Optional[str] = None) -> Optional[EntityIndex]:
+    """
+    Factory function to create the entity index reader
+
+    Returns:
+        EntityIndex, or None when disabled (GRAPH_ENTITY_INDEX=false),
+        no DSN is configured or asyncpg is missing — callers then run NER.
+    """
+    if os.getenv("GRAPH_ENTITY_INDEX", "true").lower() not in ("1", "true", "yes"):
+        return None
+    db_dsn = db_dsn or os.getenv("PG_DSN")
+    if not db_dsn or asyncpg is None:
+        return None
+    return EntityIndex(db_dsn=db_dsn)
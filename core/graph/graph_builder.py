@@ -1,6 +1,8 @@
 """
 Graph Builder — Constructs knowledge graphs from documents using NER and relation extraction.
 Supports on-demand graph construction with configurable limits.
+Entities come from the ingest-time entity index when available; NER runs only
+for documents that have not been indexed yet.
 """
 
 import logging
@@ -10,6 +12,7 @@ from collections import defaultdict
 
 from core.models.model_router import ModelRouter, get_model_router
 from core.nlp.ner_service import create_ner_service, NERStrategy
+from core.graph.entity_index import EntityIndex, create_entity_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +23,23 @@ class GraphBuilder:
     ENTITY_STOPWORDS = {"the", "this", "that", "there", "these", "those", "and", "for", "with", "from", "into", "of", "in"}
     KNOWN_ORGS = {"openai", "google", "microsoft", "amazon", "apple", "ibm", "meta"}
 
-    def __init__(self, model_router: Optional[ModelRouter] = None, use_advanced_ner: bool = True):
+    def __init__(
+        self,
+        model_router: Optional[ModelRouter] = None,
+        use_advanced_ner: bool = True,
+        entity_index: Optional[EntityIndex] = None
+    ):
         """
         Initialize graph builder
 
         Args:
             model_router: Optional ModelRouter for LLM calls
             use_advanced_ner: If True, use spaCy/LLM NER. If False, use regex fallback.
+            entity_index: Optional persistent entity index (skips NER for indexed docs)
         """
         self.model_router = model_router or get_model_router()
         self.use_advanced_ner = use_advanced_ner
+        self.entity_index = entity_index
         self.ner_service = None
 
         # Initialize NER service if advanced mode
@@ -60,11 +70,23 @@ class GraphBuilder:
         """
         logger.info(f"Building graph from {len(docs)} docs (max_nodes={max_nodes}, max_edges={max_edges})")
 
-        # Step 1: Extract entities (NER)
-        entities = await self._extract_entities(docs, lang=lang)
-
-        # Step 2: Extract relations between entities
-        relations = await self._extract_relations(docs, entities, lang=lang)
+        # Step 1+2: Entities and relations — from the index, NER only for unindexed docs
+        indexed = await self._lookup_index(docs)
+        if indexed is None:
+            entity_source = "ner"
+            entities = await self._extract_entities(docs, lang=lang)
+            relations = await self._extract_relations(docs, entities, lang=lang)
+        else:
+            entities, relations = self._graph_inputs_from_index(docs, indexed)
+            missing = [doc for doc in docs if str(doc.get("article_id", "")) not in indexed["postings"]]
+            entity_source = "index"
+            if missing:
+                entity_source = "mixed"
+                extra_entities = await self._extract_entities(missing, lang=lang)
+                extra_relations = await self._extract_relations(missing, extra_entities, lang=lang)
+                entities, relations = self._merge_graph_inputs(
+                    entities, relations, extra_entities, extra_relations
+                )
 
         # Step 3: Build graph structure
         nodes, edges = self._construct_graph(entities, relations, docs, max_nodes, max_edges)
@@ -74,6 +96,7 @@ class GraphBuilder:
             "edges": edges,
             "metadata": {
                 "source_docs": len(docs),
+                "entity_source": entity_source,
                 "entities_extracted": len(entities),
                 "relations_extracted": len(relations),
                 "nodes_final": len(nodes),
@@ -88,6 +111,123 @@ class GraphBuilder:
 
         return graph
 
+    async def _lookup_index(self, docs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Fetch postings for docs from the entity index (None → use NER for all)"""
+        if not self.entity_index:
+            return None
+        article_ids = [str(doc.get("article_id")) for doc in docs if doc.get("article_id")]
+        if not article_ids:
+            return None
+        try:
+            return await self.entity_index.lookup(article_ids)
+        except Exception as e:
+            logger.warning(f"Entity index lookup failed: {e}, falling back to NER")
+            return None
+
+    def _graph_inputs_from_index(
+        self,
+        docs: List[Dict[str, Any]],
+        indexed: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Assemble entities and co-occurrence relations from index postings
+
+        Returns:
+            Same shapes as _extract_entities / _extract_relations
+        """
+        postings: Dict[str, List[str]] = indexed.get("postings", {})
+        catalog: Dict[str, Dict[str, Any]] = indexed.get("entities", {})
+        corpus_pairs: Dict[Tuple[str, str], int] = indexed.get("pairs", {})
+
+        doc_ids_by_norm: Dict[str, Set[str]] = defaultdict(set)
+        doc_text: Dict[str, str] = {}
+        for doc in docs:
+            doc_id = str(doc.get("article_id", ""))
+            if doc_id not in postings:
+                continue
+            doc_text[doc_id] = (doc.get("title", "") + " " + doc.get("snippet", "")).lower()
+            for norm in postings[doc_id]:
+                if norm in catalog:
+                    doc_ids_by_norm[norm].add(doc_id)
+
+        # Rank by docs in this result set, then by corpus-wide document frequency
+        ranked = sorted(
+            doc_ids_by_norm,
+            key=lambda n: (len(doc_ids_by_norm[n]), catalog[n].get("doc_freq", 0)),
+            reverse=True
+        )[:200]
+
+        entities = [
+            {
+                "name": catalog[norm]["name"],
+                "type": catalog[norm]["type"],
+                "doc_ids": sorted(doc_ids_by_norm[norm]),
+                "confidence": 0.9,
+                "frequency": len(doc_ids_by_norm[norm]),
+            }
+            for norm in ranked
+        ]
+
+        relations_map: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        selected = set(ranked)
+        by_norm = {norm: ent for norm, ent in zip(ranked, entities)}
+        for doc_id, norms in postings.items():
+            if doc_id not in doc_text:
+                continue
+            present = sorted(selected.intersection(norms))
+            for i, a in enumerate(present):
+                for b in present[i + 1:]:
+                    rel = relations_map.get((a, b))
+                    if rel is None:
+                        src, tgt = sorted([by_norm[a]["name"], by_norm[b]["name"]])
+                        rel = relations_map[(a, b)] = {
+                            "src": src,
+                            "tgt": tgt,
+                            "type": self._infer_relation_type(by_norm[a], by_norm[b], doc_text[doc_id]),
+                            "weight": 0.0,
+                            "doc_ids": set(),
+                            "corpus_count": corpus_pairs.get((a, b), 0),
+                        }
+                    rel["doc_ids"].add(doc_id)
+
+        relations = []
+        for rel in relations_map.values():
+            rel["weight"] = min(1.0, len(rel["doc_ids"]) / 5)
+            rel["doc_ids"] = sorted(rel["doc_ids"])
+            relations.append(rel)
+
+        # Corpus co-occurrence breaks ties when edges are capped
+        relations.sort(key=lambda r: (r["weight"], r["corpus_count"]), reverse=True)
+
+        logger.info(f"Index supplied {len(entities)} entities, {len(relations)} relations")
+        return entities, relations
+
+    @staticmethod
+    def _merge_graph_inputs(
+        entities: List[Dict[str, Any]],
+        relations: List[Dict[str, Any]],
+        extra_entities: List[Dict[str, Any]],
+        extra_relations: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Merge index-derived and NER-derived entities/relations by name"""
+        merged: Dict[str, Dict[str, Any]] = {e["name"]: dict(e) for e in entities}
+        for ent in extra_entities:
+            target = merged.setdefault(ent["name"], dict(ent, doc_ids=[]))
+            target["doc_ids"] = sorted(set(target["doc_ids"]) | set(ent["doc_ids"]))
+            target["frequency"] = len(target["doc_ids"])
+
+        merged_rel: Dict[Tuple[str, str], Dict[str, Any]] = {
+            (r["src"], r["tgt"]): dict(r) for r in relations
+        }
+        for rel in extra_relations:
+            target = merged_rel.setdefault((rel["src"], rel["tgt"]), dict(rel, doc_ids=[]))
+            target["doc_ids"] = sorted(set(target["doc_ids"]) | set(rel["doc_ids"]))
+            target["weight"] = min(1.0, len(target["doc_ids"]) / 5)
+
+        out_entities = sorted(merged.values(), key=lambda x: x["frequency"], reverse=True)[:200]
+        out_relations = sorted(merged_rel.values(), key=lambda x: x["weight"], reverse=True)
+        return out_entities, out_relations
+
     async def _extract_entities(
         self,
         docs: List[Dict[str, Any]],
@@ -103,31 +243,33 @@ class GraphBuilder:
 
         # Use advanced NER if available
         if self.use_advanced_ner and self.ner_service:
-            for doc in docs:
-                text = doc.get("title", "") + " " + doc.get("snippet", "")
-                doc_id = doc.get("article_id", "")
-
-                try:
-                    # Extract entities using NER service
-                    entities = await self.ner_service.extract_entities(text, lang=lang)
-
-                    for entity in entities:
-                        normalized = entity.text.strip()
+            texts = [doc.get("title", "") + " " + doc.get("snippet", "") for doc in docs]
+            doc_ids = [doc.get("article_id", "") for doc in docs]
+
+            try:
+                # One batched NER call for all documents
+                batch = await self.ner_service.extract_entities_batch(texts, lang=lang)
+            except Exception as e:
+                logger.warning(f"Batch NER failed: {e}, falling back to regex")
+                batch = None
+
+            for text, doc_id, entities in zip(texts, doc_ids, batch or [None] * len(docs)):
+                if entities is None:
+                    self._extract_entities_regex(text, doc_id, entities_map)
+                    continue
 
-                        if normalized not in entities_map:
-                            entities_map[normalized] = {
-                                "name": normalized,
-                                "type": entity.label.lower(),
-                                "doc_ids": set(),
-                                "confidence": entity.confidence
-                            }
+                for entity in entities:
+                    normalized = entity.text.strip()
 
-                        entities_map[normalized]["doc_ids"].add(doc_id)
+                    if normalized not in entities_map:
+                        entities_map[normalized] = {
+                            "name": normalized,
+                            "type": entity.label.lower(),
+                            "doc_ids": set(),
+                            "confidence": entity.confidence
+                        }
 
-                except Exception as e:
-                    logger.warning(f"NER failed for doc {doc_id}: {e}, falling back to regex")
-                    # Fallback to regex for this document
-                    self._extract_entities_regex(text, doc_id, entities_map)
+                    entities_map[normalized]["doc_ids"].add(doc_id)
 
         else:
             # Use simple regex NER (fallback)
@@ -426,4 +568,4 @@ class GraphBuilder:
 
 def create_graph_builder(model_router: Optional[ModelRouter] = None) -> GraphBuilder:
     """Factory function to create graph builder"""
-    return GraphBuilder(model_router=model_router)
+    return GraphBuilder(model_router=model_router, entity_index=create_entity_index())
@@ -1,5 +1,6 @@
 """Phase 4 History Tracking"""
 
 from .phase4_history_service import Phase4HistoryService, get_phase4_history_service
+from .volume_rollups import VolumeRollups, create_volume_rollups
 
-__all__ = ['Phase4HistoryService', 'get_phase4_history_service']
+__all__ = ['Phase4HistoryService', 'get_phase4_history_service', 'VolumeRollups', 'create_volume_rollups']
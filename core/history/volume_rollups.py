@@ -0,0 +1,219 @@
+"""
+Volume Rollups — read side of the hourly article volume rollups.
+Serves dense hourly series per keyword / entity / source so /predict can
+forecast without counting retrieved documents, and the summed ingest-time
+sentiment scores behind /analyze sentiment trends.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+from core.nlp.ner_service import normalize_entity_name
+from utils.text import rollup_terms
+
+logger = logging.getLogger(__name__)
+
+# Rows from the first of the last $1 hours (ending at the current UTC hour), with
+# their offset from it; hours without a row are filled with zeros client-side
+_FIRST_HOUR = """
+    (SELECT date_trunc('hour', NOW(), 'UTC') - ($1::int - 1) * INTERVAL '1 hour' AS first) s
+"""
+_SLOT = "(EXTRACT(EPOCH FROM r.hour - s.first) / 3600)::int AS slot"
+
+
+def _dense(rows, hours: int, field: str = "articles") -> list:
+    hourly = [0] * hours
+    for row in rows:
+        if 0 <= row["slot"] < hours:
+            hourly[row["slot"]] += row[field]
+    return hourly
+
+
+def _series(kind: str, term: str, rows, hours: int, sentiment: bool) -> Dict[str, Any]:
+    series = {"kind": kind, "term": term, "hourly": _dense(rows, hours)}
+    if sentiment:
+        series["scored"] = _dense(rows, hours, "scored")
+        series["sentiment"] = _dense(rows, hours, "sentiment_sum")
+    return series
+
+
+def topic_candidates(topic: str) -> List[tuple]:
+    """
+    (kind, term) series a /predict topic may refer to: the normalized entity
+    name, and the headline keyword for one- or two-word topics (each adjacent
+    bigram for longer ones)
+    """
+    candidates = []
+    entity = normalize_entity_name(topic or "")
+    if entity:
+        candidates.append(("entity", entity))
+    terms = rollup_terms(topic or "")
+    words = [t for t in terms if " " not in t]
+    if 0 < len(words) <= 2:
+        candidates.append(("keyword", " ".join(words)))
+    else:
+        candidates.extend(("keyword", t) for t in terms if " " in t)
+    return list(dict.fromkeys(candidates))
+
+
+class VolumeRollups:
+    """
+    Reads the volume_rollups table written by
+    services/entity_index_service.py (via PgClient.save_article_entities).
+    """
+
+    def __init__(self, db_dsn: str):
+        """
+        Initialize volume rollup reader
+
+        Args:
+            db_dsn: PostgreSQL connection string
+        """
+        self.db_dsn = db_dsn
+        self.db_pool = None  # Lazy initialization
+
+    async def _ensure_pool(self):
+        """Ensure database connection pool exists"""
+        if self.db_pool is None:
+            if asyncpg is None:
+                raise RuntimeError("asyncpg not installed")
+            self.db_pool = await asyncpg.create_pool(
+                dsn=self.db_dsn,
+                min_size=1,
+                max_size=5
+            )
+            logger.info("Volume rollups connection pool created")
+
+    async def series(self, kind: str, term: str, hours: int) -> List[int]:
+        """
+        Dense hourly article counts for one term
+
+        Args:
+            kind: "keyword", "entity" or "source"
+            term: Keyword / normalized entity / source as stored
+            hours: Number of hours ending at the current hour
+
+        Returns:
+            `hours` counts, oldest first, zero for hours without articles
+        """
+        result = await self._fetch_series([(kind, term)], hours)
+        return result[0]["hourly"]
+
+    async def topic_series(self, topic: Optional[str], hours: int) -> Optional[Dict[str, Any]]:
+        """
+        Hourly volume for a /predict topic
+
+        Args:
+            topic: Free-text topic, or None for all articles (summed over sources)
+            hours: Number of hours ending at the current hour
+
+        Returns:
+            {"kind", "term", "hourly": [counts oldest first]} for the candidate
+            series with the most articles, or None when no candidate has any
+        """
+        best = await self._best_series(topic, hours, sentiment=False)
+        if best is None:
+            return None
+        logger.info(
+            f"Volume rollups: {best['kind']}:{best['term']!r} "
+            f"{sum(best['hourly'])} articles over {hours}h"
+        )
+        return best if sum(best["hourly"]) > 0 else None
+
+    async def topic_sentiment(self, topic: Optional[str], hours: int) -> Optional[Dict[str, Any]]:
+        """
+        Hourly lexicon sentiment for an /analyze sentiment query
+
+        Args:
+            topic: Free-text query, or None for all articles (summed over sources)
+            hours: Number of hours ending at the current hour
+
+        Returns:
+            {"kind", "term", "hourly", "scored", "sentiment"} (articles, articles
+            with a score and the sum of their scores per hour, oldest first) for
+            the candidate series with the most scored articles, or None when no
+            candidate has any
+        """
+        best = await self._best_series(topic, hours, sentiment=True)
+        if best is None or sum(best["scored"]) == 0:
+            return None
+        logger.info(
+            f"Sentiment rollups: {best['kind']}:{best['term']!r} "
+            f"{sum(best['scored'])} scored articles over {hours}h"
+        )
+        return best
+
+    async def _best_series(self, topic: Optional[str], hours: int, sentiment: bool) -> Optional[Dict[str, Any]]:
+        """The all-sources series without a topic, else the fullest candidate series"""
+        if not topic:
+            await self._ensure_pool()
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(
+                    f"""
+                    SELECT {_SLOT}, r.articles, r.scored, r.sentiment_sum
+                    FROM {_FIRST_HOUR}
+                    JOIN volume_rollups r ON r.kind = 'source' AND r.hour >= s.first
+                    """,
+                    hours
+                )
+            return _series("source", "all", rows, hours, sentiment)
+        candidates = topic_candidates(topic)
+        if not candidates:
+            return None
+        key = "scored" if sentiment else "hourly"
+        return max(await self._fetch_series(candidates, hours, sentiment), key=lambda s: sum(s[key]))
+
+    async def _fetch_series(self, candidates: List[tuple], hours: int,
+                            sentiment: bool = False) -> List[Dict[str, Any]]:
+        """Dense series for several (kind, term) pairs in one query, in input order"""
+        await self._ensure_pool()
+        async with self.db_pool.acquire() as conn:
+            # Index range scans on (kind, term, hour); a join against a generated
+            # hour series gets planned as a hash join over the whole table
+            rows = await conn.fetch(
+                f"""
+                SELECT c.idx, {_SLOT}, r.articles, r.scored, r.sentiment_sum
+                FROM {_FIRST_HOUR}
+                CROSS JOIN unnest($2::text[], $3::text[]) WITH ORDINALITY AS c(kind, term, idx)
+                JOIN volume_rollups r
+                  ON r.kind = c.kind AND r.term = c.term AND r.hour >= s.first
+                """,
+                hours,
+                [kind for kind, _ in candidates],
+                [term for _, term in candidates]
+            )
+        by_idx: Dict[int, list] = {}
+        for row in rows:
+            by_idx.setdefault(row["idx"], []).append(row)
+        return [
+            _series(kind, term, by_idx.get(i, []), hours, sentiment)
+            for i, (kind, term) in enumerate(candidates, start=1)
+        ]
+
+    async def close(self):
+        """Close the connection pool"""
+        if self.db_pool is not None:
+            await self.db_pool.close()
+            self.db_pool = None
+
+
+def create_volume_rollups(db_dsn: Optional[str] = None) -> Optional[VolumeRollups]:
+    """
+    Factory function to create the volume rollup reader
+
+    Returns:
+        VolumeRollups, or None when disabled (VOLUME_ROLLUPS=false),
+        no DSN is configured or asyncpg is missing — /predict then counts
+        retrieved documents and /analyze sentiment asks the LLM.
+    """
+    if os.getenv("VOLUME_ROLLUPS", "true").lower() not in ("1", "true", "yes"):
+        return None
+    db_dsn = db_dsn or os.getenv("PG_DSN")
+    if not db_dsn or asyncpg is None:
+        return None
+    return VolumeRollups(db_dsn=db_dsn)
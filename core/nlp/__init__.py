@@ -5,7 +5,8 @@ from core.nlp.ner_service import (
     NERStrategy,
     Entity,
     create_ner_service,
-    extract_entities_auto
+    extract_entities_auto,
+    normalize_entity_name
 )
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     "NERStrategy",
     "Entity",
     "create_ner_service",
-    "extract_entities_auto"
+    "extract_entities_auto",
+    "normalize_entity_name"
 ]
@@ -1,16 +1,36 @@
 """
 NER Service — Multi-strategy Named Entity Recognition.
 Supports spaCy, LLM-based, and fallback regex extraction.
+spaCy runs batched (nlp.pipe) on a worker thread with an LRU result cache.
 """
 
+import asyncio
+import hashlib
 import logging
+import os
 import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
 
+_NORM_STRIP = re.compile(r"^[\W_]+|[\W_]+$")
+_NORM_SPACE = re.compile(r"\s+")
+
+
+def normalize_entity_name(name: str) -> str:
+    """Canonical key for an entity surface form ("The  OpenAI," -> "openai")"""
+    value = _NORM_SPACE.sub(" ", name or "").strip()
+    value = _NORM_STRIP.sub("", value)
+    value = re.sub(r"(?:'s|’s)$", "", value)
+    if value.lower().startswith("the "):
+        value = value[4:]
+    return value.casefold()
+
+
 class NERStrategy(Enum):
     """NER extraction strategies"""
     SPACY = "spacy"
@@ -58,6 +78,13 @@ class NERService:
         self.prefer_strategy = prefer_strategy
         self._spacy_nlp = None
         self._spacy_available = False
+        self.batch_size = int(os.getenv("NER_BATCH_SIZE", "32"))
+        self.cache_size = int(os.getenv("NER_CACHE_SIZE", "4096"))
+        self._cache: "OrderedDict[str, List[Entity]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # One worker: spaCy pipelines are not safe for concurrent calls
+        self._executor: Optional[ThreadPoolExecutor] = None
 
         # Try to load spaCy
         self._init_spacy()
@@ -69,8 +96,11 @@ class NERService:
             # Try to load English model
             try:
                 self._spacy_nlp = spacy.load("en_core_web_sm")
+                self._disable_unused_pipes()
                 self._spacy_available = True
-                logger.info("spaCy model loaded successfully: en_core_web_sm")
+                logger.info(
+                    f"spaCy model loaded successfully: en_core_web_sm (pipes: {self._spacy_nlp.pipe_names})"
+                )
             except OSError:
                 # Model not installed
                 logger.warning(
@@ -82,6 +112,91 @@ class NERService:
             logger.warning("spaCy not installed. Install with: pip install spacy")
             self._spacy_available = False
 
+    def _disable_unused_pipes(self):
+        """Keep only NER and the components it listens to (tagger/parser/lemmatizer are unused)"""
+        nlp = self._spacy_nlp
+        keep = {"ner"}
+        for name in nlp.pipe_names:
+            if "ner" in getattr(nlp.get_pipe(name), "listening_components", []):
+                keep.add(name)
+        disabled = [name for name in nlp.pipe_names if name not in keep]
+        if disabled:
+            nlp.select_pipes(disable=disabled)
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[List[Entity]]:
+        entities = self._cache.get(key)
+        if entities is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        return list(entities)
+
+    def _cache_put(self, key: str, entities: List[Entity]):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = list(entities)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _extract_spacy_batch(self, texts: List[str]) -> List[List[Entity]]:
+        """spaCy NER for many texts: cache lookup, then one nlp.pipe run off the event loop"""
+        results: List[Optional[List[Entity]]] = []
+        misses: Dict[str, List[int]] = {}
+        for idx, text in enumerate(texts):
+            key = self._cache_key(text)
+            cached = self._cache_get(key)
+            results.append(cached)
+            if cached is None:
+                misses.setdefault(key, []).append(idx)
+
+        if misses:
+            keys = list(misses)
+            miss_texts = [texts[misses[key][0]] for key in keys]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ner-spacy")
+            loop = asyncio.get_running_loop()
+            extracted = await loop.run_in_executor(self._executor, self._pipe_spacy, miss_texts)
+            for key, entities in zip(keys, extracted):
+                self._cache_put(key, entities)
+                for idx in misses[key]:
+                    results[idx] = list(entities)
+
+        return results  # type: ignore[return-value]
+
+    async def extract_entities_batch(
+        self,
+        texts: List[str],
+        lang: str = "en",
+        strategy: Optional[NERStrategy] = None
+    ) -> List[List[Entity]]:
+        """
+        Extract named entities from many texts at once
+
+        spaCy strategy: single batched nlp.pipe call on a worker thread, cached by text hash.
+        Other strategies (or spaCy failure): per-text extract_entities fallback chain.
+
+        Returns:
+            One entity list per input text, in order
+        """
+        strategy = strategy or self.prefer_strategy
+        if not texts:
+            return []
+
+        if strategy == NERStrategy.SPACY and self._spacy_available:
+            try:
+                return await self._extract_spacy_batch(texts)
+            except Exception as e:
+                logger.warning(f"spaCy batch extraction failed: {e}, falling back to LLM")
+                strategy = NERStrategy.LLM
+
+        return [await self.extract_entities(text, lang=lang, strategy=strategy) for text in texts]
+
     async def extract_entities(
         self,
         text: str,
@@ -104,7 +219,7 @@ class NERService:
         # Try strategies in order
         if strategy == NERStrategy.SPACY and self._spacy_available:
             try:
-                return self._extract_spacy(text, lang)
+                return (await self._extract_spacy_batch([text]))[0]
             except Exception as e:
                 logger.warning(f"spaCy extraction failed: {e}, falling back to LLM")
                 strategy = NERStrategy.LLM
@@ -120,29 +235,36 @@ class NERService:
         return self._extract_regex(text)
 
     def _extract_spacy(self, text: str, lang: str) -> List[Entity]:
-        """Extract entities using spaCy"""
+        """Extract entities using spaCy (blocking; prefer extract_entities)"""
+        return self._pipe_spacy([text])[0]
+
+    def _pipe_spacy(self, texts: List[str]) -> List[List[Entity]]:
+        """Run nlp.pipe over texts (blocking — call via the executor)"""
         if not self._spacy_available:
             raise RuntimeError("spaCy not available")
 
-        doc = self._spacy_nlp(text)
-        entities = []
-
-        for ent in doc.ents:
-            # Map spaCy labels to our standard labels
-            label = self._normalize_label(ent.label_)
+        results: List[List[Entity]] = []
+        for doc in self._spacy_nlp.pipe(texts, batch_size=self.batch_size):
+            entities = []
+            for ent in doc.ents:
+                # Map spaCy labels to our standard labels
+                label = self._normalize_label(ent.label_)
 
-            entities.append(
-                Entity(
-                    text=ent.text,
-                    label=label,
-                    start=ent.start_char,
-                    end=ent.end_char,
-                    confidence=1.0
+                entities.append(
+                    Entity(
+                        text=ent.text,
+                        label=label,
+                        start=ent.start_char,
+                        end=ent.end_char,
+                        confidence=1.0
+                    )
                 )
-            )
+            results.append(entities)
 
-        logger.info(f"spaCy extracted {len(entities)} entities")
-        return entities
+        logger.info(
+            f"spaCy extracted {sum(len(r) for r in results)} entities from {len(texts)} texts"
+        )
+        return results
 
     async def _extract_llm(self, text: str, lang: str) -> List[Entity]:
         """Extract entities using LLM"""
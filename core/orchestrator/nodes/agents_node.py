@@ -155,7 +155,9 @@ async def _run_agent(
 
         elif agent_name == "sentiment_emotion":
             from core.agents.sentiment_emotion import run_sentiment_emotion
-            result = await run_sentiment_emotion(docs, correlation_id)
+            series = state.get("sentiment_series")
+            explain = state.get("params", {}).get("explain")
+            result = await run_sentiment_emotion(docs, correlation_id, series=series, explain=explain)
 
         elif agent_name == "topic_modeler":
             from core.agents.topic_modeler import run_topic_modeler
@@ -166,13 +168,15 @@ async def _run_agent(
             from core.agents.trend_forecaster import run_trend_forecaster
             topic = state.get("params", {}).get("topic")
             window = state.get("window", "1w")
-            result = await run_trend_forecaster(docs, topic, window, correlation_id)
+            volume = state.get("volume_series")
+            result = await run_trend_forecaster(docs, topic, window, correlation_id, volume=volume)
 
         elif agent_name == "competitor_news":
             from core.agents.competitor_news import run_competitor_news
             domains = state.get("params", {}).get("domains")
             niche = state.get("params", {}).get("niche")
-            result = await run_competitor_news(docs, domains, niche, correlation_id)
+            aggregates = state.get("competitor_aggregates")
+            result = await run_competitor_news(docs, domains, niche, correlation_id, aggregates=aggregates)
 
         elif agent_name == "synthesis_agent":
             from core.agents.synthesis_agent import run_synthesis_agent
@@ -228,7 +228,9 @@ def _format_sentiment_response(
 
     # TL;DR
     sentiment_label = _sentiment_label(overall)
-    dominant_emotion = max(emotions.items(), key=lambda x: x[1])[0] if emotions else "neutral"
+    # Rollup-only answers carry no emotion breakdown (all zeros)
+    has_emotions = bool(emotions) and max(emotions.values()) > 0
+    dominant_emotion = max(emotions.items(), key=lambda x: x[1])[0] if has_emotions else "neutral"
     tldr = f"Overall sentiment: {sentiment_label} ({overall:+.2f}). Dominant emotion: {dominant_emotion}."
     tldr = tldr[:220]
 
@@ -401,7 +403,7 @@ def _build_sentiment_insights(sentiment_result: Dict, docs: List[Dict]) -> List[
     ))
 
     # Top emotion
-    if emotions:
+    if emotions and max(emotions.values()) > 0:
         top_emotion = max(emotions.items(), key=lambda x: x[1])
         insights.append(Insight(
             type="fact",
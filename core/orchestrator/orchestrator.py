@@ -2,6 +2,7 @@
 Phase 1 Orchestrator — retrieval → agents → format → validate with monitoring hooks.
 """
 
+import asyncio
 import logging
 import uuid
 from typing import Any, Dict, Literal, Optional
@@ -10,6 +11,10 @@ from core.orchestrator.nodes.retrieval_node import retrieval_node
 from core.orchestrator.nodes.agents_node import agents_node
 from core.orchestrator.nodes.validate_node import validate_node
 from core.orchestrator.nodes.format_node import format_node
+from core.rag.retrieval_client import get_retrieval_client
+from core.agents.trend_forecaster import volume_lookback
+from core.agents.sentiment_emotion import sentiment_lookback
+from core.history.volume_rollups import create_volume_rollups
 
 from schemas.analysis_schemas import BaseAnalysisResponse, ErrorResponse, Meta, build_error_response
 from infra.config.phase1_config import get_config
@@ -28,6 +33,7 @@ class Phase1Orchestrator:
 
     def __init__(self) -> None:
         self.config = get_config()
+        self.volume_rollups = create_volume_rollups()
         ensure_metrics_server()
 
     async def execute_trends(
@@ -108,6 +114,7 @@ class Phase1Orchestrator:
         lang: str = "auto",
         sources: Optional[list] = None,
         k_final: int = 5,
+        explain: Optional[bool] = None,
     ) -> BaseAnalysisResponse | ErrorResponse:
         mode_normalized = mode.lower()
         command_name = f"analyze_{mode_normalized}"
@@ -130,6 +137,7 @@ class Phase1Orchestrator:
                 "lang": lang,
                 "sources": sources,
                 "k_final": k_final,
+                "explain": explain,
             },
             "query": query,
             "window": window,
@@ -141,7 +149,15 @@ class Phase1Orchestrator:
         }
 
         try:
-            state = await retrieval_node(state)
+            if mode_normalized == "sentiment":
+                # Sentiment trend comes from the rollups; retrieval supplies the evidence
+                state, series = await asyncio.gather(
+                    retrieval_node(state),
+                    self._read_topic_sentiment(query, window, correlation_id),
+                )
+                state["sentiment_series"] = series
+            else:
+                state = await retrieval_node(state)
             if "error" in state:
                 reason = state.get("error", {}).get("code", "retrieval")
                 record_orchestrator_error(command_name, timer, reason)
@@ -217,7 +233,11 @@ class Phase1Orchestrator:
         }
 
         try:
-            state = await retrieval_node(state)
+            # Hourly volumes drive the forecast; retrieval still supplies the evidence
+            state, volume = await asyncio.gather(
+                retrieval_node(state),
+                self._read_topic_volume(topic, window, correlation_id),
+            )
             if "error" in state:
                 reason = state.get("error", {}).get("code", "retrieval")
                 record_orchestrator_error(command_name, timer, reason)
@@ -227,6 +247,7 @@ class Phase1Orchestrator:
             if not docs:
                 record_orchestrator_error(command_name, timer, "no_data")
                 return self._build_no_data_response(correlation_id)
+            state["volume_series"] = volume
 
             state = await agents_node(state)
             if "error" in state:
@@ -257,6 +278,47 @@ class Phase1Orchestrator:
             logger.error(f"[{correlation_id}] /predict trends failed: {exc}", exc_info=True)
             return self._build_exception_error_response(exc, correlation_id)
 
+    async def _read_topic_volume(
+        self, topic: Optional[str], window: str, correlation_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Hourly volume series for /predict, or None (forecast then counts retrieved docs)"""
+        if self.volume_rollups is None:
+            return None
+        try:
+            return await self.volume_rollups.topic_series(topic, volume_lookback(window)[0])
+        except Exception as exc:
+            logger.warning(f"[{correlation_id}] Volume rollups unavailable: {exc}")
+            return None
+
+    async def _read_topic_sentiment(
+        self, query: Optional[str], window: str, correlation_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Hourly sentiment rollups for /analyze sentiment, or None (the agent then asks the LLM)"""
+        if self.volume_rollups is None:
+            return None
+        try:
+            return await self.volume_rollups.topic_sentiment(query, sentiment_lookback(window))
+        except Exception as exc:
+            logger.warning(f"[{correlation_id}] Sentiment rollups unavailable: {exc}")
+            return None
+
+    async def _read_share_of_voice(
+        self,
+        query: Optional[str],
+        window: str,
+        domains: Optional[list],
+        sources: Optional[list],
+        correlation_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Share of voice for /analyze competitors, or None (the agent then counts retrieved docs)"""
+        try:
+            return await get_retrieval_client().share_of_voice(
+                query=query, window=window, domains=domains, sources=sources
+            )
+        except Exception as exc:
+            logger.warning(f"[{correlation_id}] Share-of-voice aggregate unavailable: {exc}")
+            return None
+
     async def execute_analyze_competitors(
         self,
         domains: Optional[list] = None,
@@ -298,7 +360,11 @@ class Phase1Orchestrator:
         }
 
         try:
-            state = await retrieval_node(state)
+            # Domain counts come from a SQL aggregate over all matches; retrieval supplies evidence
+            state, aggregates = await asyncio.gather(
+                retrieval_node(state),
+                self._read_share_of_voice(query, window, domains, sources, correlation_id),
+            )
             if "error" in state:
                 reason = state.get("error", {}).get("code", "retrieval")
                 record_orchestrator_error(command_name, timer, reason)
@@ -308,6 +374,7 @@ class Phase1Orchestrator:
             if not docs:
                 record_orchestrator_error(command_name, timer, "no_data")
                 return self._build_no_data_response(correlation_id)
+            state["competitor_aggregates"] = aggregates
 
             state = await agents_node(state)
             if "error" in state:
@@ -275,6 +275,21 @@ class RetrievalClient:
         }
         return response
 
+    async def share_of_voice(
+        self,
+        *,
+        query: Optional[str],
+        window: str,
+        domains: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Per-domain counts over every matching article, aggregated in the database."""
+        api = self._get_ranking_api()
+        return await api.share_of_voice(
+            query=query, window=window, domains=domains, sources=sources, limit=limit
+        )
+
     # ------------------------------------------------------------------
     # Cache management
     # ------------------------------------------------------------------
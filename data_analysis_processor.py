@@ -45,6 +45,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Группировки /aggregate -> PgClient.count_articles_by
+AGGREGATION_GROUPS = {
+    'источник': 'source',
+    'source': 'source',
+    'дата': 'day',
+    'date': 'day',
+    'день': 'day',
+    'day': 'day',
+    'час': 'hour',
+    'hour': 'hour',
+    'неделя': 'week',
+    'week': 'week',
+    'язык': 'language',
+    'language': 'language',
+}
+
 class AnalysisType(Enum):
     """Типы анализа данных"""
     DEEP_ANALYSIS = "analyze"
@@ -126,12 +142,15 @@ class DataAnalysisProcessor:
         try:
             logger.info(f"🔍 Processing {request.command.value} request: {request.query}")
 
-            # Получение данных
-            articles = await self._get_articles_for_analysis(
-                request.query,
-                request.timeframe,
-                request.limit
-            )
+            # Получение данных (агрегация считается в SQL, документы не нужны)
+            if request.command == AnalysisType.AGGREGATION and self.pg_client:
+                articles = []
+            else:
+                articles = await self._get_articles_for_analysis(
+                    request.query,
+                    request.timeframe,
+                    request.limit
+                )
 
             # Выбор метода анализа
             result_data = await self._route_analysis(request, articles)
@@ -142,7 +161,7 @@ class DataAnalysisProcessor:
                 success=True,
                 data=result_data,
                 metadata={
-                    'articles_count': len(articles),
+                    'articles_count': result_data.get('total_items', len(articles)),
                     'request_type': request.command.value,
                     'query': request.query,
                     'timeframe': request.timeframe,
@@ -407,16 +426,27 @@ class DataAnalysisProcessor:
         metric = request.parameters.get('metric', 'источники')
         groupby = request.parameters.get('groupby', 'дата')
 
-        # Базовая агрегация данных
-        aggregated_data = self._perform_data_aggregation(articles, metric, groupby)
+        histogram = None
+        if self.pg_client and not articles:
+            # Агрегаты по всем подходящим статьям из PostgreSQL
+            pushdown = await asyncio.to_thread(
+                self._pushdown_aggregation, request.query, request.timeframe, groupby
+            )
+            aggregated_data = pushdown['groups']
+            histogram = pushdown['histogram']
+            total_items = pushdown['total']
+            data_text = self._format_aggregates_for_gpt(pushdown, groupby)
+        else:
+            # Базовая агрегация данных
+            aggregated_data = self._perform_data_aggregation(articles, metric, groupby)
+            total_items = len(articles)
+            data_text = self._format_articles_for_gpt(articles, include_metadata=True)
 
         # GPT-5 анализ агрегированных данных
-        articles_text = self._format_articles_for_gpt(articles, include_metadata=True)
-
-        prompt = f"""Проведи агрегацию и анализ данных по {len(articles)} статьям:
+        prompt = f"""Проведи агрегацию и анализ данных по {total_items} статьям:
 
 ДАННЫЕ:
-{articles_text}
+{data_text}
 
 ЗАДАЧА АГРЕГАЦИИ:
 - Метрика: {metric}
@@ -452,13 +482,16 @@ class DataAnalysisProcessor:
                 verbosity="high"
             )
 
-            return {
+            result = {
                 'aggregation_analysis': analysis_result,
                 'raw_aggregation': aggregated_data,
                 'metric': metric,
                 'groupby': groupby,
-                'total_items': len(articles)
+                'total_items': total_items
             }
+            if histogram is not None:
+                result['histogram'] = histogram
+            return result
 
         except Exception as e:
             logger.error(f"❌ Aggregation error: {e}")
@@ -821,6 +854,40 @@ class DataAnalysisProcessor:
 
         return aggregation
 
+    def _pushdown_aggregation(self, query: str, timeframe: str, groupby: str) -> Dict[str, Any]:
+        """Агрегация в SQL (PgClient.count_articles_by / article_histogram) по всем статьям"""
+        group = AGGREGATION_GROUPS.get(groupby.lower(), 'day')
+        hours = self._parse_timeframe(timeframe) * 24
+        daily = self.pg_client.article_histogram('day', query or None, hours)
+        rows = daily if group == 'day' else self.pg_client.count_articles_by(group, query or None, hours)
+        total = sum(r['articles'] for r in daily)
+
+        def label(key):
+            return key.isoformat()[:16 if group == 'hour' else 10] if hasattr(key, 'isoformat') else str(key)
+
+        return {
+            'groups': {
+                label(r.get('key', r.get('bucket'))): {
+                    'count': r['articles'],
+                    'share': r.get('share', r['articles'] / total if total else 0.0),
+                }
+                for r in rows
+            },
+            'histogram': {label(r['bucket']): r['articles'] for r in daily},
+            'total': total,
+        }
+
+    def _format_aggregates_for_gpt(self, pushdown: Dict[str, Any], groupby: str) -> str:
+        """Форматирование SQL-агрегатов для GPT-5"""
+        if not pushdown['total']:
+            return "Нет данных для анализа"
+        lines = [f"Всего статей: {pushdown['total']}", "", f"Группировка ({groupby}):"]
+        for key, row in pushdown['groups'].items():
+            lines.append(f"- {key}: {row['count']} ({row['share']:.1%})")
+        lines += ["", "Динамика по дням:"]
+        lines += [f"- {day}: {count}" for day, count in pushdown['histogram'].items()]
+        return '\n'.join(lines)
+
     def _apply_smart_filters(self, articles: List[Dict[str, Any]], criteria: str, value: str) -> List[Dict[str, Any]]:
         """Применение умных фильтров"""
         filtered = []
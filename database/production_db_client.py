@@ -12,6 +12,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
 from pg_client_new import PgClient
+from services.hot_tier import get_hot_tier
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,23 @@ class ProductionDBClient(PgClient):
 
     def __init__(self):
         super().__init__()
+        # Recent chunks held in memory for 24-72h queries (HOT_TIER_ENABLED),
+        # one tier per process however many clients are created
+        self.hot_tier = get_hot_tier()
+
+    def search_chunks_fts_ts(self, tsquery: Optional[str], plainto: str,
+                             sources: List[str], since_days: Optional[int],
+                             limit: int = 10) -> List[Dict[str, Any]]:
+        """FTS search; recency-bounded plainto queries are served by the hot tier when it covers them"""
+        tier = getattr(self, 'hot_tier', None)
+        if tier is not None and not tsquery and since_days:
+            try:
+                results = tier.search_lexical(plainto, int(since_days), limit, sources)
+                if results is not None:
+                    return results
+            except Exception as e:
+                logger.warning(f"Hot tier FTS search failed, using database: {e}")
+        return super().search_chunks_fts_ts(tsquery, plainto, sources, since_days, limit)
 
     # ============================================================================
     # Search Logging
@@ -491,7 +509,7 @@ class ProductionDBClient(PgClient):
             with self._cursor() as cur:
                 cur.execute("""
                     SELECT
-                        article_id, url, source, title_norm, clean_text,
+                        article_id, url, source, title_norm, clean_text, text_hash,
                         published_at, is_canonical, alternatives_count,
                         source_score, content_hash
                     FROM articles_index
@@ -502,7 +520,8 @@ class ProductionDBClient(PgClient):
 
                 cols = [d[0] for d in cur.description]
                 rows = cur.fetchall()
-                records = [dict(zip(cols, row)) for row in rows]
+                # Bodies moved to fulltext_store are NULL inline
+                records = self.hydrate_fulltext([dict(zip(cols, row)) for row in rows])
                 for record in records:
                     if 'title' not in record or not record.get('title'):
                         record['title'] = record.get('title_norm')
@@ -606,7 +625,7 @@ class ProductionDBClient(PgClient):
                 query = f"""
                     SELECT
                         ai.article_id, ai.url, ai.source,
-                        ai.title_norm, ai.clean_text, ai.published_at
+                        ai.title_norm, ai.clean_text, ai.text_hash, ai.published_at
                     FROM articles_index ai
                     WHERE {where_sql}
                     ORDER BY ai.published_at DESC NULLS LAST
@@ -617,7 +636,8 @@ class ProductionDBClient(PgClient):
 
                 cols = [d[0] for d in cur.description]
                 rows = cur.fetchall()
-                records = [dict(zip(cols, row)) for row in rows]
+                # Bodies moved to fulltext_store are NULL inline
+                records = self.hydrate_fulltext([dict(zip(cols, row)) for row in rows])
                 for record in records:
                     if 'title' not in record or not record.get('title'):
                         record['title'] = record.get('title_norm')
@@ -650,6 +670,15 @@ class ProductionDBClient(PgClient):
         filters: Dict[str, Any] = None
     ) -> List[Dict[str, Any]]:
         """Search articles with time filtering using pgvector (sync version)"""
+        tier = getattr(self, 'hot_tier', None)
+        if tier is not None and query_embedding:
+            try:
+                results = tier.search_vectors(query_embedding, hours, limit,
+                                              (filters or {}).get('sources'))
+                if results is not None:
+                    return results
+            except Exception as e:
+                logger.warning(f"Hot tier vector search failed, using database: {e}")
         try:
             with self._cursor() as cur:
                 # Convert embedding to pgvector format
@@ -0,0 +1,31 @@
+-- Migration: Persistent entity index for GraphRAG
+-- Written at ingest by services/entity_index_service.py, read by core/graph/entity_index.py.
+-- PgClient.ensure_schema() creates the same objects; this file is for manual runs.
+
+CREATE TABLE IF NOT EXISTS entities (
+    entity_norm TEXT PRIMARY KEY,          -- normalize_entity_name() key
+    display_name TEXT NOT NULL,
+    label TEXT,
+    doc_freq INTEGER DEFAULT 0,
+    first_seen TIMESTAMPTZ DEFAULT NOW(),
+    last_seen TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS article_entities (
+    article_id TEXT NOT NULL,
+    entity_norm TEXT NOT NULL,
+    mentions INTEGER DEFAULT 1,
+    PRIMARY KEY (article_id, entity_norm)
+);
+CREATE INDEX IF NOT EXISTS idx_article_entities_entity ON article_entities(entity_norm);
+
+CREATE TABLE IF NOT EXISTS entity_cooccurrence (
+    entity_a TEXT NOT NULL,                -- entity_a < entity_b
+    entity_b TEXT NOT NULL,
+    doc_count INTEGER DEFAULT 0,
+    last_seen TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (entity_a, entity_b)
+);
+
+ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS entities_indexed BOOLEAN DEFAULT FALSE;
+CREATE INDEX IF NOT EXISTS idx_ai_entities_pending ON articles_index(id) WHERE entities_indexed IS NOT TRUE;
@@ -13,6 +13,8 @@ Supported SERVICE_MODE values:
   - chunk-continuous   -> python services/chunk_continuous_service.py --interval {CHUNK_CONTINUOUS_INTERVAL} --batch {CHUNK_CONTINUOUS_BATCH}
   - fts                -> python services/fts_service.py index --batch-size {FTS_BATCH}
   - fts-continuous     -> python services/fts_service.py service --interval {FTS_CONTINUOUS_INTERVAL} --batch-size {FTS_BATCH}
+  - entities           -> python services/entity_index_service.py service --interval {ENTITY_INDEX_INTERVAL} --batch-size {ENTITY_INDEX_BATCH}
+  - trends             -> python services/trend_cluster_service.py service --interval {TREND_CLUSTER_INTERVAL} --batch-size {TREND_CLUSTER_BATCH}
   - openai-migration   -> python services/openai_embedding_migration_service.py continuous --interval {MIGRATION_INTERVAL} --batch-size {MIGRATION_BATCH}
   - bot                -> python start_telegram_bot.py
   - search-api         -> uvicorn api.search_api:app --host 0.0.0.0 --port {PORT}
@@ -52,6 +54,14 @@ def build_command() -> str:
     fts_batch = os.getenv("FTS_BATCH", "100000")
     fts_continuous_interval = os.getenv("FTS_CONTINUOUS_INTERVAL", "60")
 
+    # Entity index (GraphRAG) controls
+    entity_interval = os.getenv("ENTITY_INDEX_INTERVAL", "60")
+    entity_batch = os.getenv("ENTITY_INDEX_BATCH", "200")
+
+    # Online trend clustering controls
+    trend_interval = os.getenv("TREND_CLUSTER_INTERVAL", "60")
+    trend_batch = os.getenv("TREND_CLUSTER_BATCH", "500")
+
     mig_interval = os.getenv("MIGRATION_INTERVAL", "60")
     # OpenAI embedding migration batch size (fallback to service default 100)
     mig_batch = os.getenv("OPENAI_EMBEDDING_BATCH_SIZE", os.getenv("MIGRATION_BATCH", "100"))
@@ -83,6 +93,14 @@ def build_command() -> str:
         # Continuous FTS indexing - run directly without ServiceManager to avoid OpenAI dependency
         return f"python services/fts_service.py service --interval {fts_continuous_interval} --batch-size {fts_batch}"
 
+    if mode == "entities":
+        # Ingest-time NER for /graph; spaCy/regex only, no OpenAI dependency
+        return f"python services/entity_index_service.py service --interval {entity_interval} --batch-size {entity_batch}"
+
+    if mode == "trends":
+        # Online trend clusters read by /trends (TRENDS_ONLINE=true); single instance
+        return f"python services/trend_cluster_service.py service --interval {trend_interval} --batch-size {trend_batch}"
+
     if mode == "openai-migration":
         # Default to continuous mode; the migration service requires a subcommand
         return f"python services/openai_embedding_migration_service.py continuous --interval {mig_interval} --batch-size {mig_batch}"
@@ -96,7 +114,7 @@ def build_command() -> str:
         return f"uvicorn api.search_api:app --host 0.0.0.0 --port {port}"
 
     # Fallback: print help and exit non-zero
-    print(f"Unsupported SERVICE_MODE='{mode}'. Supported: poll|work|work-continuous|embedding|chunking|chunk-continuous|openai-migration|bot|search-api", file=sys.stderr)
+    print(f"Unsupported SERVICE_MODE='{mode}'. Supported: poll|work|work-continuous|embedding|chunking|chunk-continuous|fts|fts-continuous|entities|trends|openai-migration|bot|search-api", file=sys.stderr)
     sys.exit(2)
 
 
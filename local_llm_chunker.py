@@ -113,6 +113,56 @@ class LocalLLMChunker:
         self.model = os.getenv("OLLAMA_MODEL", "qwen2.5-coder:3b")
         self.target_words = int(os.getenv("CHUNK_TARGET_WORDS", "400"))
         self.max_chunks = int(os.getenv("MAX_CHUNKS_PER_ARTICLE", "20"))
+        # Fast-path policy: auto | llm | deterministic
+        self.strategy = os.getenv("CHUNK_STRATEGY", "auto").strip().lower()
+        self.fast_path_max_words = int(
+            os.getenv("CHUNK_FAST_PATH_MAX_WORDS", str(int(self.target_words * 1.5)))
+        )
+        self.fast_path_sources = {
+            s.strip().lower()
+            for s in os.getenv(
+                "CHUNK_FAST_PATH_SOURCES", "apnews.com,reuters.com,afp.com,upi.com"
+            ).split(",")
+            if s.strip()
+        }
+
+    # Wire copy dateline, e.g. "WASHINGTON (AP) — " or "(Reuters) - "
+    _WIRE_DATELINE = re.compile(
+        r"^\W*(?:[A-Z][A-Za-z .,'/-]{0,60})?\((?:AP|Reuters|AFP|UPI)\)\s*[-\u2013\u2014]"
+    )
+    _SENTENCE_SPLIT = re.compile(
+        r"(?:(?<=[.!?\u2026])|(?<=[.!?\u2026][\"'\u201d\u2019)]))\s+(?=[\"'\u201c\u2018(]?[A-Z0-9\u0400-\u042f])"
+    )
+
+    def select_strategy(self, text: str, metadata: Dict[str, Any]) -> str:
+        """Decide between LLM boundaries and deterministic packing.
+
+        LLM boundaries add little for short articles (one or two chunks either way)
+        and for wire copy, which is already written in self-contained paragraphs.
+        Returns 'llm' or 'deterministic'.
+        """
+        if self.strategy in ("llm", "deterministic"):
+            return self.strategy
+
+        if len((text or "").split()) <= self.fast_path_max_words:
+            return "deterministic"
+
+        source = (metadata.get('source') or '').lower()
+        if source.startswith('www.'):
+            source = source[4:]
+        if source and any(source == d or source.endswith('.' + d) for d in self.fast_path_sources):
+            return "deterministic"
+
+        if self._WIRE_DATELINE.match(text[:200]):
+            return "deterministic"
+
+        return "llm"
+
+    def create_chunks_deterministic(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Chunk without an LLM round trip: paragraph/sentence packing to ~target_words"""
+        if not text or len(text) < 100:
+            return []
+        return self._pack_chunks(text, method='deterministic_packing', confidence=0.6)
 
     async def create_chunks(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create smart chunks using local LLM"""
@@ -298,27 +348,55 @@ Maximum {self.max_chunks} chunks. Focus on quality over quantity."""
             return self._fallback_chunking(original_text, {})
 
     def _fallback_chunking(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Simple paragraph-based fallback chunking to avoid zero chunks.
+        """Paragraph-based fallback chunking to avoid zero chunks when the LLM fails"""
+        return self._pack_chunks(text, method='fallback_paragraphs', confidence=0.4)
+
+    def _pack_chunks(self, text: str, method: str, confidence: float) -> List[Dict[str, Any]]:
+        """Greedy paragraph packing to ~target_words per chunk.
 
-        - Splits by blank lines, then groups paragraphs to ~target_words per chunk
+        - Splits by blank lines; paragraphs longer than the target are split at
+          sentence boundaries so a single wall of text still yields several chunks
+        - Merges a short trailing remainder into the previous chunk
         - Caps number of chunks to max_chunks
-        - Assigns low boundary confidence and type 'body'
         """
         try:
+            target = max(50, self.target_words)
             paragraphs = [p.strip() for p in re.split(r"\n\s*\n+", text) if p and len(p.strip()) > 0]
             if not paragraphs:
                 return []
 
-            chunks: List[Dict[str, Any]] = []
-            current: List[str] = []
+            # (text, words, starts_paragraph)
+            units = []
+            for para in paragraphs:
+                words = len(para.split())
+                if words <= target:
+                    units.append((para, words, True))
+                    continue
+                sentences = [s.strip() for s in self._SENTENCE_SPLIT.split(para) if s.strip()]
+                for j, sentence in enumerate(sentences):
+                    units.append((sentence, len(sentence.split()), j == 0))
+
+            groups: List[List[tuple]] = []
+            current: List[tuple] = []
             current_words = 0
-            char_offset = 0
+            for unit in units:
+                if current and current_words + unit[1] > target:
+                    groups.append(current)
+                    current, current_words = [], 0
+                current.append(unit)
+                current_words += unit[1]
+            if current:
+                if groups and current_words < target // 4:
+                    groups[-1].extend(current)
+                else:
+                    groups.append(current)
 
-            def flush_chunk():
-                nonlocal char_offset
-                if not current:
-                    return
-                chunk_text = "\n\n".join(current).strip()
+            chunks: List[Dict[str, Any]] = []
+            char_offset = 0
+            for group in groups[: self.max_chunks]:
+                chunk_text = group[0][0]
+                for unit_text, _, starts_paragraph in group[1:]:
+                    chunk_text += ("\n\n" if starts_paragraph else " ") + unit_text
                 # find approximate positions
                 start = text.find(chunk_text[:50], char_offset)
                 if start == -1:
@@ -332,28 +410,11 @@ Maximum {self.max_chunks} chunks. Focus on quality over quantity."""
                     'char_start': start,
                     'char_end': end,
                     'semantic_type': 'body',
-                    'boundary_confidence': 0.4,
+                    'boundary_confidence': confidence,
                     'llm_topic': '',
-                    'chunking_method': 'fallback_paragraphs',
+                    'chunking_method': method,
                 })
 
-            for para in paragraphs:
-                w = len(para.split())
-                if current_words + w > max(50, self.target_words):
-                    flush_chunk()
-                    current = [para]
-                    current_words = w
-                else:
-                    current.append(para)
-                    current_words += w
-
-                if len(chunks) >= self.max_chunks:
-                    break
-
-            if current and len(chunks) < self.max_chunks:
-                flush_chunk()
-
-            return chunks[: self.max_chunks]
+            return chunks
         except Exception:
             return []
-
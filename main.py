@@ -95,6 +95,22 @@ def main():
         "--max-retries", type=int, help="[Deprecated] Use --limit instead", default=None
     )
 
+    # Move inline article bodies into the compressed fulltext store
+    p_compact = sub.add_parser("compact-fulltext", help="Move inline article text into the compressed fulltext store")
+    p_compact.add_argument("--batch-size", type=int, default=500, help="Rows per table per transaction")
+
+    # Build the compact vector tier (embedding_compact + HNSW index)
+    p_vtier = sub.add_parser("build-vector-tier", help="Fill embedding_compact from embedding and index it")
+    p_vtier.add_argument("--batch-size", type=int, default=5000, help="Chunks per transaction")
+
+    # Recount the hourly volume rollups behind /predict
+    p_rollups = sub.add_parser("rebuild-volume-rollups", help="Recount hourly keyword/entity/source volumes")
+    p_rollups.add_argument("--hours", type=int, default=720, help="Hours back to recount")
+
+    # Lexicon sentiment for articles indexed before it was scored at ingest
+    p_sentiment = sub.add_parser("backfill-sentiment", help="Score indexed articles that have no sentiment")
+    p_sentiment.add_argument("--batch-size", type=int, default=1000, help="Articles per batch")
+
     # Statistics command
     p_stats = sub.add_parser("stats", help="Show system statistics")
     p_stats.add_argument(
@@ -218,6 +234,10 @@ def main():
                 print(f"  Cached (not modified): {stats['feeds_cached']}")
                 print(f"  New articles: {stats['new_articles']}")
                 print(f"  Errors: {stats['feeds_errors']}")
+                throttle = stats.get('throttle') or {}
+                if throttle.get('state') not in (None, 'normal'):
+                    print(f"  Backpressure: {throttle['state']} ({throttle['reason']}), "
+                          f"{throttle['feeds_deferred']} feeds deferred")
                 
                 if stats['errors']:
                     print("\nErrors:")
@@ -257,6 +277,9 @@ def main():
                 print(f"  Articles processed: {stats['articles_processed']}")
                 print(f"  Successful: {stats['successful']}")
                 print(f"  Duplicates: {stats['duplicates']}")
+                if 'near_duplicates' in stats:
+                    print(f"  Near-duplicates (chunking/embedding skipped): {stats['near_duplicates']} "
+                          f"({stats['compute_saved']:.1%} of text)")
                 print(f"  Partial: {stats['partial']}")
                 print(f"  Errors: {stats['errors']}")
 
@@ -278,11 +301,74 @@ def main():
             http_client = HttpClient()
             try:
                 processed = http_client.process_retry_queue(limit=limit)
-                print(f"✓ Processed {processed} items from retry queue")
+                print(f"✓ Processed {processed} items from retry queue "
+                      f"({http_client.retry_queue.size()} still queued)")
             finally:
                 http_client.close()
             return
 
+        if args.cmd == "compact-fulltext":
+            logger.info("Compacting inline fulltext")
+            totals = {'raw': 0, 'articles_index': 0}
+            skipped = 0
+            after_id = None
+            while True:
+                result = client.compact_fulltext(args.batch_size, after_id)
+                for table, count in result['moved'].items():
+                    totals[table] += count
+                skipped += sum(result['skipped'].values())
+                after_id = result['after_id']
+                if result['done']:
+                    break
+            store = client.get_fulltext_store_stats()
+            print(f"✓ Moved {totals['raw']} raw bodies and {totals['articles_index']} index bodies")
+            if skipped:
+                print(f"  {skipped} bodies left inline (row locked by a writer, or stored copy "
+                      f"differs in whitespace); rerun to retry locked rows")
+            print(f"  Store: {store['bodies']} bodies, {store['raw_bytes'] / 1e6:.1f}MB -> "
+                  f"{store['stored_bytes'] / 1e6:.1f}MB ({store['ratio']:.1f}x)")
+            print("  Run VACUUM FULL raw, articles_index (or pg_repack) to return the space")
+            return
+
+        if args.cmd == "build-vector-tier":
+            kind = client.ensure_compact_embeddings()
+            logger.info(f"Backfilling embedding_compact ({kind}({client.compact_dims}))")
+            filled, after_id = 0, 0
+            while True:
+                result = client.backfill_compact_embeddings(args.batch_size, after_id)
+                filled += result['filled']
+                after_id = result['after_id']
+                if result['done']:
+                    break
+            client.create_compact_embedding_index()
+            tier = client.get_compact_embedding_stats()
+            print(f"✓ Filled {filled} compact vectors; {tier['chunks']} chunks in the tier")
+            print(f"  {kind}({client.compact_dims}): {tier['compact_bytes'] / 1e6:.1f}MB vs "
+                  f"{tier['full_bytes'] / 1e6:.1f}MB full embeddings")
+            print("  Set EMBEDDING_COMPACT_TIER=true to search it")
+            return
+
+        if args.cmd == "rebuild-volume-rollups":
+            logger.info(f"Rebuilding volume rollups for the last {args.hours}h")
+            result = client.rebuild_volume_rollups(args.hours)
+            print(f"✓ Recounted {result['articles']} indexed articles into {result['rows']} hourly rows "
+                  f"(replaced {result['replaced']})")
+            return
+
+        if args.cmd == "backfill-sentiment":
+            logger.info("Scoring lexicon sentiment for unscored articles")
+            scored, after_id = 0, 0
+            while True:
+                result = client.backfill_sentiment(args.batch_size, after_id)
+                scored += result['scored']
+                after_id = result['after_id']
+                if result['done']:
+                    break
+            print(f"✓ Scored {scored} articles")
+            if scored:
+                print("  Run rebuild-volume-rollups to add them to the sentiment trends")
+            return
+
         if args.cmd == "stats":
             logger.info("Generating statistics")
             stats = client.get_stats()
@@ -296,6 +382,21 @@ def main():
                 print("\nArticles by status:")
                 for status, count in stats['articles'].items():
                     print(f"  {status}: {count}")
+
+            from services.backpressure import get_throttle_state
+            throttle = get_throttle_state(client)
+            if throttle:
+                reason = f" ({throttle['reason']})" if throttle.get('reason') else ''
+                print(f"\nPoller backpressure: {throttle.get('state', 'normal')}{reason}")
+                for stage, depth in (throttle.get('depths') or {}).items():
+                    print(f"  {stage}: {depth}")
+
+            try:
+                near_dup = client.get_near_duplicate_stats(24)
+                print(f"\nNear-duplicate gate (24h): {near_dup['near_duplicates']}/{near_dup['indexed']} linked, "
+                      f"{near_dup['text_share_skipped']:.1%} of text kept out of chunking/embedding")
+            except Exception as e:
+                logger.debug(f"Near-duplicate stats unavailable: {e}")
                     
             if args.detailed:
                 # Show additional detailed stats
@@ -6,15 +6,17 @@ import time
 import random
 import requests
 import os
-import socket
-import ipaddress
-from typing import Dict, Optional, Tuple, Any, List
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional, Tuple, Any, List
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import json
 import os
 
+from .resolver import BlockedAddressError, CachingResolver, PinnedAdapter, get_shared_resolver
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -29,11 +31,27 @@ class RetryItem:
     context: Dict[str, Any]
 
 class RetryQueue:
-    """Persistent retry queue for failed HTTP requests"""
-    
-    def __init__(self, queue_file: str = 'storage/queue/retry_queue.json'):
+    """Persistent retry queue for failed HTTP requests.
+
+    Backed by Redis when REDIS_URL is set, otherwise by an embedded SQLite
+    table (WAL mode) indexed on due time: enqueue is a single-row upsert and
+    dequeue an indexed range scan, safe across threads and processes.
+    A legacy JSON queue file at ``queue_file`` is imported once and renamed.
+    """
+
+    # Items handed out by get_ready_items are hidden for this long, so
+    # concurrent flushers don't retry the same URL; a crashed flusher's
+    # items simply become due again.
+    CLAIM_SECONDS = 300
+
+    def __init__(self, queue_file: str = 'storage/queue/retry_queue.json',
+                 db_file: Optional[str] = None):
         self.queue_file = queue_file
+        self.db_file = db_file or os.environ.get('RETRY_QUEUE_DB') or (
+            os.path.splitext(queue_file)[0] + '.db'
+        )
         self._ensure_queue_dir()
+        self._local = threading.local()
         self._use_redis = False
         self._redis = None
         try:
@@ -48,14 +66,112 @@ class RetryQueue:
                 self._hash_key = 'rssnews:retry_queue:data'
         except Exception as e:
             logger.warning(f"Redis not available for retry queue, falling back to file: {e}")
-            
+        try:
+            self._init_db()
+        except Exception as e:
+            logger.error(f"Failed to initialize retry queue database {self.db_file}: {e}")
+        try:
+            self._migrate_json_queue()
+        except Exception as e:
+            logger.error(f"Legacy retry queue {self.queue_file} not migrated, left in place: {e}")
+
     def _ensure_queue_dir(self):
         """Ensure queue directory exists"""
-        queue_dir = os.path.dirname(self.queue_file)
-        if queue_dir:
-            os.makedirs(queue_dir, exist_ok=True)
+        for path in (self.queue_file, self.db_file):
+            queue_dir = os.path.dirname(path)
+            if queue_dir:
+                os.makedirs(queue_dir, exist_ok=True)
 
-    # ------------- File lock helpers -------------
+    # ------------- SQLite helpers -------------
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread (and per-process, after fork) connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            # isolation_level=None: explicit BEGIN IMMEDIATE for write transactions
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout = 30000')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS retry_queue (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL DEFAULT '{}',
+                attempt INTEGER NOT NULL DEFAULT 1,
+                next_retry REAL NOT NULL,
+                max_attempts INTEGER NOT NULL DEFAULT 5,
+                error TEXT,
+                context TEXT NOT NULL DEFAULT '{}'
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_retry_queue_due ON retry_queue(next_retry)')
+
+    @staticmethod
+    def _row_to_item(row) -> RetryItem:
+        url, headers, attempt, next_retry, max_attempts, error, context = row
+        return RetryItem(
+            url=url,
+            headers=json.loads(headers or '{}'),
+            attempt=attempt,
+            next_retry=datetime.fromtimestamp(next_retry),
+            max_attempts=max_attempts,
+            error=error or '',
+            context=json.loads(context or '{}')
+        )
+
+    def _upsert_items(self, conn: sqlite3.Connection, items: List[RetryItem]):
+        # A URL already queued keeps its attempt counter and limit: a failed
+        # retry re-enqueues through add() before update_attempt() bumps it
+        conn.executemany(
+            """
+            INSERT INTO retry_queue (url, headers, attempt, next_retry, max_attempts, error, context)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                headers = excluded.headers,
+                next_retry = excluded.next_retry,
+                error = excluded.error,
+                context = excluded.context
+            """,
+            [
+                (
+                    item.url,
+                    json.dumps(dict(item.headers) if item.headers else {}),
+                    item.attempt,
+                    item.next_retry.timestamp(),
+                    item.max_attempts,
+                    item.error,
+                    json.dumps(dict(item.context) if item.context else {}, default=str),
+                )
+                for item in items
+            ]
+        )
+
+    def _migrate_json_queue(self):
+        """Import the legacy JSON queue file once, then rename it to *.migrated"""
+        if not os.path.exists(self.queue_file):
+            return
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Re-check under the write lock: another process may have migrated it
+            if not os.path.exists(self.queue_file):
+                conn.execute('COMMIT')
+                return
+            items = self._load_json_queue()
+            self._upsert_items(conn, items)
+            os.replace(self.queue_file, f"{self.queue_file}.migrated")
+            conn.execute('COMMIT')
+            logger.info(f"Migrated {len(items)} retry items from {self.queue_file} to {self.db_file}")
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    # ------------- File lock helpers (legacy JSON file) -------------
     def _lock_paths(self):
         lock_path = f"{self.queue_file}.lock"
         return lock_path
@@ -97,6 +213,11 @@ class RetryQueue:
 
         if self._use_redis and self._redis is not None:
             try:
+                existing = self._redis.hget(self._hash_key, url)
+                if existing:
+                    existing = json.loads(existing)
+                    attempt = int(existing.get('attempt', attempt))
+                    max_attempts = int(existing.get('max_attempts', max_attempts))
                 payload = {
                     'url': url,
                     'headers': dict(headers) if headers else {},
@@ -116,15 +237,16 @@ class RetryQueue:
             except Exception as e:
                 logger.warning(f"Redis enqueue failed, fallback to file: {e}")
 
-        queue = self._load_queue()
         item = RetryItem(url=url, headers=headers, attempt=attempt, next_retry=next_retry,
                          max_attempts=max_attempts, error=error, context=context or {})
-        queue.append(item)
-        self._save_queue(queue)
-        logger.info(f"Added to retry queue: {url} (attempt {attempt}/{max_attempts})")
+        try:
+            self._upsert_items(self._conn(), [item])
+            logger.info(f"Added to retry queue: {url} (attempt {attempt}/{max_attempts})")
+        except Exception as e:
+            logger.error(f"Failed to add {url} to retry queue: {e}")
     
     def get_ready_items(self, limit: int = 10) -> list[RetryItem]:
-        """Get items ready for retry"""
+        """Get items ready for retry (claimed for CLAIM_SECONDS on the SQLite backend)"""
         if self._use_redis and self._redis is not None:
             try:
                 now_ts = datetime.now().timestamp()
@@ -150,10 +272,34 @@ class RetryQueue:
             except Exception as e:
                 logger.warning(f"Redis read ready items failed, fallback to file: {e}")
 
-        queue = self._load_queue()
-        now = datetime.now()
-        ready_items = [item for item in queue if item.next_retry <= now and item.attempt <= item.max_attempts]
-        return ready_items[:limit]
+        now_ts = datetime.now().timestamp()
+        try:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT url, headers, attempt, next_retry, max_attempts, error, context
+                    FROM retry_queue
+                    WHERE next_retry <= ? AND attempt <= max_attempts
+                    ORDER BY next_retry
+                    LIMIT ?
+                    """,
+                    (now_ts, limit)
+                ).fetchall()
+                if rows:
+                    conn.executemany(
+                        'UPDATE retry_queue SET next_retry = ? WHERE url = ?',
+                        [(now_ts + self.CLAIM_SECONDS, row[0]) for row in rows]
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            return [self._row_to_item(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to read retry queue: {e}")
+            return []
     
     def remove(self, url: str):
         """Remove item from queue"""
@@ -166,9 +312,10 @@ class RetryQueue:
                 return
             except Exception as e:
                 logger.warning(f"Redis remove failed, fallback to file: {e}")
-        queue = self._load_queue()
-        queue = [item for item in queue if item.url != url]
-        self._save_queue(queue)
+        try:
+            self._conn().execute('DELETE FROM retry_queue WHERE url = ?', (url,))
+        except Exception as e:
+            logger.error(f"Failed to remove {url} from retry queue: {e}")
     
     def update_attempt(self, url: str) -> bool:
         """
@@ -203,24 +350,53 @@ class RetryQueue:
             except Exception as e:
                 logger.warning(f"Redis update attempt failed, fallback to file: {e}")
 
-        queue = self._load_queue()
-        for item in queue:
-            if item.url == url:
-                item.attempt += 1
-                if item.attempt > item.max_attempts:
-                    queue = [i for i in queue if i.url != url]
-                    self._save_queue(queue)
+        try:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT attempt, max_attempts FROM retry_queue WHERE url = ?', (url,)
+                ).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return False
+                attempt, max_attempts = row[0] + 1, row[1]
+                if attempt > max_attempts:
+                    conn.execute('DELETE FROM retry_queue WHERE url = ?', (url,))
+                    conn.execute('COMMIT')
                     logger.warning(f"Max retry attempts reached for {url}")
                     return False
-                backoff_minutes = (2 ** item.attempt) + random.uniform(0, 2)
-                item.next_retry = datetime.now() + timedelta(minutes=backoff_minutes)
-                self._save_queue(queue)
-                logger.info(f"Updated retry for {url}: attempt {item.attempt}/{item.max_attempts}")
-                return True
-        return False
+                backoff_minutes = (2 ** attempt) + random.uniform(0, 2)
+                next_retry = datetime.now() + timedelta(minutes=backoff_minutes)
+                conn.execute(
+                    'UPDATE retry_queue SET attempt = ?, next_retry = ? WHERE url = ?',
+                    (attempt, next_retry.timestamp(), url)
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            logger.info(f"Updated retry for {url}: attempt {attempt}/{max_attempts}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update retry attempt for {url}: {e}")
+            return False
+
+    def size(self) -> int:
+        """Number of queued items"""
+        if self._use_redis and self._redis is not None:
+            try:
+                return int(self._redis.zcard(self._zset_key))
+            except Exception as e:
+                logger.warning(f"Redis size failed, fallback to file: {e}")
+        try:
+            return self._conn().execute('SELECT COUNT(*) FROM retry_queue').fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count retry queue: {e}")
+            return 0
     
-    def _load_queue(self) -> list[RetryItem]:
-        """Load queue from disk"""
+    def _load_json_queue(self) -> list[RetryItem]:
+        """Load the legacy JSON queue file (migration only)"""
         if not os.path.exists(self.queue_file):
             return []
         
@@ -245,42 +421,91 @@ class RetryQueue:
             return queue
             
         except Exception as e:
-            logger.error(f"Failed to load retry queue: {e}")
-            return []
+            # Unreadable: the caller must not treat it as an empty queue and retire it
+            logger.error(f"Failed to load retry queue {self.queue_file}: {e}")
+            raise
         finally:
             self._release_lock()
-    
-    def _save_queue(self, queue: list[RetryItem]):
-        """Save queue to disk"""
+
+# Content types accepted when the caller expects an HTML page
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/xml', 'text/xml')
+
+# Leading bytes of common binary formats (documents, archives, images, audio/video)
+BINARY_SIGNATURES = (
+    b'%PDF-', b'PK\x03\x04', b'\x1f\x8b', b'\x89PNG', b'GIF87a', b'GIF89a', b'\xff\xd8\xff',
+    b'ID3', b'OggS', b'RIFF', b'\x1aE\xdf\xa3', b'fLaC', b'7z\xbc\xaf', b'Rar!',
+)
+
+
+def _sniff_binary(head: bytes) -> bool:
+    """True if the first body bytes look like a binary (non-text) format"""
+    head = head.lstrip(b'\xef\xbb\xbf')
+    if head.startswith(BINARY_SIGNATURES):
+        return True
+    # ISO-BMFF (mp4/mov/heic): size + 'ftyp'
+    if len(head) >= 8 and head[4:8] == b'ftyp':
+        return True
+    # NUL bytes never appear in text documents (UTF-16 BOMs aside)
+    return b'\x00' in head[:512] and not head.startswith((b'\xff\xfe', b'\xfe\xff'))
+
+
+def _parse_size_overrides(raw: str) -> Dict[str, int]:
+    """'example.com=20000000,cdn.example.org=1000000' -> {host: bytes}"""
+    overrides: Dict[str, int] = {}
+    for part in (raw or '').split(','):
+        if '=' not in part:
+            continue
+        host, _, value = part.partition('=')
         try:
-            data = []
-            for item in queue:
-                data.append({
-                    'url': item.url,
-                    'headers': dict(item.headers) if item.headers else {},
-                    'attempt': item.attempt,
-                    'next_retry': item.next_retry.isoformat(),
-                    'max_attempts': item.max_attempts,
-                    'error': item.error,
-                    'context': dict(item.context) if item.context else {}
-                })
-            
-            self._acquire_lock()
-            with open(self.queue_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
-        except Exception as e:
-            logger.error(f"Failed to save retry queue: {e}")
-        finally:
-            self._release_lock()
+            overrides[host.strip().lower().lstrip('.')] = int(value.strip())
+        except ValueError:
+            logger.warning(f"Ignoring invalid body size override: {part!r}")
+    return overrides
+
+
+RATE_LIMITED_ERROR = "Rate limited (429)"
+
+
+def is_rate_limited(error: Optional[str]) -> bool:
+    """True for the error HttpClient.get returns when the host still answers 429"""
+    return bool(error) and error.startswith(RATE_LIMITED_ERROR)
+
+
+class BodyRejected(Exception):
+    """Body read aborted (too large or not the expected content)"""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
 
 class HttpClient:
     """HTTP client with retry logic and rate limiting"""
     
-    def __init__(self, user_agent: str = None, timeout: int = 30):
+    def __init__(self, user_agent: str = None, timeout: int = 30,
+                 resolver: Optional[CachingResolver] = None):
         self.session = requests.Session()
         self.timeout = timeout
         self.retry_queue = RetryQueue()
+
+        # SSRF guard: every connection (redirect hops included) goes to a validated IP
+        self.resolver = resolver or get_shared_resolver()
+        adapter = PinnedAdapter(self.resolver)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Streaming body limits; per-domain overrides match the host or any parent domain
+        self.max_body_bytes = int(os.environ.get('HTTP_MAX_BODY_BYTES', str(5 * 1024 * 1024)))
+        self.max_body_overrides = _parse_size_overrides(os.environ.get('HTTP_MAX_BODY_BYTES_OVERRIDES', ''))
+        self.fetch_stats: Dict[str, int] = {
+            'aborted_too_large': 0,
+            'aborted_content_type': 0,
+            'aborted_sniffed': 0,
+        }
+
+        # Optional per-host pacing feedback: observer(host, status, latency, retry_after).
+        # When set, 429 Retry-After is left to the observer instead of sleeping here.
+        self.rate_observer: Optional[Callable[[str, int, float, Optional[str]], None]] = None
         
         # Set user agent
         user_agent = user_agent or (
@@ -296,10 +521,65 @@ class HttpClient:
             'Upgrade-Insecure-Requests': '1'
         })
     
+    def max_body_for(self, host: str) -> int:
+        """Byte ceiling for host (most specific override wins)"""
+        host = (host or '').lower().rstrip('.')
+        while host:
+            if host in self.max_body_overrides:
+                return self.max_body_overrides[host]
+            if '.' not in host:
+                break
+            host = host.split('.', 1)[1]
+        return self.max_body_bytes
+
+    def _read_body(self, response: requests.Response, expect_html: bool):
+        """Stream the body into response._content, aborting early on limits.
+
+        Raises BodyRejected (after closing the response) if the declared or
+        sniffed content is not acceptable or the byte ceiling is exceeded.
+        """
+        try:
+            url = response.url
+            limit = self.max_body_for(requests.utils.urlparse(url).hostname or '')
+
+            content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+            if expect_html and content_type and content_type not in HTML_CONTENT_TYPES:
+                raise BodyRejected('aborted_content_type', f"Unsupported content type {content_type}: {url}")
+
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > limit:
+                raise BodyRejected('aborted_too_large', f"Body too large ({declared} > {limit} bytes): {url}")
+
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if not body and chunk and _sniff_binary(chunk[:1024]):
+                    raise BodyRejected('aborted_sniffed', f"Binary body{f' labelled {content_type}' if content_type else ''}: {url}")
+                body.extend(chunk)
+                if len(body) > limit:
+                    raise BodyRejected('aborted_too_large', f"Body exceeds {limit} bytes: {url}")
+
+            response._content = bytes(body)
+            response._content_consumed = True
+        except BodyRejected as e:
+            self.fetch_stats[e.reason] += 1
+            logger.warning(str(e))
+            raise
+        finally:
+            # Body is in memory (or abandoned): release/close the connection
+            response.close()
+
+    def get_fetch_stats(self) -> Dict[str, int]:
+        """Counters for fetches aborted by the body limits"""
+        return dict(self.fetch_stats)
+
     def get(self, url: str, headers: Dict[str, str] = None, 
-            context: Dict[str, Any] = None) -> Tuple[Optional[requests.Response], Optional[str]]:
+            context: Dict[str, Any] = None,
+            expect_html: bool = False) -> Tuple[Optional[requests.Response], Optional[str]]:
         """
         GET request with retry logic
+        Bodies are streamed and capped at max_body_for(host); with expect_html,
+        non-HTML Content-Types are rejected before the body is read.
+        Each response is reported to rate_observer when one is set.
         Returns (response, final_url) or (None, error_message)
         """
         request_headers = self.session.headers.copy()
@@ -319,69 +599,82 @@ class HttpClient:
                     logger.warning("SSRF guard: Blocked host localhost/loopback")
                     return None, f"Blocked host: {host}"
                 try:
-                    infos = socket.getaddrinfo(host, None)
-                    for fam, _, _, _, sockaddr in infos:
-                        ip = sockaddr[0]
-                        ip_obj = ipaddress.ip_address(ip)
-                        if (ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_link_local
-                            or ip_obj.is_multicast or ip_obj.is_reserved):
-                            logger.warning(f"SSRF guard: Blocked private address {ip}")
-                            return None, f"Blocked host: {host}"
-                        # Block cloud metadata endpoint
-                        if str(ip_obj) == '169.254.169.254':
-                            logger.warning("SSRF guard: Blocked metadata endpoint")
-                            return None, f"Blocked metadata endpoint"
+                    # Cached, TTL-bound lookup; the pinned adapter dials these same IPs
+                    self.resolver.validated_ips(host)
+                except BlockedAddressError as e:
+                    logger.warning(f"SSRF guard: {e}")
+                    return None, f"Blocked host: {host}"
                 except Exception:
                     # DNS/parse errors handled by requests later
                     pass
             except Exception:
                 return None, "URL parsing failed"
+            started = time.monotonic()
             response = self.session.get(
                 url,
                 headers=request_headers,
                 timeout=self.timeout,
-                allow_redirects=True
+                allow_redirects=True,
+                stream=True
             )
+            if self.rate_observer is not None:
+                self.rate_observer(host.lower(), response.status_code, time.monotonic() - started,
+                                   response.headers.get('Retry-After'))
             
             # Check for rate limiting
             if response.status_code == 429:
                 retry_after = response.headers.get('Retry-After')
-                if retry_after:
+                if retry_after and self.rate_observer is None:
                     try:
                         wait_time = int(retry_after)
                         logger.info(f"Rate limited, waiting {wait_time}s: {url}")
                         time.sleep(wait_time)
                         # Try once more after waiting
+                        response.close()
                         response = self.session.get(
                             url, 
                             headers=request_headers,
                             timeout=self.timeout,
-                            allow_redirects=True
+                            allow_redirects=True,
+                            stream=True
                         )
                     except ValueError:
                         pass
                 
                 if response.status_code == 429:
-                    error_msg = f"Rate limited (429): {url}"
+                    response.close()
+                    error_msg = f"{RATE_LIMITED_ERROR}: {url}"
                     self.retry_queue.add(url, request_headers, error_msg, context)
                     return None, error_msg
             
             # Handle server errors (5xx) - add to retry queue
             if 500 <= response.status_code < 600:
+                response.close()
                 error_msg = f"Server error ({response.status_code}): {url}"
                 self.retry_queue.add(url, request_headers, error_msg, context)
                 return None, error_msg
             
             # Handle client errors (4xx) - don't retry, but log
             if 400 <= response.status_code < 500:
+                response.close()
                 error_msg = f"Client error ({response.status_code}): {url}"
                 logger.warning(error_msg)
                 return None, error_msg
             
-            # Success or redirect
+            # Success or redirect: read the body within limits
+            try:
+                self._read_body(response, expect_html and response.status_code != 304)
+            except BodyRejected as e:
+                # Permanent for this URL; not retried
+                return None, str(e)
             final_url = response.url
             return response, final_url
             
+        except BlockedAddressError as e:
+            # Raised by the pinned adapter, e.g. a redirect to an internal host
+            logger.warning(f"SSRF guard: {e}")
+            return None, f"Blocked host: {e}"
+
         except requests.exceptions.Timeout:
             error_msg = f"Timeout: {url}"
             self.retry_queue.add(url, request_headers, error_msg, context)
@@ -398,7 +691,8 @@ class HttpClient:
             return None, error_msg
     
     def get_with_conditional_headers(self, url: str, etag: str = None, 
-                                   last_modified: str = None) -> Tuple[Optional[requests.Response], Optional[str], bool]:
+                                   last_modified: str = None,
+                                   expect_html: bool = False) -> Tuple[Optional[requests.Response], Optional[str], bool]:
         """
         GET with conditional headers (If-None-Match, If-Modified-Since)
         Returns (response, final_url, was_cached)
@@ -409,7 +703,7 @@ class HttpClient:
         if last_modified:
             headers['If-Modified-Since'] = last_modified
         
-        response, final_url = self.get(url, headers)
+        response, final_url = self.get(url, headers, expect_html=expect_html)
         
         if response is None:
             return None, final_url, False
@@ -0,0 +1,218 @@
+"""
+Caching DNS resolver and IP-pinned transport for the HttpClient SSRF guard
+"""
+
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError
+
+logger = logging.getLogger(__name__)
+
+# Resolution function: host -> (ip list, ttl seconds or None if unknown)
+ResolveFn = Callable[[str], Tuple[List[str], Optional[float]]]
+
+
+class BlockedAddressError(ValueError):
+    """Host resolves to an address the SSRF guard does not allow"""
+
+
+def is_blocked_ip(ip: str) -> bool:
+    """Private, loopback, link-local (incl. cloud metadata), multicast, reserved or unspecified"""
+    ip_obj = ipaddress.ip_address(ip)
+    mapped = getattr(ip_obj, 'ipv4_mapped', None)
+    if mapped is not None:
+        ip_obj = mapped
+    return (ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_link_local
+            or ip_obj.is_multicast or ip_obj.is_reserved or ip_obj.is_unspecified
+            or str(ip_obj) == '169.254.169.254')
+
+
+def system_resolve(host: str) -> Tuple[List[str], Optional[float]]:
+    """getaddrinfo-based resolution (the OS resolver does not expose record TTLs)"""
+    infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    ips: List[str] = []
+    for _, _, _, _, sockaddr in infos:
+        if sockaddr[0] not in ips:
+            ips.append(sockaddr[0])
+    return ips, None
+
+
+class CachingResolver:
+    """
+    Thread-safe DNS cache with TTLs, negative caching and single-flight lookups.
+
+    Lookups run on a small thread pool: concurrent requests for the same host
+    share one in-flight resolution, different hosts resolve in parallel, and
+    prefetch() warms hosts without blocking the caller.
+    """
+
+    def __init__(self, resolve_fn: Optional[ResolveFn] = None, ttl: Optional[float] = None,
+                 negative_ttl: Optional[float] = None, max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.resolve_fn = resolve_fn or system_resolve
+        self.ttl = float(ttl if ttl is not None else os.getenv('RESOLVER_TTL', '300'))
+        self.negative_ttl = float(negative_ttl if negative_ttl is not None
+                                  else os.getenv('RESOLVER_NEGATIVE_TTL', '60'))
+        self.timeout = float(timeout if timeout is not None else os.getenv('RESOLVER_TIMEOUT', '10'))
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv('RESOLVER_WORKERS', '8')),
+            thread_name_prefix='dns'
+        )
+        # Reentrant: a lookup that finishes immediately runs _store inside _lookup
+        self._lock = threading.RLock()
+        # host -> (expires_at, ips or None, error or None)
+        self._cache: Dict[str, Tuple[float, Optional[List[str]], Optional[Exception]]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    def _lookup(self, host: str) -> Future:
+        """Cached result as a completed future, or the (possibly shared) in-flight lookup"""
+        with self._lock:
+            entry = self._cache.get(host)
+            if entry and entry[0] > self._clock():
+                fut: Future = Future()
+                if entry[1] is not None:
+                    self.hits += 1
+                    fut.set_result((list(entry[1]), None))
+                else:
+                    self.negative_hits += 1
+                    fut.set_exception(entry[2])
+                return fut
+            fut = self._inflight.get(host)
+            if fut is None:
+                self.misses += 1
+                fut = self._executor.submit(self.resolve_fn, host)
+                self._inflight[host] = fut
+                fut.add_done_callback(lambda f, h=host: self._store(h, f))
+            return fut
+
+    def _store(self, host: str, fut: Future):
+        now = self._clock()
+        with self._lock:
+            self._inflight.pop(host, None)
+            exc = fut.exception()
+            if exc is None:
+                ips, record_ttl = fut.result()
+                if ips:
+                    ttl = min(self.ttl, record_ttl) if record_ttl is not None else self.ttl
+                    self._cache[host] = (now + ttl, list(ips), None)
+                    return
+                exc = socket.gaierror(socket.EAI_NONAME, f"No addresses for {host}")
+            self._cache[host] = (now + self.negative_ttl, None, exc)
+
+    def resolve(self, host: str) -> List[str]:
+        """IP addresses for host (raises the cached/actual resolution error)"""
+        host = (host or '').rstrip('.').lower()
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        ips, _ = self._lookup(host).result(timeout=self.timeout)
+        if not ips:
+            raise socket.gaierror(socket.EAI_NONAME, f"No addresses for {host}")
+        return list(ips)
+
+    def prefetch(self, hosts: Iterable[str]):
+        """Start resolving hosts in the background"""
+        for host in {(h or '').rstrip('.').lower() for h in hosts if h}:
+            try:
+                ipaddress.ip_address(host)
+            except ValueError:
+                self._lookup(host)
+
+    def validated_ips(self, host: str, is_blocked: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """Resolve host and require every address to pass the SSRF guard"""
+        is_blocked = is_blocked or is_blocked_ip
+        ips = self.resolve(host)
+        for ip in ips:
+            if is_blocked(ip):
+                raise BlockedAddressError(f"{host} resolves to blocked address {ip}")
+        return ips
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+_shared_resolver: Optional[CachingResolver] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_resolver() -> CachingResolver:
+    """Process-wide resolver shared by all HttpClient instances"""
+    global _shared_resolver
+    with _shared_lock:
+        if _shared_resolver is None:
+            _shared_resolver = CachingResolver()
+        return _shared_resolver
+
+
+def _pinned_connection_classes(resolver: CachingResolver, is_blocked: Optional[Callable[[str], bool]]):
+    """Connection/pool classes that connect only to addresses validated by resolver"""
+
+    def new_conn(conn, base_new_conn):
+        host = conn._dns_host
+        try:
+            ips = resolver.validated_ips(host, is_blocked)
+        except BlockedAddressError:
+            raise
+        except Exception as e:
+            raise NameResolutionError(conn.host, conn, e) from e
+
+        last_error: Optional[Exception] = None
+        for ip in ips:
+            # Dial the validated IP; Host header, SNI and certificate checks keep using conn.host
+            conn._dns_host = ip
+            try:
+                return base_new_conn(conn)
+            except Exception as e:
+                last_error = e
+            finally:
+                conn._dns_host = host
+        raise last_error  # type: ignore[misc]
+
+    class PinnedHTTPConnection(HTTPConnection):
+        def _new_conn(self):
+            return new_conn(self, HTTPConnection._new_conn)
+
+    class PinnedHTTPSConnection(HTTPSConnection):
+        def _new_conn(self):
+            return new_conn(self, HTTPSConnection._new_conn)
+
+    class PinnedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = PinnedHTTPConnection
+
+    class PinnedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = PinnedHTTPSConnection
+
+    return {'http': PinnedHTTPConnectionPool, 'https': PinnedHTTPSConnectionPool}
+
+
+class PinnedAdapter(requests.adapters.HTTPAdapter):
+    """
+    Transport adapter that validates every connection target (including
+    redirect hops) and dials the exact IP that passed validation.
+    Proxied requests are left to the proxy.
+    """
+
+    def __init__(self, resolver: CachingResolver, is_blocked: Optional[Callable[[str], bool]] = None, **kwargs):
+        self.resolver = resolver
+        self.is_blocked = is_blocked
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pinned_connection_classes(self.resolver, self.is_blocked)
@@ -0,0 +1,177 @@
+"""
+Per-host politeness scheduler for concurrent article fetching
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "slow down" rather than "this URL is broken"
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) as seconds to wait"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+@dataclass
+class HostState:
+    """Adaptive pacing for one host"""
+    interval: float
+    concurrency: int
+    next_allowed: float = 0.0
+    in_flight: int = 0
+    successes: int = 0
+    requests: int = 0
+    throttled: int = 0
+
+
+class HostScheduler:
+    """
+    Interleaves fetches across hosts with per-host concurrency and spacing.
+
+    Callers wrap each fetch in ``async with scheduler.slot(host)``. A host
+    hands out at most ``concurrency`` slots at a time, spaced at least
+    ``interval`` seconds apart; waiting for a host does not hold a global
+    slot, so a burst from one publisher cannot starve the others.
+
+    observe() adapts each host (thread-safe, called from fetch threads):
+    429/503 doubles the interval, drops to one connection and honours
+    Retry-After; slow responses widen the interval; a run of fast
+    successes shrinks it back towards the configured minimum.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, per_host: Optional[int] = None,
+                 min_interval: Optional[float] = None, max_interval: Optional[float] = None,
+                 slow_latency: Optional[float] = None, recover_after: int = 5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_concurrency = int(max_concurrency or os.getenv('FETCH_MAX_CONCURRENCY', '10'))
+        self.per_host = int(per_host or os.getenv('FETCH_PER_HOST_CONCURRENCY', '2'))
+        self.min_interval = float(min_interval if min_interval is not None
+                                  else os.getenv('FETCH_MIN_INTERVAL', '0.25'))
+        self.max_interval = float(max_interval if max_interval is not None
+                                  else os.getenv('FETCH_MAX_INTERVAL', '60'))
+        self.slow_latency = float(slow_latency if slow_latency is not None
+                                  else os.getenv('FETCH_SLOW_LATENCY', '5'))
+        self.recover_after = recover_after
+        self.poll_interval = 0.02
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostState] = {}
+        # asyncio primitives belong to one event loop; rebuilt if the worker moves loops
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._turnstiles: Dict[str, asyncio.Lock] = {}
+        self._global: Optional[asyncio.Semaphore] = None
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._turnstiles = {}
+            self._global = asyncio.Semaphore(self.max_concurrency)
+
+    def _host(self, host: str) -> HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            st = HostState(interval=self.min_interval, concurrency=self.per_host)
+            self._hosts[host] = st
+        return st
+
+    async def acquire(self, host: str):
+        """Wait until host may take another request, then reserve it"""
+        self._bind_loop()
+        turnstile = self._turnstiles.setdefault(host, asyncio.Lock())
+        # Waiters for one host queue FIFO behind the turnstile; other hosts are unaffected
+        async with turnstile:
+            while True:
+                now = self._clock()
+                with self._lock:
+                    st = self._host(host)
+                    if st.in_flight < st.concurrency and st.next_allowed <= now:
+                        st.in_flight += 1
+                        st.requests += 1
+                        st.next_allowed = now + st.interval
+                        return
+                    if st.in_flight < st.concurrency:
+                        delay = st.next_allowed - now
+                    else:
+                        delay = self.poll_interval
+                await asyncio.sleep(min(max(delay, 0.0), 1.0) or self.poll_interval)
+
+    def release(self, host: str):
+        with self._lock:
+            st = self._host(host)
+            st.in_flight = max(0, st.in_flight - 1)
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """Host slot plus one of max_concurrency global slots"""
+        await self.acquire(host)
+        try:
+            async with self._global:
+                yield
+        finally:
+            self.release(host)
+
+    def observe(self, host: str, status: int, latency: float, retry_after: Optional[str] = None):
+        """Feed one response back into the host's pacing"""
+        now = self._clock()
+        with self._lock:
+            st = self._host(host)
+            if status in THROTTLE_STATUSES:
+                st.throttled += 1
+                st.successes = 0
+                st.concurrency = 1
+                st.interval = min(self.max_interval, max(st.interval * 2, self.min_interval, 0.1))
+                wait = parse_retry_after(retry_after)
+                if wait is not None:
+                    st.next_allowed = max(st.next_allowed, now + min(wait, self.max_interval))
+                logger.info(f"Throttled by {host} ({status}); spacing now {st.interval:.2f}s")
+            elif latency > self.slow_latency:
+                st.successes = 0
+                st.interval = min(self.max_interval, max(st.interval * 1.5, self.min_interval, 0.1))
+            elif status < 500:
+                st.successes += 1
+                if st.successes >= self.recover_after:
+                    st.successes = 0
+                    st.interval = max(self.min_interval, st.interval * 0.75)
+                    st.concurrency = min(self.per_host, st.concurrency + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-host pacing for diagnostics (only hosts that were throttled or slowed)"""
+        with self._lock:
+            adapted = {
+                host: {'interval': round(st.interval, 3), 'concurrency': st.concurrency,
+                       'throttled': st.throttled}
+                for host, st in self._hosts.items()
+                if st.throttled or st.interval > self.min_interval
+            }
+            return {
+                'hosts': len(self._hosts),
+                'requests': sum(st.requests for st in self._hosts.values()),
+                'throttled': sum(st.throttled for st in self._hosts.values()),
+                'adapted_hosts': adapted,
+            }
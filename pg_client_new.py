@@ -5,12 +5,19 @@ PostgreSQL client for RSS news aggregation with enhanced schema
 import os
 import logging
 from psycopg2 import pool as psycopg2_pool
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
+import numpy as np
+
+from services.backlog_priority import BacklogPolicy
+from utils.text import minhash_similarity
+from utils.fulltext import fulltext_key, encode_fulltext, decode_fulltext
+from utils.vectors import FORMAT_TEXT, FORMAT_VECTOR, VectorCopySink
+
 # Json wrapper compatibility (psycopg3 first, fallback to psycopg2)
 try:
     # psycopg3
@@ -34,6 +41,20 @@ class PgClient:
         except Exception as e:
             logger.error(f"Failed to initialize DB pool: {e}")
             raise
+        self.backlog = BacklogPolicy()
+        # Article bodies go to the compressed, content-addressed fulltext_store
+        self.use_fulltext_store = os.environ.get('FULLTEXT_STORE', 'true').lower() == 'true'
+        # Optional compact vector tier: ANN over embedding_compact, exact rerank on embedding
+        self.use_compact_vectors = os.environ.get('EMBEDDING_COMPACT_TIER', 'false').lower() == 'true'
+        self.compact_dims = int(os.environ.get('EMBEDDING_COMPACT_DIMS', '768'))
+        self.rerank_factor = int(os.environ.get('EMBEDDING_RERANK_FACTOR', '4'))
+        self._compact_type = None
+        # Analytics read embeddings in COPY BINARY batches of this many chunks
+        self.embedding_load_batch = int(os.environ.get('EMBEDDING_LOAD_BATCH', '10000'))
+        self._embedding_source = None
+        self._embedding_fallback = None
+        # Hourly keyword/entity/source article counts, bumped by the entity index pass
+        self.volume_rollups = os.environ.get('VOLUME_ROLLUPS', 'true').lower() == 'true'
 
     def _cursor(self):
         class _Ctx:
@@ -55,6 +76,34 @@ class PgClient:
                         self.outer.pool.putconn(self.conn)
         return _Ctx(self)
 
+    def _transaction(self):
+        """Cursor on a pooled connection inside one transaction.
+        Commits on clean exit, rolls back if the block raises.
+        """
+        class _TxCtx:
+            def __init__(self, outer):
+                self.outer = outer
+                self.conn = None
+                self.cur = None
+            def __enter__(self):
+                self.conn = self.outer.pool.getconn()
+                self.conn.autocommit = False
+                self.cur = self.conn.cursor()
+                return self.cur
+            def __exit__(self, exc_type, exc, tb):
+                try:
+                    if self.cur:
+                        self.cur.close()
+                    if exc_type is None:
+                        self.conn.commit()
+                    else:
+                        self.conn.rollback()
+                finally:
+                    if self.conn:
+                        self.conn.autocommit = True
+                        self.outer.pool.putconn(self.conn)
+        return _TxCtx(self)
+
     def ensure_schema(self):
         """Create tables if they don't exist"""
         schema_sql = """
@@ -182,6 +231,30 @@ class PgClient:
         CREATE INDEX IF NOT EXISTS idx_chunks_fts_vector ON article_chunks USING GIN(fts_vector);
         -- CREATE INDEX IF NOT EXISTS idx_chunks_embedding ON article_chunks USING HNSW(embedding public.vector_cosine_ops);
 
+        -- entity index (GraphRAG): normalized entities, postings, co-occurrence
+        CREATE TABLE IF NOT EXISTS entities (
+            entity_norm TEXT PRIMARY KEY,
+            display_name TEXT NOT NULL,
+            label TEXT,
+            doc_freq INTEGER DEFAULT 0,
+            first_seen TIMESTAMPTZ DEFAULT NOW(),
+            last_seen TIMESTAMPTZ DEFAULT NOW()
+        );
+        CREATE TABLE IF NOT EXISTS article_entities (
+            article_id TEXT NOT NULL,
+            entity_norm TEXT NOT NULL,
+            mentions INTEGER DEFAULT 1,
+            PRIMARY KEY (article_id, entity_norm)
+        );
+        CREATE INDEX IF NOT EXISTS idx_article_entities_entity ON article_entities(entity_norm);
+        CREATE TABLE IF NOT EXISTS entity_cooccurrence (
+            entity_a TEXT NOT NULL,   -- entity_a < entity_b
+            entity_b TEXT NOT NULL,
+            doc_count INTEGER DEFAULT 0,
+            last_seen TIMESTAMPTZ DEFAULT NOW(),
+            PRIMARY KEY (entity_a, entity_b)
+        );
+
         -- diagnostics
         CREATE TABLE IF NOT EXISTS diagnostics (
           id BIGSERIAL PRIMARY KEY,
@@ -216,6 +289,114 @@ class PgClient:
                     ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS processing_version INTEGER DEFAULT 1;
                     ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS ready_for_chunking BOOLEAN DEFAULT FALSE;
                     ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS chunking_completed BOOLEAN;
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS entities_indexed BOOLEAN DEFAULT FALSE;
+                """)
+                # Freshness-priority backlog (see services/backlog_priority.py)
+                cur.execute("""
+                    ALTER TABLE raw ADD COLUMN IF NOT EXISTS priority DOUBLE PRECISION;
+                    ALTER TABLE raw ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0;
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS chunk_priority DOUBLE PRECISION;
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS chunk_attempts INTEGER DEFAULT 0;
+                """)
+                # Poller short-circuit for feeds without ETag/Last-Modified
+                cur.execute("""
+                    ALTER TABLE feeds ADD COLUMN IF NOT EXISTS content_fingerprint TEXT;
+                """)
+                # Ingest-time near-duplicate gate: MinHash signature, LSH band index
+                # over canonical rows, and the link from a copy to its canonical row
+                cur.execute("""
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS minhash BIGINT[];
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS duplicate_of BIGINT;
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS near_dup_similarity REAL;
+                    CREATE TABLE IF NOT EXISTS near_dup_bands (
+                        band SMALLINT NOT NULL,
+                        band_key BIGINT NOT NULL,
+                        index_id BIGINT NOT NULL,
+                        first_seen TIMESTAMPTZ DEFAULT NOW(),
+                        PRIMARY KEY (band, band_key, index_id)
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_near_dup_bands_seen ON near_dup_bands(first_seen);
+                    CREATE INDEX IF NOT EXISTS idx_ai_duplicate_of ON articles_index(duplicate_of)
+                        WHERE duplicate_of IS NOT NULL;
+                """)
+                # Compressed, content-addressed article bodies (utils/fulltext.py).
+                # Payloads are already compressed: keep TOAST from compressing them again
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS fulltext_store (
+                        text_hash TEXT PRIMARY KEY,
+                        codec TEXT NOT NULL,
+                        body BYTEA NOT NULL,
+                        raw_bytes INTEGER NOT NULL,
+                        created_at TIMESTAMPTZ DEFAULT NOW()
+                    );
+                    ALTER TABLE fulltext_store ALTER COLUMN body SET STORAGE EXTERNAL;
+                """)
+                # Feed leases so several poller replicas can share the feed set
+                cur.execute("""
+                    ALTER TABLE feeds ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+                    ALTER TABLE feeds ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+                    ALTER TABLE feeds ADD COLUMN IF NOT EXISTS last_polled_at TIMESTAMPTZ;
+                """)
+                # Online trend clusters (services/trend_cluster_service.py): centroid is the
+                # float32 mean of member unit vectors; members without a usable embedding
+                # are kept with a NULL cluster so they are not picked up again
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS trend_clusters (
+                        id BIGSERIAL PRIMARY KEY,
+                        centroid BYTEA NOT NULL,
+                        size INTEGER NOT NULL DEFAULT 0,
+                        label TEXT,
+                        keywords TEXT[],
+                        created_at TIMESTAMPTZ DEFAULT NOW(),
+                        updated_at TIMESTAMPTZ DEFAULT NOW()
+                    );
+                    CREATE TABLE IF NOT EXISTS trend_cluster_members (
+                        article_id TEXT PRIMARY KEY,
+                        cluster_id BIGINT,
+                        chunk_id BIGINT NOT NULL,
+                        published_at TIMESTAMPTZ NOT NULL,
+                        assigned_at TIMESTAMPTZ DEFAULT NOW()
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_trend_members_cluster
+                        ON trend_cluster_members(cluster_id, published_at);
+                    CREATE INDEX IF NOT EXISTS idx_trend_members_published
+                        ON trend_cluster_members(published_at);
+                """)
+                # Rolling term statistics for trend labels: each member's terms, their
+                # document frequency over the window and their count per cluster
+                # (window document count in config 'trends.terms.docs')
+                cur.execute("""
+                    ALTER TABLE trend_cluster_members ADD COLUMN IF NOT EXISTS terms TEXT[];
+                    CREATE INDEX IF NOT EXISTS idx_trend_members_no_terms
+                        ON trend_cluster_members(article_id) WHERE terms IS NULL;
+                    CREATE TABLE IF NOT EXISTS trend_terms (
+                        term TEXT PRIMARY KEY,
+                        df INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS trend_cluster_terms (
+                        cluster_id BIGINT NOT NULL,
+                        term TEXT NOT NULL,
+                        tf INTEGER NOT NULL,
+                        PRIMARY KEY (cluster_id, term)
+                    );
+                """)
+                # Hourly article volumes per headline keyword, entity and source for
+                # /predict; save_article_entities adds articles as they get indexed
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS volume_rollups (
+                        kind TEXT NOT NULL,          -- keyword|entity|source
+                        term TEXT NOT NULL,
+                        hour TIMESTAMPTZ NOT NULL,
+                        articles INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (kind, term, hour)
+                    );
+                """)
+                # Ingest-time lexicon sentiment (utils/sentiment.py), summed into the
+                # rollups so sentiment trends are read like volumes
+                cur.execute("""
+                    ALTER TABLE articles_index ADD COLUMN IF NOT EXISTS sentiment REAL;
+                    ALTER TABLE volume_rollups ADD COLUMN IF NOT EXISTS scored INTEGER NOT NULL DEFAULT 0;
+                    ALTER TABLE volume_rollups ADD COLUMN IF NOT EXISTS sentiment_sum DOUBLE PRECISION NOT NULL DEFAULT 0;
                 """)
                 # Ensure article_chunks has fields produced by chunker
                 cur.execute("""
@@ -224,6 +405,15 @@ class PgClient:
                     ALTER TABLE article_chunks ADD COLUMN IF NOT EXISTS llm_confidence REAL;
                     ALTER TABLE article_chunks ADD COLUMN IF NOT EXISTS llm_reason TEXT;
                 """)
+                # Last FTS/embedding write, so the in-process hot tier can pick up changes
+                cur.execute("""
+                    ALTER TABLE article_chunks ADD COLUMN IF NOT EXISTS indexed_at TIMESTAMPTZ;
+                    CREATE INDEX IF NOT EXISTS idx_chunks_indexed_at ON article_chunks(indexed_at);
+                """)
+                # Time-range scans for the analytics aggregates when no text query narrows them
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_chunks_published_at ON article_chunks(published_at);
+                """)
                 # Indices may fail if they already exist; IF NOT EXISTS guards above suffice for most
                 cur.execute("""
                     CREATE INDEX IF NOT EXISTS idx_articles_url_hash_v2 ON articles_index(url_hash_v2);
@@ -234,6 +424,47 @@ class PgClient:
                 cur.execute("""
                     CREATE INDEX IF NOT EXISTS idx_ai_chunk_done ON articles_index(chunking_completed);
                 """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_articles_article_id ON articles_index(article_id);
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_ai_entities_pending ON articles_index(id) WHERE entities_indexed IS NOT TRUE;
+                """)
+                # Priority dequeue plus the oldest-first starvation lane, per stage
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_raw_pending_priority
+                        ON raw(priority DESC NULLS LAST, id) WHERE status = 'pending';
+                    CREATE INDEX IF NOT EXISTS idx_raw_pending_created
+                        ON raw(created_at, id) WHERE status = 'pending';
+                    CREATE INDEX IF NOT EXISTS idx_ai_chunk_priority
+                        ON articles_index(chunk_priority DESC NULLS LAST, id)
+                        WHERE ready_for_chunking IS TRUE AND chunking_completed IS DISTINCT FROM TRUE;
+                    CREATE INDEX IF NOT EXISTS idx_ai_chunk_queue
+                        ON articles_index(id)
+                        WHERE ready_for_chunking IS TRUE AND chunking_completed IS DISTINCT FROM TRUE;
+                """)
+                # Downstream queue depths (poller backpressure) and their consumers
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_chunks_fts_pending ON article_chunks(id) WHERE fts_vector IS NULL;
+                    CREATE INDEX IF NOT EXISTS idx_chunks_embedding_pending ON article_chunks(id) WHERE embedding IS NULL;
+                """)
+                # Rows queued before priorities existed: recency only (no source weights);
+                # undated rows get the policy's neutral age from when they were first seen
+                tau_seconds = self.backlog.tau_hours * 3600.0
+                undated_seconds = self.backlog.undated_age_hours * 3600.0
+                cur.execute("""
+                    UPDATE raw
+                    SET priority = EXTRACT(EPOCH FROM LEAST(COALESCE(
+                        published_at, COALESCE(created_at, NOW()) - make_interval(secs => %s)), NOW())) / %s
+                    WHERE status = 'pending' AND priority IS NULL
+                """, (undated_seconds, tau_seconds))
+                cur.execute("""
+                    UPDATE articles_index
+                    SET chunk_priority = EXTRACT(EPOCH FROM LEAST(COALESCE(
+                        published_at, COALESCE(first_seen, NOW()) - make_interval(secs => %s)), NOW())) / %s
+                    WHERE ready_for_chunking IS TRUE AND chunking_completed IS DISTINCT FROM TRUE
+                      AND chunk_priority IS NULL
+                """, (undated_seconds, tau_seconds))
             logger.info("Database schema ensured")
         except Exception as e:
             logger.error(f"Failed to create schema: {e}")
@@ -271,6 +502,134 @@ class PgClient:
             logger.error(f"Failed to get config {key}: {e}")
             return None
 
+    # Fulltext store
+    def _store_fulltext(self, cur, text: str) -> bool:
+        """Write a body to fulltext_store; True when the stored body is exactly `text`.
+
+        The key hashes whitespace-normalized text, so a body differing only in
+        whitespace or paragraph breaks may already hold the key: that one is
+        kept and False is returned.
+        """
+        key = fulltext_key(text)
+        codec, payload = encode_fulltext(text)
+        cur.execute("""
+            INSERT INTO fulltext_store (text_hash, codec, body, raw_bytes)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (text_hash) DO NOTHING
+            RETURNING text_hash
+        """, (key, codec, psycopg2.Binary(payload), len(text.encode('utf-8'))))
+        if cur.fetchone():
+            return True
+        cur.execute("SELECT codec, body FROM fulltext_store WHERE text_hash = %s", (key,))
+        row = cur.fetchone()
+        return row is not None and decode_fulltext(row[0], row[1]) == text
+
+    def _offload_fulltext(self, cur, data: Dict[str, Any], field: str, force: bool = False):
+        """Move data[field] into fulltext_store, leaving NULL inline.
+
+        Only when the row's text_hash is the body's content address (or unset),
+        so readers can always find the body again by text_hash, and only when the
+        stored body is byte-identical; otherwise the body stays inline.
+        """
+        text = data.get(field)
+        if not (force or self.use_fulltext_store) or not text:
+            return
+        key = fulltext_key(text)
+        if data.get('text_hash') not in (None, '', key):
+            return
+        if not self._store_fulltext(cur, text):
+            return
+        data['text_hash'] = key
+        data[field] = None
+
+    def get_fulltexts(self, text_hashes: List[str]) -> Dict[str, str]:
+        """Bodies by content address (missing keys are absent from the result)"""
+        keys = sorted({k for k in text_hashes if k})
+        if not keys:
+            return {}
+        with self._cursor() as cur:
+            cur.execute("SELECT text_hash, codec, body FROM fulltext_store WHERE text_hash = ANY(%s)", (keys,))
+            return {key: decode_fulltext(codec, body) for key, codec, body in cur.fetchall()}
+
+    def hydrate_fulltext(self, rows: List[Dict[str, Any]], field: str = 'clean_text',
+                         key_field: str = 'text_hash') -> List[Dict[str, Any]]:
+        """Fill rows whose `field` is empty from fulltext_store, in one round-trip"""
+        missing = [r.get(key_field) for r in rows if not r.get(field) and r.get(key_field)]
+        if not missing:
+            return rows
+        try:
+            bodies = self.get_fulltexts(missing)
+        except Exception as e:
+            logger.error(f"Failed to load fulltext bodies: {e}")
+            return rows
+        for row in rows:
+            if not row.get(field) and row.get(key_field) in bodies:
+                row[field] = bodies[row[key_field]]
+        return rows
+
+    def compact_fulltext(self, batch_size: int = 500,
+                         after_id: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Move one batch per table of inline raw.full_text / articles_index.clean_text into
+        the store. Pass the returned after_id back in until 'done'."""
+        after_id = dict(after_id or {})
+        moved = {'raw': 0, 'articles_index': 0}
+        # Rows passed over: locked by a writer (SKIP LOCKED), or whose body differs
+        # in whitespace from the one already stored under its text_hash
+        skipped = {'raw': 0, 'articles_index': 0}
+        done = True
+        for table, field in (('raw', 'full_text'), ('articles_index', 'clean_text')):
+            with self._transaction() as cur:
+                cur.execute(f"""
+                    SELECT id, {field}, text_hash FROM {table}
+                    WHERE id > %s AND {field} IS NOT NULL AND {field} <> ''
+                      AND text_hash IS NOT NULL AND text_hash <> ''
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                """, (after_id.get(table, 0), batch_size))
+                rows = cur.fetchall()
+                for row_id, text, text_hash in rows:
+                    data = {field: text, 'text_hash': text_hash}
+                    self._offload_fulltext(cur, data, field, force=True)
+                    if data[field] is None:
+                        cur.execute(f"UPDATE {table} SET {field} = NULL WHERE id = %s", (row_id,))
+                        moved[table] += 1
+                # Inline bodies left in the range this batch covered (our updates are visible)
+                full = len(rows) == batch_size
+                cur.execute(f"""
+                    SELECT COUNT(*) FROM {table}
+                    WHERE id > %s {'AND id <= %s' if full else ''}
+                      AND {field} IS NOT NULL AND {field} <> ''
+                      AND text_hash IS NOT NULL AND text_hash <> ''
+                """, (after_id.get(table, 0), rows[-1][0]) if full else (after_id.get(table, 0),))
+                skipped[table] = cur.fetchone()[0]
+                if rows:
+                    after_id[table] = rows[-1][0]
+                if full:
+                    done = False
+        return {'moved': moved, 'skipped': skipped, 'after_id': after_id, 'done': done}
+
+    def get_fulltext_store_stats(self) -> Dict[str, Any]:
+        """Bodies stored, their uncompressed and stored bytes, and inline bodies left"""
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(OCTET_LENGTH(body)), 0)
+                FROM fulltext_store
+            """)
+            bodies, raw_bytes, stored_bytes = cur.fetchone()
+            cur.execute("SELECT COUNT(*) FROM raw WHERE full_text IS NOT NULL AND full_text <> ''")
+            inline_raw = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM articles_index WHERE clean_text IS NOT NULL AND clean_text <> ''")
+            inline_index = cur.fetchone()[0]
+        return {
+            'bodies': bodies,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+            'ratio': (raw_bytes / stored_bytes) if stored_bytes else 0.0,
+            'inline_raw': inline_raw,
+            'inline_index': inline_index,
+        }
+
     # Feed operations
     def insert_feed(self, url: str, lang: str = None, category: str = None) -> int:
         """Insert new feed"""
@@ -300,7 +659,7 @@ class PgClient:
             with self._cursor() as cur:
                 query = """
                     SELECT id, feed_url as url, status, lang, category, etag as last_etag, 
-                           last_modified, last_entry_date
+                           last_modified, last_entry_date, content_fingerprint
                     FROM feeds 
                     WHERE status = 'active'
                     ORDER BY last_entry_date NULLS FIRST, id
@@ -315,6 +674,80 @@ class PgClient:
             logger.error(f"Failed to get active feeds: {e}")
             return []
 
+    def db_now(self) -> datetime:
+        """Database clock (lease expiry and poll passes are judged against it)"""
+        with self._cursor() as cur:
+            cur.execute("SELECT NOW()")
+            return cur.fetchone()[0]
+
+    def claim_feeds(self, owner: str, lease_seconds: int, limit: int,
+                    polled_before: datetime, exclude_ids: List[int] = None) -> List[Dict[str, Any]]:
+        """Lease up to `limit` due active feeds to `owner`.
+
+        A feed is claimable when nobody holds an unexpired lease on it and it was
+        not polled since `polled_before`. SKIP LOCKED keeps concurrent claims
+        from ever returning the same feed.
+        """
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    WITH due AS (
+                        SELECT id FROM feeds
+                        WHERE status = 'active'
+                          AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+                          AND (last_polled_at IS NULL OR last_polled_at < %s)
+                          AND NOT (id = ANY(%s::bigint[]))
+                        ORDER BY last_entry_date NULLS FIRST, id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE feeds f
+                    SET lease_owner = %s,
+                        lease_expires_at = NOW() + make_interval(secs => %s)
+                    FROM due
+                    WHERE f.id = due.id
+                    RETURNING f.id, f.feed_url as url, f.status, f.lang, f.category, f.etag as last_etag,
+                              f.last_modified, f.last_entry_date, f.content_fingerprint
+                """, (polled_before, list(exclude_ids or []), limit, owner, lease_seconds))
+                cols = [d[0] for d in cur.description]
+                feeds = [dict(zip(cols, r)) for r in cur.fetchall()]
+                # RETURNING order is unspecified; keep get_active_feeds order
+                feeds.sort(key=lambda f: (f['last_entry_date'] is not None, f['last_entry_date'] or '', f['id']))
+                return feeds
+        except Exception as e:
+            logger.error(f"Failed to claim feeds for {owner}: {e}")
+            return []
+
+    def renew_feed_leases(self, owner: str, feed_ids: List[int], lease_seconds: int) -> List[int]:
+        """Extend leases still held by `owner`; returns the ids renewed"""
+        if not feed_ids:
+            return []
+        with self._cursor() as cur:
+            cur.execute("""
+                UPDATE feeds
+                SET lease_expires_at = NOW() + make_interval(secs => %s)
+                WHERE id = ANY(%s::bigint[]) AND lease_owner = %s
+                RETURNING id
+            """, (lease_seconds, list(feed_ids), owner))
+            return [r[0] for r in cur.fetchall()]
+
+    def release_feed_leases(self, owner: str, feed_ids: List[int], polled: bool = True):
+        """Drop `owner`'s leases; polled feeds are stamped so the pass skips them"""
+        if not feed_ids:
+            return
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    UPDATE feeds
+                    SET lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        last_polled_at = CASE WHEN %s THEN NOW() ELSE last_polled_at END
+                    WHERE id = ANY(%s::bigint[]) AND lease_owner = %s
+                """, (polled, list(feed_ids), owner))
+        except Exception as e:
+            # Leases expire on their own; the feeds are only delayed by the TTL
+            logger.error(f"Failed to release feed leases for {owner}: {e}")
+
     def update_feed(self, feed_id: int, **kwargs):
         """Update feed with provided fields"""
         if not kwargs:
@@ -366,21 +799,26 @@ class PgClient:
                 if jsonb_field in processed_data and isinstance(processed_data[jsonb_field], (list, dict)):
                     processed_data[jsonb_field] = Json(processed_data[jsonb_field])
 
+            processed_data.setdefault('priority', self.backlog.priority(
+                processed_data.get('published_at'), processed_data.get('source')
+            ))
+
             with self._cursor() as cur:
+                self._offload_fulltext(cur, processed_data, 'full_text')
                 try:
                     cur.execute("""
                         INSERT INTO raw (
                             url, canonical_url, url_hash_v2, source, section, title, description,
                             keywords, authors, publisher, top_image, images, videos, enclosures, outlinks,
                             published_at, updated_at, fetched_at, language, paywalled, partial,
-                            full_text, text_hash, word_count, reading_time, status, error_reason
+                            full_text, text_hash, word_count, reading_time, status, error_reason, priority
                         ) VALUES (
                             %(url)s, %(canonical_url)s, %(url_hash)s, %(source)s, %(section)s,
                             %(title)s, %(description)s, %(keywords)s, %(authors)s, %(publisher)s,
                             %(top_image)s, %(images)s, %(videos)s, %(enclosures)s, %(outlinks)s,
                             %(published_at)s, %(updated_at)s, %(fetched_at)s, %(language)s,
                             %(paywalled)s, %(partial)s, %(full_text)s, %(text_hash)s,
-                            %(word_count)s, %(reading_time)s, %(status)s, %(error_reason)s
+                            %(word_count)s, %(reading_time)s, %(status)s, %(error_reason)s, %(priority)s
                         )
                         RETURNING id
                     """, processed_data)
@@ -390,14 +828,14 @@ class PgClient:
                             url, canonical_url, url_hash, source, section, title, description,
                             keywords, authors, publisher, top_image, images, videos, enclosures, outlinks,
                             published_at, updated_at, fetched_at, language, paywalled, partial,
-                            full_text, text_hash, word_count, reading_time, status, error_reason
+                            full_text, text_hash, word_count, reading_time, status, error_reason, priority
                         ) VALUES (
                             %(url)s, %(canonical_url)s, %(url_hash)s, %(source)s, %(section)s,
                             %(title)s, %(description)s, %(keywords)s, %(authors)s, %(publisher)s,
                             %(top_image)s, %(images)s, %(videos)s, %(enclosures)s, %(outlinks)s,
                             %(published_at)s, %(updated_at)s, %(fetched_at)s, %(language)s,
                             %(paywalled)s, %(partial)s, %(full_text)s, %(text_hash)s,
-                            %(word_count)s, %(reading_time)s, %(status)s, %(error_reason)s
+                            %(word_count)s, %(reading_time)s, %(status)s, %(error_reason)s, %(priority)s
                         )
                         RETURNING id
                     """, processed_data)
@@ -429,25 +867,28 @@ class PgClient:
             for jf in ['images', 'videos', 'enclosures']:
                 if jf in d and isinstance(d[jf], (list, dict)):
                     d[jf] = Json(d[jf])
+            d.setdefault('priority', self.backlog.priority(d.get('published_at'), d.get('source')))
             rows.append(d)
 
         cols = [
             'url','canonical_url','url_hash','source','section','title','description',
             'keywords','authors','publisher','top_image','images','videos','enclosures','outlinks',
             'published_at','updated_at','fetched_at','language','paywalled','partial',
-            'full_text','text_hash','word_count','reading_time','status','error_reason'
+            'full_text','text_hash','word_count','reading_time','status','error_reason','priority'
         ]
 
         inserted = 0
         conflicted = 0
         with self._cursor() as cur:
+            for r in rows:
+                self._offload_fulltext(cur, r, 'full_text')
             # Use url_hash constraint (matches existing schema)
             sql = """
                 INSERT INTO raw (
                     url, canonical_url, url_hash, source, section, title, description,
                     keywords, authors, publisher, top_image, images, videos, enclosures, outlinks,
                     published_at, updated_at, fetched_at, language, paywalled, partial,
-                    full_text, text_hash, word_count, reading_time, status, error_reason
+                    full_text, text_hash, word_count, reading_time, status, error_reason, priority
                 ) VALUES %s
                 ON CONFLICT (url_hash) DO NOTHING
             """
@@ -460,20 +901,36 @@ class PgClient:
         return {"inserted": inserted, "conflicted": conflicted}
 
     def get_pending_articles(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get pending articles for processing"""
+        """Get pending articles for processing, highest priority first.
+        A share of the batch goes to rows pending longer than BACKLOG_MAX_WAIT_HOURS
+        (oldest first) so stale items are never starved by a stream of fresh ones.
+        """
+        select_sql = """
+            SELECT id, url, canonical_url, title, description, authors, section, keywords,
+                   published_at, language, status, fetched_at, url_hash, text_hash,
+                   enclosures, created_at
+            FROM raw
+        """
+        aged_limit, _ = self.backlog.split(limit)
         try:
             with self._cursor() as cur:
-                cur.execute("""
-                    SELECT id, url, canonical_url, title, description, authors, section, keywords,
-                           published_at, language, status, fetched_at, url_hash, text_hash,
-                           enclosures
-                    FROM raw 
-                    WHERE status = 'pending'
-                    ORDER BY created_at
+                rows = []
+                if aged_limit:
+                    cur.execute(select_sql + """
+                        WHERE status = 'pending'
+                          AND created_at < NOW() - make_interval(secs => %s)
+                        ORDER BY created_at, id
+                        LIMIT %s
+                    """, (self.backlog.max_wait_hours * 3600.0, aged_limit))
+                    rows = cur.fetchall()
+                taken = [r[0] for r in rows]
+                cur.execute(select_sql + """
+                    WHERE status = 'pending' AND NOT (id = ANY(%s))
+                    ORDER BY priority DESC NULLS LAST, id
                     LIMIT %s
-                """, (limit,))
+                """, (taken, limit - len(rows)))
                 cols = [d[0] for d in cur.description]
-                rows = cur.fetchall()
+                rows.extend(cur.fetchall())
                 return [dict(zip(cols, r)) for r in rows]
         except Exception as e:
             logger.error(f"Failed to get pending articles: {e}")
@@ -483,11 +940,15 @@ class PgClient:
         """Update article processing status"""
         try:
             with self._cursor() as cur:
+                # Each claim counts as an attempt; should the row return to pending
+                # it queues behind fresher work (see BacklogPolicy.retry_penalty)
                 cur.execute("""
                     UPDATE raw 
-                    SET status = %s, error_reason = %s
+                    SET status = %s, error_reason = %s,
+                        attempts = COALESCE(attempts, 0) + CASE WHEN %s = 'processing' THEN 1 ELSE 0 END,
+                        priority = priority - CASE WHEN %s = 'processing' THEN %s ELSE 0 END
                     WHERE id = %s
-                """, (status, error_reason, article_id))
+                """, (status, error_reason, status, status, self.backlog.retry_penalty, article_id))
         except Exception as e:
             logger.error(f"Failed to update article {article_id} status: {e}")
             raise
@@ -500,6 +961,14 @@ class PgClient:
         set_clauses = []
         values = []
         
+        if kwargs.get('full_text'):
+            try:
+                with self._cursor() as cur:
+                    self._offload_fulltext(cur, kwargs, 'full_text')
+            except Exception as e:
+                # Keep the body inline rather than lose it
+                logger.warning(f"Failed to store fulltext for article {article_id}: {e}")
+        
         for key, value in kwargs.items():
             # Handle datetime conversion
             if key in ['fetched_at', 'published_at', 'updated_at'] and hasattr(value, 'isoformat'):
@@ -560,7 +1029,8 @@ class PgClient:
         """Insert or update article index for deduplication and Stage 6 readiness.
         Accepts optional url_hash_v2 key and maps to url_hash for backward compatibility.
         Supports extended fields: article_id, url, title_norm, clean_text, language, category,
-        tags_norm (JSON), published_at, processing_version, ready_for_chunking.
+        tags_norm (JSON), published_at, processing_version, ready_for_chunking, sentiment.
+        first_seen (the raw row's created_at) is only used to rank undated articles.
         """
         try:
             payload = index_data.copy()
@@ -573,17 +1043,27 @@ class PgClient:
             # Default processing_version
             if 'processing_version' not in payload or payload.get('processing_version') is None:
                 payload['processing_version'] = 1
+            # An undated article ages from when its raw row was first seen
+            payload.setdefault('chunk_priority', self.backlog.priority(
+                payload.get('published_at'), payload.get('source'), first_seen=payload.get('first_seen')
+            ))
+            for key in ('minhash', 'duplicate_of', 'near_dup_similarity', 'sentiment'):
+                payload.setdefault(key, None)
             with self._cursor() as cur:
+                self._offload_fulltext(cur, payload, 'clean_text')
                 # Use url_hash (consistent with existing schema)
                 cur.execute("""
                     INSERT INTO articles_index (
                         url_hash, text_hash, title, author, source,
                         article_id, url, title_norm, clean_text, language, category,
-                        tags_norm, published_at, processing_version, ready_for_chunking
+                        tags_norm, published_at, processing_version, ready_for_chunking, chunk_priority,
+                        minhash, duplicate_of, near_dup_similarity, sentiment
                     ) VALUES (
                         %(url_hash)s, %(text_hash)s, %(title)s, %(author)s, %(source)s,
                         %(article_id)s, %(url)s, %(title_norm)s, %(clean_text)s, %(language)s, %(category)s,
-                        %(tags_norm)s, %(published_at)s, %(processing_version)s, %(ready_for_chunking)s
+                        %(tags_norm)s, %(published_at)s, %(processing_version)s, %(ready_for_chunking)s,
+                        %(chunk_priority)s, %(minhash)s, %(duplicate_of)s, %(near_dup_similarity)s,
+                        %(sentiment)s
                     )
                     ON CONFLICT (text_hash) DO UPDATE SET
                             last_seen = NOW(),
@@ -599,12 +1079,99 @@ class PgClient:
                             tags_norm = COALESCE(EXCLUDED.tags_norm, articles_index.tags_norm),
                             published_at = COALESCE(EXCLUDED.published_at, articles_index.published_at),
                             processing_version = GREATEST(articles_index.processing_version, COALESCE(EXCLUDED.processing_version, 1)),
-                            ready_for_chunking = (articles_index.ready_for_chunking OR COALESCE(EXCLUDED.ready_for_chunking, FALSE))
+                            ready_for_chunking = (articles_index.ready_for_chunking OR COALESCE(EXCLUDED.ready_for_chunking, FALSE)),
+                            chunk_priority = COALESCE(articles_index.chunk_priority, EXCLUDED.chunk_priority),
+                            minhash = COALESCE(articles_index.minhash, EXCLUDED.minhash),
+                            sentiment = COALESCE(articles_index.sentiment, EXCLUDED.sentiment)
+                    RETURNING id
                     """, payload)
+                row = cur.fetchone()
+                return row[0] if row else None
         except Exception as e:
             logger.error(f"Failed to upsert article index: {e}")
             raise
 
+    def find_near_duplicate(self, signature: List[int], bands: List[int], threshold: float = 0.8,
+                            window_hours: float = 72) -> Optional[Dict[str, Any]]:
+        """Most similar canonical article sharing an LSH band with `signature`.
+
+        Only rows banded within `window_hours` are considered; a candidate matches
+        when its estimated Jaccard similarity is >= `threshold`.
+        Returns {'id', 'article_id', 'similarity'} or None.
+        """
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT ai.id, ai.article_id, ai.minhash
+                    FROM articles_index ai
+                    WHERE ai.id IN (
+                        SELECT b.index_id
+                        FROM near_dup_bands b
+                        JOIN unnest(%s::smallint[], %s::bigint[]) AS q(band, band_key)
+                          ON b.band = q.band AND b.band_key = q.band_key
+                        WHERE b.first_seen >= NOW() - make_interval(secs => %s)
+                        LIMIT 200
+                    )
+                """, (list(range(len(bands))), bands, window_hours * 3600.0))
+                best = None
+                for index_id, article_id, candidate in cur.fetchall():
+                    similarity = minhash_similarity(signature, candidate or [])
+                    if similarity >= threshold and (best is None or similarity > best['similarity']):
+                        best = {'id': index_id, 'article_id': article_id, 'similarity': similarity}
+                return best
+        except Exception as e:
+            # The gate only saves work: on failure the article is processed normally
+            logger.warning(f"Near-duplicate lookup failed: {e}")
+            return None
+
+    def add_near_duplicate_bands(self, index_id: int, bands: List[int]):
+        """Make a canonical article findable by later copies"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    INSERT INTO near_dup_bands (band, band_key, index_id)
+                    SELECT band, band_key, %s
+                    FROM unnest(%s::smallint[], %s::bigint[]) AS q(band, band_key)
+                    ON CONFLICT DO NOTHING
+                """, (index_id, list(range(len(bands))), bands))
+        except Exception as e:
+            logger.warning(f"Failed to index near-duplicate bands for {index_id}: {e}")
+
+    def prune_near_duplicate_bands(self, window_hours: float = 72) -> int:
+        """Drop band entries older than the lookup window"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    DELETE FROM near_dup_bands
+                    WHERE first_seen < NOW() - make_interval(secs => %s)
+                """, (window_hours * 3600.0,))
+                return cur.rowcount
+        except Exception as e:
+            logger.warning(f"Failed to prune near-duplicate bands: {e}")
+            return 0
+
+    def get_near_duplicate_stats(self, hours: float = 24) -> Dict[str, Any]:
+        """Articles indexed in the last `hours` and the share the near-duplicate gate kept
+        out of chunking/embedding (by article count and by text volume)"""
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*),
+                       COUNT(*) FILTER (WHERE ai.duplicate_of IS NOT NULL),
+                       COALESCE(SUM(COALESCE(LENGTH(ai.clean_text), fs.raw_bytes)), 0),
+                       COALESCE(SUM(COALESCE(LENGTH(ai.clean_text), fs.raw_bytes))
+                                FILTER (WHERE ai.duplicate_of IS NOT NULL), 0)
+                FROM articles_index ai
+                LEFT JOIN fulltext_store fs ON ai.clean_text IS NULL AND fs.text_hash = ai.text_hash
+                WHERE ai.first_seen >= NOW() - make_interval(secs => %s)
+            """, (hours * 3600.0,))
+            total, linked, chars, linked_chars = cur.fetchone()
+        return {
+            'indexed': total,
+            'near_duplicates': linked,
+            'article_share_skipped': (linked / total) if total else 0.0,
+            'text_share_skipped': (linked_chars / chars) if chars else 0.0,
+        }
+
     # Diagnostics
     def log_diagnostics(self, level: str, component: str, message: str, details: Dict = None):
         """Log diagnostics event"""
@@ -617,6 +1184,16 @@ class PgClient:
         except Exception as e:
             logger.error(f"Failed to log diagnostics: {e}")
 
+    def notify_pipeline(self, channel: str, payload: str = '') -> None:
+        """Wake downstream stages listening on `channel` (see services/pipeline_events.py).
+        Best-effort: listeners also poll on an interval, so failures are only logged.
+        """
+        try:
+            with self._cursor() as cur:
+                cur.execute("SELECT pg_notify(%s, %s)", (channel, str(payload)))
+        except Exception as e:
+            logger.debug(f"Pipeline notify on {channel} failed: {e}")
+
     # Statistics and monitoring
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics"""
@@ -652,106 +1229,156 @@ class PgClient:
             logger.error(f"Failed to get stats: {e}")
             return {}
 
+    def get_stage_backlog(self, cap: int = 100000) -> Dict[str, int]:
+        """Pending work per pipeline stage, each count capped at `cap`.
+        Capped counts scan at most cap index entries, so this stays cheap
+        however far behind a stage is.
+        """
+        queries = {
+            'raw_pending': "SELECT 1 FROM raw WHERE status = 'pending'",
+            'chunking_pending': """
+                SELECT 1 FROM articles_index
+                WHERE ready_for_chunking IS TRUE AND chunking_completed IS DISTINCT FROM TRUE
+            """,
+            'fts_pending': "SELECT 1 FROM article_chunks WHERE fts_vector IS NULL",
+            'embedding_pending': "SELECT 1 FROM article_chunks WHERE embedding IS NULL",
+        }
+        depths = {}
+        with self._cursor() as cur:
+            for stage, sql in queries.items():
+                cur.execute(f"SELECT COUNT(*) FROM ({sql} LIMIT %s) q", (cap,))
+                depths[stage] = cur.fetchone()[0] or 0
+        return depths
+
     # ============== Stage 6 (Chunking) operations ==============
     def get_articles_ready_for_chunking(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Fetch articles from articles_index that are ready for chunking."""
+        """Fetch articles from articles_index that are ready for chunking.
+        Highest chunk_priority first, with the same starvation lane as get_pending_articles.
+        """
+        select_sql = """
+            SELECT 
+                id AS index_id,
+                COALESCE(article_id, COALESCE(url_hash_v2, url_hash)) AS article_id,
+                COALESCE(url, '') AS url,
+                COALESCE(source, '') AS source,
+                COALESCE(title_norm, '') AS title_norm,
+                COALESCE(clean_text, '') AS clean_text,
+                text_hash,
+                COALESCE(language, '') AS language,
+                category,
+                tags_norm,
+                published_at,
+                COALESCE(processing_version, 1) AS processing_version
+            FROM articles_index
+            WHERE ready_for_chunking = TRUE
+              AND (chunking_completed IS DISTINCT FROM TRUE)
+        """
+        aged_limit, _ = self.backlog.split(limit)
         try:
             with self._cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT 
-                        COALESCE(article_id, COALESCE(url_hash_v2, url_hash)) AS article_id,
-                        COALESCE(url, '') AS url,
-                        COALESCE(source, '') AS source,
-                        COALESCE(title_norm, '') AS title_norm,
-                        COALESCE(clean_text, '') AS clean_text,
-                        COALESCE(language, '') AS language,
-                        category,
-                        tags_norm,
-                        published_at,
-                        COALESCE(processing_version, 1) AS processing_version
-                    FROM articles_index
-                    WHERE ready_for_chunking = TRUE
-                      AND (chunking_completed IS DISTINCT FROM TRUE)
-                    ORDER BY published_at NULLS LAST, id
+                rows = []
+                if aged_limit:
+                    cur.execute(select_sql + """
+                      AND first_seen < NOW() - make_interval(secs => %s)
+                    ORDER BY id
                     LIMIT %s
-                    """,
-                    (limit,)
-                )
+                    """, (self.backlog.max_wait_hours * 3600.0, aged_limit))
+                    rows = cur.fetchall()
+                taken = [r[0] for r in rows]
+                cur.execute(select_sql + """
+                      AND NOT (id = ANY(%s))
+                    ORDER BY chunk_priority DESC NULLS LAST, id
+                    LIMIT %s
+                    """, (taken, limit - len(rows)))
                 cols = [d[0] for d in cur.description]
-                rows = cur.fetchall()
-                return [dict(zip(cols, r)) for r in rows]
+                rows.extend(cur.fetchall())
+            return self.hydrate_fulltext([dict(zip(cols, r)) for r in rows])
         except Exception as e:
             logger.error(f"Failed to get articles ready for chunking: {e}")
             return []
 
+    def record_chunking_failures(self, index_ids: List[int]) -> None:
+        """Count a failed chunking attempt; failed rows stay queued at lower priority"""
+        ids = [i for i in index_ids if i is not None]
+        if not ids:
+            return
+        with self._cursor() as cur:
+            cur.execute(
+                """
+                UPDATE articles_index
+                SET chunk_attempts = COALESCE(chunk_attempts, 0) + 1,
+                    chunk_priority = chunk_priority - %s
+                WHERE id = ANY(%s)
+                """,
+                (self.backlog.retry_penalty, ids)
+            )
+
+    _CHUNK_UPSERT_SQL = """
+        INSERT INTO article_chunks (
+            article_id, processing_version, chunk_index, text, word_count_chunk,
+            char_start, char_end, semantic_type, boundary_confidence, llm_action,
+            llm_confidence, llm_reason, url, title_norm, source_domain,
+            published_at, language, category, tags_norm
+        ) VALUES %s
+        ON CONFLICT (article_id, processing_version, chunk_index) DO UPDATE SET
+            text = EXCLUDED.text,
+            word_count_chunk = EXCLUDED.word_count_chunk,
+            char_start = EXCLUDED.char_start,
+            char_end = EXCLUDED.char_end,
+            semantic_type = EXCLUDED.semantic_type,
+            boundary_confidence = EXCLUDED.boundary_confidence,
+            llm_action = EXCLUDED.llm_action,
+            llm_confidence = EXCLUDED.llm_confidence,
+            llm_reason = EXCLUDED.llm_reason,
+            url = EXCLUDED.url,
+            title_norm = EXCLUDED.title_norm,
+            source_domain = EXCLUDED.source_domain,
+            published_at = EXCLUDED.published_at,
+            language = EXCLUDED.language,
+            category = EXCLUDED.category,
+            tags_norm = EXCLUDED.tags_norm
+    """
+
+    @staticmethod
+    def _chunk_rows(article_id: str, processing_version: int, chunks: List[Dict[str, Any]]) -> List[tuple]:
+        """Build article_chunks VALUES tuples for one article."""
+        values = []
+        for c in chunks:
+            tags = Json(c.get('tags_norm', [])) if isinstance(c.get('tags_norm'), (list, dict)) else c.get('tags_norm')
+            values.append((
+                article_id,
+                processing_version,
+                int(c['chunk_index']),
+                c['text'],
+                int(c['word_count_chunk']),
+                int(c['char_start']),
+                int(c['char_end']),
+                c.get('semantic_type'),
+                float(c.get('boundary_confidence', 0.0)),
+                c.get('llm_action', 'noop'),
+                float(c.get('llm_confidence', 0.0)),
+                c.get('llm_reason'),
+                c['url'],
+                c['title_norm'],
+                c['source_domain'],
+                c.get('published_at'),
+                c['language'],
+                c.get('category'),
+                tags
+            ))
+        return values
+
     def upsert_article_chunks(self, article_id: str, processing_version: int, chunks: List[Dict[str, Any]]) -> Dict[str, int]:
         """Idempotent upsert of article chunks for a single article within a transaction.
         Uses unique (article_id, processing_version, chunk_index).
         """
         from psycopg2.extras import execute_values
-        inserted = 0
-        updated = 0
         if not chunks:
             return {"inserted": 0, "updated": 0}
         try:
             with self._cursor() as cur:
-                cols = [
-                    'article_id','processing_version','chunk_index','text','word_count_chunk',
-                    'char_start','char_end','semantic_type','boundary_confidence','llm_action',
-                    'llm_confidence','llm_reason','url','title_norm','source_domain',
-                    'published_at','language','category','tags_norm'
-                ]
-                values = []
-                for c in chunks:
-                    tags = Json(c.get('tags_norm', [])) if isinstance(c.get('tags_norm'), (list, dict)) else c.get('tags_norm')
-                    values.append((
-                        article_id,
-                        processing_version,
-                        int(c['chunk_index']),
-                        c['text'],
-                        int(c['word_count_chunk']),
-                        int(c['char_start']),
-                        int(c['char_end']),
-                        c.get('semantic_type'),
-                        float(c.get('boundary_confidence', 0.0)),
-                        c.get('llm_action', 'noop'),
-                        float(c.get('llm_confidence', 0.0)),
-                        c.get('llm_reason'),
-                        c['url'],
-                        c['title_norm'],
-                        c['source_domain'],
-                        c.get('published_at'),
-                        c['language'],
-                        c.get('category'),
-                        tags
-                    ))
-                sql = """
-                    INSERT INTO article_chunks (
-                        article_id, processing_version, chunk_index, text, word_count_chunk,
-                        char_start, char_end, semantic_type, boundary_confidence, llm_action,
-                        llm_confidence, llm_reason, url, title_norm, source_domain,
-                        published_at, language, category, tags_norm
-                    ) VALUES %s
-                    ON CONFLICT (article_id, processing_version, chunk_index) DO UPDATE SET
-                        text = EXCLUDED.text,
-                        word_count_chunk = EXCLUDED.word_count_chunk,
-                        char_start = EXCLUDED.char_start,
-                        char_end = EXCLUDED.char_end,
-                        semantic_type = EXCLUDED.semantic_type,
-                        boundary_confidence = EXCLUDED.boundary_confidence,
-                        llm_action = EXCLUDED.llm_action,
-                        llm_confidence = EXCLUDED.llm_confidence,
-                        llm_reason = EXCLUDED.llm_reason,
-                        url = EXCLUDED.url,
-                        title_norm = EXCLUDED.title_norm,
-                        source_domain = EXCLUDED.source_domain,
-                        published_at = EXCLUDED.published_at,
-                        language = EXCLUDED.language,
-                        category = EXCLUDED.category,
-                        tags_norm = EXCLUDED.tags_norm
-                """
-                execute_values(cur, sql, values)
+                values = self._chunk_rows(article_id, processing_version, chunks)
+                execute_values(cur, self._CHUNK_UPSERT_SQL, values)
                 # rowcount is unreliable with execute_values; return conservative stats
                 return {"inserted": 0, "updated": 0}
         except Exception as e:
@@ -762,19 +1389,843 @@ class PgClient:
         """Mark article as chunking completed."""
         try:
             with self._cursor() as cur:
+                # article_id falls back to the url hash for legacy rows (see
+                # get_articles_ready_for_chunking); each branch can use an index
                 cur.execute(
                     """
                     UPDATE articles_index
                     SET chunking_completed = TRUE,
                         ready_for_chunking = FALSE
-                    WHERE COALESCE(article_id::text, COALESCE(url_hash_v2, url_hash)) = %s::text
+                    WHERE article_id = %s
+                       OR (article_id IS NULL AND (url_hash_v2 = %s OR url_hash = %s))
                 """,
-                    (str(article_id),)
+                    (str(article_id), str(article_id), str(article_id))
                 )
         except Exception as e:
             logger.error(f"Failed to mark chunking completed for {article_id}: {e}")
             raise
 
+    def upsert_article_chunks_batch(self, articles: List[Dict[str, Any]], page_size: int = 1000) -> Dict[str, int]:
+        """Upsert chunks for many articles and mark them chunked in ONE transaction.
+
+        Each item: {article_id, processing_version, chunks, index_id (optional)}.
+        index_id is the articles_index primary key returned by
+        get_articles_ready_for_chunking; completion is marked by it (PK lookup),
+        falling back to the indexed article_id/url-hash columns for items without it.
+        Either every article in the batch is written and marked, or none is.
+        """
+        from psycopg2.extras import execute_values
+        items = [a for a in articles if a.get('chunks')]
+        if not items:
+            return {"articles": 0, "chunks": 0}
+
+        values: List[tuple] = []
+        index_ids: List[int] = []
+        keys: List[str] = []
+        seen = set()
+        for item in items:
+            # Every input is marked, including duplicates whose chunks are dropped
+            if item.get('index_id') is not None:
+                index_ids.append(int(item['index_id']))
+            else:
+                keys.append(str(item['article_id']))
+            # ON CONFLICT cannot touch the same row twice in one statement
+            key = (str(item['article_id']), item.get('processing_version') or 1)
+            if key in seen:
+                continue
+            seen.add(key)
+            values.extend(self._chunk_rows(
+                item['article_id'], item.get('processing_version') or 1, item['chunks']
+            ))
+
+        try:
+            with self._transaction() as cur:
+                execute_values(cur, self._CHUNK_UPSERT_SQL, values, page_size=page_size)
+                if index_ids:
+                    cur.execute(
+                        """
+                        UPDATE articles_index
+                        SET chunking_completed = TRUE,
+                            ready_for_chunking = FALSE
+                        WHERE id = ANY(%s)
+                        """,
+                        (index_ids,)
+                    )
+                if keys:
+                    cur.execute(
+                        """
+                        UPDATE articles_index
+                        SET chunking_completed = TRUE,
+                            ready_for_chunking = FALSE
+                        WHERE article_id = ANY(%s)
+                           OR (article_id IS NULL AND (url_hash_v2 = ANY(%s) OR url_hash = ANY(%s)))
+                        """,
+                        (keys, keys, keys)
+                    )
+            return {"articles": len(seen), "chunks": len(values)}
+        except Exception as e:
+            logger.error(f"Failed to batch upsert chunks for {len(items)} articles: {e}")
+            raise
+
+    # ============== Entity index (GraphRAG) ==============
+    def get_articles_pending_entities(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """Fetch indexed articles whose entities have not been extracted yet (newest first)."""
+        try:
+            with self._cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        id AS index_id,
+                        COALESCE(article_id, COALESCE(url_hash_v2, url_hash)) AS article_id,
+                        COALESCE(title_norm, title, '') AS title,
+                        COALESCE(clean_text, '') AS clean_text,
+                        text_hash,
+                        COALESCE(language, '') AS language,
+                        published_at,
+                        COALESCE(source, '') AS source,
+                        sentiment
+                    FROM articles_index
+                    WHERE entities_indexed IS NOT TRUE
+                    ORDER BY id DESC
+                    LIMIT %s
+                    """,
+                    (limit,)
+                )
+                cols = [d[0] for d in cur.description]
+                rows = cur.fetchall()
+                return self.hydrate_fulltext([dict(zip(cols, r)) for r in rows])
+        except Exception as e:
+            logger.error(f"Failed to get articles pending entity extraction: {e}")
+            return []
+
+    def save_article_entities(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Store entity postings for many articles and mark them indexed in ONE transaction.
+
+        Each item: {index_id, article_id, entities: [{norm, name, label, mentions}]},
+        optionally with published_at, source, keywords and sentiment for the volume rollups.
+        doc_freq, co-occurrence and rollup counts only grow for postings and
+        articles that are new, so re-indexing an article never double counts.
+        """
+        from psycopg2.extras import execute_values
+        if not articles:
+            return {"articles": 0, "postings": 0, "pairs": 0}
+
+        entity_rows: Dict[str, tuple] = {}
+        posting_rows: Dict[tuple, tuple] = {}
+        for item in articles:
+            article_id = str(item['article_id'])
+            for ent in item.get('entities') or []:
+                entity_rows.setdefault(ent['norm'], (ent['norm'], ent['name'], ent.get('label')))
+                posting_rows[(article_id, ent['norm'])] = (article_id, ent['norm'], int(ent.get('mentions', 1)))
+        index_ids = [int(item['index_id']) for item in articles if item.get('index_id') is not None]
+
+        try:
+            with self._transaction() as cur:
+                new_postings: List[tuple] = []
+                if posting_rows:
+                    # Sorted keys keep lock order stable across concurrent writers
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO entities (entity_norm, display_name, label) VALUES %s
+                        ON CONFLICT (entity_norm) DO UPDATE SET last_seen = NOW()
+                        """,
+                        [entity_rows[k] for k in sorted(entity_rows)]
+                    )
+                    new_postings = execute_values(
+                        cur,
+                        """
+                        INSERT INTO article_entities (article_id, entity_norm, mentions) VALUES %s
+                        ON CONFLICT (article_id, entity_norm) DO NOTHING
+                        RETURNING article_id, entity_norm
+                        """,
+                        [posting_rows[k] for k in sorted(posting_rows)],
+                        fetch=True
+                    )
+
+                doc_freq: Dict[str, int] = {}
+                per_article: Dict[str, List[str]] = {}
+                for article_id, norm in new_postings:
+                    doc_freq[norm] = doc_freq.get(norm, 0) + 1
+                    per_article.setdefault(article_id, []).append(norm)
+
+                pairs: Dict[tuple, int] = {}
+                for norms in per_article.values():
+                    norms = sorted(set(norms))
+                    for i, a in enumerate(norms):
+                        for b in norms[i + 1:]:
+                            pairs[(a, b)] = pairs.get((a, b), 0) + 1
+
+                if doc_freq:
+                    execute_values(
+                        cur,
+                        """
+                        UPDATE entities e SET doc_freq = e.doc_freq + v.n
+                        FROM (VALUES %s) AS v(entity_norm, n)
+                        WHERE e.entity_norm = v.entity_norm
+                        """,
+                        sorted(doc_freq.items())
+                    )
+                if pairs:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO entity_cooccurrence (entity_a, entity_b, doc_count) VALUES %s
+                        ON CONFLICT (entity_a, entity_b) DO UPDATE SET
+                            doc_count = entity_cooccurrence.doc_count + EXCLUDED.doc_count,
+                            last_seen = NOW()
+                        """,
+                        [(a, b, n) for (a, b), n in sorted(pairs.items())]
+                    )
+                newly_indexed: set = set()
+                if index_ids:
+                    cur.execute(
+                        """
+                        UPDATE articles_index SET entities_indexed = TRUE
+                        WHERE id = ANY(%s) AND entities_indexed IS NOT TRUE
+                        RETURNING id
+                        """,
+                        (index_ids,)
+                    )
+                    newly_indexed = {row[0] for row in cur.fetchall()}
+                if self.volume_rollups:
+                    self._add_volume_rollups(
+                        cur,
+                        self._volume_rollup_counts(articles, newly_indexed, new_postings),
+                        self._sentiment_rollup_sums(articles, newly_indexed, new_postings)
+                    )
+            return {"articles": len(articles), "postings": len(new_postings), "pairs": len(pairs)}
+        except Exception as e:
+            logger.error(f"Failed to save entities for {len(articles)} articles: {e}")
+            raise
+
+    # --------------- Volume rollups ---------------
+    @staticmethod
+    def _rollup_hour(published_at: Optional[datetime]) -> Optional[datetime]:
+        """UTC hour bucket of a publication time (naive times are taken as UTC)"""
+        if published_at is None:
+            return None
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=timezone.utc)
+        return published_at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def _rollup_keys(cls, articles: List[Dict[str, Any]], newly_indexed: set,
+                     new_postings: List[tuple]) -> List[tuple]:
+        """(item, (kind, term, hour)) for every rollup row an article adds to:
+        keywords and source of newly indexed articles, entities of new postings;
+        articles without published_at skipped"""
+        by_id: Dict[str, tuple] = {}
+        keys: List[tuple] = []
+        for item in articles:
+            hour = cls._rollup_hour(item.get('published_at'))
+            if hour is None:
+                continue
+            by_id[str(item['article_id'])] = (item, hour)
+            if item.get('index_id') is None or int(item['index_id']) not in newly_indexed:
+                continue
+            terms = [('keyword', kw) for kw in dict.fromkeys(item.get('keywords') or [])]
+            if item.get('source'):
+                terms.append(('source', item['source']))
+            keys.extend((item, (kind, term, hour)) for kind, term in terms)
+        for article_id, norm in new_postings:
+            if article_id in by_id:
+                item, hour = by_id[article_id]
+                keys.append((item, ('entity', norm, hour)))
+        return keys
+
+    @classmethod
+    def _volume_rollup_counts(cls, articles: List[Dict[str, Any]], newly_indexed: set,
+                              new_postings: List[tuple]) -> Dict[tuple, int]:
+        """(kind, term, hour) -> articles: keywords and source of newly indexed
+        articles, entities of new postings; articles without published_at skipped"""
+        counts: Dict[tuple, int] = {}
+        for _, key in cls._rollup_keys(articles, newly_indexed, new_postings):
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    @classmethod
+    def _sentiment_rollup_sums(cls, articles: List[Dict[str, Any]], newly_indexed: set,
+                               new_postings: List[tuple]) -> Dict[tuple, tuple]:
+        """(kind, term, hour) -> (scored articles, sentiment sum) for the same rows
+        as _volume_rollup_counts, over articles that carry a sentiment score"""
+        sums: Dict[tuple, tuple] = {}
+        for item, key in cls._rollup_keys(articles, newly_indexed, new_postings):
+            if item.get('sentiment') is None:
+                continue
+            scored, total = sums.get(key, (0, 0.0))
+            sums[key] = (scored + 1, total + float(item['sentiment']))
+        return sums
+
+    @staticmethod
+    def _add_volume_rollups(cur, counts: Dict[tuple, int],
+                            sentiment: Optional[Dict[tuple, tuple]] = None) -> None:
+        from psycopg2.extras import execute_values
+        if not counts:
+            return
+        sentiment = sentiment or {}
+        # Sorted keys keep lock order stable across concurrent writers
+        execute_values(
+            cur,
+            """
+            INSERT INTO volume_rollups (kind, term, hour, articles, scored, sentiment_sum) VALUES %s
+            ON CONFLICT (kind, term, hour) DO UPDATE SET
+                articles = volume_rollups.articles + EXCLUDED.articles,
+                scored = volume_rollups.scored + EXCLUDED.scored,
+                sentiment_sum = volume_rollups.sentiment_sum + EXCLUDED.sentiment_sum
+            """,
+            [(kind, term, hour, n) + sentiment.get((kind, term, hour), (0, 0.0))
+             for (kind, term, hour), n in sorted(counts.items())],
+            page_size=1000
+        )
+
+    def backfill_sentiment(self, batch_size: int = 1000, after_id: int = 0) -> Dict[str, Any]:
+        """Score one batch of articles_index rows stored before ingest-time sentiment.
+        Pass the returned after_id back in until 'done'; rebuild_volume_rollups
+        then folds the scores into the rollups."""
+        from psycopg2.extras import execute_values
+        from utils.sentiment import score_sentiment
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT id, COALESCE(title_norm, title, '') AS title,
+                       COALESCE(clean_text, '') AS clean_text, text_hash
+                FROM articles_index
+                WHERE sentiment IS NULL AND id > %s
+                ORDER BY id
+                LIMIT %s
+            """, (after_id, batch_size))
+            cols = [d[0] for d in cur.description]
+            rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+        if not rows:
+            return {'scored': 0, 'after_id': after_id, 'done': True}
+
+        scores = []
+        for row in self.hydrate_fulltext(rows):
+            score = score_sentiment(row['clean_text'], row['title'])
+            if score is not None:
+                scores.append((row['id'], score))
+        if scores:
+            with self._cursor() as cur:
+                execute_values(cur, """
+                    UPDATE articles_index ai SET sentiment = v.sentiment
+                    FROM (VALUES %s) AS v(id, sentiment)
+                    WHERE ai.id = v.id AND ai.sentiment IS NULL
+                """, scores, template="(%s, %s::real)", page_size=1000)
+        return {'scored': len(scores), 'after_id': rows[-1]['id'], 'done': len(rows) < batch_size}
+
+    def rebuild_volume_rollups(self, hours: int, batch_size: int = 5000) -> Dict[str, int]:
+        """Recount volume_rollups for the last `hours` from indexed articles and
+        their entity postings, in ONE transaction (the incremental writer waits)"""
+        from utils.text import rollup_terms
+        with self._transaction() as cur:
+            cur.execute("LOCK TABLE volume_rollups IN SHARE ROW EXCLUSIVE MODE")
+            cur.execute("SELECT date_trunc('hour', NOW() - %s * INTERVAL '1 hour', 'UTC')", (hours,))
+            since = cur.fetchone()[0]
+            cur.execute("DELETE FROM volume_rollups WHERE hour >= %s", (since,))
+            deleted = cur.rowcount
+            cur.execute("""
+                INSERT INTO volume_rollups (kind, term, hour, articles, scored, sentiment_sum)
+                SELECT 'source', source, date_trunc('hour', published_at, 'UTC'), COUNT(*),
+                       COUNT(sentiment), COALESCE(SUM(sentiment), 0)
+                FROM articles_index
+                WHERE entities_indexed IS TRUE AND published_at >= %s AND COALESCE(source, '') <> ''
+                GROUP BY 2, 3
+            """, (since,))
+            cur.execute("""
+                INSERT INTO volume_rollups (kind, term, hour, articles, scored, sentiment_sum)
+                SELECT 'entity', p.entity_norm, date_trunc('hour', ai.published_at, 'UTC'), COUNT(*),
+                       COUNT(ai.sentiment), COALESCE(SUM(ai.sentiment), 0)
+                FROM articles_index ai
+                JOIN article_entities p
+                  ON p.article_id = COALESCE(ai.article_id, COALESCE(ai.url_hash_v2, ai.url_hash))
+                WHERE ai.entities_indexed IS TRUE AND ai.published_at >= %s
+                GROUP BY 2, 3
+            """, (since,))
+
+            articles, last_id = 0, 0
+            while True:
+                cur.execute("""
+                    SELECT id, COALESCE(title_norm, title, ''), published_at, sentiment
+                    FROM articles_index
+                    WHERE entities_indexed IS TRUE AND published_at >= %s AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                """, (since, last_id, batch_size))
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                articles += len(rows)
+                counts: Dict[tuple, int] = {}
+                sums: Dict[tuple, tuple] = {}
+                for _, title, published_at, sentiment in rows:
+                    hour = self._rollup_hour(published_at)
+                    for kw in rollup_terms(title):
+                        key = ('keyword', kw, hour)
+                        counts[key] = counts.get(key, 0) + 1
+                        if sentiment is not None:
+                            scored, total = sums.get(key, (0, 0.0))
+                            sums[key] = (scored + 1, total + sentiment)
+                self._add_volume_rollups(cur, counts, sums)
+            cur.execute("SELECT COUNT(*) FROM volume_rollups WHERE hour >= %s", (since,))
+            rows_written = cur.fetchone()[0]
+        logger.info(f"Rebuilt volume rollups since {since}: {articles} articles, "
+                    f"{rows_written} rows (replaced {deleted})")
+        return {"articles": articles, "rows": rows_written, "replaced": deleted}
+
+    # --------------- Analytics aggregates ---------------
+    # Grouped counts, share of voice and histograms computed in SQL over every
+    # matching article, so handlers get result rows instead of documents.
+    ANALYTICS_GROUPS = {
+        'source': "domain",
+        'language': "language",
+        'hour': "date_trunc('hour', published_at, 'UTC')",
+        'day': "date_trunc('day', published_at, 'UTC')",
+        'week': "date_trunc('week', published_at, 'UTC')",
+    }
+
+    @staticmethod
+    def _matched_articles_sql(query: Optional[str], hours: Optional[int],
+                              sources: Optional[List[str]]) -> Tuple[str, Dict[str, Any]]:
+        """`matched` CTE: one row per article with a chunk matching the filters
+        (article_id, domain without www., published_at, language, title)"""
+        where = ["ac.published_at IS NOT NULL"]
+        params: Dict[str, Any] = {}
+        if query:
+            # Same per-language match as search_chunks_fts_ts; the OR of all four
+            # queries is a superset the GIN index can serve
+            params['q'] = query
+            where.append("""ac.fts_vector @@ (plainto_tsquery('pg_catalog.russian', %(q)s)
+                                            || plainto_tsquery('pg_catalog.english', %(q)s)
+                                            || plainto_tsquery('pg_catalog.spanish', %(q)s)
+                                            || plainto_tsquery('pg_catalog.simple', %(q)s))""")
+            where.append("""ac.fts_vector @@ CASE
+                        WHEN ac.language ILIKE 'ru%%' THEN plainto_tsquery('pg_catalog.russian', %(q)s)
+                        WHEN ac.language ILIKE 'en%%' THEN plainto_tsquery('pg_catalog.english', %(q)s)
+                        WHEN ac.language ILIKE 'es%%' THEN plainto_tsquery('pg_catalog.spanish', %(q)s)
+                        ELSE plainto_tsquery('pg_catalog.simple', %(q)s)
+                    END""")
+        if hours:
+            params['hours'] = int(hours)
+            where.append("ac.published_at >= NOW() - %(hours)s * INTERVAL '1 hour'")
+        if sources:
+            params['sources'] = list(sources)
+            where.append("ac.source_domain = ANY(%(sources)s)")
+        sql = f"""
+            matched AS MATERIALIZED (
+                SELECT ac.article_id,
+                       regexp_replace(lower(COALESCE(MIN(ac.source_domain), '')), '^www\\.', '') AS domain,
+                       MIN(ac.published_at) AS published_at,
+                       COALESCE(MIN(ac.language), '') AS language,
+                       COALESCE(MIN(ac.title_norm), '') AS title
+                FROM article_chunks ac
+                WHERE {' AND '.join(where)}
+                GROUP BY ac.article_id
+            )
+        """
+        return sql, params
+
+    def count_articles_by(self, group_by: str, query: Optional[str] = None, hours: Optional[int] = None,
+                          sources: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Matching articles per source / language / hour / day / week.
+
+        Rows: {key, articles, share, first_seen, last_seen}; time buckets in
+        time order, other groups by article count.
+        """
+        if group_by not in self.ANALYTICS_GROUPS:
+            raise ValueError(f"Unknown analytics group {group_by!r}; expected one of {sorted(self.ANALYTICS_GROUPS)}")
+        matched, params = self._matched_articles_sql(query, hours, sources)
+        order = "key" if group_by in ('hour', 'day', 'week') else "articles DESC, key"
+        params['limit'] = limit
+        with self._cursor() as cur:
+            cur.execute(f"""
+                WITH {matched}
+                SELECT {self.ANALYTICS_GROUPS[group_by]} AS key,
+                       COUNT(*) AS articles,
+                       COUNT(*)::float / SUM(COUNT(*)) OVER () AS share,
+                       MIN(published_at) AS first_seen,
+                       MAX(published_at) AS last_seen
+                FROM matched
+                GROUP BY 1
+                ORDER BY {order}
+                LIMIT %(limit)s
+            """, params)
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def article_histogram(self, bucket: str = 'day', query: Optional[str] = None, hours: Optional[int] = None,
+                          sources: Optional[List[str]] = None, by_source: bool = False) -> List[Dict[str, Any]]:
+        """Matching articles per time bucket (hour / day / week), optionally split by source.
+
+        Rows: {bucket, articles} or {bucket, domain, articles}, in time order;
+        buckets without articles are omitted.
+        """
+        if bucket not in ('hour', 'day', 'week'):
+            raise ValueError(f"Unknown histogram bucket {bucket!r}; expected hour, day or week")
+        matched, params = self._matched_articles_sql(query, hours, sources)
+        columns = f"{self.ANALYTICS_GROUPS[bucket]} AS bucket" + (", domain" if by_source else "")
+        with self._cursor() as cur:
+            cur.execute(f"""
+                WITH {matched}
+                SELECT {columns}, COUNT(*) AS articles
+                FROM matched
+                GROUP BY {'1, 2' if by_source else '1'}
+                ORDER BY {'1, 3 DESC, 2' if by_source else '1'}
+            """, params)
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def share_of_voice(self, query: Optional[str] = None, hours: Optional[int] = None,
+                       domains: Optional[List[str]] = None, sources: Optional[List[str]] = None,
+                       limit: int = 20, terms_per_domain: int = 10) -> Dict[str, Any]:
+        """Each domain's share of the matching articles, in ONE query.
+
+        Returns {total, domain_count, domains: [{domain, articles, share,
+        first_seen, last_seen, terms}]} for the `limit` largest domains plus any
+        requested `domains`; terms are the domain's most frequent headline words
+        (alphabetic, longer than four letters) by article count.
+        """
+        matched, params = self._matched_articles_sql(query, hours, sources)
+        wanted = [d.lower()[4:] if d.lower().startswith('www.') else d.lower() for d in (domains or [])]
+        params.update({'wanted': wanted, 'limit': limit, 'terms': terms_per_domain})
+        with self._cursor() as cur:
+            cur.execute(f"""
+                WITH {matched},
+                per_domain AS (
+                    SELECT domain, COUNT(*) AS articles,
+                           MIN(published_at) AS first_seen, MAX(published_at) AS last_seen
+                    FROM matched
+                    WHERE domain <> ''
+                    GROUP BY domain
+                ),
+                ranked AS (
+                    SELECT *,
+                           SUM(articles) OVER () AS total,
+                           COUNT(*) OVER () AS domain_count,
+                           ROW_NUMBER() OVER (ORDER BY articles DESC, domain) AS rank
+                    FROM per_domain
+                ),
+                shown AS (
+                    SELECT * FROM ranked WHERE rank <= %(limit)s OR domain = ANY(%(wanted)s)
+                ),
+                domain_terms AS (
+                    SELECT m.domain, w.term, COUNT(DISTINCT m.article_id) AS articles,
+                           ROW_NUMBER() OVER (PARTITION BY m.domain
+                                              ORDER BY COUNT(DISTINCT m.article_id) DESC, w.term) AS rank
+                    FROM matched m
+                    CROSS JOIN LATERAL regexp_split_to_table(lower(m.title), '[^[:alpha:]]+') AS w(term)
+                    WHERE length(w.term) > 4 AND m.domain IN (SELECT domain FROM shown)
+                    GROUP BY m.domain, w.term
+                )
+                SELECT 'domain' AS row_kind, domain, NULL AS term, articles, rank,
+                       articles::float / total AS share, first_seen, last_seen, total, domain_count
+                FROM shown
+                UNION ALL
+                SELECT 'term', domain, term, articles, rank, NULL, NULL, NULL, NULL, NULL
+                FROM domain_terms
+                WHERE rank <= %(terms)s
+                ORDER BY row_kind, rank
+            """, params)
+            rows = cur.fetchall()
+
+        result: Dict[str, Any] = {"total": 0, "domain_count": 0, "domains": []}
+        by_domain: Dict[str, Dict[str, Any]] = {}
+        for kind, domain, term, articles, _, share, first_seen, last_seen, total, domain_count in rows:
+            if kind == 'domain':
+                result["total"], result["domain_count"] = int(total), int(domain_count)
+                by_domain[domain] = {"domain": domain, "articles": int(articles), "share": share,
+                                     "first_seen": first_seen, "last_seen": last_seen, "terms": []}
+                result["domains"].append(by_domain[domain])
+            else:
+                by_domain[domain]["terms"].append(term)
+        return result
+
+    # --------------- Online trend clusters ---------------
+    def get_articles_pending_trend_clustering(self, hours: int, limit: int = 500) -> List[Dict[str, Any]]:
+        """Articles published in the last `hours` with an embedded chunk and no cluster yet, oldest first"""
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT ai.article_id, ac.id, ai.published_at
+                FROM articles_index ai
+                JOIN LATERAL (
+                    SELECT ac.id FROM article_chunks ac
+                    WHERE ac.article_id = ai.article_id AND ac.embedding IS NOT NULL
+                    ORDER BY ac.chunk_index
+                    LIMIT 1
+                ) ac ON TRUE
+                WHERE ai.published_at >= NOW() - %s * INTERVAL '1 hour'
+                  AND ai.article_id IS NOT NULL
+                  AND NOT EXISTS (
+                      SELECT 1 FROM trend_cluster_members m WHERE m.article_id = ai.article_id
+                  )
+                ORDER BY ai.published_at, ai.id
+                LIMIT %s
+            """, (hours, limit))
+            return [
+                {'article_id': row[0], 'chunk_id': row[1], 'published_at': row[2]}
+                for row in cur.fetchall()
+            ]
+
+    def get_expired_trend_members(self, hours: int, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Cluster members published before the trend window"""
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT article_id, cluster_id, chunk_id FROM trend_cluster_members
+                WHERE published_at < NOW() - %s * INTERVAL '1 hour'
+                ORDER BY published_at
+                LIMIT %s
+            """, (hours, limit))
+            return [
+                {'article_id': row[0], 'cluster_id': row[1], 'chunk_id': row[2]}
+                for row in cur.fetchall()
+            ]
+
+    def load_trend_clusters(self) -> List[Dict[str, Any]]:
+        with self._cursor() as cur:
+            cur.execute("SELECT id, centroid, size, label, keywords FROM trend_clusters")
+            return [
+                {'id': row[0], 'centroid': bytes(row[1]), 'size': row[2], 'label': row[3],
+                 'keywords': list(row[4] or [])}
+                for row in cur.fetchall()
+            ]
+
+    def get_trend_members_without_terms(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Members stored before term statistics were kept"""
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT article_id, cluster_id, chunk_id, published_at FROM trend_cluster_members
+                WHERE terms IS NULL
+                LIMIT %s
+            """, (limit,))
+            return [
+                {'article_id': row[0], 'cluster_id': row[1], 'chunk_id': row[2], 'published_at': row[3]}
+                for row in cur.fetchall()
+            ]
+
+    def get_trend_members(self, cluster_ids: List[int]) -> List[Dict[str, Any]]:
+        if not cluster_ids:
+            return []
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT article_id, cluster_id, chunk_id, published_at FROM trend_cluster_members
+                WHERE cluster_id = ANY(%s)
+            """, (list(cluster_ids),))
+            return [
+                {'article_id': row[0], 'cluster_id': row[1], 'chunk_id': row[2], 'published_at': row[3]}
+                for row in cur.fetchall()
+            ]
+
+    def save_trend_state(self, clusters: List[Dict[str, Any]], deleted: List[int] = (),
+                         members: List[Dict[str, Any]] = (), removed: List[str] = (),
+                         reassigned: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+        """Persist clusterer changes in ONE transaction; returns {temporary id: new id}.
+
+        clusters: [{id, centroid (bytes), size, label, keywords}], negative ids are new.
+        members are upserted by article_id, removed article ids deleted, and
+        reassigned moves every stored member of a cluster to another one.
+        Term statistics follow: a member's 'terms' (kept when omitted) count towards
+        the window document frequencies and its cluster's term counts.
+        """
+        from psycopg2.extras import execute_values
+        with self._transaction() as cur:
+            new_ids = sorted({c['id'] for c in clusters if c['id'] < 0}, reverse=True)
+            id_map: Dict[int, int] = {}
+            if new_ids:
+                cur.execute(
+                    "SELECT nextval(pg_get_serial_sequence('trend_clusters', 'id')) "
+                    "FROM generate_series(1, %s)", (len(new_ids),)
+                )
+                id_map = dict(zip(new_ids, (row[0] for row in cur.fetchall())))
+
+            def real(cluster_id):
+                return id_map.get(cluster_id, cluster_id)
+
+            if clusters:
+                execute_values(cur, """
+                    INSERT INTO trend_clusters (id, centroid, size, label, keywords) VALUES %s
+                    ON CONFLICT (id) DO UPDATE SET
+                        centroid = EXCLUDED.centroid, size = EXCLUDED.size,
+                        label = EXCLUDED.label, keywords = EXCLUDED.keywords, updated_at = NOW()
+                """, sorted(
+                    (real(c['id']), psycopg2.Binary(c['centroid']), c['size'], c.get('label'),
+                     list(c.get('keywords') or []))
+                    for c in clusters
+                ))
+            for old, new in sorted((reassigned or {}).items()):
+                cur.execute("UPDATE trend_cluster_members SET cluster_id = %s WHERE cluster_id = %s",
+                            (real(new), old))
+                cur.execute("""
+                    INSERT INTO trend_cluster_terms (cluster_id, term, tf)
+                    SELECT %s, term, tf FROM trend_cluster_terms WHERE cluster_id = %s
+                    ON CONFLICT (cluster_id, term) DO UPDATE SET tf = trend_cluster_terms.tf + EXCLUDED.tf
+                """, (real(new), old))
+                cur.execute("DELETE FROM trend_cluster_terms WHERE cluster_id = %s", (old,))
+
+            # Term statistic deltas: stored terms leave with their old cluster / the
+            # window, new terms join with the member's new cluster
+            df: Dict[str, int] = {}
+            tf: Dict[Tuple[int, str], int] = {}
+            docs = 0
+
+            def count(cluster_id, terms, sign):
+                for term in terms:
+                    if cluster_id is not None:
+                        tf[(cluster_id, term)] = tf.get((cluster_id, term), 0) + sign
+                for term in set(terms):
+                    df[term] = df.get(term, 0) + sign
+
+            touched = [m['article_id'] for m in members] + list(removed)
+            stored: Dict[str, Tuple[Optional[int], Optional[List[str]]]] = {}
+            if touched:
+                cur.execute("SELECT article_id, cluster_id, terms FROM trend_cluster_members "
+                            "WHERE article_id = ANY(%s)", (touched,))
+                stored = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
+            for article_id in removed:
+                cluster_id, terms = stored.get(article_id, (None, None))
+                if terms is not None:
+                    count(cluster_id, terms, -1)
+                    docs -= 1
+            for m in members:
+                cluster_id, terms = stored.get(m['article_id'], (None, None))
+                if terms is not None:
+                    count(cluster_id, terms, -1)
+                    docs -= 1
+                terms = m.get('terms', terms)
+                if terms is not None:
+                    count(real(m['cluster_id']) if m['cluster_id'] is not None else None, terms, 1)
+                    docs += 1
+
+            if members:
+                execute_values(cur, """
+                    INSERT INTO trend_cluster_members (article_id, cluster_id, chunk_id, published_at, terms)
+                    VALUES %s
+                    ON CONFLICT (article_id) DO UPDATE SET
+                        cluster_id = EXCLUDED.cluster_id, chunk_id = EXCLUDED.chunk_id,
+                        terms = COALESCE(EXCLUDED.terms, trend_cluster_members.terms)
+                """, sorted(
+                    (m['article_id'], real(m['cluster_id']) if m['cluster_id'] is not None else None,
+                     m['chunk_id'], m['published_at'], m.get('terms'))
+                    for m in members
+                ))
+            if removed:
+                cur.execute("DELETE FROM trend_cluster_members WHERE article_id = ANY(%s)", (list(removed),))
+
+            df = {term: delta for term, delta in df.items() if delta}
+            tf = {key: delta for key, delta in tf.items() if delta}
+            if df:
+                execute_values(cur, """
+                    INSERT INTO trend_terms (term, df) VALUES %s
+                    ON CONFLICT (term) DO UPDATE SET df = trend_terms.df + EXCLUDED.df
+                """, sorted(df.items()))
+                cur.execute("DELETE FROM trend_terms WHERE term = ANY(%s) AND df <= 0", (sorted(df),))
+            if tf:
+                execute_values(cur, """
+                    INSERT INTO trend_cluster_terms (cluster_id, term, tf) VALUES %s
+                    ON CONFLICT (cluster_id, term) DO UPDATE SET tf = trend_cluster_terms.tf + EXCLUDED.tf
+                """, sorted((cid, term, delta) for (cid, term), delta in tf.items()))
+                cur.execute("DELETE FROM trend_cluster_terms WHERE cluster_id = ANY(%s) AND tf <= 0",
+                            (sorted({cid for cid, _ in tf}),))
+            if docs:
+                cur.execute("""
+                    INSERT INTO config (k, v) VALUES ('trends.terms.docs', %s)
+                    ON CONFLICT (k) DO UPDATE SET v = (config.v::bigint + %s)::text
+                """, (str(docs), docs))
+            if deleted:
+                cur.execute("DELETE FROM trend_cluster_terms WHERE cluster_id = ANY(%s)", (list(deleted),))
+                cur.execute("DELETE FROM trend_clusters WHERE id = ANY(%s)", (list(deleted),))
+            cur.execute("""
+                INSERT INTO config (k, v) VALUES ('trends.online.updated_at', NOW()::text)
+                ON CONFLICT (k) DO UPDATE SET v = EXCLUDED.v
+            """)
+        return id_map
+
+    def get_trend_state_age(self) -> Optional[float]:
+        """Seconds since the online clusterer last saved, None if it never ran"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT EXTRACT(EPOCH FROM NOW() - v::timestamptz) FROM config
+                    WHERE k = 'trends.online.updated_at'
+                """)
+                row = cur.fetchone()
+                return float(row[0]) if row else None
+        except Exception as e:
+            logger.debug(f"Trend state age unavailable: {e}")
+            return None
+
+    def get_trend_window_members(self, hours: int, min_size: int) -> List[Dict[str, Any]]:
+        """Members published in the last `hours` of clusters with at least min_size of them"""
+        with self._cursor() as cur:
+            cur.execute("""
+                WITH recent AS (
+                    SELECT article_id, cluster_id, published_at FROM trend_cluster_members
+                    WHERE published_at >= NOW() - %s * INTERVAL '1 hour' AND cluster_id IS NOT NULL
+                ), live AS (
+                    SELECT cluster_id FROM recent GROUP BY cluster_id HAVING COUNT(*) >= %s
+                )
+                SELECT r.cluster_id, c.label, c.keywords, r.article_id, r.published_at
+                FROM recent r
+                JOIN live USING (cluster_id)
+                JOIN trend_clusters c ON c.id = r.cluster_id
+            """, (hours, min_size))
+            return [
+                {'cluster_id': row[0], 'label': row[1], 'keywords': list(row[2] or []),
+                 'article_id': row[3], 'published_at': row[4]}
+                for row in cur.fetchall()
+            ]
+
+    def get_trend_cluster_keywords(self, cluster_ids: List[int], topk: int = 8) -> Dict[int, List[str]]:
+        """Top c-TF-IDF terms per cluster from the term store (see trends_service.rank_terms)"""
+        if not cluster_ids:
+            return {}
+        with self._cursor() as cur:
+            cur.execute("""
+                WITH docs AS (
+                    SELECT COALESCE((SELECT v::float FROM config WHERE k = 'trends.terms.docs'), 0) AS n
+                )
+                SELECT cluster_id, term FROM (
+                    SELECT ct.cluster_id, ct.term,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY ct.cluster_id
+                               ORDER BY ct.tf * (LN((1 + docs.n) / (1 + COALESCE(t.df, 0))) + 1) DESC, ct.term
+                           ) AS rank
+                    FROM trend_cluster_terms ct
+                    CROSS JOIN docs
+                    LEFT JOIN trend_terms t ON t.term = ct.term
+                    WHERE ct.cluster_id = ANY(%s)
+                ) ranked
+                WHERE rank <= %s
+                ORDER BY cluster_id, rank
+            """, (list(cluster_ids), topk))
+            keywords: Dict[int, List[str]] = {}
+            for cluster_id, term in cur.fetchall():
+                keywords.setdefault(cluster_id, []).append(term)
+            return keywords
+
+    def get_trend_term_df(self, terms: List[str]) -> Tuple[int, Dict[str, int]]:
+        """(window document count, {term: document frequency}) from the term store"""
+        with self._cursor() as cur:
+            cur.execute("SELECT v FROM config WHERE k = 'trends.terms.docs'")
+            row = cur.fetchone()
+            docs = int(row[0]) if row else 0
+            if not docs or not terms:
+                return docs, {}
+            cur.execute("SELECT term, df FROM trend_terms WHERE term = ANY(%s)", (list(terms),))
+            return docs, dict(cur.fetchall())
+
+    def get_trend_articles(self, article_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """article_id -> {title_norm, url, source, clean_text} (bodies hydrated from the store)"""
+        if not article_ids:
+            return {}
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT article_id, title_norm, url, source, clean_text, text_hash
+                FROM articles_index WHERE article_id = ANY(%s)
+            """, (list(article_ids),))
+            cols = [d[0] for d in cur.description]
+            rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+        return {r['article_id']: r for r in self.hydrate_fulltext(rows)}
+
     # --------------- Stage 7 (Indexing) ---------------
     def get_chunks_for_indexing(self, limit: int = 128) -> List[Dict[str, Any]]:
         """Select chunks missing FTS or embedding."""
@@ -827,7 +2278,8 @@ class PgClient:
                             END
                         )::regconfig,
                         coalesce(text, '')
-                    )
+                    ),
+                    indexed_at = NOW()
                     WHERE id = ANY(%s)
                     """,
                     (ids,)
@@ -848,14 +2300,14 @@ class PgClient:
 
                 # Always update TEXT embedding (backwards compatibility)
                 cur.execute(
-                    "UPDATE article_chunks SET embedding = %s WHERE id = %s",
+                    "UPDATE article_chunks SET embedding = %s, indexed_at = NOW() WHERE id = %s",
                     (vec_str, chunk_id)
                 )
 
                 # Try to also update pgvector column if it exists
                 try:
                     cur.execute(
-                        "UPDATE article_chunks SET embedding_vector = %s::vector WHERE id = %s",
+                        "UPDATE article_chunks SET embedding_vector = %s::vector, indexed_at = NOW() WHERE id = %s",
                         (vec_str, chunk_id)
                     )
                     logger.debug(f"Chunk {chunk_id}: Updated both TEXT and pgvector columns")
@@ -863,12 +2315,220 @@ class PgClient:
                     # pgvector column doesn't exist or wrong dimension - not a critical error
                     logger.debug(f"Chunk {chunk_id}: pgvector update skipped ({e_pg})")
 
+                if self.use_compact_vectors and self._get_compact_type():
+                    try:
+                        cur.execute(
+                            f"UPDATE article_chunks SET embedding_compact = %s::{self._compact_type} WHERE id = %s",
+                            (self._compact_literal(embedding), chunk_id)
+                        )
+                    except Exception as e_compact:
+                        logger.debug(f"Chunk {chunk_id}: compact vector update skipped ({e_compact})")
+
                 return True
 
         except Exception as e:
             logger.error(f"Failed to update embedding for chunk {chunk_id}: {e}")
             return False
 
+    # Bulk embedding loading (analytics)
+    def _get_embedding_source(self) -> Tuple[str, str]:
+        """(column, format) analytics read: embedding_vector if present, else embedding.
+        With embedding_vector as the source, a TEXT embedding column is kept as the
+        fallback for rows not migrated to pgvector yet (_embedding_fallback).
+        """
+        if self._embedding_source is None:
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute
+                    WHERE attrelid = 'article_chunks'::regclass
+                      AND attname IN ('embedding_vector', 'embedding') AND NOT attisdropped
+                """)
+                types = {name: kind.split('(')[0] for name, kind in cur.fetchall()}
+            self._embedding_fallback = None
+            if types.get('embedding_vector') == 'vector':
+                self._embedding_source = ('embedding_vector', FORMAT_VECTOR)
+                if types.get('embedding') == 'text':
+                    self._embedding_fallback = ('embedding', FORMAT_TEXT)
+            elif types.get('embedding') == 'vector':
+                self._embedding_source = ('embedding', FORMAT_VECTOR)
+            else:
+                self._embedding_source = ('embedding', FORMAT_TEXT)
+        return self._embedding_source
+
+    def load_embeddings(self, chunk_ids: Sequence[int], batch_size: Optional[int] = None,
+                        mmap_path: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Embeddings of chunk_ids as one float32 matrix (row i = chunk_ids[i]) plus a found mask.
+
+        Vectors stream through COPY ... (FORMAT binary) straight into a preallocated
+        array, batch_size ids per COPY. With mmap_path the matrix is a memory-mapped
+        .npy file at that path (np.load(path, mmap_mode='r') reopens it later).
+        Rows without an embedding (or with a different dimension) stay zero and
+        are False in the mask; with no embeddings at all the matrix has 0 columns.
+        Chunks whose embedding_vector is NULL are read from the TEXT column.
+        """
+        ids = [int(x) for x in chunk_ids]
+        positions: Dict[int, List[int]] = {}
+        for row, chunk_id in enumerate(ids):
+            positions.setdefault(chunk_id, []).append(row)
+
+        def allocate(dims: int) -> np.ndarray:
+            if mmap_path:
+                return np.lib.format.open_memmap(mmap_path, mode='w+', dtype=np.float32,
+                                                 shape=(len(ids), dims))
+            return np.zeros((len(ids), dims), dtype=np.float32)
+
+        column, fmt = self._get_embedding_source()
+        sink = VectorCopySink(positions, allocate, fmt=fmt)
+        step = batch_size or self.embedding_load_batch
+
+        def copy_column(cur, column: str, wanted: List[int]):
+            for start in range(0, len(wanted), step):
+                query = cur.mogrify(
+                    f"SELECT id, {column} FROM article_chunks WHERE id = ANY(%s) AND {column} IS NOT NULL",
+                    (wanted[start:start + step],)
+                ).decode()
+                sink.begin()
+                cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT binary)", sink)
+
+        with self._cursor() as cur:
+            copy_column(cur, column, list(positions))
+            if self._embedding_fallback:
+                missing = [i for i, rows in positions.items() if sink.found is None or not sink.found[rows[0]]]
+                if missing:
+                    sink.fmt = self._embedding_fallback[1]
+                    copy_column(cur, self._embedding_fallback[0], missing)
+
+        if sink.out is None:
+            return np.zeros((len(ids), 0), dtype=np.float32), np.zeros(len(ids), dtype=bool)
+        if sink.skipped:
+            logger.warning(f"load_embeddings: {sink.skipped} embeddings skipped "
+                           f"(dimension other than {sink.out.shape[1]} or unparseable)")
+        if mmap_path:
+            sink.out.flush()
+        return sink.out, sink.found
+
+    # Compact vector tier
+    def _get_compact_type(self) -> str:
+        """Type of article_chunks.embedding_compact ('halfvec' / 'vector'), '' if not built"""
+        if self._compact_type is None:
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                    WHERE attrelid = 'article_chunks'::regclass
+                      AND attname = 'embedding_compact' AND NOT attisdropped
+                """)
+                row = cur.fetchone()
+            self._compact_type = row[0].split('(')[0] if row else ''
+        return self._compact_type
+
+    def _compact_literal(self, vector: List[float]) -> str:
+        """Leading compact_dims components (Matryoshka truncation), zero-padded if shorter"""
+        head = [float(x) for x in vector[:self.compact_dims]]
+        head += [0.0] * (self.compact_dims - len(head))
+        return '[' + ','.join(str(x) for x in head) + ']'
+
+    def ensure_compact_embeddings(self) -> str:
+        """Add article_chunks.embedding_compact; returns its type.
+
+        halfvec (pgvector >= 0.7) stores the leading dims at half precision; older
+        pgvector gets a plain vector of the truncated dims.
+        """
+        with self._cursor() as cur:
+            cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            row = cur.fetchone()
+            if not row:
+                raise RuntimeError("pgvector extension is not installed")
+            version = tuple(int(p) for p in row[0].split('.')[:2])
+            kind = 'halfvec' if version >= (0, 7) else 'vector'
+            cur.execute(f"""
+                ALTER TABLE article_chunks
+                ADD COLUMN IF NOT EXISTS embedding_compact {kind}({self.compact_dims})
+            """)
+        self._compact_type = None
+        return self._get_compact_type()
+
+    def create_compact_embedding_index(self):
+        """HNSW index on embedding_compact (build it after the backfill)"""
+        kind = self._get_compact_type()
+        with self._cursor() as cur:
+            cur.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_chunks_embedding_compact
+                ON article_chunks USING hnsw (embedding_compact {kind}_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+            """)
+
+    def backfill_compact_embeddings(self, batch_size: int = 5000, after_id: int = 0) -> Dict[str, Any]:
+        """Fill embedding_compact from embedding for one keyset page of chunks.
+        Pass the returned after_id back in until 'done'."""
+        kind = self._get_compact_type()
+        with self._transaction() as cur:
+            cur.execute(f"""
+                WITH page AS (
+                    SELECT id FROM article_chunks
+                    WHERE id > %(after)s
+                    ORDER BY id
+                    LIMIT %(limit)s
+                ), filled AS (
+                    UPDATE article_chunks ac
+                    SET embedding_compact = ((ac.embedding::text::vector::real[]
+                                              || array_fill(0::real, ARRAY[%(dims)s]))[1:%(dims)s])::vector::{kind}
+                    FROM page
+                    WHERE ac.id = page.id AND ac.embedding IS NOT NULL AND ac.embedding_compact IS NULL
+                    RETURNING ac.id
+                )
+                SELECT (SELECT MAX(id) FROM page), (SELECT COUNT(*) FROM page), (SELECT COUNT(*) FROM filled)
+            """, {'after': after_id, 'limit': batch_size, 'dims': self.compact_dims})
+            last_id, scanned, filled = cur.fetchone()
+        return {'filled': filled, 'after_id': last_id or after_id, 'done': scanned < batch_size}
+
+    def get_compact_embedding_stats(self) -> Dict[str, Any]:
+        """Chunks in the compact tier and bytes per tier"""
+        with self._cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(embedding_compact),
+                       COALESCE(SUM(pg_column_size(embedding_compact)), 0),
+                       COALESCE(SUM(pg_column_size(embedding)) FILTER (WHERE embedding_compact IS NOT NULL), 0)
+                FROM article_chunks
+            """)
+            chunks, compact_bytes, full_bytes = cur.fetchone()
+        return {'chunks': chunks, 'compact_bytes': compact_bytes, 'full_bytes': full_bytes}
+
+    def _search_chunks_two_stage(self, query_vector: List[float], full_query: List[float],
+                                 limit: int) -> List[Dict[str, Any]]:
+        """ANN candidates from embedding_compact, reranked by exact cosine distance on embedding"""
+        kind = self._get_compact_type()
+        if not kind:
+            raise RuntimeError("embedding_compact column not found (run build-vector-tier)")
+        candidates = limit * self.rerank_factor
+        full_str = '[' + ','.join(str(float(x)) for x in full_query) + ']'
+        with self._transaction() as cur:
+            # HNSW returns at most ef_search rows: widen it to the candidate pool
+            cur.execute("SET LOCAL hnsw.ef_search = %s", (min(1000, max(40, candidates)),))
+            cur.execute(f"""
+                WITH candidates AS (
+                    SELECT id FROM article_chunks
+                    WHERE embedding_compact IS NOT NULL
+                    ORDER BY embedding_compact <=> %s::{kind}
+                    LIMIT %s
+                )
+                SELECT
+                    ac.id, ac.article_id, ac.chunk_index, ac.text,
+                    ac.url, ac.title_norm, ac.source_domain,
+                    1 - (ac.embedding <=> %s::vector) as score
+                FROM article_chunks ac
+                JOIN candidates USING (id)
+                ORDER BY ac.embedding <=> %s::vector
+                LIMIT %s
+            """, (self._compact_literal(query_vector), candidates, full_str, full_str, limit))
+            return [
+                {
+                    'id': row[0], 'article_id': row[1], 'chunk_index': row[2],
+                    'text': row[3], 'url': row[4], 'title_norm': row[5],
+                    'source_domain': row[6], 'score': row[7]
+                }
+                for row in cur.fetchall()
+            ]
+
     # ============== Stage 8 (Retrieval) operations ==============
     def search_chunks_fts(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search chunks using Full-Text Search (FTS) with BM25 ranking."""
@@ -962,6 +2622,12 @@ class PgClient:
                 else:
                     padded_query = query_vector
 
+                if self.use_compact_vectors:
+                    try:
+                        return self._search_chunks_two_stage(query_vector, padded_query, limit)
+                    except Exception as e_compact:
+                        logger.debug(f"Compact vector search failed, scanning full vectors: {e_compact}")
+
                 try:
                     # Try pgvector native search first
                     query_vec_str = '[' + ','.join(str(float(x)) for x in padded_query) + ']'
@@ -27,6 +27,29 @@ from caching_service import CachingService
 
 logger = logging.getLogger(__name__)
 
+WINDOW_HOURS = {
+    "1h": 1,
+    "6h": 6,
+    "12h": 12,
+    "24h": 24,
+    "1d": 24,
+    "3d": 72,
+    "7d": 168,
+    "1w": 168,
+    "14d": 336,
+    "2w": 336,
+    "30d": 720,
+    "1m": 720,
+    "3m": 2160,
+    "6m": 4320,
+    "1y": 8760,
+}
+
+
+def window_hours(window: Optional[str]) -> int:
+    """Hours covered by an analysis window ("24h", "1w", ...); unknown windows are 24h"""
+    return WINDOW_HOURS.get((window or "7d").lower(), 24)
+
 
 @dataclass
 class SearchRequest:
@@ -399,6 +422,20 @@ class RankingAPI:
                 applied_filters={'error': str(e)}
             )
 
+    async def share_of_voice(
+        self,
+        query: Optional[str] = None,
+        window: str = "1w",
+        domains: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Per-domain article counts and headline terms over everything matching, aggregated in SQL."""
+        normalized_query = self._normalize_query(query or "") or None
+        return await asyncio.to_thread(
+            self.db.share_of_voice, normalized_query, window_hours(window), domains, sources, limit
+        )
+
     async def retrieve_for_analysis(
         self,
         query: Optional[str] = None,
@@ -421,25 +458,7 @@ class RankingAPI:
         metrics_payload: Dict[str, Any] = {"timings": {}}
 
         try:
-            window_key = (window or "7d").lower()
-            window_hours_map = {
-                "1h": 1,
-                "6h": 6,
-                "12h": 12,
-                "24h": 24,
-                "1d": 24,
-                "3d": 72,
-                "7d": 168,
-                "1w": 168,
-                "14d": 336,
-                "2w": 336,
-                "30d": 720,
-                "1m": 720,
-                "3m": 2160,
-                "6m": 4320,
-                "1y": 8760,
-            }
-            hours = window_hours_map.get(window_key, 168 if window_key in {"7d", "1w"} else 24)
+            hours = window_hours(window)
 
             filters: Dict[str, Any] = {}
             if sources:
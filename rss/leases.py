@@ -0,0 +1,62 @@
+"""
+DB-backed feed leases so several poller replicas can share the feed set
+
+A replica claims a batch of due feeds by writing its id and an expiry into
+feeds.lease_owner / feeds.lease_expires_at (FOR UPDATE SKIP LOCKED, so
+concurrent claims never return the same row). While the batch is polled a
+heartbeat thread renews the leases; when a replica dies its leases simply
+expire and any other replica claims those feeds on its next claim, so
+takeover is bounded by FEED_LEASE_SECONDS.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import List, Set
+
+logger = logging.getLogger(__name__)
+
+
+def default_replica_id() -> str:
+    """POLLER_REPLICA_ID, or host-pid-random (unique per process)"""
+    return os.getenv('POLLER_REPLICA_ID') or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeaseHeartbeat:
+    """Renews a batch's feed leases every ttl/3 until stopped"""
+
+    def __init__(self, db_client, owner: str, feed_ids: List[int], lease_seconds: int):
+        self.db = db_client
+        self.owner = owner
+        self.feed_ids = list(feed_ids)
+        self.lease_seconds = lease_seconds
+        self.interval = max(1.0, lease_seconds / 3.0)
+        # Feeds whose lease was taken over (renewal did not find our row)
+        self.lost: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat-{owner}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            held = [fid for fid in self.feed_ids if fid not in self.lost]
+            if not held:
+                return
+            try:
+                renewed = set(self.db.renew_feed_leases(self.owner, held, self.lease_seconds))
+            except Exception as e:
+                # Keep polling; the lease only lapses if renewals fail for a full TTL
+                logger.warning(f"Feed lease renewal failed: {e}")
+                continue
+            lost = set(held) - renewed
+            if lost:
+                logger.warning(f"Lost feed leases for {sorted(lost)}; another replica took over")
+                self.lost |= lost
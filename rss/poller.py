@@ -5,17 +5,47 @@ RSS feed polling with batch processing and conditional headers
 import asyncio
 import concurrent.futures
 import feedparser
+import hashlib
 import logging
+import os
+import re
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone
-from urllib.parse import urljoin
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urljoin, urlparse
 import uuid
 
 from net.http import HttpClient
 from utils.url import canonicalize_url, extract_domain, compute_url_hash
+from services.pipeline_events import CHANNEL_RAW_PENDING
+from services.backpressure import BackpressureController
+from rss.leases import LeaseHeartbeat, default_replica_id
 
 logger = logging.getLogger(__name__)
 
+# Channel-level build stamps change on every regeneration without any new items
+_VOLATILE_FEED_TAGS = re.compile(rb'<lastBuildDate>[^<]*</lastBuildDate>', re.IGNORECASE)
+
+
+def feed_fingerprint(content: bytes) -> str:
+    """SHA-256 of a feed body, ignoring the RSS <lastBuildDate> stamp"""
+    return hashlib.sha256(_VOLATILE_FEED_TAGS.sub(b'', content or b'')).hexdigest()
+
+
+def parse_watermark(value) -> Optional[datetime]:
+    """Stored last_entry_date (TEXT column) as an aware datetime"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            from dateutil.parser import parse
+            parsed = parse(str(value))
+        except (ValueError, OverflowError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 class RSSPoller:
     """RSS feed poller with batch processing"""
     
@@ -24,13 +54,30 @@ class RSSPoller:
         self.batch_size = batch_size
         self.max_workers = max_workers
         self.http_client = HttpClient()
+        self.backpressure = BackpressureController(db_client)
+        # Entries this much older than the feed watermark are treated as already seen
+        self.watermark_grace = timedelta(
+            seconds=int(os.getenv('POLL_WATERMARK_GRACE_SECONDS', '3600'))
+        )
+        # Lease-based sharding across replicas; stores without lease support poll everything
+        self.use_leases = (os.getenv('FEED_LEASES', 'true').lower() == 'true'
+                           and callable(getattr(type(db_client), 'claim_feeds', None)))
+        self.lease_seconds = int(os.getenv('FEED_LEASE_SECONDS', '120'))
+        self.min_poll_interval = timedelta(seconds=int(os.getenv('FEED_MIN_POLL_SECONDS', '60')))
+        self.replica_id = default_replica_id()
+        self._lost_leases = set()
         
     def poll_active_feeds(self, feed_limit: int = None) -> Dict[str, Any]:
         """
         Poll active feeds in batches
+        With feed leases (default), batches are claimed from the DB so several
+        replicas can run at once without polling the same feed.
         Returns statistics about the polling operation
         """
         logger.info("Starting RSS feed polling")
+
+        if self.use_leases:
+            return self._poll_leased_feeds(feed_limit)
         
         # Get active feeds
         feeds = self.db.get_active_feeds(feed_limit)
@@ -38,18 +85,21 @@ class RSSPoller:
             logger.info("No active feeds to poll")
             return {'feeds_polled': 0, 'new_articles': 0, 'errors': 0}
         
-        logger.info(f"Polling {len(feeds)} active feeds")
+        # Slow down or pause low-priority feeds while downstream stages are behind
+        self.backpressure.evaluate()
+        feeds, deferred = self.backpressure.filter_feeds(feeds)
         
-        # Process feeds in batches
-        stats = {
-            'feeds_polled': 0,
-            'feeds_successful': 0,
-            'feeds_cached': 0,
-            'feeds_errors': 0,
-            'new_articles': 0,
-            'duplicate_articles': 0,
-            'errors': []
-        }
+        stats = self._new_stats(deferred)
+        if deferred:
+            logger.info(f"Backpressure {stats['throttle']['state']} ({stats['throttle']['reason']}): "
+                        f"deferring {deferred} low-priority feeds")
+        if not feeds:
+            return stats
+
+        logger.info(f"Polling {len(feeds)} active feeds")
+
+        # Resolve all feed hosts in parallel up front; fetches then hit the DNS cache
+        self.http_client.resolver.prefetch(urlparse(feed['url']).hostname for feed in feeds)
         
         # Process in batches with concurrent workers
         for batch_start in range(0, len(feeds), self.batch_size):
@@ -59,18 +109,94 @@ class RSSPoller:
             logger.info(f"Processing batch {batch_start//self.batch_size + 1}: "
                        f"feeds {batch_start+1}-{batch_end}")
             
-            batch_stats = self._process_feed_batch(batch_feeds)
-            
-            # Merge stats
-            for key, value in batch_stats.items():
-                if isinstance(value, list):
-                    stats[key].extend(value)
-                else:
-                    stats[key] += value
+            self._merge_stats(stats, self._process_feed_batch(batch_feeds))
         
+        return self._finish_poll(stats)
+
+    def _poll_leased_feeds(self, feed_limit: Optional[int]) -> Dict[str, Any]:
+        """Claim-poll-release loop over DB feed leases"""
+        self.backpressure.evaluate()
+        stats = self._new_stats(0)
+        stats['replica_id'] = self.replica_id
+
+        # Feeds any replica polled since (pass start - min interval) are not due this pass
+        polled_before = self.db.db_now() - self.min_poll_interval
+        excluded: List[int] = []
+        claimed_total = 0
+        batch_no = 0
+
+        while feed_limit is None or claimed_total < feed_limit:
+            size = self.batch_size if feed_limit is None else min(self.batch_size, feed_limit - claimed_total)
+            feeds = self.db.claim_feeds(self.replica_id, self.lease_seconds, size,
+                                        polled_before=polled_before, exclude_ids=excluded)
+            if not feeds:
+                break
+            claimed_total += len(feeds)
+            batch_no += 1
+
+            selected, deferred = self.backpressure.filter_feeds(feeds)
+            if deferred:
+                selected_ids = {f['id'] for f in selected}
+                deferred_ids = [f['id'] for f in feeds if f['id'] not in selected_ids]
+                excluded.extend(deferred_ids)
+                self.db.release_feed_leases(self.replica_id, deferred_ids, polled=False)
+                stats['throttle']['feeds_deferred'] += deferred
+            if not selected:
+                continue
+
+            logger.info(f"Processing batch {batch_no}: {len(selected)} leased feeds")
+            self.http_client.resolver.prefetch(urlparse(feed['url']).hostname for feed in selected)
+
+            ids = [f['id'] for f in selected]
+            heartbeat = LeaseHeartbeat(self.db, self.replica_id, ids, self.lease_seconds)
+            heartbeat.start()
+            self._lost_leases = heartbeat.lost
+            try:
+                batch_stats = self._process_feed_batch(selected)
+            finally:
+                heartbeat.stop()
+                # Failed polls count as polled too: other replicas skip them this pass
+                self.db.release_feed_leases(self.replica_id, ids, polled=True)
+            self._merge_stats(stats, batch_stats)
+
+        if stats['throttle']['feeds_deferred']:
+            logger.info(f"Backpressure {stats['throttle']['state']} ({stats['throttle']['reason']}): "
+                        f"deferred {stats['throttle']['feeds_deferred']} low-priority feeds")
+        if not claimed_total:
+            logger.info("No active feeds to poll (none due or all leased by other replicas)")
+            return stats
+        return self._finish_poll(stats)
+
+    def _new_stats(self, deferred: int) -> Dict[str, Any]:
+        return {
+            'feeds_polled': 0,
+            'feeds_successful': 0,
+            'feeds_cached': 0,
+            'feeds_unchanged': 0,
+            'feeds_errors': 0,
+            'new_articles': 0,
+            'duplicate_articles': 0,
+            'skipped_by_watermark': 0,
+            'errors': [],
+            'throttle': {**self.backpressure.get_stats(), 'feeds_deferred': deferred}
+        }
+
+    @staticmethod
+    def _merge_stats(stats: Dict[str, Any], batch_stats: Dict[str, Any]):
+        for key, value in batch_stats.items():
+            if isinstance(value, list):
+                stats[key].extend(value)
+            else:
+                stats[key] += value
+
+    def _finish_poll(self, stats: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"Polling complete: {stats['feeds_successful']}/{stats['feeds_polled']} successful, "
                    f"{stats['new_articles']} new articles")
-        
+
+        # Wake the article worker instead of waiting for its next poll
+        if stats['new_articles'] > 0:
+            self.db.notify_pipeline(CHANNEL_RAW_PENDING, stats['new_articles'])
+
         # Log to diagnostics
         self.db.log_diagnostics(
             level='INFO',
@@ -87,9 +213,11 @@ class RSSPoller:
             'feeds_polled': 0,
             'feeds_successful': 0,
             'feeds_cached': 0,
+            'feeds_unchanged': 0,
             'feeds_errors': 0,
             'new_articles': 0,
             'duplicate_articles': 0,
+            'skipped_by_watermark': 0,
             'errors': []
         }
         
@@ -112,8 +240,11 @@ class RSSPoller:
                         batch_stats['feeds_successful'] += 1
                         if feed_stats['cached']:
                             batch_stats['feeds_cached'] += 1
+                        if feed_stats['unchanged']:
+                            batch_stats['feeds_unchanged'] += 1
                         batch_stats['new_articles'] += feed_stats['new_articles']
                         batch_stats['duplicate_articles'] += feed_stats['duplicate_articles']
+                        batch_stats['skipped_by_watermark'] += feed_stats['skipped_by_watermark']
                     else:
                         batch_stats['feeds_errors'] += 1
                         batch_stats['errors'].append({
@@ -139,8 +270,11 @@ class RSSPoller:
         feed_stats = {
             'success': False,
             'cached': False,
+            'unchanged': False,
             'new_articles': 0,
             'duplicate_articles': 0,
+            'skipped_by_watermark': 0,
+            'failed_entries': 0,
             'error': None
         }
         
@@ -160,6 +294,11 @@ class RSSPoller:
             if response is None:
                 feed_stats['error'] = f"Failed to fetch {feed_url}"
                 return feed_stats
+
+            if feed_id in self._lost_leases:
+                # Another replica owns this feed now; leave the writes to it
+                feed_stats['error'] = f"Feed lease lost: {feed_url}"
+                return feed_stats
             
             # Update feed metadata
             feed_updates = {
@@ -174,6 +313,16 @@ class RSSPoller:
                 self.db.update_feed(feed_id, **feed_updates)
                 logger.debug(f"Feed not modified: {feed_url}")
                 return feed_stats
+
+            # Same body as last poll: skip parsing (covers feeds without ETag/Last-Modified)
+            fingerprint = feed_fingerprint(response.content)
+            if fingerprint == feed.get('content_fingerprint'):
+                feed_stats['success'] = True
+                feed_stats['cached'] = True
+                feed_stats['unchanged'] = True
+                self.db.update_feed(feed_id, **feed_updates)
+                logger.debug(f"Feed body unchanged: {feed_url}")
+                return feed_stats
             
             # Parse RSS/Atom feed
             feed_data = feedparser.parse(response.content)
@@ -182,44 +331,50 @@ class RSSPoller:
                 feed_stats['error'] = f"Invalid feed format: {feed_url}"
                 return feed_stats
             
-            # Process entries
-            newest_entry_date = feed.get('last_entry_date')
+            # Entries clearly older than the newest one seen before are already stored
+            watermark = parse_watermark(feed.get('last_entry_date'))
+            cutoff = watermark - self.watermark_grace if watermark else None
+            now = datetime.now(timezone.utc)
+            newest_entry_date = watermark
             
             for entry in feed_data.entries:
                 try:
+                    entry_date = self._extract_entry_date(entry)
+                    if entry_date and entry_date <= now + self.watermark_grace:
+                        # Future-dated entries must not push the watermark ahead of real ones
+                        if not newest_entry_date or entry_date > newest_entry_date:
+                            newest_entry_date = entry_date
+
+                    if cutoff and entry_date and entry_date < cutoff:
+                        feed_stats['skipped_by_watermark'] += 1
+                        continue
+
                     article_stats = self._process_feed_entry(entry, feed, final_url or feed_url)
                     if article_stats['new']:
                         feed_stats['new_articles'] += 1
-                        
-                        # Track newest entry date
-                        if article_stats['published_at']:
-                            current_date = article_stats['published_at']
-                            # Convert string date to datetime for comparison if needed
-                            if isinstance(newest_entry_date, str) and newest_entry_date:
-                                try:
-                                    from dateutil.parser import parse
-                                    newest_entry_date = parse(newest_entry_date)
-                                except:
-                                    newest_entry_date = None
-                            
-                            if not newest_entry_date or current_date > newest_entry_date:
-                                newest_entry_date = current_date
                     else:
                         feed_stats['duplicate_articles'] += 1
                         
                 except Exception as e:
+                    feed_stats['failed_entries'] += 1
                     logger.error(f"Error processing entry from {feed_url}: {e}")
                     continue
             
-            # Update feed with new metadata
-            if newest_entry_date != feed.get('last_entry_date'):
-                feed_updates['last_entry_date'] = newest_entry_date
-            
-            self.db.update_feed(feed_id, **feed_updates)
+            if feed_stats['failed_entries']:
+                # Keep validators, fingerprint and watermark as they were so the
+                # next poll parses this body again and retries the failed entries
+                logger.warning(f"{feed_stats['failed_entries']} entries failed for {feed_url}; "
+                               f"feed state not advanced")
+            else:
+                if newest_entry_date and newest_entry_date != watermark:
+                    feed_updates['last_entry_date'] = newest_entry_date
+                feed_updates['content_fingerprint'] = fingerprint
+                self.db.update_feed(feed_id, **feed_updates)
             
             feed_stats['success'] = True
             logger.debug(f"Feed polled successfully: {feed_url} "
-                        f"({feed_stats['new_articles']} new articles)")
+                        f"({feed_stats['new_articles']} new articles, "
+                        f"{feed_stats['skipped_by_watermark']} below watermark)")
             
         except Exception as e:
             feed_stats['error'] = str(e)
@@ -297,14 +452,13 @@ class RSSPoller:
             'error_reason': ''
         }
         
-        try:
-            # insert into raw using url_hash_v2 during migration window (and/or url_hash fallback)
-            article_id = self.db.insert_raw_article(article_data)
-            if article_id:
-                entry_stats['new'] = True
-                logger.debug(f"New article queued: {title[:50]}...")
-        except Exception as e:
-            logger.error(f"Failed to insert article {entry_url}: {e}")
+        # insert into raw using url_hash_v2 during migration window (and/or url_hash fallback).
+        # Duplicates return None; other DB errors propagate so the poll counts the
+        # entry as failed and leaves the feed state where it was
+        article_id = self.db.insert_raw_article(article_data)
+        if article_id:
+            entry_stats['new'] = True
+            logger.debug(f"New article queued: {title[:50]}...")
         
         return entry_stats
     
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark analytics aggregates computed in SQL against counting in Python.
+
+Loads synthetic chunks (several per article, a share mentioning the query
+topic) into a scratch schema. For grouped counts by source, a daily histogram
+and share of voice with headline terms, times fetching every matching chunk
+and counting it in Python (what the handlers do with retrieved documents)
+against the PgClient aggregate, and reports rows transferred and peak traced
+memory for each.
+
+Usage: PG_DSN=... python scripts/bench_analytics_aggregates.py [--articles 50000] [--chunks 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import psycopg2  # noqa: E402
+from psycopg2.extras import execute_values  # noqa: E402
+
+WORDS = ["market", "growth", "policy", "budget", "energy", "transport", "health", "science",
+         "startup", "funding", "election", "weather", "football", "climate", "security"]
+
+
+def schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+def load(db, articles, chunks, domains, days, topic_share, rng):
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(articles):
+        words = list(rng.choice(WORDS, 4, replace=False))
+        if rng.random() < topic_share:
+            words.insert(1, "oil")
+        title = ' '.join(words)
+        domain = f"site{int(rng.zipf(1.6)) % domains}.com"
+        published = now - timedelta(hours=float(rng.uniform(0, days * 24)))
+        for c in range(chunks):
+            text = f"{title} paragraph {c} " + ' '.join(rng.choice(WORDS, 30))
+            rows.append((f"a{i}", 1, c, text, f"https://{domain}/a{i}", title, domain, published, 'en', text))
+    with db._cursor() as cur:
+        execute_values(cur, """
+            INSERT INTO article_chunks (article_id, processing_version, chunk_index, text, url,
+                                        title_norm, source_domain, published_at, language, fts_vector)
+            VALUES %s
+        """, rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, to_tsvector('english', %s))",
+            page_size=2000)
+        cur.execute("VACUUM ANALYZE article_chunks")
+    return len(rows)
+
+
+def fetch_matching(db, query, hours):
+    """Every matching chunk, as a document-level handler would receive them"""
+    with db._cursor() as cur:
+        cur.execute("""
+            SELECT article_id, url, title_norm, source_domain, published_at, text
+            FROM article_chunks
+            WHERE fts_vector @@ plainto_tsquery('english', %s)
+              AND published_at >= NOW() - %s * INTERVAL '1 hour'
+        """, (query, hours))
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+def python_by_source(db, query, hours):
+    docs = fetch_matching(db, query, hours)
+    seen, counts = set(), Counter()
+    for d in docs:
+        if d['article_id'] not in seen:
+            seen.add(d['article_id'])
+            counts[d['source_domain']] += 1
+    return counts.most_common(50), len(docs)
+
+
+def python_histogram(db, query, hours):
+    docs = fetch_matching(db, query, hours)
+    seen, counts = set(), Counter()
+    for d in docs:
+        if d['article_id'] not in seen:
+            seen.add(d['article_id'])
+            counts[d['published_at'].astimezone(timezone.utc).date()] += 1
+    return sorted(counts.items()), len(docs)
+
+
+def python_share_of_voice(db, query, hours):
+    docs = fetch_matching(db, query, hours)
+    seen, counts, terms = set(), Counter(), defaultdict(Counter)
+    for d in docs:
+        if d['article_id'] in seen:
+            continue
+        seen.add(d['article_id'])
+        counts[d['source_domain']] += 1
+        terms[d['source_domain']].update({w for w in d['title_norm'].lower().split() if len(w) > 4 and w.isalpha()})
+    total = sum(counts.values())
+    return [(domain, n / total, [t for t, _ in terms[domain].most_common(10)])
+            for domain, n in counts.most_common(20)], len(docs)
+
+
+def measure(fn, repeat):
+    times, peak, result = [], 0, None
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return result, statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--articles', type=int, default=50000)
+    parser.add_argument('--chunks', type=int, default=3, help='chunks per article')
+    parser.add_argument('--domains', type=int, default=200)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--topic-share', type=float, default=0.2, help='share of articles matching the query')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    dsn = os.environ['PG_DSN']
+    schema = f"bench_agg_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        os.environ['PG_DSN'] = schema_dsn(dsn, schema)
+        os.environ.setdefault('HOT_TIER_ENABLED', 'false')
+        from database.production_db_client import ProductionDBClient
+
+        db = ProductionDBClient()
+        db.ensure_schema()
+        chunks = load(db, args.articles, args.chunks, args.domains, args.days, args.topic_share,
+                      np.random.default_rng(42))
+        hours = args.days * 24
+        cases = [
+            ("counts by source",
+             lambda: python_by_source(db, "oil", hours),
+             lambda: db.count_articles_by('source', "oil", hours)),
+            ("daily histogram",
+             lambda: python_histogram(db, "oil", hours),
+             lambda: db.article_histogram('day', "oil", hours)),
+            ("share of voice + terms",
+             lambda: python_share_of_voice(db, "oil", hours),
+             lambda: db.share_of_voice("oil", hours)),
+        ]
+        results = []
+        for name, in_python, in_sql in cases:
+            (_, fetched), python_ms, python_peak = measure(in_python, args.repeat)
+            rows, sql_ms, sql_peak = measure(in_sql, args.repeat)
+            returned = len(rows['domains']) if isinstance(rows, dict) else len(rows)
+            results.append((name, python_ms, python_peak, fetched, sql_ms, sql_peak, returned))
+        db.close()
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+    print(f"{args.articles} articles x {args.chunks} chunks ({chunks} rows), {args.domains} domains, "
+          f"{args.days} days, {args.topic_share:.0%} matching")
+    print(f"{'aggregate':<24}{'python':>11}{'peak':>10}{'rows in':>9}{'sql':>11}{'peak':>10}{'rows out':>10}")
+    for name, python_ms, python_peak, fetched, sql_ms, sql_peak, returned in results:
+        print(f"{name:<24}{python_ms:>9.1f}ms{python_peak / 1e6:>8.1f}MB{fetched:>9}"
+              f"{sql_ms:>9.1f}ms{sql_peak / 1e6:>8.2f}MB{returned:>10}")
+
+
+if __name__ == '__main__':
+    main()
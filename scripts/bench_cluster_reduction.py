@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the reduction stage ahead of density clustering.
+
+Clusters a synthetic embedding set (topics plus unrelated one-offs, variance
+decaying across dimensions like text-embedding-3 vectors) with the /trends
+DBSCAN and the ClusteringService HDBSCAN, on raw vectors and after each
+reduction. Reports runtime (reduction included), peak traced memory, cluster
+count and agreement (adjusted Rand index) with the unreduced run and with the
+generating topics. No database needed.
+
+Usage: python scripts/bench_cluster_reduction.py [--articles 2000] [--dims 3072] [--topics 40]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+from sklearn.cluster import DBSCAN, HDBSCAN  # noqa: E402
+from sklearn.metrics import adjusted_rand_score  # noqa: E402
+
+from clustering_service import ClusterConfig  # noqa: E402
+from utils.reduction import VectorReducer  # noqa: E402
+
+
+def synthetic_embeddings(count, dims, topics, rng, noise_share=0.2):
+    scale = (1 + np.arange(dims) / 64) ** -0.5
+    centers = rng.standard_normal((topics, dims)) * scale
+    labels = rng.integers(0, topics, count)
+    X = centers[labels] + 0.5 * rng.standard_normal((count, dims)) * scale
+    noise = rng.random(count) < noise_share
+    X[noise] = rng.standard_normal((int(noise.sum()), dims)) * scale
+    labels[noise] = -1
+    return (X / np.linalg.norm(X, axis=1, keepdims=True)).astype(np.float32), labels
+
+
+def dbscan(X):
+    return DBSCAN(eps=0.30, min_samples=5, metric="cosine").fit_predict(X)
+
+
+def hdbscan(X):
+    config = ClusterConfig()
+    return HDBSCAN(min_cluster_size=config.min_cluster_size, min_samples=config.min_samples + 1,
+                   metric=config.metric).fit_predict(X)
+
+
+def measure(cluster, reducer, X):
+    tracemalloc.start()
+    started = time.perf_counter()
+    labels = cluster(reducer.transform(X) if reducer else X)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return labels, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--dims', type=int, default=3072)
+    parser.add_argument('--topics', type=int, default=40)
+    parser.add_argument('--components', type=int, nargs='+', default=[64, 128])
+    args = parser.parse_args()
+
+    X, truth = synthetic_embeddings(args.articles, args.dims, args.topics, np.random.default_rng(42))
+    print(f"{args.articles} articles x {args.dims} dims, {args.topics} topics, 20% one-offs")
+    print(f"{'clusterer':<10}{'vectors':<14}{'time':>10}{'peak mem':>12}{'clusters':>10}"
+          f"{'ARI raw':>9}{'ARI topics':>12}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, cluster in (('DBSCAN', dbscan), ('HDBSCAN', hdbscan)):
+            baseline = None
+            runs = [('raw', None)] + [
+                (f"{method} {k}", VectorReducer(method, k, cache_dir=cache_dir))
+                for method in ('random', 'pca') for k in args.components
+            ]
+            for label, reducer in runs:
+                if reducer is not None and reducer.method == 'pca':
+                    reducer.transform(X[:reducer.fit_sample])  # fit once; later runs reuse the cache
+                labels, elapsed, peak = measure(cluster, reducer, X)
+                if baseline is None:
+                    baseline = labels
+                clusters = len(set(labels)) - (1 if -1 in labels else 0)
+                print(f"{name:<10}{label:<14}{elapsed:>9.2f}s{peak / 1e6:>10.1f}MB{clusters:>10}"
+                      f"{adjusted_rand_score(baseline, labels):>9.3f}"
+                      f"{adjusted_rand_score(truth, labels):>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
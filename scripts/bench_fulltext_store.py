@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compressed fulltext store on a synthetic corpus.
+
+Loads the same corpus twice into scratch schemas (bodies inline, then bodies
+in fulltext_store) and reports table sizes and the latency of the chunking
+fetch (get_articles_ready_for_chunking). A share of the articles repeat an
+earlier body; those are handled as the worker does (marked duplicate).
+
+Usage: PG_DSN=... python scripts/bench_fulltext_store.py [--articles 5000] [--dup-share 0.3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import psycopg2  # noqa: E402
+
+from utils.text import compute_text_hash  # noqa: E402
+
+WORDS = (
+    "the of and to in a is that for on with as was by said it from at be his have has are an "
+    "government minister election market shares police court report president officials company "
+    "year percent week country people city state united economy prices talks military health "
+    "according statement spokesperson told reuters agency news sources investigation announced "
+    "billion million energy oil gas bank rates inflation growth trade tariffs security forces"
+).split()
+
+
+def synthetic_corpus(count, dup_share, rng):
+    """Article bodies of 300-1200 words; dup_share of them repeat an earlier body"""
+    bodies = []
+    for _ in range(count):
+        if bodies and rng.random() < dup_share:
+            bodies.append(rng.choice(bodies))
+            continue
+        paragraphs = []
+        for _ in range(rng.randint(6, 20)):
+            sentence_count = rng.randint(2, 5)
+            paragraphs.append(' '.join(
+                ' '.join(rng.choices(WORDS, k=rng.randint(8, 22))).capitalize() + '.'
+                for _ in range(sentence_count)
+            ))
+        bodies.append('\n\n'.join(paragraphs))
+    return bodies
+
+
+def schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+def load(dsn, schema, bodies, use_store):
+    os.environ['PG_DSN'] = schema_dsn(dsn, schema)
+    os.environ['FULLTEXT_STORE'] = 'true' if use_store else 'false'
+    from pg_client_new import PgClient
+    db = PgClient()
+    db.ensure_schema()
+    seen = set()
+    raw_rows = []
+    for n, body in enumerate(bodies):
+        text_hash = compute_text_hash(body)
+        # As in ArticleWorker: exact text duplicates are marked, not stored or indexed
+        duplicate = text_hash in seen
+        seen.add(text_hash)
+        raw_rows.append({
+            'url': f"https://example.com/{n}", 'url_hash': f"bench-{n}", 'source': 'example.com',
+            'title': f"Article {n}", 'full_text': None if duplicate else body, 'text_hash': text_hash,
+            'status': 'duplicate' if duplicate else 'stored',
+        })
+        if duplicate:
+            continue
+        db.upsert_article_index({
+            'url_hash': f"bench-{n}", 'text_hash': text_hash,
+            'title': f"Article {n}", 'author': '', 'source': 'example.com', 'article_id': f"bench-{n}",
+            'url': f"https://example.com/{n}", 'title_norm': f"article {n}", 'clean_text': body,
+            'language': 'en', 'category': None, 'tags_norm': [], 'published_at': None,
+            'ready_for_chunking': True,
+        })
+    for start in range(0, len(raw_rows), 500):
+        db.bulk_upsert_raw(raw_rows[start:start + 500])
+    return db
+
+
+def measure(db, rounds=30, batch=50):
+    with db._cursor() as cur:
+        cur.execute("VACUUM (FULL, ANALYZE) raw")
+        cur.execute("VACUUM (FULL, ANALYZE) articles_index")
+        cur.execute("VACUUM (FULL, ANALYZE) fulltext_store")
+        sizes = {}
+        for table in ('raw', 'articles_index', 'fulltext_store'):
+            cur.execute("SELECT pg_total_relation_size(%s)", (table,))
+            sizes[table] = cur.fetchone()[0]
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        rows = db.get_articles_ready_for_chunking(batch)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert rows and all(r['clean_text'] for r in rows)
+    return sizes, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--dup-share', type=float, default=0.3)
+    args = parser.parse_args()
+
+    dsn = os.environ['PG_DSN']
+    bodies = synthetic_corpus(args.articles, args.dup_share, random.Random(42))
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    results = {}
+    try:
+        for label, use_store in (('inline', False), ('fulltext_store', True)):
+            schema = f"bench_ft_{uuid.uuid4().hex[:8]}"
+            with admin.cursor() as cur:
+                cur.execute(f"CREATE SCHEMA {schema}")
+            try:
+                db = load(dsn, schema, bodies, use_store)
+                results[label] = measure(db)
+                db.close()
+            finally:
+                with admin.cursor() as cur:
+                    cur.execute(f"DROP SCHEMA {schema} CASCADE")
+    finally:
+        admin.close()
+
+    print(f"{args.articles} articles, {args.dup_share:.0%} repeated bodies")
+    print(f"{'layout':<16}{'raw':>12}{'index':>12}{'store':>12}{'total':>12}{'fetch p50':>12}")
+    for label, (sizes, latency) in results.items():
+        total = sum(sizes.values())
+        print(f"{label:<16}" + ''.join(f"{sizes[t] / 1e6:>10.1f}MB" for t in ('raw', 'articles_index', 'fulltext_store'))
+              + f"{total / 1e6:>10.1f}MB{latency:>10.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark ingest-time lexicon sentiment scoring.
+
+Builds a synthetic corpus of English and Russian articles (headline plus a
+body of filler words with planted positive or negative sentiment words, some
+negated) and scores every article the way ArticleWorker does. Reports
+throughput, per-article latency percentiles and how often the score's sign
+matches the planted polarity.
+
+Usage: python scripts/bench_ingest_sentiment.py [--articles 20000] [--words 600]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+
+from utils.sentiment import SENTIMENT_MAX_WORDS, score_sentiment, word_valence  # noqa: E402
+
+FILLER = {
+    'en': ["the", "company", "said", "on", "market", "report", "officials", "city", "year", "plan",
+           "minister", "according", "data", "week", "its", "statement", "region", "analysts"],
+    'ru': ["компания", "заявила", "в", "рынок", "отчет", "власти", "город", "год", "план",
+           "министр", "по", "данным", "неделе", "его", "заявлении", "регионе", "аналитики"],
+}
+POLAR = {
+    ('en', 1): ["growth", "gains", "strong", "recovery", "success", "rally", "improved", "optimism"],
+    ('en', -1): ["crisis", "losses", "plunge", "fears", "decline", "attack", "scandal", "collapse"],
+    ('ru', 1): ["рост", "прибыли", "успех", "улучшение", "поддержку", "надежды", "победа"],
+    ('ru', -1): ["кризис", "убытки", "падение", "угрозы", "скандал", "обвал", "санкции"],
+}
+NEGATOR = {'en': "not", 'ru': "не"}
+
+
+def make_article(lang, polarity, words, rng):
+    polar = POLAR[(lang, polarity)]
+    title = ' '.join(list(rng.choice(FILLER[lang], 4)) + [str(rng.choice(polar))])
+    body = list(rng.choice(FILLER[lang], words))
+    # Sentiment words spread through the body, a few of them negated
+    for pos in rng.choice(words, max(3, words // 60), replace=False):
+        body[pos] = str(rng.choice(polar))
+        if rng.random() < 0.1 and pos > 0:
+            body[pos - 1] = NEGATOR[lang]
+    return title, ' '.join(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--words', type=int, default=600, help='body words per article')
+    parser.add_argument('--ru-share', type=float, default=0.5, help='share of Russian articles')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    corpus = []
+    for _ in range(args.articles):
+        lang = 'ru' if rng.random() < args.ru_share else 'en'
+        polarity = 1 if rng.random() < 0.5 else -1
+        corpus.append((polarity, *make_article(lang, polarity, args.words, rng)))
+    total_bytes = sum(len(title.encode()) + len(body.encode()) for _, title, body in corpus)
+
+    word_valence.cache_clear()
+    latencies, correct = [], 0
+    started = time.perf_counter()
+    for polarity, title, body in corpus:
+        t0 = time.perf_counter()
+        score = score_sentiment(body, title)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        correct += (score > 0) == (polarity > 0)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    cache = word_valence.cache_info()
+    print(f"{args.articles} articles x {args.words} words ({args.ru_share:.0%} Russian, "
+          f"{total_bytes / 1e6:.1f}MB), body capped at {SENTIMENT_MAX_WORDS} words")
+    print(f"throughput:     {args.articles / elapsed:,.0f} articles/s ({total_bytes / 1e6 / elapsed:.1f}MB/s of input)")
+    print(f"latency:        median {statistics.median(latencies):.0f}us, "
+          f"p99 {latencies[int(0.99 * (len(latencies) - 1))]:.0f}us")
+    print(f"sign agreement: {correct / args.articles:.1%}")
+    print(f"lexicon cache:  {cache.currsize} words, hit rate {cache.hits / max(cache.hits + cache.misses, 1):.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark the /predict forecast signal: rolled-up volumes against raw articles.
+
+Loads a synthetic corpus into a scratch schema: topics whose coverage rises,
+falls or stays flat over the lookback, plus background articles, indexed
+through save_article_entities so the volume rollups fill as they would at
+ingest. For every topic, times and scores three ways to get its signal:
+
+- top-k FTS (before): the documents retrieval hands the forecaster, EWMA over
+  their publication days
+- raw aggregate: an hourly COUNT over articles_index matching the topic
+- rollups (after): one dense-series read from volume_rollups, EWMA per period
+
+Usage: PG_DSN=... python scripts/bench_predict_volumes.py [--topics 30] [--background 10000] [--window 1w]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import psycopg2  # noqa: E402
+from psycopg2.extras import execute_values  # noqa: E402
+
+from core.agents.trend_forecaster import (  # noqa: E402
+    VOLUME_CHANGE_THRESHOLD, compute_ewma, determine_direction, volume_lookback, volume_signal,
+)
+from utils.text import rollup_terms  # noqa: E402
+
+DIRECTIONS = ("up", "down", "flat")
+
+
+def schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+def publish_hours(direction, count, hours, rng):
+    """Hours ago for `count` articles whose rate rises, falls or stays flat over `hours`"""
+    u = rng.random(count)
+    if direction == "flat":
+        position = u
+    else:
+        # Rate grows linearly 1 -> 3 across the lookback (inverse CDF), mirrored for "down"
+        position = (np.sqrt(1 + 8 * u) - 1) / 2
+        if direction == "down":
+            position = 1 - position
+    return (1 - position) * hours
+
+
+def load(db, topics, background, hours, per_topic, rng):
+    now = datetime.now(timezone.utc)
+    rows, truth = [], {}
+    for t in range(topics):
+        direction = DIRECTIONS[t % 3]
+        name = f"topic{t} alpha{t}"
+        truth[name] = direction
+        for ago in publish_hours(direction, per_topic, hours, rng):
+            rows.append((f"{name} {rng.choice(['rises', 'talks', 'update', 'report'])}",
+                         now - timedelta(hours=float(ago)), f"topic{t}"))
+    for i in range(background):
+        rows.append((f"misc{i % 500} story{i}", now - timedelta(hours=float(rng.uniform(0, hours))), None))
+
+    articles, chunks = [], []
+    for i, (title, published, _) in enumerate(rows):
+        article_id = f"bench{i}"
+        articles.append((article_id, f"https://src{i % 20}.com/{article_id}", f"src{i % 20}.com",
+                         title, title, uuid.uuid4().hex, published, 'en'))
+        chunks.append((article_id, 1, 0, title, published, 'en', title))
+    with db._cursor() as cur:
+        execute_values(cur, """
+            INSERT INTO articles_index (article_id, url, source, title_norm, clean_text,
+                                        text_hash, published_at, language)
+            VALUES %s
+        """, articles, page_size=1000)
+        execute_values(cur, """
+            INSERT INTO article_chunks (article_id, processing_version, chunk_index, text,
+                                        published_at, language, fts_vector)
+            VALUES %s
+        """, chunks, template="(%s, %s, %s, %s, %s, %s, to_tsvector('english', %s))", page_size=1000)
+
+    # Entity index passes, as services/entity_index_service.py runs them
+    entities = {f"bench{i}": entity for i, (_, _, entity) in enumerate(rows) if entity}
+    while True:
+        pending = db.get_articles_pending_entities(limit=2000)
+        if not pending:
+            break
+        db.save_article_entities([
+            {
+                'index_id': a['index_id'], 'article_id': a['article_id'],
+                'entities': ([{'norm': entities[a['article_id']], 'name': entities[a['article_id']],
+                               'label': 'ORG', 'mentions': 1}] if a['article_id'] in entities else []),
+                'published_at': a['published_at'], 'source': a['source'],
+                'keywords': rollup_terms(a['title']),
+            }
+            for a in pending
+        ])
+    with db._cursor() as cur:
+        for table in ('articles_index', 'article_chunks', 'volume_rollups'):
+            cur.execute(f"VACUUM ANALYZE {table}")
+    return truth, len(rows)
+
+
+def topk_docs(db, topic, k, hours):
+    with db._cursor() as cur:
+        cur.execute("""
+            SELECT ac.article_id, ac.published_at
+            FROM article_chunks ac
+            WHERE ac.fts_vector @@ plainto_tsquery('english', %s)
+              AND ac.published_at >= NOW() - %s * INTERVAL '1 hour'
+            ORDER BY ts_rank_cd(ac.fts_vector, plainto_tsquery('english', %s)) DESC
+            LIMIT %s
+        """, (topic, hours, topic, k))
+        return cur.fetchall()
+
+
+def raw_hourly(db, topic, hours):
+    with db._cursor() as cur:
+        cur.execute("""
+            WITH hours AS (
+                SELECT generate_series(date_trunc('hour', NOW(), 'UTC') - (%s - 1) * INTERVAL '1 hour',
+                                       date_trunc('hour', NOW(), 'UTC'), INTERVAL '1 hour') AS hour
+            )
+            SELECT COALESCE(n, 0) FROM hours h
+            LEFT JOIN (
+                SELECT date_trunc('hour', published_at, 'UTC') AS hour, COUNT(*) AS n
+                FROM articles_index
+                WHERE published_at >= NOW() - %s * INTERVAL '1 hour'
+                  AND title_norm ILIKE %s
+                GROUP BY 1
+            ) c ON c.hour = h.hour
+            ORDER BY h.hour
+        """, (hours, hours, f"%{topic}%"))
+        return [row[0] for row in cur.fetchall()]
+
+
+def timed(fn, repeat):
+    result, times = None, []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--topics', type=int, default=30)
+    parser.add_argument('--per-topic', type=int, default=300)
+    parser.add_argument('--background', type=int, default=10000)
+    parser.add_argument('--window', default='1w')
+    parser.add_argument('--k', type=int, default=10, help='documents retrieval hands the forecaster')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    hours = volume_lookback(args.window)[0]
+    dsn = os.environ['PG_DSN']
+    schema = f"bench_pv_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        os.environ['PG_DSN'] = schema_dsn(dsn, schema)
+        os.environ.setdefault('HOT_TIER_ENABLED', 'false')
+        from database.production_db_client import ProductionDBClient
+        from core.history.volume_rollups import VolumeRollups
+
+        db = ProductionDBClient()
+        db.ensure_schema()
+        started = time.perf_counter()
+        truth, total = load(db, args.topics, args.background, hours, args.per_topic, np.random.default_rng(42))
+        load_s = time.perf_counter() - started
+
+        results = {name: {} for name in ('top-k FTS', 'raw aggregate', 'rollups')}
+        loop = asyncio.new_event_loop()
+        reader = VolumeRollups(os.environ['PG_DSN'])
+        for topic, expected in truth.items():
+            docs, ms = timed(lambda: topk_docs(db, topic, args.k, hours), args.repeat)
+            dates = [published for _, published in docs]
+            _, slope = compute_ewma(dates, alpha=0.3, periods=min(len(dates), 14))
+            results['top-k FTS'][topic] = (ms, determine_direction(slope, threshold=0.1) == expected)
+
+            hourly, ms = timed(lambda: raw_hourly(db, topic, hours), args.repeat)
+            change = volume_signal(hourly, args.window)[1]
+            results['raw aggregate'][topic] = (
+                ms, determine_direction(change, VOLUME_CHANGE_THRESHOLD) == expected)
+
+            def read():
+                return loop.run_until_complete(reader.topic_series(topic, hours))
+            read()  # pool warm-up
+            volume, ms = timed(read, args.repeat)
+            change = volume_signal(volume['hourly'], args.window)[1]
+            results['rollups'][topic] = (ms, determine_direction(change, VOLUME_CHANGE_THRESHOLD) == expected)
+        loop.run_until_complete(reader.close())
+        loop.close()
+        with db._cursor() as cur:
+            cur.execute("SELECT COUNT(*), pg_total_relation_size('volume_rollups') FROM volume_rollups")
+            rollup_rows, rollup_bytes = cur.fetchone()
+        db.close()
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+    print(f"{total} articles over {hours}h ({args.topics} topics x {args.per_topic}, "
+          f"{args.background} background), loaded and indexed in {load_s:.1f}s")
+    print(f"volume_rollups: {rollup_rows} rows, {rollup_bytes / 1e6:.1f}MB")
+    print(f"{'signal':<16}{'median read':>14}{'p95 read':>12}{'direction acc':>16}")
+    for name, per_topic in results.items():
+        times = sorted(ms for ms, _ in per_topic.values())
+        accuracy = sum(ok for _, ok in per_topic.values()) / len(per_topic)
+        print(f"{name:<16}{statistics.median(times):>12.2f}ms"
+              f"{times[int(0.95 * (len(times) - 1))]:>10.2f}ms{accuracy:>15.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark online trend clusters against the batch /trends rebuild.
+
+Loads a synthetic corpus into a scratch schema: embedded articles around a set
+of topics plus unrelated one-offs, published over the last day. Times the batch
+DBSCAN rebuild behind /trends (cache miss), the online service's initial
+backfill, an incremental pass over newly arrived articles, a maintenance pass,
+and the /trends read from the persisted cluster state. Cluster labels are timed
+both ways: a TF-IDF refit over the member texts and the term store lookup.
+
+Usage: PG_DSN=... python scripts/bench_trend_clustering.py [--articles 5000] [--dims 1536] [--topics 40]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import psycopg2  # noqa: E402
+from psycopg2.extras import execute_values  # noqa: E402
+
+
+def schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+def literal(vector):
+    return '[' + ','.join(f"{x:.6f}" for x in vector) + ']'
+
+
+class Corpus:
+    def __init__(self, dims, topics, rng, noise_share=0.2):
+        self.dims = dims
+        self.rng = rng
+        self.noise_share = noise_share
+        self.centers = rng.standard_normal((topics, dims))
+        self.centers /= np.linalg.norm(self.centers, axis=1, keepdims=True)
+        self.count = 0
+
+    def insert(self, db, count, max_hours=20.0):
+        now = datetime.now(timezone.utc)
+        articles, chunks = [], []
+        for _ in range(count):
+            self.count += 1
+            article_id = f"bench{self.count}"
+            if self.rng.random() < self.noise_share:
+                vector = self.rng.standard_normal(self.dims)
+                title = f"misc{self.count} story{self.count}"
+            else:
+                topic = int(self.rng.integers(len(self.centers)))
+                vector = self.centers[topic] + 0.25 / np.sqrt(self.dims) * self.rng.standard_normal(self.dims)
+                words = [f"topic{topic}word{j}" for j in self.rng.choice(8, 4, replace=False)]
+                title = ' '.join(words)
+            published = now - timedelta(hours=float(self.rng.uniform(0, max_hours)))
+            articles.append((article_id, f"https://example.com/{article_id}", 'example.com', title, title,
+                             uuid.uuid4().hex, published, 'en'))
+            text = literal(vector)
+            chunks.append((article_id, 1, 0, title, text, text))
+        with db._cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO articles_index (article_id, url, source, title_norm, clean_text,
+                                            text_hash, published_at, language)
+                VALUES %s
+            """, articles, page_size=500)
+            execute_values(cur, """
+                INSERT INTO article_chunks (article_id, processing_version, chunk_index, text,
+                                            embedding, embedding_vector)
+                VALUES %s
+            """, chunks, template="(%s, %s, %s, %s, %s, %s::vector)", page_size=500)
+
+
+def timed(fn, repeat=1):
+    result, times = None, []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--dims', type=int, default=1536)
+    parser.add_argument('--topics', type=int, default=40)
+    parser.add_argument('--incoming', type=int, default=200, help='articles arriving between passes')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    dsn = os.environ['PG_DSN']
+    schema = f"bench_tc_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        os.environ['PG_DSN'] = schema_dsn(dsn, schema)
+        os.environ.setdefault('HOT_TIER_ENABLED', 'false')
+        os.environ.setdefault('TREND_WINDOW_HOURS', '48')
+        from database.production_db_client import ProductionDBClient
+        from services.trend_cluster_service import TrendClusterService
+        from services.trends_service import TrendsService, article_text, cluster_keywords
+
+        db = ProductionDBClient()
+        db.ensure_schema()
+        with db._cursor() as cur:
+            cur.execute(f"ALTER TABLE article_chunks ADD COLUMN embedding_vector vector({args.dims})")
+        corpus = Corpus(args.dims, args.topics, np.random.default_rng(42))
+        corpus.insert(db, args.articles)
+        with db._cursor() as cur:
+            cur.execute("VACUUM ANALYZE article_chunks")
+            cur.execute("VACUUM ANALYZE articles_index")
+
+        trends = TrendsService(db, cache_ttl_seconds=0)
+        limit = args.articles + args.incoming
+        trends.online = False
+        batch, batch_ms = timed(lambda: trends.build_trends("24h", limit, 10), args.repeat)
+
+        service = TrendClusterService(db)
+        backfill, backfill_ms = timed(lambda: service.update(batch_size=limit))
+
+        corpus.insert(db, args.incoming, max_hours=0.5)
+        service.maintenance_seconds = 10 ** 9
+        incremental, incremental_ms = timed(lambda: service.update(batch_size=limit))
+        maintenance, maintenance_ms = timed(service.maintain)
+
+        live = [c.id for c in service.clusterer.clusters.values() if c.size >= service.clusterer.min_size]
+
+        def refit():
+            members = db.get_trend_members(live)
+            articles = db.get_trend_articles([m['article_id'] for m in members])
+            texts = {}
+            for m in members:
+                texts.setdefault(m['cluster_id'], []).append(article_text(articles[m['article_id']]))
+            return cluster_keywords(["\n".join(t) for t in texts.values()])
+
+        _, refit_ms = timed(refit, args.repeat)
+        _, lookup_ms = timed(lambda: db.get_trend_cluster_keywords(live, 8), args.repeat)
+
+        trends.online = True
+        online, online_ms = timed(lambda: trends.build_trends("24h", limit, 10), args.repeat)
+        trends.online = False
+        rebuilt, rebuild_ms = timed(lambda: trends.build_trends("24h", limit, 10), args.repeat)
+        with db._cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM trend_clusters WHERE size >= %s", (service.clusterer.min_size,))
+            online_clusters = cur.fetchone()[0]
+        db.close()
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+    print(f"{args.articles} articles (+{args.incoming} incoming) x {args.dims} dims, "
+          f"{args.topics} topics, 20% one-offs")
+    print(f"{'step':<36}{'time':>12}  notes")
+    print(f"{'batch rebuild (before)':<36}{batch_ms:>10.1f}ms  {len(batch['data'])} topics shown")
+    print(f"{'online backfill (first pass)':<36}{backfill_ms:>10.1f}ms  "
+          f"{backfill['assigned']} assigned, {backfill['clusters']} clusters")
+    print(f"{'online incremental pass':<36}{incremental_ms:>10.1f}ms  {incremental['assigned']} assigned")
+    print(f"{'online maintenance pass':<36}{maintenance_ms:>10.1f}ms  "
+          f"{maintenance['recentered']} recentered, {maintenance['split']} split, "
+          f"{maintenance['merged']} merged, {maintenance['relabeled']} relabeled")
+    print(f"{'labels: TF-IDF refit':<36}{refit_ms:>10.1f}ms  {len(live)} clusters")
+    print(f"{'labels: term store lookup':<36}{lookup_ms:>10.1f}ms  {len(live)} clusters")
+    print(f"{'/trends from online state':<36}{online_ms:>10.1f}ms  "
+          f"{online_clusters} clusters >= min size, {len(online['data'])} shown")
+    print(f"{'batch rebuild (after)':<36}{rebuild_ms:>10.1f}ms  {len(rebuilt['data'])} topics shown")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compact vector tier against exact embedding search.
+
+Loads a synthetic corpus into a scratch schema: 3072-dim vectors whose variance
+decays across dimensions (the Matryoshka layout of text-embedding-3 models),
+mixed with 768-dim local embeddings zero-padded to 3072. Reports recall@k
+against an exact scan, and median latency, for the exact scan, the compact
+ANN alone and the compact ANN with exact rerank.
+
+Usage: PG_DSN=... python scripts/bench_vector_tier.py [--chunks 10000] [--queries 100] [--k 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import psycopg2  # noqa: E402
+from psycopg2.extras import execute_values  # noqa: E402
+
+FULL_DIMS = 3072
+LOCAL_DIMS = 768
+
+
+def synthetic_corpus(count, rng, topics=200, local_share=0.5):
+    """Clustered vectors; a local_share of rows only use the leading 768 dims"""
+    scale = (1 + np.arange(FULL_DIMS) / 64) ** -0.5
+    centers = rng.standard_normal((topics, FULL_DIMS)) * scale
+    labels = rng.integers(0, topics, count)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((count, FULL_DIMS)) * scale
+    local = rng.random(count) < local_share
+    vectors[local, LOCAL_DIMS:] = 0.0
+    return vectors.astype(np.float32)
+
+
+def literal(vector):
+    return '[' + ','.join(f"{x:.6f}" for x in vector) + ']'
+
+
+def schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+def load(db, vectors):
+    with db._cursor() as cur:
+        cur.execute(f"ALTER TABLE article_chunks ALTER COLUMN embedding TYPE vector({FULL_DIMS}) "
+                    f"USING embedding::vector({FULL_DIMS})")
+        for start in range(0, len(vectors), 500):
+            execute_values(cur, """
+                INSERT INTO article_chunks (article_id, processing_version, chunk_index, text, embedding)
+                VALUES %s
+            """, [(f"a{start + n}", 1, 0, f"chunk {start + n}", literal(v))
+                  for n, v in enumerate(vectors[start:start + 500])])
+    kind = db.ensure_compact_embeddings()
+    after_id = 0
+    while True:
+        result = db.backfill_compact_embeddings(5000, after_id)
+        after_id = result['after_id']
+        if result['done']:
+            break
+    db.create_compact_embedding_index()
+    with db._cursor() as cur:
+        cur.execute("VACUUM ANALYZE article_chunks")
+        cur.execute("SELECT pg_relation_size('idx_chunks_embedding_compact')")
+        index_bytes = cur.fetchone()[0]
+    return kind, index_bytes
+
+
+def timed(fn, queries):
+    latencies, results = [], []
+    for q in queries:
+        started = time.perf_counter()
+        results.append(fn(q))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return results, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--chunks', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = synthetic_corpus(args.chunks, rng)
+    picks = rng.integers(0, args.chunks, args.queries)
+    queries = [list(vectors[i] + 0.3 * rng.standard_normal(FULL_DIMS).astype(np.float32) * (vectors[i] != 0))
+               for i in picks]
+
+    dsn = os.environ['PG_DSN']
+    schema = f"bench_vt_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        os.environ['PG_DSN'] = schema_dsn(dsn, schema)
+        from pg_client_new import PgClient
+        db = PgClient()
+        db.ensure_schema()
+        kind, index_bytes = load(db, vectors)
+        tier = db.get_compact_embedding_stats()
+
+        db.use_compact_vectors = False
+        exact, exact_ms = timed(lambda q: [r['id'] for r in db.search_chunks_embedding(q, args.k)], queries)
+        rows = {'exact scan': (1.0, exact_ms)}
+
+        for label, factor in (('compact ANN', 1), ('compact + rerank x4', 4), ('compact + rerank x10', 10)):
+            db.rerank_factor = factor
+            found, ms = timed(lambda q: [r['id'] for r in db._search_chunks_two_stage(q, q, args.k)], queries)
+            recall = statistics.mean(len(set(f) & set(e)) / args.k for f, e in zip(found, exact))
+            rows[label] = (recall, ms)
+        db.close()
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+    print(f"{args.chunks} chunks x {FULL_DIMS} dims, {args.queries} queries, "
+          f"compact tier {kind}({db.compact_dims})")
+    print(f"vector bytes: full {tier['full_bytes'] / 1e6:.1f}MB, compact {tier['compact_bytes'] / 1e6:.1f}MB, "
+          f"compact HNSW index {index_bytes / 1e6:.1f}MB")
+    print(f"{'search':<24}{'recall@' + str(args.k):>10}{'p50':>12}")
+    for label, (recall, ms) in rows.items():
+        print(f"{label:<24}{recall:>10.3f}{ms:>10.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
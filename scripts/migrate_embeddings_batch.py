@@ -2,228 +2,267 @@
 """
 Batch migrate embeddings from JSON to pgvector format
 
-This script migrates embeddings in small batches to avoid memory issues.
-Designed to work with Railway PostgreSQL memory constraints.
+Set-based and resumable: the id space of article_chunks (up to the max id at
+planning time) is split into one contiguous range per worker. Each worker
+keyset-pages its range and converts a whole batch with a single
+UPDATE ... SET embedding_vector = embedding::vector, committing the batch and
+its checkpoint (config table) together. Rerunning resumes from the checkpoints.
+
+Rows written after planning need no migration: update_chunk_embedding fills
+both columns. Concurrent live writes are safe because the UPDATE only touches
+rows whose embedding_vector is still NULL and re-checks that under the row lock.
 
 Usage:
-    python scripts/migrate_embeddings_batch.py [--batch-size 100] [--limit 1000]
+    python scripts/migrate_embeddings_batch.py [--batch-size 5000] [--workers 4]
+                                               [--limit N] [--sleep 0.0] [--reset]
 """
 
 import os
 import sys
 import json
+import time
 import logging
 import argparse
+import multiprocessing
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import psycopg2
 from dotenv import load_dotenv
 load_dotenv()
 
 from pg_client_new import PgClient
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-
-def migrate_batch(client: PgClient, chunk_ids: List[int]) -> Tuple[int, int]:
-    """Migrate a batch of embeddings from JSON to vector format"""
-
-    success_count = 0
-    error_count = 0
-
+PLAN_KEY = 'migration.embedding_vector.plan'
+RANGE_KEY = 'migration.embedding_vector.range.{}'
+
+
+def _vector_dims(client: PgClient) -> Optional[int]:
+    """Declared dimension of article_chunks.embedding_vector (None if the column is missing)"""
+    with client._cursor() as cur:
+        cur.execute("""
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = 'article_chunks'::regclass
+              AND attname = 'embedding_vector' AND NOT attisdropped
+        """)
+        row = cur.fetchone()
+    if not row:
+        return None
+    return row[0] if row[0] and row[0] > 0 else 0
+
+
+def plan_ranges(client: PgClient, workers: int, reset: bool = False) -> List[Tuple[int, int]]:
+    """Contiguous, disjoint (lo, hi] id ranges, one per worker; reuses a saved plan"""
+    saved = client.get_config(PLAN_KEY)
+    if saved and not reset:
+        plan = json.loads(saved)
+        if plan['workers'] != workers:
+            raise ValueError(f"Saved plan uses {plan['workers']} workers; rerun with "
+                             f"--workers {plan['workers']} or --reset")
+        return [tuple(r) for r in plan['ranges']]
+
+    with client._cursor() as cur:
+        cur.execute("SELECT COALESCE(MIN(id), 1) - 1, COALESCE(MAX(id), 0) FROM article_chunks")
+        low, high = cur.fetchone()
+    step = max(1, -(-(high - low) // workers))
+    ranges = [(low + i * step, min(high, low + (i + 1) * step)) for i in range(workers)]
+
+    with client._transaction() as cur:
+        cur.execute("DELETE FROM config WHERE k LIKE %s", (RANGE_KEY.format('%'),))
+        cur.execute("""
+            INSERT INTO config (k, v) VALUES (%s, %s)
+            ON CONFLICT (k) DO UPDATE SET v = EXCLUDED.v
+        """, (PLAN_KEY, json.dumps({'workers': workers, 'ranges': ranges, 'high_id': high})))
+    return ranges
+
+
+def load_progress(client: PgClient, index: int, lo: int) -> Dict[str, Any]:
+    saved = client.get_config(RANGE_KEY.format(index))
+    if saved:
+        return json.loads(saved)
+    return {'last_id': lo, 'migrated': 0, 'skipped': 0, 'done': False}
+
+
+def _migrate_rows_individually(client: PgClient, ids: List[int]) -> Tuple[int, int]:
+    """Fallback for a batch containing an unparsable embedding: convert row by row.
+    Only rows Postgres rejects as data are skipped; any other error propagates.
+    """
+    migrated = skipped = 0
+    for row_id in ids:
+        try:
+            with client._cursor() as cur:
+                cur.execute("""
+                    UPDATE article_chunks SET embedding_vector = embedding::vector
+                    WHERE id = %s AND embedding IS NOT NULL AND embedding_vector IS NULL
+                """, (row_id,))
+                migrated += cur.rowcount
+        except psycopg2.DataError as e:
+            logger.warning(f"Chunk {row_id}: cannot convert embedding ({str(e).splitlines()[0]})")
+            skipped += 1
+    return migrated, skipped
+
+
+def migrate_batch(client: PgClient, index: int, progress: Dict[str, Any], hi: int,
+                  batch_size: int, dims: int) -> int:
+    """Convert the next keyset page of a range; returns rows scanned (0 = range finished).
+
+    Rows whose embedding has the wrong number of elements are left alone and counted
+    as skipped; the page and its checkpoint commit in one transaction. Operational
+    errors (connection loss, statement or lock timeout) propagate without saving
+    progress, so a rerun retries the page.
+    """
+    after = progress['last_id']
+    params = {'after': after, 'hi': hi, 'limit': batch_size, 'dims': dims}
+    page_sql = """
+        WITH page AS (
+            SELECT id FROM article_chunks
+            WHERE id > %(after)s AND id <= %(hi)s
+            ORDER BY id
+            LIMIT %(limit)s
+        ), pending AS (
+            SELECT ac.id,
+                   %(dims)s = 0 OR LENGTH(ac.embedding) - LENGTH(REPLACE(ac.embedding, ',', '')) + 1
+                                     = %(dims)s AS dims_ok
+            FROM article_chunks ac JOIN page USING (id)
+            WHERE ac.embedding IS NOT NULL AND ac.embedding_vector IS NULL
+        ), converted AS (
+            UPDATE article_chunks ac
+            SET embedding_vector = ac.embedding::vector
+            FROM pending
+            WHERE ac.id = pending.id AND pending.dims_ok
+              AND ac.embedding IS NOT NULL AND ac.embedding_vector IS NULL
+            RETURNING ac.id
+        )
+        SELECT (SELECT MAX(id) FROM page),
+               (SELECT COUNT(*) FROM page),
+               (SELECT COUNT(*) FROM converted),
+               (SELECT COUNT(*) FROM pending WHERE NOT dims_ok)
+    """
     try:
+        with client._transaction() as cur:
+            cur.execute(page_sql, params)
+            last_id, scanned, migrated, skipped = cur.fetchone()
+            if scanned:
+                progress.update(last_id=last_id, migrated=progress['migrated'] + migrated,
+                                skipped=progress['skipped'] + skipped)
+            progress['done'] = scanned < batch_size
+            cur.execute("""
+                INSERT INTO config (k, v) VALUES (%s, %s)
+                ON CONFLICT (k) DO UPDATE SET v = EXCLUDED.v
+            """, (RANGE_KEY.format(index), json.dumps(progress)))
+        return scanned
+    except psycopg2.DataError as e:
+        # A malformed embedding aborts the set-based UPDATE: redo this page row by row
+        logger.warning(f"Range {index}: batch after id {after} failed ({str(e).splitlines()[0]}), "
+                       f"converting row by row")
         with client._cursor() as cur:
-            # Fetch embeddings for this batch
             cur.execute("""
-                SELECT id, embedding
-                FROM article_chunks
-                WHERE id = ANY(%s)
-                  AND embedding IS NOT NULL
-                  AND embedding_vector IS NULL
-            """, (chunk_ids,))
-
-            rows = cur.fetchall()
-
-            for row_id, embedding_json in rows:
-                try:
-                    # Parse JSON embedding
-                    if isinstance(embedding_json, str):
-                        embedding_list = json.loads(embedding_json)
-                    elif isinstance(embedding_json, list):
-                        embedding_list = embedding_json
-                    else:
-                        logger.warning(f"Chunk {row_id}: Unknown embedding format, skipping")
-                        error_count += 1
-                        continue
-
-                    # Auto-detect dimension (support 768, 1536, 3072)
-                    dim = len(embedding_list)
-                    if dim not in (768, 1536, 3072):
-                        logger.warning(f"Chunk {row_id}: Unsupported dimension {dim}")
-                        error_count += 1
-                        continue
-
-                    # Convert to pgvector format string
-                    vector_str = '[' + ','.join(str(float(x)) for x in embedding_list) + ']'
-
-                    # Update with vector
-                    cur.execute("""
-                        UPDATE article_chunks
-                        SET embedding_vector = %s::vector
-                        WHERE id = %s
-                    """, (vector_str, row_id))
-
-                    success_count += 1
-
-                except Exception as e:
-                    logger.error(f"Chunk {row_id}: Migration failed - {e}")
-                    error_count += 1
-                    continue
-
-    except Exception as e:
-        logger.error(f"Batch migration failed: {e}")
-        return success_count, error_count
-
-    return success_count, error_count
-
-
-def migrate_embeddings(batch_size: int = 100, limit: int = None):
-    """Migrate embeddings in batches"""
+                SELECT id FROM article_chunks WHERE id > %s AND id <= %s ORDER BY id LIMIT %s
+            """, (after, hi, batch_size))
+            ids = [r[0] for r in cur.fetchall()]
+        migrated, skipped = _migrate_rows_individually(client, ids)
+        progress.update(last_id=ids[-1] if ids else after, migrated=progress['migrated'] + migrated,
+                        skipped=progress['skipped'] + skipped, done=len(ids) < batch_size)
+        client.set_config(RANGE_KEY.format(index), json.dumps(progress))
+        return len(ids)
+
+
+def migrate_range(index: int, lo: int, hi: int, batch_size: int, limit: Optional[int] = None,
+                  sleep: float = 0.0) -> Dict[str, Any]:
+    """Worker entry point: page through one range until done or `limit` rows were scanned"""
+    client = PgClient()
+    try:
+        dims = _vector_dims(client) or 0
+        progress = load_progress(client, index, lo)
+        scanned_total = 0
+        while not progress['done'] and (limit is None or scanned_total < limit):
+            size = batch_size if limit is None else min(batch_size, limit - scanned_total)
+            scanned = migrate_batch(client, index, progress, hi, size, dims)
+            scanned_total += scanned
+            if sleep:
+                # Spread WAL and replication load for very large tables
+                time.sleep(sleep)
+        logger.info(f"Range {index} ({lo}, {hi}]: migrated {progress['migrated']}, "
+                    f"skipped {progress['skipped']}, at id {progress['last_id']}"
+                    f"{' (done)' if progress['done'] else ''}")
+        return progress
+    finally:
+        client.close()
+
+
+def _run_range(args):
+    return migrate_range(*args)
+
+
+def migrate_embeddings(batch_size: int = 5000, limit: int = None, workers: int = 1,
+                       sleep: float = 0.0, reset: bool = False) -> bool:
+    """Plan (or resume) the migration and run one process per range"""
 
     if not os.getenv('PG_DSN'):
         logger.error("PG_DSN environment variable not set")
         return False
 
+    client = PgClient()
     try:
-        client = PgClient()
-        logger.info("Connected to database")
-
-        # Check if embedding_vector column exists
-        with client._cursor() as cur:
-            cur.execute("""
-                SELECT COUNT(*)
-                FROM information_schema.columns
-                WHERE table_name = 'article_chunks'
-                  AND column_name = 'embedding_vector'
-            """)
-
-            if cur.fetchone()[0] == 0:
-                logger.error("embedding_vector column not found. Run step1 migration first:")
-                logger.error("  psql $PG_DSN -f infra/migrations/004_enable_pgvector_step1.sql")
-                return False
-
-        # Count total embeddings to migrate
-        with client._cursor() as cur:
-            cur.execute("""
-                SELECT COUNT(*)
-                FROM article_chunks
-                WHERE embedding IS NOT NULL
-                  AND embedding_vector IS NULL
-            """)
-            total_pending = cur.fetchone()[0]
-
-            cur.execute("""
-                SELECT COUNT(*)
-                FROM article_chunks
-                WHERE embedding_vector IS NOT NULL
-            """)
-            already_migrated = cur.fetchone()[0]
-
-        logger.info(f"📊 Migration status:")
-        logger.info(f"   Already migrated: {already_migrated}")
-        logger.info(f"   Pending: {total_pending}")
-
-        if total_pending == 0:
-            logger.info("✅ All embeddings already migrated!")
-            return True
-
-        # Apply limit if specified
-        if limit and limit < total_pending:
-            logger.info(f"⚠️ Limiting migration to {limit} embeddings (--limit {limit})")
-            total_to_migrate = limit
-        else:
-            total_to_migrate = total_pending
-
-        # Fetch IDs to migrate
-        with client._cursor() as cur:
-            cur.execute("""
-                SELECT id
-                FROM article_chunks
-                WHERE embedding IS NOT NULL
-                  AND embedding_vector IS NULL
-                ORDER BY id
-                LIMIT %s
-            """, (total_to_migrate,))
-
-            all_ids = [row[0] for row in cur.fetchall()]
-
-        logger.info(f"🚀 Starting migration of {len(all_ids)} embeddings (batch_size={batch_size})")
-
-        # Process in batches
-        total_success = 0
-        total_errors = 0
-
-        for i in range(0, len(all_ids), batch_size):
-            batch_ids = all_ids[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(all_ids) + batch_size - 1) // batch_size
-
-            logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch_ids)} chunks)...")
-
-            success, errors = migrate_batch(client, batch_ids)
-            total_success += success
-            total_errors += errors
-
-            if (batch_num % 10) == 0:
-                logger.info(f"Progress: {total_success}/{len(all_ids)} ({100*total_success//len(all_ids)}%)")
-
-        logger.info(f"✅ Migration complete!")
-        logger.info(f"   Migrated: {total_success}")
-        logger.info(f"   Errors: {total_errors}")
-        logger.info(f"   Total: {already_migrated + total_success}")
-
-        if total_errors > 0:
-            logger.warning(f"⚠️ {total_errors} embeddings failed to migrate")
-
-        # Final status
-        with client._cursor() as cur:
-            cur.execute("""
-                SELECT COUNT(*)
-                FROM article_chunks
-                WHERE embedding_vector IS NOT NULL
-            """)
-            final_count = cur.fetchone()[0]
-
-        logger.info(f"📊 Final count: {final_count} embeddings in pgvector format")
-
-        if total_pending > total_to_migrate:
-            remaining = total_pending - total_to_migrate
-            logger.info(f"💡 Run again to migrate remaining {remaining} embeddings")
-        else:
-            logger.info("💡 Next step: Create HNSW index")
-            logger.info("   psql $PG_DSN -f infra/migrations/004_enable_pgvector_step2.sql")
-
+        if _vector_dims(client) is None:
+            logger.error("embedding_vector column not found. Run step1 migration first:")
+            logger.error("  psql $PG_DSN -f infra/migrations/004_enable_pgvector_step1.sql")
+            return False
+        ranges = plan_ranges(client, workers, reset=reset)
+        pending = [(i, lo, hi) for i, (lo, hi) in enumerate(ranges)
+                   if not load_progress(client, i, lo)['done']]
+    finally:
+        client.close()
+
+    if not pending:
+        logger.info("✅ All embeddings already migrated!")
         return True
 
-    except Exception as e:
-        logger.error(f"Migration failed: {e}", exc_info=True)
-        return False
+    per_worker = -(-limit // len(pending)) if limit else None
+    jobs = [(i, lo, hi, batch_size, per_worker, sleep) for i, lo, hi in pending]
+    logger.info(f"🚀 Migrating {len(jobs)} range(s) (batch_size={batch_size})")
+    started = time.monotonic()
+    if len(jobs) == 1:
+        results = [_run_range(jobs[0])]
+    else:
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.map(_run_range, jobs)
+
+    migrated = sum(r['migrated'] for r in results)
+    skipped = sum(r['skipped'] for r in results)
+    logger.info(f"✅ Migrated {migrated} embeddings in {time.monotonic() - started:.1f}s "
+                f"({skipped} skipped: wrong dimension or unparsable)")
+    if all(r['done'] for r in results):
+        logger.info("💡 Next step: Create HNSW index")
+        logger.info("   psql $PG_DSN -f infra/migrations/004_enable_pgvector_step2.sql")
+    else:
+        logger.info("💡 Run again to continue from the saved checkpoints")
+    return True
 
 
 if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     parser = argparse.ArgumentParser(description='Batch migrate embeddings to pgvector')
-    parser.add_argument('--batch-size', type=int, default=100,
-                       help='Number of embeddings per batch (default: 100)')
+    parser.add_argument('--batch-size', type=int, default=5000,
+                       help='Rows per set-based UPDATE/commit (default: 5000)')
     parser.add_argument('--limit', type=int, default=None,
-                       help='Max embeddings to migrate (default: all)')
+                       help='Max rows to scan this run, across workers (default: all)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Parallel workers, each on its own id range (default: 1)')
+    parser.add_argument('--sleep', type=float, default=0.0,
+                       help='Pause between batches in seconds (default: 0)')
+    parser.add_argument('--reset', action='store_true',
+                       help='Discard saved checkpoints and plan again')
 
     args = parser.parse_args()
 
-    success = migrate_embeddings(batch_size=args.batch_size, limit=args.limit)
+    success = migrate_embeddings(batch_size=args.batch_size, limit=args.limit,
+                                 workers=args.workers, sleep=args.sleep, reset=args.reset)
     sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+"""
+Freshness-priority policy for the pending article backlog
+
+Pending rows (raw for the article worker, articles_index for chunking) carry a
+stored priority so stages dequeue newest/most important work first through an
+index instead of draining oldest first after an outage.
+
+The score is the log of an exponential freshness decay times source and retry
+factors:
+
+    log(exp(-age/tau) * weight * penalty^attempts)
+      = (published - now)/tau + ln(weight) - attempts * ln(1/penalty)
+
+``now`` is the same for every row at dequeue time, so ordering by the
+time-independent remainder is identical to ordering by the decayed score.
+That remainder is what gets stored and indexed (units: tau intervals).
+
+Rows without a publish date are treated as BACKLOG_UNDATED_AGE_HOURS old as
+of when they were first seen, so they neither jump ahead of fresh dated
+news nor sink to the bottom.
+
+A share of every batch is reserved for rows that have waited longer than
+BACKLOG_MAX_WAIT_HOURS (oldest first), so old items cannot starve.
+"""
+
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+
+def _parse_weights(raw: str) -> Dict[str, float]:
+    """'reuters.com=2,apnews.com=1.5' -> {domain: weight}"""
+    weights: Dict[str, float] = {}
+    for part in (raw or '').split(','):
+        domain, sep, value = part.partition('=')
+        if not sep:
+            continue
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if weight > 0:
+            weights[domain.strip().lower().lstrip('.')] = weight
+    return weights
+
+
+class BacklogPolicy:
+    """Priority score and batch split for pending work"""
+
+    def __init__(self):
+        self.tau_hours = float(os.getenv('BACKLOG_TAU_HOURS', '24'))
+        # Each failed attempt counts as this many tau intervals of extra age
+        self.retry_penalty = float(os.getenv('BACKLOG_RETRY_PENALTY', '0.5'))
+        self.source_weights = _parse_weights(os.getenv('BACKLOG_SOURCE_WEIGHTS', ''))
+        self.max_wait_hours = float(os.getenv('BACKLOG_MAX_WAIT_HOURS', '6'))
+        self.aged_share = float(os.getenv('BACKLOG_AGED_SHARE', '0.1'))
+        self.undated_age_hours = float(os.getenv('BACKLOG_UNDATED_AGE_HOURS', '24'))
+
+    def source_weight(self, source: Optional[str]) -> float:
+        """Configured weight for a domain or any parent domain (default 1.0)"""
+        host = (source or '').lower().rstrip('.')
+        if host.startswith('www.'):
+            host = host[4:]
+        while host:
+            if host in self.source_weights:
+                return self.source_weights[host]
+            if '.' not in host:
+                break
+            host = host.split('.', 1)[1]
+        return 1.0
+
+    def priority(self, published_at: Optional[datetime], source: Optional[str] = None,
+                 attempts: int = 0, now: Optional[datetime] = None,
+                 first_seen: Optional[datetime] = None) -> float:
+        """Stored priority (higher dequeues first)"""
+        now = now or datetime.now(timezone.utc)
+        if isinstance(published_at, datetime):
+            if published_at.tzinfo is None:
+                published_at = published_at.replace(tzinfo=timezone.utc)
+            # Future dates rank as "published now"
+            ts = min(published_at, now)
+        else:
+            if isinstance(first_seen, datetime) and first_seen.tzinfo is None:
+                first_seen = first_seen.replace(tzinfo=timezone.utc)
+            seen = min(first_seen, now) if isinstance(first_seen, datetime) else now
+            ts = seen - timedelta(hours=self.undated_age_hours)
+        score = ts.timestamp() / (self.tau_hours * 3600.0)
+        score += math.log(self.source_weight(source))
+        score -= max(0, attempts) * self.retry_penalty
+        return score
+
+    def split(self, limit: int) -> Tuple[int, int]:
+        """(aged, fresh) batch sizes: aged rows are served first, up to their share"""
+        if limit <= 1 or self.aged_share <= 0:
+            return 0, limit
+        aged = max(1, int(limit * self.aged_share))
+        return aged, limit - aged
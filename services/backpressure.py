@@ -0,0 +1,169 @@
+"""
+Backpressure from downstream stage backlogs to the RSS poller
+
+The poller inserts at a fixed cadence regardless of how far the worker,
+chunking and embedding stages are behind. This controller reads the stage
+queue depths before each poll and moves between three states:
+
+  normal     poll every active feed
+  throttled  poll high-priority feeds every run, low-priority feeds every Nth run
+  paused     poll high-priority feeds only
+
+A stage is over its soft limit when depth >= BACKPRESSURE_<STAGE>_SOFT and over
+its hard limit at BACKPRESSURE_<STAGE>_HARD. The state only steps back down once
+every stage is under BACKPRESSURE_RESUME_RATIO x its soft limit (hysteresis), so
+polling resumes automatically as the pipeline drains without flapping.
+State is kept in the config table because each poll run is a fresh process.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from services.backlog_priority import BacklogPolicy
+
+logger = logging.getLogger(__name__)
+
+STATE_NORMAL = 'normal'
+STATE_THROTTLED = 'throttled'
+STATE_PAUSED = 'paused'
+
+_LEVELS = {STATE_NORMAL: 0, STATE_THROTTLED: 1, STATE_PAUSED: 2}
+
+# Stage -> (default soft, default hard) queue depth
+STAGE_LIMITS = {
+    'raw_pending': (2000, 10000),
+    'chunking_pending': (2000, 10000),
+    'fts_pending': (20000, 100000),
+    'embedding_pending': (20000, 100000),
+}
+
+CONFIG_KEY = 'poller.backpressure'
+
+
+def get_throttle_state(db_client) -> Dict[str, Any]:
+    """Last saved throttle state ({} before the first evaluated poll)"""
+    try:
+        raw = db_client.get_config(CONFIG_KEY)
+        return json.loads(raw) if raw else {}
+    except Exception as e:
+        logger.warning(f"Failed to load backpressure state: {e}")
+        return {}
+
+
+class BackpressureController:
+    """Decides which feeds a poll run may fetch, from downstream queue depths"""
+
+    def __init__(self, db_client, policy: Optional[BacklogPolicy] = None):
+        self.db = db_client
+        self.enabled = os.getenv('BACKPRESSURE_ENABLED', 'true').lower() == 'true'
+        self.limits: Dict[str, Tuple[int, int]] = {
+            stage: (
+                int(os.getenv(f'BACKPRESSURE_{stage.upper()}_SOFT', str(soft))),
+                int(os.getenv(f'BACKPRESSURE_{stage.upper()}_HARD', str(hard))),
+            )
+            for stage, (soft, hard) in STAGE_LIMITS.items()
+        }
+        self.resume_ratio = float(os.getenv('BACKPRESSURE_RESUME_RATIO', '0.8'))
+        # While throttled, each low-priority feed is polled once every N runs
+        self.throttle_every = max(2, int(os.getenv('BACKPRESSURE_THROTTLE_EVERY', '4')))
+        # Feeds with an entry this recent, or a source weight above 1, are high priority
+        self.hot_feed_hours = float(os.getenv('BACKPRESSURE_HOT_FEED_HOURS', '6'))
+        self.policy = policy or BacklogPolicy()
+        self.state = STATE_NORMAL
+        self.reason = ''
+        self.depths: Dict[str, int] = {}
+        self.run_counter = 0
+
+    def _save(self):
+        try:
+            self.db.set_config(CONFIG_KEY, json.dumps({
+                'state': self.state,
+                'run': self.run_counter,
+                'reason': self.reason,
+                'depths': self.depths,
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+            }))
+        except Exception as e:
+            logger.warning(f"Failed to save backpressure state: {e}")
+
+    def _target_state(self, depths: Dict[str, int], previous: str) -> Tuple[str, str]:
+        """New state and the stage that drove it"""
+        hard = [s for s, d in depths.items() if d >= self.limits[s][1]]
+        if hard:
+            return STATE_PAUSED, ', '.join(f"{s}={depths[s]}" for s in hard)
+        soft = [s for s, d in depths.items() if d >= self.limits[s][0]]
+        if soft:
+            return STATE_THROTTLED, ', '.join(f"{s}={depths[s]}" for s in soft)
+
+        # Below every soft limit: step down one level once drained past the resume mark
+        draining = [s for s, d in depths.items() if d >= self.limits[s][0] * self.resume_ratio]
+        if previous != STATE_NORMAL and draining:
+            level = STATE_THROTTLED if previous == STATE_PAUSED else previous
+            return level, 'draining: ' + ', '.join(f"{s}={depths[s]}" for s in draining)
+        return STATE_NORMAL, ''
+
+    def evaluate(self) -> str:
+        """Read stage depths and update the throttle state"""
+        saved = get_throttle_state(self.db)
+        previous = saved.get('state') if saved.get('state') in _LEVELS else STATE_NORMAL
+        self.run_counter = int(saved.get('run') or 0) + 1
+
+        if not self.enabled:
+            self.state, self.reason, self.depths = STATE_NORMAL, 'disabled', {}
+            return self.state
+
+        try:
+            # Counts are capped at the hard limit: deeper queues cost nothing extra to detect
+            self.depths = self.db.get_stage_backlog(max(hard for _, hard in self.limits.values()))
+        except Exception as e:
+            # Never stop polling because the depth query failed
+            logger.warning(f"Backpressure depth check failed, polling normally: {e}")
+            self.state, self.reason, self.depths = STATE_NORMAL, f"depth check failed: {e}", {}
+            return self.state
+
+        self.state, self.reason = self._target_state(
+            {s: d for s, d in self.depths.items() if s in self.limits}, previous
+        )
+        if self.state != previous:
+            log = logger.warning if _LEVELS[self.state] > _LEVELS[previous] else logger.info
+            log(f"Poller backpressure {previous} -> {self.state}"
+                f"{f' ({self.reason})' if self.reason else ''}")
+        self._save()
+        return self.state
+
+    def is_high_priority(self, feed: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+        host = urlparse(feed.get('url') or '').hostname or ''
+        if self.policy.source_weight(host) > 1.0:
+            return True
+        last_entry = feed.get('last_entry_date')
+        if last_entry:
+            from rss.poller import parse_watermark
+            when = parse_watermark(last_entry)
+            now = now or datetime.now(timezone.utc)
+            if when and now - when <= timedelta(hours=self.hot_feed_hours):
+                return True
+        return False
+
+    def filter_feeds(self, feeds: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Feeds to poll this run under the current state, and how many were deferred"""
+        if self.state == STATE_NORMAL:
+            return feeds, 0
+        selected = []
+        for feed in feeds:
+            if self.is_high_priority(feed):
+                selected.append(feed)
+            elif self.state == STATE_THROTTLED and (int(feed['id']) + self.run_counter) % self.throttle_every == 0:
+                # Rotates with the run counter so every low-priority feed still gets polled
+                selected.append(feed)
+        return selected, len(feeds) - len(selected)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'reason': self.reason,
+            'depths': dict(self.depths),
+        }
@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pg_client_new import PgClient
 from services.chunking_service import ChunkingService
+from services.pipeline_events import PipelineListener, CHANNEL_CHUNKING_READY
 
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +35,8 @@ class ChunkContinuousService:
         self.db = db_client or PgClient()
         self.batch_size = int(os.getenv("CHUNK_CONTINUOUS_BATCH", "100"))
         self.chunker = ChunkingService(db_client=self.db)
+        # Woken by the article worker when articles become ready for chunking
+        self.listener = PipelineListener(getattr(self.db, 'dsn', None), [CHANNEL_CHUNKING_READY])
 
     def get_backlog_stats(self) -> Dict[str, Any]:
         """Get statistics about articles needing chunking using articles_index."""
@@ -135,9 +138,10 @@ class ChunkContinuousService:
             else:
                 logger.info("No articles need chunking, waiting...")
 
-            # Wait before next iteration
-            logger.info(f"Waiting {interval}s until next check...")
-            await asyncio.sleep(interval)
+            # Wait for a pipeline notification, or the interval as a fallback poll
+            logger.info(f"Waiting up to {interval}s for new work...")
+            if await self.listener.wait(interval):
+                logger.info("Woken by pipeline notification")
 
 
 def main():
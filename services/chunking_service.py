@@ -6,14 +6,17 @@ import os
 import sys
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+import psycopg2
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pg_client_new import PgClient
 from local_llm_chunker import LocalLLMChunker
+from services.pipeline_events import CHANNEL_CHUNKS_CREATED
 from config import load_config
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,8 @@ class ChunkingService:
         self.db = db_client or PgClient()
         self.chunker = LocalLLMChunker()
         self.enabled = os.getenv("ENABLE_LOCAL_CHUNKING", "true").lower() == "true"
+        # Max in-flight Ollama requests; deterministic fast-path articles don't count
+        self.llm_concurrency = max(1, int(os.getenv("CHUNK_LLM_CONCURRENCY", "2")))
 
     async def process_pending_chunks(self, batch_size: int = 10) -> Dict[str, Any]:
         """Process articles that need chunking"""
@@ -49,41 +54,116 @@ class ChunkingService:
             'successful': 0,
             'errors': 0,
             'total_chunks': 0,
+            'llm_chunked': 0,
+            'fast_path_chunked': 0,
             'error_details': []
         }
 
-        for article in articles:
+        # Chunk articles concurrently; only LLM calls are bounded by the semaphore.
+        # Created per pass because services may call us from different event loops.
+        llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        results = await asyncio.gather(
+            *(self._chunk_article(article, llm_slots) for article in articles),
+            return_exceptions=True
+        )
+
+        chunked = []
+        failed_ids = []
+        for article, result in zip(articles, results):
             stats['processed'] += 1
 
-            try:
-                result = await self._chunk_article(article)
-
-                if result['success']:
-                    stats['successful'] += 1
-                    stats['total_chunks'] += result['chunk_count']
-                else:
-                    stats['errors'] += 1
-                    stats['error_details'].append({
-                        'article_id': article['article_id'],
-                        'error': result['error']
-                    })
-
-            except Exception as e:
+            if isinstance(result, Exception):
                 stats['errors'] += 1
-                error_msg = f"Exception chunking article {article['article_id']}: {e}"
+                failed_ids.append(article.get('index_id'))
+                error_msg = f"Exception chunking article {article['article_id']}: {result}"
                 logger.error(error_msg)
                 stats['error_details'].append({
                     'article_id': article['article_id'],
-                    'error': str(e)
+                    'error': str(result)
+                })
+                continue
+
+            if result['success']:
+                chunked.append(result)
+            else:
+                stats['errors'] += 1
+                failed_ids.append(article.get('index_id'))
+                stats['error_details'].append({
+                    'article_id': article['article_id'],
+                    'error': result['error']
                 })
 
+        # Persist the whole pass in one transaction: a single multi-row upsert
+        # plus one completion UPDATE instead of two round-trips per article
+        if chunked:
+            failed_writes = self._save_chunks(chunked)
+            for result, error in failed_writes:
+                logger.error(f"Failed to save chunks for article {result['article_id']}: {error}")
+                stats['errors'] += 1
+                stats['error_details'].append({'article_id': result['article_id'], 'error': str(error)})
+                failed_ids.append(result.get('index_id'))
+            if failed_writes:
+                failed = {id(result) for result, _ in failed_writes}
+                chunked = [r for r in chunked if id(r) not in failed]
+
+        # Failed articles stay queued, behind fresher work, until they succeed
+        if any(i is not None for i in failed_ids):
+            try:
+                self.db.record_chunking_failures(failed_ids)
+            except Exception as e:
+                logger.warning(f"Failed to record chunking attempts: {e}")
+
+        for result in chunked:
+            stats['successful'] += 1
+            stats['total_chunks'] += result['chunk_count']
+            if result.get('strategy') == 'deterministic':
+                stats['fast_path_chunked'] += 1
+            else:
+                stats['llm_chunked'] += 1
+
         logger.info(f"Chunking complete: {stats['successful']}/{stats['processed']} successful, "
-                   f"{stats['total_chunks']} total chunks created")
+                   f"{stats['total_chunks']} total chunks created "
+                   f"(llm: {stats['llm_chunked']}, fast path: {stats['fast_path_chunked']})")
+
+        # New chunks need FTS vectors and embeddings; wake those stages
+        if stats['total_chunks'] > 0:
+            self.db.notify_pipeline(CHANNEL_CHUNKS_CREATED, stats['total_chunks'])
 
         return stats
 
-    async def _chunk_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
-        """Chunk a single article"""
+    def _save_chunks(self, results: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Exception]]:
+        """Write results with upsert_article_chunks_batch; a failed batch is
+        bisected until the bad articles are isolated, so the rest still land.
+        An OperationalError (lost connection, lock or statement timeout) is
+        not any one article's fault, so it fails everything not yet written.
+        Returns the (result, error) pairs that could not be written.
+        """
+        failed: List[Tuple[Dict[str, Any], Exception]] = []
+        pending = [results]
+        while pending:
+            batch = pending.pop()
+            try:
+                self.db.upsert_article_chunks_batch(batch)
+            except psycopg2.OperationalError as e:
+                remaining = [r for b in [batch] + pending for r in b]
+                logger.warning(f"Batch chunk write failed on the database, not bisecting "
+                               f"{len(remaining)} unwritten articles: {e}")
+                failed.extend((r, e) for r in remaining)
+                break
+            except Exception as e:
+                if len(batch) == 1:
+                    failed.append((batch[0], e))
+                    continue
+                logger.warning(f"Batch chunk write of {len(batch)} articles failed, bisecting: {e}")
+                mid = len(batch) // 2
+                pending.extend([batch[mid:], batch[:mid]])
+        return failed
+
+    async def _chunk_article(self, article: Dict[str, Any],
+                             llm_slots: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """Chunk a single article (LLM or deterministic fast path, per chunker policy).
+        Does not write; process_pending_chunks persists results in one batch.
+        """
         article_id = article['article_id']
 
         try:
@@ -102,8 +182,14 @@ class ChunkingService:
                 'source': article.get('source', '')
             }
 
-            # Create chunks using LLM
-            chunks = await self.chunker.create_chunks(content, metadata)
+            strategy = self.chunker.select_strategy(content, metadata)
+            if strategy == 'deterministic':
+                chunks = self.chunker.create_chunks_deterministic(content, metadata)
+            elif llm_slots is not None:
+                async with llm_slots:
+                    chunks = await self.chunker.create_chunks(content, metadata)
+            else:
+                chunks = await self.chunker.create_chunks(content, metadata)
 
             if not chunks:
                 return {'success': False, 'error': 'No chunks generated'}
@@ -120,17 +206,17 @@ class ChunkingService:
                     'tags_norm': article.get('tags_norm', []),
                 })
 
-            # Save chunks to database
-            processing_version = article.get('processing_version', 1)
-            self.db.upsert_article_chunks(article_id, processing_version, chunks)
-            self.db.mark_chunking_completed(article_id, processing_version)
-
-            logger.info(f"Successfully chunked article {article_id}: {len(chunks)} chunks")
+            logger.debug(f"Chunked article {article_id}: {len(chunks)} chunks ({strategy})")
 
+            # Chunks are written by the caller in one batch transaction
             return {
                 'success': True,
                 'chunk_count': len(chunks),
-                'article_id': article_id
+                'article_id': article_id,
+                'index_id': article.get('index_id'),
+                'processing_version': article.get('processing_version', 1),
+                'chunks': chunks,
+                'strategy': strategy
             }
 
         except Exception as e:
@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pg_client_new import PgClient
 from local_embedding_generator import LocalEmbeddingGenerator
+from services.pipeline_events import PipelineListener, CHANNEL_CHUNKS_CREATED
 from config import load_config
 
 logger = logging.getLogger(__name__)
@@ -239,18 +240,26 @@ class EmbeddingService:
             return False
 
     async def run_service_async(self, interval_seconds: int = 45):
-        """Run embedding service loop (async)."""
+        """Run embedding service loop (async).
+
+        Wakes as soon as the chunking stage announces new chunks; the interval
+        is only the fallback poll.
+        """
         logger.info(f"Starting embedding service with {interval_seconds}s interval")
-        while True:
-            try:
-                await self.process_pending_embeddings()
-                await asyncio.sleep(interval_seconds)
-            except KeyboardInterrupt:
-                logger.info("Embedding service stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in embedding service: {e}")
-                await asyncio.sleep(interval_seconds)
+        listener = PipelineListener(getattr(self.db, 'dsn', None), [CHANNEL_CHUNKS_CREATED])
+        try:
+            while True:
+                try:
+                    await self.process_pending_embeddings()
+                    await listener.wait(interval_seconds)
+                except KeyboardInterrupt:
+                    logger.info("Embedding service stopped by user")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in embedding service: {e}")
+                    await asyncio.sleep(interval_seconds)
+        finally:
+            listener.close()
 
     def run_service(self, interval_seconds: int = 45):
         """Synchronous wrapper to run the embedding service loop."""
@@ -0,0 +1,179 @@
+"""
+Entity index service: ingest-time NER for GraphRAG
+
+Extracts entities once per article and stores normalized entities,
+entity -> article postings and co-occurrence counts, so /graph can
+assemble graphs from the index instead of running NER per request.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from collections import Counter
+from typing import Dict, List, Any, Optional
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pg_client_new import PgClient
+from services.pipeline_events import PipelineListener, CHANNEL_CHUNKING_READY
+from core.nlp.ner_service import create_ner_service, normalize_entity_name, NERStrategy
+from utils.text import rollup_terms
+
+logger = logging.getLogger(__name__)
+
+# Labels that are not useful graph nodes
+SKIP_LABELS = {"DATE", "TIME", "MONEY", "PERCENT"}
+
+
+class EntityIndexService:
+    """Builds the persistent entity index from articles_index"""
+
+    def __init__(self, db_client: Optional[PgClient] = None, ner_service=None):
+        self.db = db_client or PgClient()
+        # No model router: ingest must never spend LLM budget (spaCy, then regex)
+        self.ner = ner_service or create_ner_service(model_router=None, prefer_strategy=NERStrategy.SPACY)
+        self.max_chars = int(os.getenv("ENTITY_INDEX_MAX_CHARS", "5000"))
+        self.max_per_article = int(os.getenv("ENTITY_INDEX_MAX_PER_ARTICLE", "30"))
+
+    def _article_text(self, article: Dict[str, Any]) -> str:
+        title = article.get('title') or ''
+        body = (article.get('clean_text') or '')[:self.max_chars]
+        return f"{title}\n{body}".strip()
+
+    def _aggregate(self, entities) -> List[Dict[str, Any]]:
+        """Aggregate NER mentions by normalized name (top N per article)"""
+        mentions: Counter = Counter()
+        first: Dict[str, Dict[str, Any]] = {}
+        for ent in entities:
+            if ent.label in SKIP_LABELS:
+                continue
+            norm = normalize_entity_name(ent.text)
+            if len(norm) < 2:
+                continue
+            mentions[norm] += 1
+            first.setdefault(norm, {'name': ent.text.strip(), 'label': ent.label.lower()})
+
+        return [
+            {'norm': norm, 'name': first[norm]['name'], 'label': first[norm]['label'], 'mentions': count}
+            for norm, count in mentions.most_common(self.max_per_article)
+        ]
+
+    async def extract_article_entities(self, article: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run NER on one article and aggregate mentions by normalized name"""
+        return (await self.extract_batch([article]))[0]
+
+    async def extract_batch(self, articles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Batched NER over articles (one extract_entities_batch call per language)"""
+        results: List[List[Dict[str, Any]]] = [[] for _ in articles]
+        by_lang: Dict[str, List[int]] = {}
+        for idx, article in enumerate(articles):
+            if self._article_text(article):
+                lang = (article.get('language') or 'en')[:2] or 'en'
+                by_lang.setdefault(lang, []).append(idx)
+
+        for lang, indices in by_lang.items():
+            texts = [self._article_text(articles[i]) for i in indices]
+            batch = await self.ner.extract_entities_batch(texts, lang=lang)
+            for idx, entities in zip(indices, batch):
+                results[idx] = self._aggregate(entities)
+        return results
+
+    async def process_pending(self, batch_size: int = 200) -> Dict[str, Any]:
+        """Extract entities for a batch of articles and store them in one transaction"""
+        articles = self.db.get_articles_pending_entities(batch_size)
+        if not articles:
+            logger.info("No articles pending entity extraction")
+            return {'processed': 0, 'successful': 0, 'errors': 0}
+
+        stats = {'processed': len(articles), 'successful': 0, 'errors': 0, 'postings': 0}
+        try:
+            extracted = await self.extract_batch(articles)
+        except Exception as e:
+            # Leave the batch pending; it is retried on the next pass
+            logger.error(f"Entity extraction failed for batch of {len(articles)}: {e}")
+            stats['errors'] = len(articles)
+            return stats
+
+        items = [
+            {
+                'index_id': article['index_id'],
+                'article_id': article['article_id'],
+                'entities': entities,
+                # Hourly volume and sentiment rollups (keywords from the headline)
+                'published_at': article.get('published_at'),
+                'source': article.get('source'),
+                'keywords': rollup_terms(article.get('title', '')),
+                'sentiment': article.get('sentiment'),
+            }
+            for article, entities in zip(articles, extracted)
+        ]
+
+        if items:
+            try:
+                result = self.db.save_article_entities(items)
+                stats['successful'] = len(items)
+                stats['postings'] = result.get('postings', 0)
+            except Exception as e:
+                stats['errors'] += len(items)
+                logger.error(f"Failed to save entity index batch: {e}")
+
+        logger.info(
+            f"Entity index: {stats['successful']}/{stats['processed']} articles, "
+            f"{stats['postings']} new postings, {stats['errors']} errors"
+        )
+        return stats
+
+    async def run_service(self, interval_seconds: int = 60, batch_size: int = 200):
+        """Run continuously, woken early when the worker stores new articles"""
+        logger.info(f"Starting entity index service with {interval_seconds}s interval")
+        listener = PipelineListener(getattr(self.db, 'dsn', None), [CHANNEL_CHUNKING_READY])
+
+        try:
+            while True:
+                try:
+                    stats = await self.process_pending(batch_size)
+                except Exception as e:
+                    logger.error(f"Error in entity index service: {e}")
+                    stats = {}
+                # Keep draining a backlog without waiting
+                if stats.get('processed', 0) >= batch_size and stats.get('successful'):
+                    continue
+                await listener.wait(interval_seconds)
+        except asyncio.CancelledError:
+            logger.info("Entity index service cancelled")
+            raise
+        finally:
+            listener.close()
+
+
+async def main():
+    """CLI entry point for entity index service"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='RSS News Entity Index Service')
+    parser.add_argument('command', choices=['index', 'service'], help='Command to run')
+    parser.add_argument('--batch-size', type=int, default=200, help='Articles per pass')
+    parser.add_argument('--interval', type=int, default=60, help='Service loop interval in seconds')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    service = EntityIndexService(PgClient())
+
+    if args.command == 'index':
+        result = await service.process_pending(args.batch_size)
+        print(f"Entity indexing complete: {result}")
+    else:
+        try:
+            await service.run_service(args.interval, args.batch_size)
+        except KeyboardInterrupt:
+            logger.info("Entity index service stopped by user")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
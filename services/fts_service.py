@@ -13,6 +13,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pg_client_new import PgClient
+from services.pipeline_events import PipelineListener, CHANNEL_CHUNKS_CREATED
 from config import load_config
 
 logger = logging.getLogger(__name__)
@@ -144,10 +145,11 @@ class FTSService:
             return {'processed': 0, 'successful': 0, 'errors': 1}
 
     async def run_service(self, interval_seconds: int = 60, batch_size: int = 100000):
-        """Run FTS service in a loop"""
+        """Run FTS service in a loop, woken early when new chunks are created"""
         logger.info(
             f"Starting FTS service with {interval_seconds}s interval and batch size {batch_size}"
         )
+        listener = PipelineListener(getattr(self.db, 'dsn', None), [CHANNEL_CHUNKS_CREATED])
 
         try:
             while True:
@@ -156,10 +158,12 @@ class FTSService:
                 except Exception as e:
                     logger.error(f"Error in FTS service: {e}")
 
-                await asyncio.sleep(interval_seconds)
+                await listener.wait(interval_seconds)
         except asyncio.CancelledError:
             logger.info("FTS service cancelled")
             raise
+        finally:
+            listener.close()
 
 
 
@@ -0,0 +1,495 @@
+"""
+In-process hot tier for recency-bounded search
+
+Most /ask and search traffic asks for the last 24-72 hours, yet every query goes
+to Postgres FTS and the vector scan over all of article_chunks. This tier keeps
+the chunks published in the last HOT_TIER_HOURS in memory, with their
+embedding_vector (a normalized float32 matrix) and their fts_vector lexemes (an
+inverted index), and answers window-bounded queries from there:
+
+  vector   same rows, filters and cosine ordering as
+           ProductionDBClient.search_with_time_filter
+  lexical  same matches and ts_rank_cd scores as PgClient.search_chunks_fts_ts
+           (plainto queries). Query text is turned into lexemes by Postgres'
+           plainto_tsquery once per distinct query (cached); document lexemes
+           come from the stored fts_vector, so matching is identical.
+
+A background thread refreshes the tier every HOT_TIER_REFRESH_SECONDS from
+chunks whose indexed_at moved (new FTS or embedding writes) and evicts chunks
+that aged out of the window. The tier stays under HOT_TIER_MAX_MB (estimated)
+by evicting the oldest chunks; windows reaching past what is held, stale tiers
+and unsupported queries return None and the caller falls back to the DB.
+
+One tier per process (get_hot_tier), shared by every ProductionDBClient and
+refreshed through its own PgClient.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ts_rank_cd default weights, indexed by label D, C, B, A (float4 constants in tsrank.c)
+RANK_WEIGHTS = tuple(float(np.float32(w)) for w in (0.1, 0.2, 0.4, 1.0))
+_WEIGHT_CODES = {'D': 0, 'C': 1, 'B': 2, 'A': 3}
+
+# Text search configs used by update_chunks_fts / search_chunks_fts_ts
+TS_CONFIGS = ('pg_catalog.russian', 'pg_catalog.english', 'pg_catalog.spanish', 'pg_catalog.simple')
+
+# Rows re-read on each refresh to cover commits that landed after the last one
+REFRESH_OVERLAP = timedelta(seconds=60)
+# Rows per fetch from the refresh's server-side cursor (newest first)
+REFRESH_FETCH_ROWS = 2000
+
+_QUOTED = re.compile(r"'((?:[^']|'')*)'")
+_TSVECTOR_ITEM = re.compile(r"'((?:[^']|'')*)'(?::([0-9A-D,]+))?")
+_POSITION = re.compile(r"(\d+)([A-D]?)")
+
+
+def ts_config_for(language: Optional[str]) -> str:
+    """Text search config chosen for a chunk language (mirrors the SQL CASE)"""
+    lang = (language or '').lower()
+    if lang.startswith('ru'):
+        return 'pg_catalog.russian'
+    if lang.startswith('en'):
+        return 'pg_catalog.english'
+    if lang.startswith('es'):
+        return 'pg_catalog.spanish'
+    return 'pg_catalog.simple'
+
+
+def _unescape(lexeme: str) -> str:
+    return lexeme.replace("''", "'").replace('\\\\', '\\')
+
+
+def parse_tsvector(text: Optional[str]) -> Dict[str, List[Tuple[int, int]]]:
+    """tsvector text output -> {lexeme: [(position, weight code)]}"""
+    lexemes = {}
+    for match in _TSVECTOR_ITEM.finditer(text or ''):
+        positions = [(int(pos), _WEIGHT_CODES[label or 'D'])
+                     for pos, label in _POSITION.findall(match.group(2) or '')]
+        lexemes[_unescape(match.group(1))] = positions
+    return lexemes
+
+
+def parse_and_tsquery(text: str) -> Optional[List[str]]:
+    """Lexemes of a tsquery made only of '&'-joined plain lexemes; None for anything else"""
+    if _QUOTED.sub('', text).strip(' &'):
+        return None
+    return list(dict.fromkeys(_unescape(m) for m in _QUOTED.findall(text)))
+
+
+def rank_cd(lexemes: Dict[str, List[Tuple[int, int]]], terms: List[str]) -> float:
+    """ts_rank_cd(fts_vector, query) for an AND query, normalization 0.
+
+    Port of calc_rank_cd/Cover from src/backend/utils/adt/tsrank.c: covers are
+    minimal spans holding every term, each adding (span items / sum of inverse
+    weights) / (1 + noise words). Returned as the float4 Postgres sends, i.e.
+    its shortest decimal form read back into a Python float.
+    """
+    doc = sorted((pos, weight, term) for term in terms for pos, weight in lexemes.get(term, ()))
+    if not doc or not terms:
+        return 0.0
+    needed = len(terms)
+    total = 0.0
+    start = 0
+    while start < len(doc):
+        seen: Set[str] = set()
+        end = None
+        for i in range(start, len(doc)):
+            seen.add(doc[i][2])
+            if len(seen) == needed:
+                end = i
+                break
+        if end is None:
+            break
+        seen = set()
+        begin = end
+        for i in range(end, start - 1, -1):
+            seen.add(doc[i][2])
+            if len(seen) == needed:
+                begin = i
+                break
+        p, q = doc[begin][0], doc[end][0]
+        inv_sum = sum(1.0 / RANK_WEIGHTS[doc[i][1]] for i in range(begin, end + 1))
+        noise = (q - p) - (end - begin)
+        if noise < 0:
+            noise = (end - begin) // 2
+        total += ((end - begin + 1) / inv_sum) / (1 + noise)
+        start = begin + 1
+    return float(str(np.float32(total)))
+
+
+@dataclass
+class HotChunk:
+    id: int
+    article_id: str
+    chunk_index: int
+    text: str
+    url: str
+    title_norm: str
+    source_domain: str
+    published_at: datetime
+    ts_config: str
+    lexemes: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+    vector: Optional[np.ndarray] = None
+    nbytes: int = 0
+
+
+def _estimate_bytes(chunk: HotChunk) -> int:
+    """Rough resident size: strings, vector, postings and per-object overhead"""
+    size = 400 + sum(sys.getsizeof(v) for v in (chunk.text, chunk.url, chunk.title_norm) if v)
+    size += sum(80 + 64 * len(positions) for positions in chunk.lexemes.values())
+    if chunk.vector is not None:
+        size += chunk.vector.nbytes + 112
+    return size
+
+
+class HotChunkTier:
+    """Recent chunks with vectors and a lexical index, answering windowed queries in memory"""
+
+    def __init__(self, db, hours: int = 72, max_bytes: int = 512 * 1024 * 1024,
+                 refresh_seconds: float = 30.0, query_cache_size: int = 1024):
+        self.db = db
+        self.hours = hours
+        self.max_bytes = max_bytes
+        self.refresh_seconds = refresh_seconds
+        self.query_cache_size = query_cache_size
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        self._chunks: Dict[int, HotChunk] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._matrix = None
+        self._query_lexemes: 'OrderedDict[str, Optional[Dict[str, List[str]]]]' = OrderedDict()
+        self._has_vectors: Optional[bool] = None
+        self._watermark: Optional[datetime] = None
+        self._window_start: Optional[datetime] = None
+        self._evicted_through: Optional[datetime] = None
+        self._refreshed_at: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, db) -> Optional['HotChunkTier']:
+        """Started tier when HOT_TIER_ENABLED=true, else None"""
+        if os.getenv('HOT_TIER_ENABLED', 'false').lower() != 'true':
+            return None
+        tier = cls(
+            db,
+            hours=int(os.getenv('HOT_TIER_HOURS', '72')),
+            max_bytes=int(float(os.getenv('HOT_TIER_MAX_MB', '512')) * 1024 * 1024),
+            refresh_seconds=float(os.getenv('HOT_TIER_REFRESH_SECONDS', '30')),
+        )
+        tier.start()
+        return tier
+
+    # Lifecycle
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='hot-tier-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Hot tier refresh failed: {e}")
+            self._stop.wait(self.refresh_seconds)
+
+    # Loading
+    def _detect_vectors(self, cur) -> bool:
+        cur.execute("""
+            SELECT 1 FROM pg_attribute
+            WHERE attrelid = 'article_chunks'::regclass
+              AND attname = 'embedding_vector' AND NOT attisdropped
+        """)
+        return cur.fetchone() is not None
+
+    def refresh(self) -> int:
+        """Load chunks indexed since the last refresh and evict aged-out ones; returns rows read.
+
+        Rows stream newest first through a server-side cursor, REFRESH_FETCH_ROWS
+        at a time. Once the budget is exceeded the oldest chunks are evicted and
+        reading stops at the eviction boundary, so memory stays within about
+        max_bytes plus one fetch however large the window is.
+        """
+        read = 0
+        with self.db._transaction() as cur:
+            if self._has_vectors is None:
+                self._has_vectors = self._detect_vectors(cur)
+            cur.execute("SELECT NOW()")
+            now = cur.fetchone()[0]
+            window_start = now - timedelta(hours=self.hours)
+            vector_col = "embedding_vector::text" if self._has_vectors else "NULL"
+            vector_cond = "OR embedding_vector IS NOT NULL" if self._has_vectors else ""
+            sql = f"""
+                SELECT id, article_id, chunk_index, text, url, title_norm, source_domain,
+                       published_at, language, fts_vector::text, {vector_col}
+                FROM article_chunks
+                WHERE published_at >= %s
+                  AND (fts_vector IS NOT NULL {vector_cond})
+            """
+            params: List[Any] = [window_start]
+            if self._watermark is not None:
+                sql += " AND indexed_at > %s"
+                params.append(self._watermark - REFRESH_OVERLAP)
+            sql += " ORDER BY published_at DESC"
+            stream = cur.connection.cursor(name='hot_tier_refresh')
+            try:
+                stream.execute(sql, params)
+                while True:
+                    rows = stream.fetchmany(REFRESH_FETCH_ROWS)
+                    if not rows:
+                        break
+                    read += len(rows)
+                    with self._lock:
+                        for row in rows:
+                            self._put(self._chunk_from_row(row))
+                        if self.bytes_used > self.max_bytes:
+                            self._evict(window_start)
+                        # Everything further down is at or before the boundary: not admitted
+                        if self._evicted_through is not None and rows[-1][7] <= self._evicted_through:
+                            break
+            finally:
+                stream.close()
+
+        with self._lock:
+            self._evict(window_start)
+            self._watermark = now
+            self._window_start = window_start
+            self._refreshed_at = now
+        logger.debug(f"Hot tier refreshed: {read} rows read, {len(self._chunks)} chunks, "
+                     f"{self.bytes_used / 1e6:.1f}MB")
+        return read
+
+    def _chunk_from_row(self, row) -> HotChunk:
+        (chunk_id, article_id, chunk_index, text, url, title_norm, source_domain,
+         published_at, language, fts_text, vector_text) = row
+        vector = None
+        if vector_text:
+            vector = np.array(vector_text[1:-1].split(','), dtype=np.float32)
+        chunk = HotChunk(
+            id=chunk_id, article_id=article_id, chunk_index=chunk_index, text=text, url=url,
+            title_norm=title_norm, source_domain=source_domain, published_at=published_at,
+            ts_config=ts_config_for(language), lexemes=parse_tsvector(fts_text), vector=vector,
+        )
+        chunk.nbytes = _estimate_bytes(chunk)
+        return chunk
+
+    def _put(self, chunk: HotChunk):
+        if self._evicted_through is not None and chunk.published_at <= self._evicted_through:
+            return
+        self._drop(chunk.id)
+        self._chunks[chunk.id] = chunk
+        for lexeme in chunk.lexemes:
+            self._postings.setdefault(lexeme, set()).add(chunk.id)
+        self.bytes_used += chunk.nbytes
+        self._matrix = None
+
+    def _drop(self, chunk_id: int):
+        old = self._chunks.pop(chunk_id, None)
+        if old is None:
+            return
+        for lexeme in old.lexemes:
+            ids = self._postings.get(lexeme)
+            if ids is not None:
+                ids.discard(chunk_id)
+                if not ids:
+                    del self._postings[lexeme]
+        self.bytes_used -= old.nbytes
+        self._matrix = None
+
+    def _evict(self, window_start: datetime):
+        """Drop chunks older than the window, then the oldest until under the memory budget"""
+        if self._evicted_through is not None and self._evicted_through < window_start:
+            self._evicted_through = None
+        for chunk_id in [c.id for c in self._chunks.values() if c.published_at < window_start]:
+            self._drop(chunk_id)
+        if self.bytes_used <= self.max_bytes:
+            return
+        by_age = sorted(self._chunks.values(), key=lambda c: c.published_at)
+        boundary = None
+        for chunk in by_age:
+            if self.bytes_used <= self.max_bytes and chunk.published_at != boundary:
+                break
+            boundary = chunk.published_at
+            self._drop(chunk.id)
+        self._evicted_through = boundary
+        logger.info(f"Hot tier over budget: evicted through {boundary}")
+
+    # Coverage
+    def covers(self, since: datetime) -> bool:
+        """True when every chunk published at/after `since` is held (and the tier is fresh)"""
+        with self._lock:
+            if self._window_start is None or since < self._window_start:
+                return False
+            if self._evicted_through is not None and since <= self._evicted_through:
+                return False
+            age = datetime.now(timezone.utc) - self._refreshed_at
+            return age <= timedelta(seconds=max(3 * self.refresh_seconds, 60))
+
+    def _vector_matrix(self):
+        if self._matrix is None:
+            chunks = [c for c in self._chunks.values() if c.vector is not None]
+            if chunks and len({c.vector.shape[0] for c in chunks}) == 1:
+                matrix = np.stack([c.vector for c in chunks])
+                norms = np.linalg.norm(matrix, axis=1)
+                keep = norms > 0
+                chunks = [c for c, k in zip(chunks, keep) if k]
+                matrix = matrix[keep] / norms[keep, None]
+            else:
+                chunks, matrix = [], np.zeros((0, 0), dtype=np.float32)
+            published = np.array([c.published_at.timestamp() for c in chunks], dtype=np.float64)
+            sources = np.array([c.source_domain for c in chunks], dtype=object)
+            self._matrix = (chunks, matrix, published, sources)
+        return self._matrix
+
+    # Queries
+    def search_vectors(self, query_embedding: List[float], hours: int, limit: int,
+                       sources: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Cosine top-`limit` over chunks published in the last `hours`; None if not covered"""
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        if not query_embedding or not self.covers(since):
+            self.misses += 1
+            return None
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        with self._lock:
+            chunks, matrix, published, source_arr = self._vector_matrix()
+            if not chunks or norm == 0 or matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            mask = published >= since.timestamp()
+            if sources:
+                mask &= np.isin(source_arr, list(sources))
+            idx = np.nonzero(mask)[0]
+            sims = matrix[idx] @ (query / norm)
+            if len(idx) > limit:
+                top = np.argpartition(-sims, limit - 1)[:limit]
+            else:
+                top = np.arange(len(idx))
+            top = top[np.argsort(-sims[top], kind='stable')]
+            results = []
+            for i in top:
+                chunk = chunks[idx[i]]
+                similarity = float(sims[i])
+                results.append({
+                    'id': chunk.id,
+                    'article_id': chunk.article_id,
+                    'chunk_index': chunk.chunk_index,
+                    'text': chunk.text,
+                    'url': chunk.url,
+                    'title_norm': chunk.title_norm,
+                    'title': chunk.title_norm,
+                    'source_domain': chunk.source_domain,
+                    'published_at': str(chunk.published_at) if chunk.published_at else None,
+                    'similarity': similarity,
+                    'semantic_score': similarity,
+                    'fts_score': 0.5
+                })
+        self.hits += 1
+        return results
+
+    def _lexemes_for(self, text: str) -> Optional[Dict[str, List[str]]]:
+        """plainto_tsquery lexemes per text search config (memoized)"""
+        with self._lock:
+            if text in self._query_lexemes:
+                self._query_lexemes.move_to_end(text)
+                return self._query_lexemes[text]
+        with self.db._cursor() as cur:
+            cur.execute("SELECT " + ", ".join(["plainto_tsquery(%s, %s)::text"] * len(TS_CONFIGS)),
+                        [v for cfg in TS_CONFIGS for v in (cfg, text)])
+            row = cur.fetchone()
+        parsed = {cfg: parse_and_tsquery(tsq) for cfg, tsq in zip(TS_CONFIGS, row)}
+        lexemes = None if any(v is None for v in parsed.values()) else parsed
+        with self._lock:
+            self._query_lexemes[text] = lexemes
+            while len(self._query_lexemes) > self.query_cache_size:
+                self._query_lexemes.popitem(last=False)
+        return lexemes
+
+    def search_lexical(self, plainto: str, since_days: int, limit: int,
+                       sources: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """plainto_tsquery matches ranked by ts_rank_cd, published in the last `since_days`"""
+        since = datetime.now(timezone.utc) - timedelta(days=since_days)
+        if not plainto or not self.covers(since):
+            self.misses += 1
+            return None
+        lexemes = self._lexemes_for(plainto)
+        if lexemes is None:
+            self.misses += 1
+            return None
+        source_set = set(sources) if sources else None
+        scored = []
+        with self._lock:
+            for cfg, terms in lexemes.items():
+                if not terms:
+                    continue
+                postings = sorted((self._postings.get(t, set()) for t in terms), key=len)
+                for chunk_id in set.intersection(*postings):
+                    chunk = self._chunks[chunk_id]
+                    if chunk.ts_config != cfg or chunk.published_at is None or chunk.published_at <= since:
+                        continue
+                    if source_set is not None and chunk.source_domain not in source_set:
+                        continue
+                    scored.append((rank_cd(chunk.lexemes, terms), chunk))
+        scored.sort(key=lambda item: (-item[0], item[1].id))
+        self.hits += 1
+        return [
+            {
+                'id': chunk.id, 'article_id': chunk.article_id, 'chunk_index': chunk.chunk_index,
+                'text': chunk.text, 'url': chunk.url, 'title_norm': chunk.title_norm,
+                'source_domain': chunk.source_domain, 'score': score,
+            }
+            for score, chunk in scored[:limit]
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'chunks': len(self._chunks),
+                'bytes': self.bytes_used,
+                'max_bytes': self.max_bytes,
+                'window_start': self._window_start,
+                'evicted_through': self._evicted_through,
+                'refreshed_at': self._refreshed_at,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_shared_tier: Optional[HotChunkTier] = None
+_shared_lock = threading.Lock()
+
+
+def get_hot_tier() -> Optional[HotChunkTier]:
+    """Process-wide tier shared by all ProductionDBClient instances (None when disabled)"""
+    global _shared_tier
+    if os.getenv('HOT_TIER_ENABLED', 'false').lower() != 'true':
+        return None
+    with _shared_lock:
+        if _shared_tier is None:
+            # Own client: the tier outlives whichever caller created it
+            from pg_client_new import PgClient
+            _shared_tier = HotChunkTier.from_env(PgClient())
+        return _shared_tier
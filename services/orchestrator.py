@@ -95,6 +95,7 @@ class OrchestratorService:
         lang: str = "auto",
         sources: Optional[List[str]] = None,
         k_final: int = 5,
+        explain: Optional[bool] = None,
         correlation_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Execute orchestrator /analyze flow for a given mode."""
@@ -122,6 +123,7 @@ class OrchestratorService:
                 lang=lang,
                 sources=sources,
                 k_final=k_final,
+                explain=explain,
             )
             payload = format_for_telegram(response)
             context = {
@@ -378,6 +380,7 @@ async def execute_analyze_command(
     lang: str = "auto",
     sources: Optional[List[str]] = None,
     k_final: int = 5,
+    explain: Optional[bool] = None,
     correlation_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Public helper used by Telegram bot to run /analyze."""
@@ -390,6 +393,7 @@ async def execute_analyze_command(
         lang=lang,
         sources=sources,
         k_final=k_final,
+        explain=explain,
         correlation_id=correlation_id,
     )
 
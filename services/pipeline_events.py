@@ -0,0 +1,135 @@
+"""
+Pipeline notification bus for RSS News System
+
+Stages NOTIFY on a Postgres channel when they produce work for the next stage,
+and downstream continuous services LISTEN so they wake up immediately instead
+of sleeping out a fixed interval. The interval is kept as a fallback poll, so
+a missed notification (listener reconnect, NOTIFY disabled) only costs latency.
+
+Channels:
+  - rssnews_raw_pending      poller inserted new rows into raw (status=pending)
+  - rssnews_chunking_ready   worker marked articles ready_for_chunking
+  - rssnews_chunks_created   chunking wrote chunks needing FTS/embeddings
+"""
+
+import os
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_RAW_PENDING = 'rssnews_raw_pending'
+CHANNEL_CHUNKING_READY = 'rssnews_chunking_ready'
+CHANNEL_CHUNKS_CREATED = 'rssnews_chunks_created'
+
+
+def notifications_enabled() -> bool:
+    """LISTEN/NOTIFY handoff can be switched off with PIPELINE_NOTIFY=false"""
+    return os.getenv("PIPELINE_NOTIFY", "true").lower() == "true"
+
+
+class PipelineListener:
+    """Wait for pipeline notifications with a polling-interval fallback.
+
+    Uses a dedicated (non-pooled) autocommit connection, since a LISTEN is
+    bound to the session that issued it.
+    """
+
+    def __init__(self, dsn: Optional[str], channels: Iterable[str], connection=None):
+        self.dsn = dsn
+        self.channels: List[str] = list(channels)
+        self.conn = connection
+        self.enabled = notifications_enabled() and bool(dsn or connection)
+        self.notifications_received = 0
+        self._listening = False
+
+    def _connect(self) -> bool:
+        """Open the LISTEN connection if needed. Returns False when unavailable."""
+        if self._listening and self.conn is not None:
+            return True
+        try:
+            if self.conn is None:
+                import psycopg2
+                from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+                self.conn = psycopg2.connect(self.dsn)
+                self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            cur = self.conn.cursor()
+            try:
+                for channel in self.channels:
+                    cur.execute(f"LISTEN {channel}")
+            finally:
+                cur.close()
+            self._listening = True
+            logger.info(f"Listening for pipeline notifications on {', '.join(self.channels)}")
+            return True
+        except Exception as e:
+            logger.warning(f"Pipeline LISTEN unavailable, falling back to polling: {e}")
+            self._reset()
+            return False
+
+    def _reset(self):
+        """Drop the connection; the next wait() reconnects."""
+        try:
+            if self.conn is not None:
+                self.conn.close()
+        except Exception:
+            pass
+        self.conn = None
+        self._listening = False
+
+    def _drain(self) -> int:
+        """Consume pending notifications, returning how many arrived"""
+        self.conn.poll()
+        count = len(self.conn.notifies)
+        if count:
+            del self.conn.notifies[:]
+            self.notifications_received += count
+        return count
+
+    async def wait(self, timeout: float) -> bool:
+        """Sleep until a notification arrives or `timeout` seconds pass.
+
+        Returns True if woken by a notification, False on timeout/fallback.
+        """
+        if not self.enabled or not self._connect():
+            await asyncio.sleep(timeout)
+            return False
+
+        loop = asyncio.get_running_loop()
+        woke = asyncio.Event()
+
+        def _on_readable():
+            try:
+                if self._drain():
+                    woke.set()
+            except Exception as e:
+                logger.warning(f"Pipeline listener connection lost: {e}")
+                loop.remove_reader(fd)
+                self._reset()
+                woke.set()
+
+        try:
+            # Notifications may already be buffered from a previous batch
+            if self._drain():
+                return True
+            fd = self.conn.fileno()
+            loop.add_reader(fd, _on_readable)
+        except Exception as e:
+            logger.warning(f"Pipeline listener failed, falling back to polling: {e}")
+            self._reset()
+            await asyncio.sleep(timeout)
+            return False
+
+        try:
+            await asyncio.wait_for(woke.wait(), timeout)
+            return self._listening
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if self._listening:
+                loop.remove_reader(fd)
+
+    def close(self):
+        """Close the LISTEN connection"""
+        self._reset()
@@ -19,6 +19,7 @@ from config import load_config
 from services.chunking_service import ChunkingService
 from services.fts_service import FTSService
 from services.embedding_service import EmbeddingService
+from services.pipeline_events import PipelineListener, CHANNEL_CHUNKING_READY, CHANNEL_CHUNKS_CREATED
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,13 @@ class ServiceManager:
             }
         }
 
+        # Upstream notification channel that wakes each service early
+        self.service_channels = {
+            'chunking': CHANNEL_CHUNKING_READY,
+            'fts': CHANNEL_CHUNKS_CREATED,
+            'embedding': CHANNEL_CHUNKS_CREATED,
+        }
+
     async def start_all_services(self):
         """Start all enabled services"""
         logger.info("Starting RSS News service manager")
@@ -94,21 +102,25 @@ class ServiceManager:
     async def _run_service(self, service_name: str, service, interval: int):
         """Run a single service in a loop"""
         logger.info(f"Service {service_name} started with {interval}s interval")
+        listener = PipelineListener(getattr(self.db, 'dsn', None), [self.service_channels[service_name]])
 
-        while self.running:
-            try:
-                if service_name == 'chunking':
-                    await service.process_pending_chunks(batch_size=self.chunking_batch_size)
-                elif service_name == 'fts':
-                    await service.update_fts_index(batch_size=self.fts_batch_size)
-                elif service_name == 'embedding':
-                    await service.process_pending_embeddings(batch_size=self.embedding_batch_size)
+        try:
+            while self.running:
+                try:
+                    if service_name == 'chunking':
+                        await service.process_pending_chunks(batch_size=self.chunking_batch_size)
+                    elif service_name == 'fts':
+                        await service.update_fts_index(batch_size=self.fts_batch_size)
+                    elif service_name == 'embedding':
+                        await service.process_pending_embeddings(batch_size=self.embedding_batch_size)
 
-                await asyncio.sleep(interval)
+                    await listener.wait(interval)
 
-            except Exception as e:
-                logger.error(f"Error in {service_name} service: {e}")
-                await asyncio.sleep(interval)
+                except Exception as e:
+                    logger.error(f"Error in {service_name} service: {e}")
+                    await asyncio.sleep(interval)
+        finally:
+            listener.close()
 
         logger.info(f"Service {service_name} stopped")
 
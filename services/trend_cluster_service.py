@@ -0,0 +1,494 @@
+"""
+Online trend clustering
+
+Keeps persistent topic clusters over the trend window instead of re-running
+DBSCAN per /trends request. Newly embedded articles join the most similar
+cluster centroid (cosine >= TREND_ASSIGN_SIMILARITY, the DBSCAN eps the batch
+path uses) or open a new one; articles published before the window are
+subtracted back out. A periodic maintenance pass recomputes the centroids of
+changed clusters from their members, splits clusters that separated into two
+topics, merges clusters whose centroids converged and relabels them.
+
+Labels come from rolling term statistics saved with the same transactions:
+each member's terms, their document frequency over the window and their count
+per cluster. Relabeling is a c-TF-IDF lookup over those, not a TF-IDF refit.
+
+Cluster ids are stable across passes, so a trend keeps its identity while it
+lives. /trends (TrendsService with TRENDS_ONLINE=true) only reads the stored
+state. Run a single instance: SERVICE_MODE=trends.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pg_client_new import PgClient
+from services.trends_service import article_terms, article_text
+
+logger = logging.getLogger(__name__)
+
+# 2-means iterations when testing a cluster for a split
+SPLIT_ITERATIONS = 10
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+@dataclass
+class TrendCluster:
+    id: int
+    total: np.ndarray  # sum of member unit vectors (float64)
+    size: int
+    label: Optional[str] = None
+    keywords: List[str] = field(default_factory=list)
+    dirty: bool = True    # not yet persisted
+    changed: bool = True  # membership changed since the last maintenance pass
+
+    @property
+    def centroid(self) -> np.ndarray:
+        return (self.total / self.size if self.size else self.total).astype(np.float32)
+
+
+class OnlineClusterer:
+    """Centroid clusters over unit vectors, updated one article at a time.
+
+    Unit centroids live in one float32 matrix, a row per cluster; the row of a
+    removed cluster is zeroed and reused, so similarities to it are 0 and it is
+    never picked. New clusters get negative ids until persisted (rename()).
+    """
+
+    def __init__(self, assign_similarity: float = 0.70, merge_similarity: float = 0.85,
+                 min_size: int = 5):
+        self.assign_similarity = assign_similarity
+        self.merge_similarity = merge_similarity
+        self.min_size = min_size
+        self.clusters: Dict[int, TrendCluster] = {}
+        self.deleted: Set[int] = set()  # persisted ids removed since the last save
+        self.dims: Optional[int] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._row_of: Dict[int, int] = {}
+        self._row_ids: List[Optional[int]] = []
+        self._free_rows: List[int] = []
+        self._next_temp_id = -1
+
+    # ---------------- rows ----------------
+    def _ensure_dims(self, dims: int):
+        if self.dims is None:
+            self.dims = dims
+            self._centroids = np.zeros((64, dims), dtype=np.float32)
+
+    def _attach(self, cluster: TrendCluster):
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._row_ids[row] = cluster.id
+        else:
+            row = len(self._row_ids)
+            if row == self._centroids.shape[0]:
+                grown = np.zeros((row * 2, self.dims), dtype=np.float32)
+                grown[:row] = self._centroids
+                self._centroids = grown
+            self._row_ids.append(cluster.id)
+        self._row_of[cluster.id] = row
+        self.clusters[cluster.id] = cluster
+        self._refresh_row(cluster)
+
+    def _refresh_row(self, cluster: TrendCluster):
+        self._centroids[self._row_of[cluster.id]] = _unit(cluster.total)
+
+    def _delete(self, cluster_id: int):
+        cluster = self.clusters.pop(cluster_id)
+        row = self._row_of.pop(cluster_id)
+        self._centroids[row] = 0.0
+        self._row_ids[row] = None
+        self._free_rows.append(row)
+        if cluster.id > 0:
+            self.deleted.add(cluster.id)
+
+    def _new_cluster(self, total: np.ndarray, size: int) -> TrendCluster:
+        cluster = TrendCluster(id=self._next_temp_id, total=total, size=size)
+        self._next_temp_id -= 1
+        self._attach(cluster)
+        return cluster
+
+    def _touch(self, cluster: TrendCluster):
+        cluster.dirty = cluster.changed = True
+        self._refresh_row(cluster)
+
+    # ---------------- updates ----------------
+    def accepts(self, vector: np.ndarray) -> bool:
+        return self.dims is None or len(vector) == self.dims
+
+    def add_cluster(self, cluster_id: int, centroid: np.ndarray, size: int,
+                    label: Optional[str] = None, keywords: Optional[List[str]] = None) -> TrendCluster:
+        """Restore a persisted cluster (centroid = mean of its member unit vectors)"""
+        self._ensure_dims(len(centroid))
+        cluster = TrendCluster(
+            id=cluster_id, total=np.asarray(centroid, dtype=np.float64) * size, size=size,
+            label=label, keywords=list(keywords or []), dirty=False, changed=False,
+        )
+        self._attach(cluster)
+        return cluster
+
+    def assign(self, vector: np.ndarray) -> int:
+        """Add one article vector; returns its cluster id"""
+        self._ensure_dims(len(vector))
+        unit = _unit(np.asarray(vector, dtype=np.float64))
+        if self.clusters:
+            sims = self._centroids[:len(self._row_ids)] @ unit.astype(np.float32)
+            row = int(np.argmax(sims))
+            if sims[row] >= self.assign_similarity:
+                cluster = self.clusters[self._row_ids[row]]
+                cluster.total += unit
+                cluster.size += 1
+                self._touch(cluster)
+                return cluster.id
+        return self._new_cluster(unit.copy(), 1).id
+
+    def remove(self, cluster_id: int, vector: Optional[np.ndarray]):
+        """Take an article out (aged out of the window). Without its vector only the
+        size drops; the centroid is corrected at the next maintenance pass."""
+        cluster = self.clusters.get(cluster_id)
+        if cluster is None:
+            return
+        cluster.size -= 1
+        if cluster.size <= 0:
+            self._delete(cluster_id)
+            return
+        if vector is not None and len(vector) == self.dims:
+            cluster.total -= _unit(np.asarray(vector, dtype=np.float64))
+        self._touch(cluster)
+
+    def recenter(self, cluster_id: int, vectors: np.ndarray):
+        """Exact centroid from the current member vectors (undoes incremental drift)"""
+        cluster = self.clusters[cluster_id]
+        if len(vectors) == 0:
+            self._delete(cluster_id)
+            return
+        cluster.total = _unit_rows(vectors.astype(np.float64)).sum(axis=0)
+        cluster.size = len(vectors)
+        cluster.dirty = True
+        self._refresh_row(cluster)
+
+    def split(self, cluster_id: int, vectors: np.ndarray) -> Optional[Tuple[int, np.ndarray]]:
+        """Spherical 2-means over a cluster's member vectors. When both halves hold at
+        least min_size articles and their centroids are less similar than the
+        assignment threshold, the smaller half becomes a new cluster:
+        returns (new cluster id, mask of the members that moved)."""
+        if len(vectors) < 2 * self.min_size:
+            return None
+        X = _unit_rows(vectors.astype(np.float64))
+        center = _unit(X.sum(axis=0))
+        a = X[int(np.argmin(X @ center))]
+        b = X[int(np.argmin(X @ a))]
+        to_b = None
+        for _ in range(SPLIT_ITERATIONS):
+            moved = (X @ b) > (X @ a)
+            if not moved.any() or moved.all():
+                return None
+            if to_b is not None and np.array_equal(moved, to_b):
+                break
+            to_b = moved
+            a, b = _unit(X[~to_b].sum(axis=0)), _unit(X[to_b].sum(axis=0))
+        if min(int(to_b.sum()), int((~to_b).sum())) < self.min_size or float(a @ b) >= self.assign_similarity:
+            return None
+        if to_b.sum() > (~to_b).sum():
+            to_b = ~to_b
+        cluster = self.clusters[cluster_id]
+        cluster.total = X[~to_b].sum(axis=0)
+        cluster.size = int((~to_b).sum())
+        self._touch(cluster)
+        new = self._new_cluster(X[to_b].sum(axis=0), int(to_b.sum()))
+        return new.id, to_b
+
+    def merge_close(self) -> Dict[int, int]:
+        """Merge clusters whose centroids reached merge_similarity; returns {absorbed: kept}.
+
+        Only pairs involving a changed cluster are compared: unchanged pairs
+        were already below the threshold at the previous pass.
+        """
+        candidates = [c.id for c in self.clusters.values() if c.changed]
+        if not candidates or len(self.clusters) < 2:
+            return {}
+        n = len(self._row_ids)
+        C = self._centroids[:n]
+        cand_rows = [self._row_of[cid] for cid in candidates]
+        S = C[cand_rows] @ C.T
+        # Free (zeroed) rows never match, whatever the threshold
+        free = [row for row, cid in enumerate(self._row_ids) if cid is None]
+        S[:, free] = -1.0
+        S[np.arange(len(cand_rows)), cand_rows] = -1.0
+        merged: Dict[int, int] = {}
+        while True:
+            r, col = divmod(int(np.argmax(S)), n)
+            if S[r, col] < self.merge_similarity:
+                break
+            first, second = self.clusters[self._row_ids[cand_rows[r]]], self.clusters[self._row_ids[col]]
+            # The bigger (then the longer persisted) cluster keeps its id
+            keep, gone = sorted((first, second), key=lambda c: (-c.size, c.id < 0, abs(c.id)))
+            keep.total += gone.total
+            keep.size += gone.size
+            merged[gone.id] = keep.id
+            gone_row = self._row_of[gone.id]
+            self._delete(gone.id)
+            self._touch(keep)
+            # Drop the absorbed cluster and refresh the kept cluster's similarities
+            free.append(gone_row)
+            kept_row = self._row_of[keep.id]
+            S[:, kept_row] = C[cand_rows] @ C[kept_row]
+            if kept_row in cand_rows:
+                S[cand_rows.index(kept_row)] = C @ C[kept_row]
+            else:
+                cand_rows.append(kept_row)
+                S = np.vstack([S, (C @ C[kept_row])[None, :]])
+            S[:, free] = -1.0
+            S[[i for i, row in enumerate(cand_rows) if row in free]] = -1.0
+            S[np.arange(len(cand_rows)), cand_rows] = -1.0
+        # Resolve chains (a -> b, b -> c) to the surviving cluster
+        for gone, keep in merged.items():
+            while keep in merged:
+                keep = merged[keep]
+            merged[gone] = keep
+        return merged
+
+    def rename(self, id_map: Dict[int, int]):
+        """Swap temporary ids for the ids assigned at save"""
+        for temp, real in id_map.items():
+            cluster = self.clusters.pop(temp, None)
+            if cluster is None:
+                continue
+            cluster.id = real
+            self.clusters[real] = cluster
+            row = self._row_of.pop(temp)
+            self._row_of[real] = row
+            self._row_ids[row] = real
+
+    def snapshot(self, cluster: TrendCluster) -> Dict[str, Any]:
+        return {'id': cluster.id, 'centroid': cluster.centroid.tobytes(), 'size': cluster.size,
+                'label': cluster.label, 'keywords': cluster.keywords}
+
+
+class TrendClusterService:
+    """Maintains trend_clusters / trend_cluster_members from newly embedded articles"""
+
+    def __init__(self, db_client: Optional[PgClient] = None, clusterer: Optional[OnlineClusterer] = None):
+        self.db = db_client or PgClient()
+        self.window_hours = int(os.getenv("TREND_WINDOW_HOURS", "72"))
+        self.maintenance_seconds = int(os.getenv("TREND_MAINTENANCE_SECONDS", "300"))
+        self.clusterer = clusterer or OnlineClusterer(
+            assign_similarity=float(os.getenv("TREND_ASSIGN_SIMILARITY", "0.70")),
+            merge_similarity=float(os.getenv("TREND_MERGE_SIMILARITY", "0.85")),
+            min_size=int(os.getenv("TREND_MIN_CLUSTER_SIZE", "5")),
+        )
+        self._loaded = False
+        self._last_maintenance = 0.0
+
+    def load(self):
+        """Restore clusters from the database (once per process)"""
+        for row in self.db.load_trend_clusters():
+            centroid = np.frombuffer(row['centroid'], dtype=np.float32)
+            self.clusterer.add_cluster(row['id'], centroid, row['size'], row['label'], row['keywords'])
+        self._loaded = True
+        logger.info(f"Trend clusterer loaded {len(self.clusterer.clusters)} clusters")
+
+    def _reset(self):
+        old = self.clusterer
+        self.clusterer = OnlineClusterer(old.assign_similarity, old.merge_similarity, old.min_size)
+        self._loaded = False
+
+    def _save(self, members: List[Dict[str, Any]] = (), removed: List[str] = (),
+              reassigned: Optional[Dict[int, int]] = None):
+        clusterer = self.clusterer
+        dirty = [clusterer.snapshot(c) for c in clusterer.clusters.values() if c.dirty]
+        try:
+            id_map = self.db.save_trend_state(dirty, sorted(clusterer.deleted), members, removed, reassigned)
+        except Exception:
+            # The in-memory clusters are ahead of the rolled-back state: drop
+            # them so the next pass reloads from the database
+            self._reset()
+            raise
+        clusterer.rename(id_map)
+        for cluster in clusterer.clusters.values():
+            cluster.dirty = False
+        clusterer.deleted.clear()
+
+    def update(self, batch_size: int = 500) -> Dict[str, Any]:
+        """Age out old members, assign newly embedded articles; maintenance when due"""
+        if not self._loaded:
+            self.load()
+        clusterer = self.clusterer
+        stats = {'assigned': 0, 'unclustered': 0, 'expired': 0, 'clusters_before': len(clusterer.clusters)}
+
+        expired = self.db.get_expired_trend_members(self.window_hours)
+        if expired:
+            vectors, found = self.db.load_embeddings([m['chunk_id'] for m in expired])
+            for member, vector, ok in zip(expired, vectors, found):
+                if member['cluster_id'] is not None:
+                    clusterer.remove(member['cluster_id'], vector if ok else None)
+            stats['expired'] = len(expired)
+
+        pending = self.db.get_articles_pending_trend_clustering(self.window_hours, batch_size)
+        members: List[Dict[str, Any]] = []
+        if pending:
+            vectors, found = self.db.load_embeddings([p['chunk_id'] for p in pending])
+            terms = self._terms([p['article_id'] for p in pending])
+            for article, vector, ok in zip(pending, vectors, found):
+                cluster_id = clusterer.assign(vector) if ok and clusterer.accepts(vector) else None
+                stats['assigned' if cluster_id is not None else 'unclustered'] += 1
+                members.append({**article, 'cluster_id': cluster_id, 'terms': terms[article['article_id']]})
+
+        # Members stored before term statistics were kept get their terms
+        expired_ids = {m['article_id'] for m in expired}
+        backfill = [m for m in self.db.get_trend_members_without_terms(batch_size)
+                    if m['article_id'] not in expired_ids]
+        if backfill:
+            terms = self._terms([m['article_id'] for m in backfill])
+            members.extend({**m, 'terms': terms[m['article_id']]} for m in backfill)
+            stats['terms_backfilled'] = len(backfill)
+
+        if members or expired or clusterer.deleted:
+            # Temporary ids in members are mapped to the new cluster ids at save
+            self._save(members, [m['article_id'] for m in expired])
+        stats['pending'] = len(pending)
+
+        if time.monotonic() - self._last_maintenance >= self.maintenance_seconds:
+            stats.update(self.maintain())
+        stats['clusters'] = len(clusterer.clusters)
+        return stats
+
+    def maintain(self) -> Dict[str, Any]:
+        """Recenter and split changed clusters, merge converged ones, relabel"""
+        self._last_maintenance = time.monotonic()
+        clusterer = self.clusterer
+        changed = [c.id for c in clusterer.clusters.values() if c.changed]
+        stats = {'recentered': 0, 'split': 0, 'merged': 0, 'relabeled': 0}
+        if not changed:
+            return stats
+
+        rows = self.db.get_trend_members(changed)
+        vectors, found = self.db.load_embeddings([m['chunk_id'] for m in rows])
+        by_cluster: Dict[int, List[int]] = {cid: [] for cid in changed}
+        for i, member in enumerate(rows):
+            if found[i] and (clusterer.dims is None or vectors.shape[1] == clusterer.dims):
+                by_cluster[member['cluster_id']].append(i)
+
+        moved: List[Dict[str, Any]] = []
+        for cid, idxs in by_cluster.items():
+            if cid not in clusterer.clusters:
+                continue
+            clusterer.recenter(cid, vectors[idxs])
+            stats['recentered'] += 1
+            result = clusterer.split(cid, vectors[idxs]) if cid in clusterer.clusters else None
+            if result:
+                new_id, mask = result
+                moved.extend({**rows[i], 'cluster_id': new_id} for i, m in zip(idxs, mask) if m)
+                stats['split'] += 1
+
+        merged = clusterer.merge_close()
+        stats['merged'] = len(merged)
+        for member in moved:
+            member['cluster_id'] = merged.get(member['cluster_id'], member['cluster_id'])
+
+        # Stored members of absorbed clusters follow them; split members move by article
+        self._save(moved, reassigned={gone: keep for gone, keep in merged.items() if gone > 0})
+        stats['relabeled'] = self._relabel()
+        if stats['relabeled']:
+            self._save()
+        for cluster in clusterer.clusters.values():
+            cluster.changed = False
+        logger.info(f"Trend maintenance: {stats}, {len(clusterer.clusters)} clusters")
+        return stats
+
+    def _terms(self, article_ids: List[str]) -> Dict[str, List[str]]:
+        articles = self.db.get_trend_articles(article_ids)
+        return {a: article_terms(article_text(articles[a])) if a in articles else [] for a in article_ids}
+
+    def _relabel(self) -> int:
+        """c-TF-IDF keywords from the term store for every cluster with min_size
+        members, when any of them changed (IDF moves with the window)"""
+        clusterer = self.clusterer
+        live = [c for c in clusterer.clusters.values() if c.size >= clusterer.min_size]
+        if not any(c.changed or c.label is None for c in live):
+            return 0
+        keywords = self.db.get_trend_cluster_keywords([c.id for c in live], topk=8)
+        relabeled = 0
+        for cluster in live:
+            if cluster.id not in keywords:
+                continue
+            label = ", ".join(keywords[cluster.id][:2])
+            if keywords[cluster.id] != cluster.keywords or label != cluster.label:
+                cluster.keywords, cluster.label = keywords[cluster.id], label
+                cluster.dirty = True
+                relabeled += 1
+        return relabeled
+
+    async def run_service(self, interval_seconds: int = 60, batch_size: int = 500):
+        """Run continuously; a full batch is followed straight away by the next one"""
+        logger.info(f"Starting trend cluster service with {interval_seconds}s interval, "
+                    f"{self.window_hours}h window")
+        try:
+            while True:
+                try:
+                    stats = await asyncio.to_thread(self.update, batch_size)
+                    logger.info(f"Trend clusters: {stats}")
+                except Exception as e:
+                    logger.error(f"Error in trend cluster service: {e}")
+                    stats = {}
+                if stats.get('pending', 0) >= batch_size:
+                    continue
+                await asyncio.sleep(interval_seconds)
+        except asyncio.CancelledError:
+            logger.info("Trend cluster service cancelled")
+            raise
+
+
+async def main():
+    """CLI entry point for the trend cluster service"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='RSS News Online Trend Clustering')
+    parser.add_argument('command', choices=['update', 'service'], help='Command to run')
+    parser.add_argument('--batch-size', type=int, default=500, help='Articles assigned per pass')
+    parser.add_argument('--interval', type=int, default=60, help='Service loop interval in seconds')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    service = TrendClusterService(PgClient())
+
+    if args.command == 'update':
+        # Drain everything pending, then one maintenance pass
+        while True:
+            result = service.update(args.batch_size)
+            print(f"Trend clustering pass: {result}")
+            if result['pending'] < args.batch_size:
+                break
+        print(f"Trend maintenance: {service.maintain()}")
+    else:
+        try:
+            await service.run_service(args.interval, args.batch_size)
+        except KeyboardInterrupt:
+            logger.info("Trend cluster service stopped by user")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,6 +4,7 @@ TrendsService: builds production-grade /trends payload using embeddings + cluste
 Design goals:
 - No heavy optional deps (HDBSCAN/KeyBERT); rely on sklearn + our LocalEmbeddingGenerator
 - Provide interpretable labels via TF-IDF over cluster texts (c-TF-IDF inspired)
+  (with TRENDS_ONLINE: term counts x IDF from the maintained term store, no refit)
 - Basic dynamics: hour buckets, momentum, simple burst heuristic
 - Cache results for a short TTL to keep /trends fast at runtime
 """
@@ -11,6 +12,7 @@ Design goals:
 from __future__ import annotations
 
 import math
+import os
 import time
 import logging
 from dataclasses import dataclass
@@ -23,11 +25,63 @@ import numpy as np
 
 from database.production_db_client import ProductionDBClient
 from local_embedding_generator import LocalEmbeddingGenerator
+from utils.reduction import VectorReducer
 
 
 logger = logging.getLogger(__name__)
 
 
+def article_text(article: Dict[str, Any]) -> str:
+    """Title plus the first line of the body (max 280 chars): the text trends are labeled from"""
+    title = (article.get("title_norm") or "").strip()
+    body = (article.get("clean_text") or "").strip()
+    if body:
+        body = body.split("\n")[0][:280]
+    text = (title + ". " + body).strip()
+    return text or title or ""
+
+
+# Same tokens (unigrams + bigrams, English stop words) as the TF-IDF fit below
+_analyze = TfidfVectorizer(ngram_range=(1, 2), stop_words="english").build_analyzer()
+
+
+def article_terms(text: str) -> List[str]:
+    """Terms of one article text, repeats kept (the per-article unit of the term store)"""
+    return _analyze(text) if text else []
+
+
+def rank_terms(counts: Dict[str, int], df: Dict[str, int], docs: int, topk: int = 6) -> List[str]:
+    """Top c-TF-IDF terms of a cluster: term count in the cluster x smoothed IDF over
+    the window's articles, ln((1 + docs) / (1 + df)) + 1; ties by term"""
+    def score(term: str) -> float:
+        return counts[term] * (math.log((1 + docs) / (1 + df.get(term, 0))) + 1)
+
+    return sorted(counts, key=lambda term: (-score(term), term))[:topk]
+
+
+def cluster_keywords(cluster_docs: List[str], topk: int = 6) -> List[List[str]]:
+    """Top TF-IDF terms per cluster document (one concatenated document per cluster)"""
+    if not cluster_docs:
+        return []
+    # TF-IDF over cluster documents approximates c-TF-IDF
+    vec = TfidfVectorizer(max_features=5000, ngram_range=(1, 2), stop_words="english")
+    try:
+        M = vec.fit_transform(cluster_docs)  # shape: [clusters, vocab]
+    except ValueError:  # empty vocabulary
+        return [[] for _ in cluster_docs]
+    feature_names = np.array(vec.get_feature_names_out())
+    keywords: List[List[str]] = []
+    for ridx in range(len(cluster_docs)):
+        row = M.getrow(ridx)
+        if row.nnz == 0:
+            keywords.append([])
+            continue
+        data = row.toarray().ravel()
+        idxs = np.argsort(-data)[:topk]
+        keywords.append([t for t in feature_names[idxs] if t.strip()])
+    return keywords
+
+
 @dataclass
 class TrendTopic:
     label: str
@@ -37,6 +91,7 @@ class TrendTopic:
     top_keywords: List[str]
     top_articles: List[Dict[str, Any]]
     score: float
+    cluster_id: Optional[int] = None
 
 
 class TrendsService:
@@ -46,6 +101,13 @@ class TrendsService:
         self.embedder = LocalEmbeddingGenerator()
         self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self.cache_ttl = cache_ttl_seconds
+        # Read clusters maintained by services/trend_cluster_service.py instead of re-clustering
+        self.online = os.getenv("TRENDS_ONLINE", "false").lower() == "true"
+        self.online_window_hours = int(os.getenv("TREND_WINDOW_HOURS", "72"))
+        self.online_min_size = int(os.getenv("TREND_MIN_CLUSTER_SIZE", "5"))
+        self.online_stale_seconds = int(os.getenv("TREND_STALE_SECONDS", "900"))
+        # Projection ahead of DBSCAN (CLUSTER_REDUCTION*)
+        self.reducer = VectorReducer()
 
     def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
         item = self._cache.get(key)
@@ -61,18 +123,24 @@ class TrendsService:
         self._cache[key] = (time.time(), value)
 
     # ----------------------- Data fetch -----------------------
-    def _fetch_articles_with_embeddings(self, hours: int, limit: int) -> List[Dict[str, Any]]:
-        """Fetch recent canonical articles with one representative chunk embedding each."""
+    def _fetch_articles_with_embeddings(
+        self, hours: int, limit: int
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """Fetch recent canonical articles with one representative chunk embedding each.
+
+        Returns (rows, embeddings, found): embeddings row i belongs to rows[i] and is
+        loaded in bulk by chunk id; found marks rows that actually have one.
+        """
         try:
             with self.db._cursor() as cur:
                 cur.execute(
                     """
                     SELECT ai.article_id, ai.url, ai.source,
                            ai.title_norm, ai.clean_text, ai.published_at,
-                           ac.embedding
+                           ai.text_hash, ac.id AS chunk_id
                     FROM articles_index ai
                     JOIN LATERAL (
-                        SELECT ac.embedding
+                        SELECT ac.id
                         FROM article_chunks ac
                         WHERE ac.article_id = ai.article_id AND ac.embedding IS NOT NULL
                         ORDER BY ac.chunk_index ASC
@@ -85,37 +153,32 @@ class TrendsService:
                     (int(hours), limit),
                 )
                 cols = [d[0] for d in cur.description]
-                return [dict(zip(cols, r)) for r in cur.fetchall()]
+                rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+            embeddings, found = self.db.load_embeddings([r["chunk_id"] for r in rows])
+            # Bodies moved to the compressed fulltext store come back by text_hash
+            if hasattr(self.db, 'hydrate_fulltext'):
+                rows = self.db.hydrate_fulltext(rows)
+            return rows, embeddings, found
         except Exception as e:
             logger.error(f"Failed to fetch articles with embeddings: {e}")
-            return []
+            return [], np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=bool)
 
     # ----------------------- Embeddings -----------------------
     def _prepare_texts(self, articles: List[Dict[str, Any]]) -> List[str]:
-        texts: List[str] = []
-        for a in articles:
-            title = (a.get("title_norm") or "").strip()
-            body = (a.get("clean_text") or "").strip()
-            if body:
-                body = body.split("\n")[0][:280]
-            text = (title + ". " + body).strip()
-            texts.append(text or title or "")
-        return texts
+        return [article_text(a) for a in articles]
 
     # ----------------------- Clustering -----------------------
-    def _cluster(self, embeddings: List[Optional[List[float]]]) -> np.ndarray:
-        X = np.array([e for e in embeddings if e is not None], dtype=float)
+    def _cluster(self, embeddings: np.ndarray, found: np.ndarray) -> np.ndarray:
+        X = embeddings[found]
         if X.size == 0:
             return np.array([])
-        # Map back to original indices (some embeddings may be None)
-        valid_idx = [i for i, e in enumerate(embeddings) if e is not None]
+        X = self.reducer.transform(X)
         # DBSCAN with cosine distance is a reasonable default without HDBSCAN
         db = DBSCAN(eps=0.30, min_samples=5, metric="cosine")
         labels = db.fit_predict(X)
-        # Build full label array aligned with input
-        full = -np.ones(len(embeddings), dtype=int)
-        for j, li in enumerate(labels):
-            full[valid_idx[j]] = int(li)
+        # Build full label array aligned with input (rows without an embedding stay noise)
+        full = -np.ones(len(found), dtype=int)
+        full[found] = labels
         return full
 
     # ----------------------- Labeling via c-TF-IDF-like -----------------------
@@ -125,27 +188,25 @@ class TrendsService:
         cluster_ids = sorted({int(l) for l in labels if l >= 0})
         if not cluster_ids:
             return {}
+        if self.online:
+            # Document frequencies from the term store the online clusterer maintains
+            counts: Dict[int, Dict[str, int]] = {cid: {} for cid in cluster_ids}
+            for text, l in zip(texts, labels):
+                if l >= 0:
+                    bucket = counts[int(l)]
+                    for term in article_terms(text):
+                        bucket[term] = bucket.get(term, 0) + 1
+            vocab = {term for bucket in counts.values() for term in bucket}
+            try:
+                docs, df = self.db.get_trend_term_df(sorted(vocab))
+            except Exception as e:
+                logger.warning(f"Trend term store unavailable, fitting TF-IDF: {e}")
+                docs = 0
+            if docs:
+                return {cid: rank_terms(counts[cid], df, docs, topk) for cid in cluster_ids}
         # Create corpus per cluster by concatenating cluster docs
-        cluster_docs: List[str] = []
-        id_map: List[int] = []
-        for cid in cluster_ids:
-            joined = "\n".join([texts[i] for i, l in enumerate(labels) if l == cid])
-            cluster_docs.append(joined)
-            id_map.append(cid)
-        # TF-IDF over cluster documents approximates c-TF-IDF
-        vec = TfidfVectorizer(max_features=5000, ngram_range=(1, 2), stop_words="english")
-        M = vec.fit_transform(cluster_docs)  # shape: [clusters, vocab]
-        feature_names = np.array(vec.get_feature_names_out())
-        top_per_cluster: Dict[int, List[str]] = {}
-        for ridx, cid in enumerate(id_map):
-            row = M.getrow(ridx)
-            if row.nnz == 0:
-                top_per_cluster[cid] = []
-                continue
-            data = row.toarray().ravel()
-            idxs = np.argsort(-data)[:topk]
-            top_per_cluster[cid] = [t for t in feature_names[idxs] if t.strip()]
-        return top_per_cluster
+        cluster_docs = ["\n".join([texts[i] for i, l in enumerate(labels) if l == cid]) for cid in cluster_ids]
+        return dict(zip(cluster_ids, cluster_keywords(cluster_docs, topk)))
 
     # ----------------------- Dynamics -----------------------
     def _hour_buckets(self, datetimes: List[datetime], hours: int) -> List[int]:
@@ -361,42 +422,25 @@ class TrendsService:
             payload = {"status": "error", "error": f"Invalid time window format: {window}"}
             return payload
 
+        if self.online and hours <= self.online_window_hours:
+            try:
+                payload = self._build_from_clusters(hours, topn)
+            except Exception as e:
+                logger.warning(f"Online trend read failed, rebuilding in batch: {e}")
+                payload = None
+            if payload is not None:
+                self._cache_set(cache_key, payload)
+                return payload
+
         # Fetch articles paired with an embedding from DB
-        rows = self._fetch_articles_with_embeddings(hours, limit)
+        rows, embeddings, found = self._fetch_articles_with_embeddings(hours, limit)
         if not rows:
             payload = {"status": "ok", "data": [], "errors": ["no_data"]}
             self._cache_set(cache_key, payload)
             return payload
 
-        # Prepare texts and parse embeddings
-        texts: List[str] = []
-        embs: List[Optional[List[float]]] = []
-        def _parse_embedding(val: Any) -> Optional[List[float]]:
-            try:
-                if val is None:
-                    return None
-                if isinstance(val, list):
-                    return [float(x) for x in val]
-                if isinstance(val, (bytes, bytearray, memoryview)):
-                    s = bytes(val).decode('utf-8', errors='ignore')
-                else:
-                    s = str(val)
-                s = s.strip()
-                if s.startswith('[') and s.endswith(']'):
-                    import json as _json
-                    return [float(x) for x in _json.loads(s)]
-                # Fallback: split by comma
-                if ',' in s:
-                    return [float(x.strip()) for x in s.strip('[]').split(',')]
-            except Exception:
-                return None
-            return None
-
-        for r in rows:
-            texts.append(self._prepare_texts([r])[0])
-            embs.append(_parse_embedding(r.get('embedding')))
-
-        labels = self._cluster(embs)
+        texts = self._prepare_texts(rows)
+        labels = self._cluster(embeddings, found)
         if labels.size == 0:
             payload = {"status": "ok", "data": [], "errors": ["no_embeddings"]}
             self._cache_set(cache_key, payload)
@@ -410,39 +454,47 @@ class TrendsService:
             label_to_indices.setdefault(int(l), []).append(i)
 
         # Generate labels (keywords) per cluster
-        cluster_keywords = self._label_clusters(texts, labels, topk=6)
+        keywords_by_cluster = self._label_clusters(texts, labels, topk=6)
 
         topics: List[TrendTopic] = []
         for cid, idxs in label_to_indices.items():
-            dt_list = [rows[i]["published_at"] for i in idxs if rows[i].get("published_at")]
-            series = self._hour_buckets(dt_list, min(hours, 48))
-            momentum, burst = self._momentum_and_burst(series)
             # pick showcase articles (top 3 most recent)
             showcase = sorted(
                 (rows[i] for i in idxs), key=lambda a: a.get("published_at") or datetime.min, reverse=True
             )[:3]
-            top_articles = [
-                {"title": (a.get("title_norm") or "").strip()[:140], "source": a.get("domain") or a.get("source"), "url": a.get("url")}
-                for a in showcase
-            ]
-            kws = cluster_keywords.get(cid, [])
-            label_txt = ", ".join(kws[:2]) if kws else "General"
-            topics.append(
-                TrendTopic(
-                    label=label_txt,
-                    count=len(idxs),
-                    momentum=round(float(momentum), 3),
-                    burst=burst,
-                    top_keywords=kws[:8],
-                    top_articles=top_articles,
-                    score=0.0,
-                )
+            topic = self._make_topic(
+                [rows[i].get("published_at") for i in idxs], hours, keywords_by_cluster.get(cid, [])
             )
+            topic.top_articles = self._showcase(showcase)
+            topics.append(topic)
 
-        ranked = self._rank(topics)
-        # Build payload
-        data = [
-            {
+        payload = self._payload(self._rank(topics), topn)
+        self._cache_set(cache_key, payload)
+        return payload
+
+    def _make_topic(self, published: List[Any], hours: int, keywords: List[str]) -> TrendTopic:
+        series = self._hour_buckets([dt for dt in published if dt], min(hours, 48))
+        momentum, burst = self._momentum_and_burst(series)
+        return TrendTopic(
+            label=", ".join(keywords[:2]) if keywords else "General",
+            count=len(published),
+            momentum=round(float(momentum), 3),
+            burst=burst,
+            top_keywords=keywords[:8],
+            top_articles=[],
+            score=0.0,
+        )
+
+    def _showcase(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {"title": (a.get("title_norm") or "").strip()[:140], "source": a.get("domain") or a.get("source"), "url": a.get("url")}
+            for a in articles
+        ]
+
+    def _payload(self, ranked: List[TrendTopic], topn: int) -> Dict[str, Any]:
+        data = []
+        for t in ranked[:topn]:
+            item = {
                 "label": t.label,
                 "count": t.count,
                 "momentum": t.momentum,
@@ -450,12 +502,43 @@ class TrendsService:
                 "top_keywords": t.top_keywords,
                 "top_articles": t.top_articles,
             }
-            for t in ranked[:topn]
-        ]
+            if t.cluster_id is not None:
+                item["cluster_id"] = t.cluster_id
+            data.append(item)
+        return {"status": "ok", "data": data, "errors": []}
+
+    def _build_from_clusters(self, hours: int, topn: int) -> Optional[Dict[str, Any]]:
+        """Trends from the online cluster state; None when it is missing or stale"""
+        age = self.db.get_trend_state_age()
+        if age is None or age > self.online_stale_seconds:
+            logger.info(f"Online trend state unavailable (age={age}), rebuilding in batch")
+            return None
+        members = self.db.get_trend_window_members(hours, self.online_min_size)
+        if not members:
+            return {"status": "ok", "data": [], "errors": ["no_data"]}
 
-        payload = {"status": "ok", "data": data, "errors": []}
-        self._cache_set(cache_key, payload)
-        return payload
+        by_cluster: Dict[int, List[Dict[str, Any]]] = {}
+        for m in members:
+            by_cluster.setdefault(m["cluster_id"], []).append(m)
+        topics: List[TrendTopic] = []
+        for cid, group in by_cluster.items():
+            topic = self._make_topic([m["published_at"] for m in group], hours, group[0]["keywords"])
+            if group[0]["label"]:
+                topic.label = group[0]["label"]
+            topic.cluster_id = cid
+            topics.append(topic)
+
+        ranked = self._rank(topics)[:topn]
+        # Showcase articles only for the topics shown
+        recent = {
+            t.cluster_id: [m["article_id"] for m in sorted(
+                by_cluster[t.cluster_id], key=lambda m: m["published_at"], reverse=True)[:3]]
+            for t in ranked
+        }
+        articles = self.db.get_trend_articles([a for ids in recent.values() for a in ids])
+        for t in ranked:
+            t.top_articles = self._showcase([articles[a] for a in recent[t.cluster_id] if a in articles])
+        return self._payload(ranked, topn)
 
     def format_trends_markdown(self, payload: Dict[str, Any], window: str = "24h") -> str:
         if payload.get("status") != "ok" or not payload.get("data"):
@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pg_client_new import PgClient
 from worker import ArticleWorker
+from services.pipeline_events import PipelineListener, CHANNEL_RAW_PENDING
 
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +40,8 @@ class WorkContinuousService:
             batch_size=self.batch_size,
             max_workers=self.max_workers
         )
+        # Woken by the poller when new raw articles are queued
+        self.listener = PipelineListener(getattr(self.db, 'dsn', None), [CHANNEL_RAW_PENDING])
 
     def get_backlog_stats(self) -> Dict[str, Any]:
         """Get statistics about pending articles"""
@@ -136,9 +139,10 @@ class WorkContinuousService:
             else:
                 logger.info("No pending articles, waiting...")
 
-            # Wait before next iteration
-            logger.info(f"Waiting {interval}s until next check...")
-            await asyncio.sleep(interval)
+            # Wait for a pipeline notification, or the interval as a fallback poll
+            logger.info(f"Waiting up to {interval}s for new work...")
+            if await self.listener.wait(interval):
+                logger.info("Woken by pipeline notification")
 
 
 def main():
@@ -0,0 +1,113 @@
+"""
+Analytics aggregates against a local Postgres: grouped counts, histograms and
+share of voice computed in SQL match counting the same articles in Python
+"""
+
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+# (article_id, domain, title, language, hours before the current UTC day)
+ARTICLES = [
+    ("a1", "www.wire.com", "Oil prices climb after output talks", "en", 2),
+    ("a2", "wire.com", "Oil output talks stall", "en", 26),
+    ("a3", "daily.com", "Refinery strike lifts oil prices", "en", 3),
+    ("a4", "daily.com", "Football final draws record crowd", "en", 4),
+    ("a5", "noticias.es", "Suben los precios del crudo", "es", 5),
+    ("a6", "tiny.org", "Oil market outlook", "en", 50),
+    ("a7", "wire.com", "Oil outlook from a year ago", "en", 24 * 40),
+]
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"analytics_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("HOT_TIER_ENABLED", "false")
+
+    from database.production_db_client import ProductionDBClient
+    client = ProductionDBClient()
+    client.ensure_schema()
+    day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    with client._cursor() as cur:
+        for article_id, domain, title, language, hours_ago in ARTICLES:
+            config = 'spanish' if language == 'es' else 'english'
+            # Two chunks per article: counts are per article, not per chunk
+            for chunk_index in range(2):
+                cur.execute(f"""
+                    INSERT INTO article_chunks (article_id, processing_version, chunk_index, text,
+                                                url, title_norm, source_domain, published_at,
+                                                language, fts_vector)
+                    VALUES (%s, 1, %s, %s, %s, %s, %s, %s, %s, to_tsvector('{config}', %s))
+                """, (article_id, chunk_index, title, f"https://{domain}/{article_id}", title, domain,
+                      day - timedelta(hours=hours_ago) + timedelta(minutes=30), language, title))
+    try:
+        yield client
+    finally:
+        client.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def test_grouped_counts_match_python(db):
+    rows = db.count_articles_by('source', query="oil prices", hours=24 * 7)
+    assert [(r['key'], r['articles']) for r in rows] == [("daily.com", 1), ("wire.com", 1)]
+    assert sum(r['share'] for r in rows) == pytest.approx(1.0)
+
+    # No text query: everything in the window, per language
+    rows = db.count_articles_by('language', hours=24 * 7)
+    expected = Counter(a[3] for a in ARTICLES if a[4] < 24 * 7)
+    assert {r['key']: r['articles'] for r in rows} == expected
+
+    # Per-language stemming: the Spanish query only matches the Spanish article
+    assert [r['key'] for r in db.count_articles_by('source', query="crudos", hours=24 * 7)] == ["noticias.es"]
+
+    with pytest.raises(ValueError):
+        db.count_articles_by('author')
+
+
+def test_histogram_buckets(db):
+    rows = db.article_histogram('day', query="oil", hours=24 * 7)
+    assert [r['articles'] for r in rows] == [1, 1, 2]
+    assert [r['bucket'] for r in rows] == sorted(r['bucket'] for r in rows)
+
+    split = db.article_histogram('day', query="oil", hours=24 * 7, by_source=True)
+    assert sum(r['articles'] for r in split) == 4
+    assert {r['domain'] for r in split} == {"wire.com", "daily.com", "tiny.org"}
+
+
+def test_share_of_voice(db):
+    result = db.share_of_voice(query="oil", hours=24 * 7, limit=2, terms_per_domain=3)
+    assert result["total"] == 4 and result["domain_count"] == 3
+    # www. is folded into the domain; ties (domains and terms) order by name
+    assert [(d["domain"], d["articles"]) for d in result["domains"]] == [("wire.com", 2), ("daily.com", 1)]
+    assert result["domains"][0]["share"] == pytest.approx(0.5)
+    assert result["domains"][0]["terms"] == ["output", "talks", "after"]
+    assert "refinery" in result["domains"][1]["terms"]
+
+    # Requested domains are reported even outside the top `limit`
+    result = db.share_of_voice(query="oil", hours=24 * 7, domains=["www.tiny.org"], limit=1)
+    assert [d["domain"] for d in result["domains"]] == ["wire.com", "tiny.org"]
+
+    empty = db.share_of_voice(query="volcano", hours=24 * 7)
+    assert empty == {"total": 0, "domain_count": 0, "domains": []}
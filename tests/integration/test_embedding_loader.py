@@ -0,0 +1,126 @@
+"""
+PgClient.load_embeddings (COPY BINARY into float32) against a local Postgres
+"""
+
+import os
+import random
+import uuid
+
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+DIMS = 24
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"emb_loader_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+
+    from pg_client_new import PgClient
+    client = PgClient()
+    client.ensure_schema()
+    with client._cursor() as cur:
+        cur.execute(f"ALTER TABLE article_chunks ADD COLUMN embedding_vector vector({DIMS})")
+    try:
+        yield client
+    finally:
+        client.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def add_chunks(db, rng, count, embedded=True):
+    ids, vectors = [], []
+    with db._cursor() as cur:
+        for _ in range(count):
+            cur.execute("""
+                INSERT INTO article_chunks (article_id, processing_version, chunk_index, text)
+                VALUES (%s, 1, 0, 'x') RETURNING id
+            """, (f"a{uuid.uuid4().hex[:12]}",))
+            ids.append(cur.fetchone()[0])
+    for chunk_id in ids:
+        vector = [rng.gauss(0, 1) for _ in range(DIMS)] if embedded else None
+        if vector:
+            db.update_chunk_embedding(chunk_id, vector)
+        vectors.append(vector)
+    return ids, vectors
+
+
+def test_binary_load_matches_stored_vectors(db, tmp_path):
+    rng = random.Random(2)
+    ids, vectors = add_chunks(db, rng, 60)
+    bare, _ = add_chunks(db, rng, 3, embedded=False)
+    expected = np.array(vectors, dtype=np.float32)
+
+    # Requested order, repeats, chunks without embeddings and unknown ids
+    order = list(reversed(ids)) + [ids[0], bare[1], 10 ** 9]
+    matrix, found = db.load_embeddings(order, batch_size=7)
+    assert db._get_embedding_source() == ('embedding_vector', 'vector')
+    assert matrix.dtype == np.float32 and matrix.shape == (len(order), DIMS)
+    assert found.tolist() == [True] * 61 + [False, False]
+    np.testing.assert_array_equal(matrix[:60], expected[::-1])
+    np.testing.assert_array_equal(matrix[60], expected[0])
+    assert not matrix[61:].any()
+
+    path = tmp_path / "embeddings.npy"
+    mapped, found = db.load_embeddings(ids, mmap_path=str(path))
+    assert isinstance(mapped, np.memmap) and found.all()
+    np.testing.assert_array_equal(np.load(path, mmap_mode='r'), expected)
+
+
+def test_text_column_without_pgvector_column(db):
+    rng = random.Random(4)
+    ids, vectors = add_chunks(db, rng, 20)
+    with db._cursor() as cur:
+        cur.execute("ALTER TABLE article_chunks DROP COLUMN embedding_vector")
+    db._embedding_source = None
+
+    matrix, found = db.load_embeddings(ids, batch_size=6)
+    assert db._get_embedding_source() == ('embedding', 'text')
+    assert found.all()
+    np.testing.assert_array_equal(matrix, np.array(vectors, dtype=np.float32))
+
+
+def test_text_only_rows_fall_back_to_text_column(db):
+    rng = random.Random(6)
+    ids, vectors = add_chunks(db, rng, 8)
+    # Written before embedding_vector existed: TEXT embedding only
+    with db._cursor() as cur:
+        cur.execute("UPDATE article_chunks SET embedding_vector = NULL WHERE id = ANY(%s)", (ids[::2],))
+
+    matrix, found = db.load_embeddings(ids, batch_size=3)
+    assert db._get_embedding_source() == ('embedding_vector', 'vector')
+    assert found.all()
+    np.testing.assert_array_equal(matrix, np.array(vectors, dtype=np.float32))
+
+    # Nothing in embedding_vector at all
+    with db._cursor() as cur:
+        cur.execute("UPDATE article_chunks SET embedding_vector = NULL")
+    matrix, found = db.load_embeddings(ids[:2])
+    assert found.all() and matrix.shape == (2, DIMS)
+
+
+def test_no_embeddings_at_all(db):
+    ids, _ = add_chunks(db, random.Random(1), 3, embedded=False)
+    matrix, found = db.load_embeddings(ids)
+    assert matrix.shape == (3, 0) and not found.any()
+    matrix, found = db.load_embeddings([])
+    assert matrix.shape == (0, 0) and found.shape == (0,)
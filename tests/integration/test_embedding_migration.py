@@ -0,0 +1,206 @@
+"""
+Set-based embedding migration (scripts/migrate_embeddings_batch.py) against a local Postgres
+
+Runs in a scratch schema with a small-dimension embedding_vector column and a
+synthetic corpus that includes unparsable and wrong-dimension embeddings.
+"""
+
+import importlib.util
+import json
+import os
+import random
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+DIMS = 16
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "migrate_embeddings_batch.py"
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture(scope="module")
+def migration():
+    spec = importlib.util.spec_from_file_location("migrate_embeddings_batch", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so forked workers can unpickle the worker entry point
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def chunks_db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"embmig_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+
+    from pg_client_new import PgClient
+    db = PgClient()
+    db.ensure_schema()
+    with db._cursor() as cur:
+        cur.execute(f"ALTER TABLE article_chunks ADD COLUMN embedding_vector vector({DIMS})")
+    try:
+        yield db
+    finally:
+        db.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def load_corpus(db, count, bad_every=97, wrong_dim_every=89, missing_every=53):
+    """Chunks with JSON text embeddings; returns ids of the rows that must not convert"""
+    with db._cursor() as cur:
+        cur.execute("""
+            INSERT INTO article_chunks (article_id, processing_version, chunk_index, text, embedding)
+            SELECT 'a' || (n / 10), 1, n %% 10, 'chunk ' || n,
+                   CASE
+                       WHEN n %% %(missing)s = 0 THEN NULL
+                       WHEN n %% %(bad)s = 0 THEN '[0.1, not-a-number]'
+                       WHEN n %% %(wrong)s = 0 THEN '[0.5, 0.25]'
+                       ELSE '[' || array_to_string(
+                           ARRAY(SELECT round((random() * 2 - 1)::numeric, 6) || ''
+                                 FROM generate_series(1, %(dims)s) WHERE n > 0), ', ') || ']'
+                   END
+            FROM generate_series(1, %(count)s) AS n
+        """, {'count': count, 'dims': DIMS, 'bad': bad_every, 'wrong': wrong_dim_every,
+              'missing': missing_every})
+        cur.execute("""
+            SELECT id FROM article_chunks
+            WHERE embedding IS NOT NULL
+              AND (embedding LIKE '%%not-a-number%%' OR embedding = '[0.5, 0.25]')
+        """)
+        return {r[0] for r in cur.fetchall()}
+
+
+def assert_fully_migrated(db, unconvertible):
+    with db._cursor() as cur:
+        cur.execute("""
+            SELECT id FROM article_chunks
+            WHERE embedding IS NOT NULL AND embedding_vector IS NULL
+        """)
+        assert {r[0] for r in cur.fetchall()} == unconvertible
+        # Converted vectors equal their JSON source
+        cur.execute("""
+            SELECT COUNT(*) FROM article_chunks
+            WHERE embedding_vector IS NOT NULL AND embedding_vector <> embedding::vector
+        """)
+        assert cur.fetchone()[0] == 0
+
+
+def test_parallel_workers_with_live_writes(chunks_db, migration):
+    db = chunks_db
+    unconvertible = load_corpus(db, 6000)
+    ranges = migration.plan_ranges(db, 3)
+
+    # Contiguous, disjoint and covering every existing id
+    assert all(hi == lo_next for (_, hi), (lo_next, _) in zip(ranges, ranges[1:]))
+    with db._cursor() as cur:
+        cur.execute("SELECT MIN(id), MAX(id) FROM article_chunks")
+        low, high = cur.fetchone()
+    assert ranges[0][0] < low and ranges[-1][1] == high
+
+    # The embedding service keeps writing fresh vectors, also into rows being migrated
+    stop = threading.Event()
+    live = {}
+
+    def embed_live():
+        rng = random.Random(3)
+        while not stop.is_set():
+            chunk_id = rng.randint(low, high)
+            vector = [round(rng.uniform(-1, 1), 4) for _ in range(DIMS)]
+            if db.update_chunk_embedding(chunk_id, vector):
+                live[chunk_id] = vector
+
+    writer = threading.Thread(target=embed_live)
+    writer.start()
+    try:
+        assert migration.migrate_embeddings(batch_size=250, workers=3)
+    finally:
+        stop.set()
+        writer.join()
+
+    assert_fully_migrated(db, unconvertible - set(live))
+    with db._cursor() as cur:
+        cur.execute("SELECT id, embedding_vector::text FROM article_chunks WHERE id = ANY(%s)",
+                    (list(live),))
+        for chunk_id, vector in cur.fetchall():
+            assert json.loads(vector) == pytest.approx(live[chunk_id])
+
+    progress = [migration.load_progress(db, i, lo) for i, (lo, _) in enumerate(ranges)]
+    assert all(p['done'] for p in progress)
+    assert [p['last_id'] for p in progress] == [hi for _, hi in ranges]
+    assert sum(p['skipped'] for p in progress) >= len(unconvertible - set(live))
+
+
+def test_resumes_from_checkpoint(chunks_db, migration):
+    db = chunks_db
+    unconvertible = load_corpus(db, 3000)
+
+    assert migration.migrate_embeddings(batch_size=400, limit=1000, workers=2)
+    progress = [json.loads(db.get_config(migration.RANGE_KEY.format(i))) for i in range(2)]
+    assert not any(p['done'] for p in progress)
+    with db._cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM article_chunks WHERE embedding_vector IS NOT NULL")
+        first_pass = cur.fetchone()[0]
+    assert first_pass == sum(p['migrated'] for p in progress)
+    assert 0 < first_pass <= 1000
+
+    # A different worker count would re-split ranges under the checkpoints
+    with pytest.raises(ValueError):
+        migration.migrate_embeddings(batch_size=400, workers=3)
+
+    assert migration.migrate_embeddings(batch_size=400, workers=2)
+    assert_fully_migrated(db, unconvertible)
+    final = [json.loads(db.get_config(migration.RANGE_KEY.format(i))) for i in range(2)]
+    with db._cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM article_chunks WHERE embedding_vector IS NOT NULL")
+        assert cur.fetchone()[0] == sum(p['migrated'] for p in final)
+
+
+def test_lock_timeout_does_not_skip_the_page(chunks_db, migration, monkeypatch):
+    import psycopg2
+
+    db = chunks_db
+    load_corpus(db, 300, bad_every=10 ** 6, wrong_dim_every=10 ** 6)
+    with db._cursor() as cur:
+        cur.execute("SELECT MIN(id) - 1, MAX(id) FROM article_chunks")
+        low, high = cur.fetchone()
+
+    # A live writer holds one row of the page; this worker gives up waiting quickly
+    holder = psycopg2.connect(os.environ["PG_DSN"])
+    with holder.cursor() as cur:
+        cur.execute("SELECT id FROM article_chunks WHERE id = %s FOR UPDATE", (low + 5,))
+    monkeypatch.setenv("PG_DSN", os.environ["PG_DSN"] + "%20-clock_timeout%3D200")
+    from pg_client_new import PgClient
+    client = PgClient()
+    try:
+        progress = migration.load_progress(client, 0, low)
+        with pytest.raises(psycopg2.OperationalError):
+            migration.migrate_batch(client, 0, progress, high, 100, DIMS)
+        assert db.get_config(migration.RANGE_KEY.format(0)) is None
+        assert progress['skipped'] == 0 and progress['last_id'] == low
+
+        holder.rollback()
+        assert migration.migrate_batch(client, 0, progress, high, 100, DIMS) == 100
+        assert progress['migrated'] == 100 - len([i for i in range(1, 101) if i % 53 == 0])
+    finally:
+        holder.close()
+        client.close()
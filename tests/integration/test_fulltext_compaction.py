@@ -0,0 +1,102 @@
+"""
+PgClient.compact_fulltext against a local Postgres: a body differing only in
+whitespace from the stored one, and locked rows, stay inline and are reported
+"""
+
+import os
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+SENTENCE = "Officials said on Tuesday that talks would resume next week."
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"fulltext_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("FULLTEXT_STORE", "false")
+
+    from pg_client_new import PgClient
+    client = PgClient()
+    client.ensure_schema()
+    try:
+        yield client
+    finally:
+        client.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def add_rows(db, raw_bodies, index_bodies):
+    from utils.text import compute_text_hash
+
+    raw_ids, index_ids = [], []
+    with db._cursor() as cur:
+        for n, body in enumerate(raw_bodies):
+            cur.execute("""
+                INSERT INTO raw (url, url_hash, full_text, text_hash) VALUES (%s, %s, %s, %s) RETURNING id
+            """, (f"https://example.com/raw/{n}", f"raw{n}", body, compute_text_hash(body)))
+            raw_ids.append(cur.fetchone()[0])
+        for n, body in enumerate(index_bodies):
+            cur.execute("""
+                INSERT INTO articles_index (article_id, url, clean_text, text_hash)
+                VALUES (%s, %s, %s, %s) RETURNING id
+            """, (f"a{n}", f"https://example.com/{n}", body, compute_text_hash(body)))
+            index_ids.append(cur.fetchone()[0])
+    return raw_ids, index_ids
+
+
+def test_only_identical_bodies_leave_the_row(db):
+    import psycopg2
+
+    # The fetched body keeps its paragraph breaks; the cleaned one was flattened
+    paragraphs = "\n\n".join([SENTENCE] * 40)
+    flattened = " ".join([SENTENCE] * 40)
+    others = [f"{SENTENCE} Story number {n}. " * 10 for n in range(6)]
+    _, ids = add_rows(db, [paragraphs], [flattened] + others)
+
+    # A writer holds the last index row
+    holder = psycopg2.connect(os.environ["PG_DSN"])
+    with holder.cursor() as cur:
+        cur.execute("SELECT id FROM articles_index WHERE id = %s FOR UPDATE", (ids[-1],))
+    try:
+        moved, skipped, after_id = 0, 0, None
+        while True:
+            result = db.compact_fulltext(batch_size=3, after_id=after_id)
+            moved += sum(result['moved'].values())
+            skipped += sum(result['skipped'].values())
+            after_id = result['after_id']
+            if result['done']:
+                break
+    finally:
+        holder.close()
+
+    assert moved == 1 + 5
+    assert skipped == 2
+    with db._cursor() as cur:
+        cur.execute("SELECT id, clean_text, text_hash FROM articles_index ORDER BY id")
+        rows = [{'id': r[0], 'clean_text': r[1], 'text_hash': r[2]} for r in cur.fetchall()]
+    assert [r['id'] for r in rows if r['clean_text'] is not None] == [ids[0], ids[-1]]
+    assert [r['clean_text'] for r in db.hydrate_fulltext(rows)] == [flattened] + others
+    with db._cursor() as cur:
+        cur.execute("SELECT full_text, text_hash FROM raw")
+        [(inline, key)] = cur.fetchall()
+    assert inline is None and db.get_fulltexts([key]) == {key: paragraphs}
@@ -0,0 +1,198 @@
+"""
+Hot tier parity with the database search paths, against a local Postgres
+
+A scratch schema gets chunks spread over the last five days in three languages,
+indexed by the real update_chunks_fts / update_chunk_embedding. Each query runs
+once through the database (tier detached) and once through the tier.
+"""
+
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+DIMS = 16
+WORDS = {
+    'en': "oil prices rose after the talks between ministers on energy security and gas supply "
+          "police said the court will report on the election results in the city".split(),
+    'es': "el gobierno anunció nuevas medidas sobre la energía y los precios del petróleo".split(),
+    'ru': "правительство объявило новые меры по энергетике и ценам на нефть".split(),
+}
+SOURCES = ['reuters.com', 'bbc.co.uk', 'elpais.com', 'ria.ru']
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"hot_tier_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("HOT_TIER_ENABLED", "false")
+
+    from database.production_db_client import ProductionDBClient
+    client = ProductionDBClient()
+    client.ensure_schema()
+    with client._cursor() as cur:
+        cur.execute(f"ALTER TABLE article_chunks ADD COLUMN embedding_vector vector({DIMS})")
+    try:
+        yield client
+    finally:
+        client.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def add_chunks(db, rng, count, max_hours=120, start=0):
+    now = datetime.now(timezone.utc)
+    ids = []
+    with db._cursor() as cur:
+        for n in range(start, start + count):
+            lang = rng.choice(['en', 'en', 'es', 'ru'])
+            text = ' '.join(rng.choices(WORDS[lang], k=rng.randint(8, 60)))
+            cur.execute("""
+                INSERT INTO article_chunks (article_id, processing_version, chunk_index, text, url,
+                                            title_norm, source_domain, published_at, language)
+                VALUES (%s, 1, 0, %s, %s, %s, %s, %s, %s) RETURNING id
+            """, (f"a{n}", text, f"https://example.com/{n}", f"title {n}", rng.choice(SOURCES),
+                  now - timedelta(hours=rng.uniform(0, max_hours)), lang))
+            ids.append(cur.fetchone()[0])
+    db.update_chunks_fts(ids)
+    for chunk_id in ids:
+        db.update_chunk_embedding(chunk_id, [rng.gauss(0, 1) for _ in range(DIMS)])
+    return ids
+
+
+def both_paths(db, tier, call):
+    db.hot_tier = None
+    from_db = call()
+    db.hot_tier = tier
+    hits = tier.hits
+    from_tier = call()
+    return from_db, from_tier, tier.hits > hits
+
+
+def assert_same_vectors(from_db, from_tier):
+    assert [r['id'] for r in from_tier] == [r['id'] for r in from_db]
+    for a, b in zip(from_db, from_tier):
+        assert b['similarity'] == pytest.approx(a['similarity'], abs=1e-5)
+        assert {k: v for k, v in a.items() if k != 'similarity' and k != 'semantic_score'} == \
+               {k: v for k, v in b.items() if k != 'similarity' and k != 'semantic_score'}
+
+
+def assert_same_fts(from_db, from_tier):
+    assert {r['id']: r['score'] for r in from_tier} == {r['id']: float(r['score']) for r in from_db}
+    assert [r['score'] for r in from_tier] == sorted((r['score'] for r in from_db), reverse=True)
+    by_id = {r['id']: r for r in from_db}
+    for r in from_tier:
+        assert {k: v for k, v in r.items() if k != 'score'} == \
+               {k: v for k, v in by_id[r['id']].items() if k != 'score'}
+
+
+def test_parity_with_database_paths(db):
+    from services.hot_tier import HotChunkTier
+
+    rng = random.Random(17)
+    add_chunks(db, rng, 400)
+    tier = HotChunkTier(db, hours=72)
+    tier.refresh()
+
+    for hours, sources in ((24, None), (72, None), (48, ['reuters.com', 'elpais.com'])):
+        for _ in range(5):
+            query = [rng.gauss(0, 1) for _ in range(DIMS)]
+            from_db, from_tier, served = both_paths(
+                db, tier, lambda: db._search_with_time_filter_sync(
+                    "", query, hours=hours, limit=20, filters={'sources': sources} if sources else None))
+            assert served and from_db
+            assert_same_vectors(from_db, from_tier)
+
+    for text in ("oil prices", "energy security talks", "police court report",
+                 "precios del petróleo", "ценам на нефть", "the"):
+        for days in (1, 3):
+            from_db, from_tier, served = both_paths(
+                db, tier, lambda: db.search_chunks_fts_ts(None, text, [], days, limit=500))
+            assert served
+            assert_same_fts(from_db, from_tier)
+    from_db, from_tier, _ = both_paths(
+        db, tier, lambda: db.search_chunks_fts_ts(None, "oil prices", ['reuters.com'], 2, limit=5))
+    assert [r['score'] for r in from_tier] == [float(r['score']) for r in from_db]
+
+    # Older windows are not held: the database answers
+    query = [rng.gauss(0, 1) for _ in range(DIMS)]
+    from_db, from_tier, served = both_paths(
+        db, tier, lambda: db._search_with_time_filter_sync("", query, hours=120, limit=20))
+    assert not served and from_tier == from_db
+
+
+def test_incremental_refresh_and_memory_budget(db):
+    from services.hot_tier import HotChunkTier
+
+    rng = random.Random(3)
+    add_chunks(db, rng, 150, max_hours=70)
+    tier = HotChunkTier(db, hours=72)
+    tier.refresh()
+    assert tier.get_stats()['chunks'] == 150
+
+    # Newly indexed chunks arrive with the next refresh, re-reading only recent writes
+    with db._cursor() as cur:
+        cur.execute("UPDATE article_chunks SET indexed_at = indexed_at - INTERVAL '10 minutes'")
+    fresh = add_chunks(db, rng, 10, max_hours=1, start=1000)
+    assert tier.refresh() == 10
+    query = [rng.gauss(0, 1) for _ in range(DIMS)]
+    from_db, from_tier, served = both_paths(
+        db, tier, lambda: db._search_with_time_filter_sync("", query, hours=2, limit=50))
+    assert served and set(fresh) <= {r['id'] for r in from_tier}
+    assert_same_vectors(from_db, from_tier)
+
+    # Half the budget: the oldest chunks go and wide windows fall back to the database
+    tier.max_bytes = tier.bytes_used // 2
+    tier.refresh()
+    stats = tier.get_stats()
+    assert stats['bytes'] <= tier.max_bytes and stats['evicted_through'] is not None
+    from_db, from_tier, served = both_paths(
+        db, tier, lambda: db._search_with_time_filter_sync("", query, hours=72, limit=20))
+    assert not served and from_tier == from_db
+    from_db, from_tier, served = both_paths(
+        db, tier, lambda: db.search_chunks_fts_ts(None, "oil prices", [], 3, limit=500))
+    assert not served and from_tier == from_db
+    from_db, from_tier, served = both_paths(
+        db, tier, lambda: db._search_with_time_filter_sync("", query, hours=2, limit=20))
+    assert served
+    assert_same_vectors(from_db, from_tier)
+
+
+def test_first_load_stops_at_the_budget(db, monkeypatch):
+    import services.hot_tier as hot_tier_module
+    from services.hot_tier import HotChunkTier
+
+    monkeypatch.setattr(hot_tier_module, "REFRESH_FETCH_ROWS", 20)
+    rng = random.Random(5)
+    add_chunks(db, rng, 300, max_hours=70)
+    full = HotChunkTier(db, hours=72)
+    full.refresh()
+
+    tier = HotChunkTier(db, hours=72, max_bytes=full.bytes_used // 5)
+    read = tier.refresh()
+
+    stats = tier.get_stats()
+    assert stats['bytes'] <= tier.max_bytes
+    # Newest first: reading stops soon after the budget fills, not at the window's end
+    assert read < 300 // 2
+    assert min(c.published_at for c in tier._chunks.values()) > stats['evicted_through']
+    assert tier.covers(stats['evicted_through'] + timedelta(seconds=1))
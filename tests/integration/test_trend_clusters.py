@@ -0,0 +1,235 @@
+"""
+Online trend clusters against a local Postgres: service passes, /trends reads,
+stable identities and aging, compared with the batch DBSCAN rebuild
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+DIMS = 32
+TOPICS = [
+    "oil prices opec output cut barrels",
+    "election votes parliament coalition ballot",
+    "football cup final goal penalty",
+]
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"trend_clusters_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("HOT_TIER_ENABLED", "false")
+    monkeypatch.setenv("TREND_WINDOW_HOURS", "48")
+
+    from database.production_db_client import ProductionDBClient
+    client = ProductionDBClient()
+    client.ensure_schema()
+    with client._cursor() as cur:
+        cur.execute(f"ALTER TABLE article_chunks ADD COLUMN embedding_vector vector({DIMS})")
+    try:
+        yield client
+    finally:
+        client.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+class Corpus:
+    def __init__(self, db, seed=0):
+        self.db = db
+        self.rng = np.random.default_rng(seed)
+        self.centers = np.linalg.qr(self.rng.standard_normal((DIMS, DIMS)))[0][:len(TOPICS) + 1]
+        self.count = 0
+
+    def add(self, topic, n, max_hours=20):
+        """n articles on a topic (None: unrelated one-offs), published in the last max_hours"""
+        now = datetime.now(timezone.utc)
+        ids = []
+        for _ in range(n):
+            self.count += 1
+            article_id = f"art{self.count}"
+            if topic is None:
+                vector, title = self.rng.standard_normal(DIMS), f"misc story {self.count}"
+            else:
+                vector = self.centers[topic] + 0.05 * self.rng.standard_normal(DIMS)
+                title = f"{TOPICS[topic]} {self.count}"
+            with self.db._cursor() as cur:
+                cur.execute("""
+                    INSERT INTO articles_index (article_id, url, source, title_norm, clean_text,
+                                                text_hash, published_at, language)
+                    VALUES (%s, %s, 'example.com', %s, %s, %s, %s, 'en')
+                """, (article_id, f"https://example.com/{article_id}", title, title,
+                      uuid.uuid4().hex, now - timedelta(hours=float(self.rng.uniform(0, max_hours)))))
+                cur.execute("""
+                    INSERT INTO article_chunks (article_id, processing_version, chunk_index, text)
+                    VALUES (%s, 1, 0, %s) RETURNING id
+                """, (article_id, title))
+                chunk_id = cur.fetchone()[0]
+            self.db.update_chunk_embedding(chunk_id, vector.tolist())
+            ids.append(article_id)
+        return ids
+
+
+def trends(db, online, window="24h"):
+    from services.trends_service import TrendsService
+    service = TrendsService(db)
+    service.online = online
+    return service.build_trends(window, 600, 10)
+
+
+def assert_term_stats_match_members(db):
+    """The rolling term store equals a recount over the stored members' terms"""
+    with db._cursor() as cur:
+        cur.execute("""
+            SELECT term, COUNT(DISTINCT article_id) FROM trend_cluster_members, unnest(terms) term
+            GROUP BY term
+        """)
+        expected_df = dict(cur.fetchall())
+        cur.execute("SELECT term, df FROM trend_terms")
+        assert dict(cur.fetchall()) == expected_df
+        cur.execute("""
+            SELECT cluster_id, term, COUNT(*) FROM trend_cluster_members, unnest(terms) term
+            WHERE cluster_id IS NOT NULL GROUP BY cluster_id, term
+        """)
+        expected_tf = {(c, t): n for c, t, n in cur.fetchall()}
+        cur.execute("SELECT cluster_id, term, tf FROM trend_cluster_terms")
+        assert {(c, t): n for c, t, n in cur.fetchall()} == expected_tf
+        cur.execute("SELECT COUNT(*) FROM trend_cluster_members WHERE terms IS NOT NULL")
+        docs = cur.fetchone()[0]
+        cur.execute("SELECT v FROM config WHERE k = 'trends.terms.docs'")
+        row = cur.fetchone()
+        assert int(row[0] if row else 0) == docs
+
+
+def test_online_state_matches_batch_and_keeps_identities(db):
+    from services.trend_cluster_service import TrendClusterService
+
+    corpus = Corpus(db)
+    for topic, n in ((0, 15), (1, 12), (2, 8)):
+        corpus.add(topic, n)
+    corpus.add(None, 10)
+
+    service = TrendClusterService(db)
+    stats = service.update()
+    assert stats['assigned'] == 45 and stats['recentered'] > 0
+    # Later passes find nothing new
+    assert service.update()['pending'] == 0
+
+    online, batch = trends(db, True), trends(db, False)
+    by_count = {t['count']: t for t in online['data']}
+    assert sorted(by_count) == [8, 12, 15]
+    assert sorted(t['count'] for t in batch['data']) == [8, 12, 15]
+    for count, words in zip((15, 12, 8), TOPICS):
+        words = words.split()
+        phrases = words + [' '.join(p) for p in zip(words, words[1:])]
+        assert by_count[count]['top_keywords'] and set(by_count[count]['top_keywords']) <= set(phrases)
+        assert len(by_count[count]['top_articles']) == 3
+    ids = {t['count']: t['cluster_id'] for t in online['data']}
+    assert_term_stats_match_members(db)
+    # The batch path (window wider than the maintained one) labels from the term store too
+    wide = {t['count']: t for t in trends(db, True, window="7d")['data']}
+    for count, words in zip((15, 12, 8), TOPICS):
+        words = words.split()
+        assert set(wide[count]['top_keywords']) <= set(words + [' '.join(p) for p in zip(words, words[1:])])
+
+    # A reloaded service (new process) keeps assigning into the same clusters
+    corpus.add(1, 6, max_hours=1)
+    restarted = TrendClusterService(db)
+    assert restarted.update()['assigned'] == 6
+    again = trends(db, True)
+    assert {t['cluster_id']: t['count'] for t in again['data']} == {ids[15]: 15, ids[12]: 18, ids[8]: 8}
+    assert_term_stats_match_members(db)
+
+
+def test_aging_and_stale_state(db):
+    from services.trend_cluster_service import TrendClusterService
+
+    corpus = Corpus(db, seed=1)
+    corpus.add(0, 10)
+    old = corpus.add(2, 7)
+    service = TrendClusterService(db)
+    service.update()
+    assert len(trends(db, True)['data']) == 2
+
+    # Topic 2 falls out of the 48h window: members removed, cluster dropped
+    with db._cursor() as cur:
+        cur.execute("""
+            UPDATE trend_cluster_members SET published_at = published_at - INTERVAL '3 days'
+            WHERE article_id = ANY(%s)
+        """, (old,))
+        cur.execute("""
+            UPDATE articles_index SET published_at = published_at - INTERVAL '3 days'
+            WHERE article_id = ANY(%s)
+        """, (old,))
+    stats = service.update()
+    assert stats['expired'] == 7 and stats['clusters'] == 1
+    with db._cursor() as cur:
+        cur.execute("SELECT COUNT(*), SUM(size) FROM trend_clusters")
+        assert cur.fetchone() == (1, 10)
+    assert_term_stats_match_members(db)
+    assert [t['count'] for t in trends(db, True)['data']] == [10]
+
+    # Wider than the maintained window (aged articles included again), or a
+    # stale state: batch rebuild
+    wide = trends(db, True, window="7d")['data']
+    assert sorted(t['count'] for t in wide) == [7, 10] and 'cluster_id' not in wide[0]
+    with db._cursor() as cur:
+        cur.execute("UPDATE config SET v = (NOW() - INTERVAL '1 hour')::text WHERE k = 'trends.online.updated_at'")
+    stale = trends(db, True)['data']
+    assert [t['count'] for t in stale] == [10] and 'cluster_id' not in stale[0]
+
+
+def test_term_stats_follow_splits_merges_and_backfill(db):
+    from services.trend_cluster_service import OnlineClusterer, TrendClusterService
+
+    corpus = Corpus(db, seed=2)
+    corpus.add(0, 9)
+    corpus.add(1, 7)
+    # Everything lands in one cluster, then maintenance splits it into the two topics
+    service = TrendClusterService(db, OnlineClusterer(assign_similarity=-1.0, min_size=5))
+    service.maintenance_seconds = 10 ** 6
+    service.update()
+    service.clusterer.assign_similarity = 0.7
+    assert service.maintain()['split'] == 1
+    assert sorted(c.size for c in service.clusterer.clusters.values()) == [7, 9]
+    assert_term_stats_match_members(db)
+    labels = {c.size: c.keywords for c in service.clusterer.clusters.values()}
+    assert set(labels[9]) & set(TOPICS[0].split()) and not set(labels[9]) & set(TOPICS[1].split())
+
+    # ... and merges them back
+    service.clusterer.merge_similarity = -0.5
+    for cluster in service.clusterer.clusters.values():
+        cluster.changed = True
+    assert service.maintain()['merged'] == 1
+    assert_term_stats_match_members(db)
+
+    # Members stored without terms (before the term store) are backfilled
+    with db._cursor() as cur:
+        cur.execute("UPDATE trend_cluster_members SET terms = NULL")
+        cur.execute("DELETE FROM trend_terms")
+        cur.execute("DELETE FROM trend_cluster_terms")
+        cur.execute("DELETE FROM config WHERE k = 'trends.terms.docs'")
+    assert service.update()['terms_backfilled'] == 16
+    assert_term_stats_match_members(db)
+    assert 'terms_backfilled' not in service.update()
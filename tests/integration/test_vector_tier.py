@@ -0,0 +1,132 @@
+"""
+Compact vector tier (embedding_compact + exact rerank) against a local Postgres
+
+Scaled down: 64-dim full vectors with a 16-dim compact tier, in a scratch schema.
+"""
+
+import os
+import random
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+FULL_DIMS = 64
+COMPACT_DIMS = 16
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+def vector(rng, center=None):
+    """Variance decays across dims, so the leading dims carry most of the signal"""
+    base = center or [0.0] * FULL_DIMS
+    return [b + rng.gauss(0, 1) / (1 + i / 4) for i, b in enumerate(base)]
+
+
+@pytest.fixture
+def chunks_db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"vtier_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("EMBEDDING_COMPACT_TIER", "true")
+    monkeypatch.setenv("EMBEDDING_COMPACT_DIMS", str(COMPACT_DIMS))
+
+    from pg_client_new import PgClient
+    db = PgClient()
+    db.ensure_schema()
+    with db._cursor() as cur:
+        cur.execute(f"ALTER TABLE article_chunks ALTER COLUMN embedding TYPE vector({FULL_DIMS}) "
+                    f"USING embedding::vector({FULL_DIMS})")
+    try:
+        yield db
+    finally:
+        db.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def load_chunks(db, rng, count):
+    centers = [vector(rng) for _ in range(20)]
+    vectors = [vector(rng, rng.choice(centers)) for _ in range(count)]
+    with db._cursor() as cur:
+        for n, v in enumerate(vectors):
+            cur.execute("""
+                INSERT INTO article_chunks (article_id, processing_version, chunk_index, embedding)
+                VALUES (%s, 1, 0, %s)
+            """, (f"a{n}", '[' + ','.join(map(str, v)) + ']'))
+    return vectors
+
+
+def build_tier(db):
+    kind = db.ensure_compact_embeddings()
+    after_id, filled = 0, 0
+    while True:
+        result = db.backfill_compact_embeddings(128, after_id)
+        filled += result['filled']
+        after_id = result['after_id']
+        if result['done']:
+            break
+    db.create_compact_embedding_index()
+    return kind, filled
+
+
+def test_two_stage_search_matches_exact(chunks_db):
+    db = chunks_db
+    rng = random.Random(11)
+    vectors = load_chunks(db, rng, 1000)
+
+    # Not built yet: the flag alone falls back to the exact scan
+    query = vector(rng, rng.choice(vectors))
+    db.use_compact_vectors = False
+    exact_first = db.search_chunks_embedding(query, 5)
+    db.use_compact_vectors = True
+    assert db.search_chunks_embedding(query, 5) == exact_first
+
+    kind, filled = build_tier(db)
+    assert kind in ('halfvec', 'vector') and filled == 1000
+    with db._cursor() as cur:
+        cur.execute("SELECT vector_dims(embedding_compact::text::vector) FROM article_chunks LIMIT 1")
+        assert cur.fetchone()[0] == COMPACT_DIMS
+
+    hits = 0
+    queries = [vector(rng, rng.choice(vectors)) for _ in range(30)]
+    for query in queries:
+        db.use_compact_vectors = False
+        exact = [r['id'] for r in db.search_chunks_embedding(query, 10)]
+        db.use_compact_vectors = True
+        found = db.search_chunks_embedding(query, 10)
+        # Scores come from the full vectors, in exact order
+        assert [r['score'] for r in found] == sorted((r['score'] for r in found), reverse=True)
+        hits += len(set(exact) & {r['id'] for r in found})
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_embedding_writes_fill_the_compact_tier(chunks_db):
+    db = chunks_db
+    rng = random.Random(5)
+    load_chunks(db, rng, 3)
+    build_tier(db)
+    with db._cursor() as cur:
+        cur.execute("SELECT id FROM article_chunks ORDER BY id LIMIT 1")
+        chunk_id = cur.fetchone()[0]
+
+    fresh = vector(rng)
+    assert db.update_chunk_embedding(chunk_id, fresh)
+
+    with db._cursor() as cur:
+        cur.execute("SELECT embedding_compact::text FROM article_chunks WHERE id = %s", (chunk_id,))
+        stored = [float(x) for x in cur.fetchone()[0].strip('[]').split(',')]
+    assert stored == pytest.approx(fresh[:COMPACT_DIMS], abs=1e-3)
@@ -0,0 +1,200 @@
+"""
+Hourly volume rollups against a local Postgres: counts written by the entity
+index pass, re-indexing, the rebuild and the dense series /predict reads
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("PG_DSN"), reason="PG_DSN not set")
+
+
+def _schema_dsn(dsn, schema):
+    sep = '&' if '?' in dsn else '?'
+    return f"{dsn}{sep}options=-csearch_path%3D{schema}%2Cpublic"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import psycopg2
+
+    base = os.environ["PG_DSN"]
+    schema = f"volume_rollups_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(base)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"CREATE SCHEMA {schema}")
+    monkeypatch.setenv("PG_DSN", _schema_dsn(base, schema))
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("HOT_TIER_ENABLED", "false")
+
+    from database.production_db_client import ProductionDBClient
+    client = ProductionDBClient()
+    client.ensure_schema()
+    try:
+        yield client
+    finally:
+        client.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def add_articles(db, rows):
+    """rows: (article_id, title, source, hours before the current UTC hour)"""
+    hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    with db._cursor() as cur:
+        for article_id, title, source, hours_ago in rows:
+            cur.execute("""
+                INSERT INTO articles_index (article_id, url, source, title_norm, clean_text,
+                                            text_hash, published_at, language)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, 'en')
+            """, (article_id, f"https://{source}/{article_id}", source, title, title,
+                  uuid.uuid4().hex, hour - timedelta(hours=hours_ago) + timedelta(minutes=1)))
+
+
+def index_pending(db, entities):
+    """One entity index pass, with fixed entities per article instead of NER"""
+    from utils.text import rollup_terms
+
+    pending = db.get_articles_pending_entities(limit=100)
+    items = [
+        {
+            'index_id': a['index_id'],
+            'article_id': a['article_id'],
+            'entities': [{'norm': e, 'name': e, 'label': 'ORG', 'mentions': 1}
+                         for e in entities.get(a['article_id'], [])],
+            'published_at': a['published_at'],
+            'source': a['source'],
+            'keywords': rollup_terms(a['title']),
+            'sentiment': a['sentiment'],
+        }
+        for a in pending
+    ]
+    db.save_article_entities(items)
+    return items
+
+
+def rollups(db):
+    with db._cursor() as cur:
+        cur.execute("SELECT kind, term, hour, articles FROM volume_rollups ORDER BY 1, 2, 3")
+        return cur.fetchall()
+
+
+def test_rollups_follow_indexing_and_rebuild(db):
+    add_articles(db, [
+        ("a1", "Oil prices rise", "wire.com", 0),
+        ("a2", "Oil prices fall", "wire.com", 0),
+        ("a3", "OPEC meets on oil output", "daily.com", 30),
+    ])
+    items = index_pending(db, {"a1": ["opec"], "a3": ["opec", "saudi aramco"]})
+
+    by_key = {(kind, term): 0 for kind, term, _, _ in rollups(db)}
+    for kind, term, _, n in rollups(db):
+        by_key[(kind, term)] += n
+    assert by_key[("keyword", "oil")] == 3
+    assert by_key[("keyword", "oil prices")] == 2
+    assert by_key[("source", "wire.com")] == 2
+    assert by_key[("entity", "opec")] == 2
+    assert by_key[("entity", "saudi aramco")] == 1
+
+    # Re-saving an indexed batch does not count anything twice
+    before = rollups(db)
+    db.save_article_entities(items)
+    assert rollups(db) == before
+
+    # New articles add to the existing hours
+    add_articles(db, [("a4", "Oil prices steady", "wire.com", 0)])
+    index_pending(db, {"a4": ["opec"]})
+    incremental = rollups(db)
+    assert sum(n for kind, term, _, n in incremental if (kind, term) == ("keyword", "oil prices")) == 3
+
+    # The rebuild recounts the same rows from the indexed articles
+    with db._cursor() as cur:
+        cur.execute("UPDATE volume_rollups SET articles = articles + 5")
+    result = db.rebuild_volume_rollups(hours=48)
+    assert result["articles"] == 4
+    assert rollups(db) == incremental
+
+
+def test_dense_series_for_predict(db):
+    from core.history.volume_rollups import VolumeRollups
+
+    add_articles(db, [(f"r{i}", "Oil prices rise", "wire.com", hours) for i, hours in
+                      enumerate([0, 0, 0, 1, 1, 5])])
+    add_articles(db, [("o1", "Football cup final", "sport.com", 3)])
+    index_pending(db, {"r0": ["opec"]})
+
+    async def read():
+        reader = VolumeRollups(os.environ["PG_DSN"])
+        try:
+            return (await reader.series("keyword", "oil prices", 8),
+                    await reader.topic_series("Oil prices", 8),
+                    await reader.topic_series(None, 8),
+                    await reader.topic_series("Volcano eruption", 8))
+        finally:
+            await reader.close()
+
+    series, topic, overall, unknown = asyncio.run(read())
+    assert series == [0, 0, 1, 0, 0, 0, 2, 3]
+    assert topic == {"kind": "keyword", "term": "oil prices", "hourly": series}
+    assert overall["kind"] == "source" and overall["hourly"] == [0, 0, 1, 0, 1, 0, 2, 3]
+    assert unknown is None
+
+
+def test_sentiment_rollups_and_trend(db):
+    from core.history.volume_rollups import VolumeRollups
+
+    add_articles(db, [
+        ("s1", "Oil prices plunge", "wire.com", 0),
+        ("s2", "Oil prices rally", "wire.com", 0),
+        ("s3", "Oil prices plunge again", "daily.com", 2),
+        ("s4", "Oil prices steady", "daily.com", 2),
+    ])
+    # Ingest-time scores; s4 was stored before scoring
+    with db._cursor() as cur:
+        cur.execute("UPDATE articles_index SET sentiment = v.s FROM (VALUES ('s1', -0.6), ('s2', 0.4), "
+                    "('s3', -0.8)) AS v(id, s) WHERE article_id = v.id")
+    index_pending(db, {})
+
+    def sentiment_rows():
+        with db._cursor() as cur:
+            cur.execute("SELECT kind, term, hour, articles, scored, round(sentiment_sum::numeric, 4)::float8 "
+                        "FROM volume_rollups ORDER BY 1, 2, 3")
+            return cur.fetchall()
+
+    incremental = sentiment_rows()
+    oil = [row for row in incremental if row[:2] == ("keyword", "oil prices")]
+    assert [row[3:] for row in oil] == [(2, 1, -0.8), (2, 2, -0.2)]
+
+    # The rebuild recounts the same sums
+    assert db.rebuild_volume_rollups(hours=24)["articles"] == 4
+    assert sentiment_rows() == incremental
+
+    # Backfill scores only the unscored article
+    result = db.backfill_sentiment(batch_size=10)
+    assert result["scored"] == 1 and result["done"]
+    with db._cursor() as cur:
+        cur.execute("SELECT sentiment FROM articles_index WHERE article_id = 's4'")
+        assert cur.fetchone()[0] == 0.0
+
+    async def read():
+        reader = VolumeRollups(os.environ["PG_DSN"])
+        try:
+            return (await reader.topic_sentiment("Oil prices", 6),
+                    await reader.topic_series("Oil prices", 6),
+                    await reader.topic_sentiment("Volcano eruption", 6))
+        finally:
+            await reader.close()
+
+    sentiment, volume, unknown = asyncio.run(read())
+    assert sentiment["term"] == "oil prices"
+    assert sentiment["scored"] == [0, 0, 0, 1, 0, 2]
+    assert sentiment["sentiment"][-1] == pytest.approx(-0.2)
+    assert set(volume) == {"kind", "term", "hourly"}
+    assert unknown is None
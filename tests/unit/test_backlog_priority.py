@@ -0,0 +1,158 @@
+"""
+Unit tests for the freshness-priority backlog policy, including a simulated
+backlog drain measuring publish -> processed latency for fresh items
+"""
+
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.backlog_priority import BacklogPolicy
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setenv("BACKLOG_TAU_HOURS", "24")
+    monkeypatch.setenv("BACKLOG_RETRY_PENALTY", "0.5")
+    monkeypatch.setenv("BACKLOG_SOURCE_WEIGHTS", "reuters.com=2, bad=x,apnews.com=1.5")
+    monkeypatch.setenv("BACKLOG_MAX_WAIT_HOURS", "6")
+    monkeypatch.setenv("BACKLOG_AGED_SHARE", "0.1")
+    monkeypatch.setenv("BACKLOG_UNDATED_AGE_HOURS", "24")
+    return BacklogPolicy()
+
+
+class TestPriority:
+
+    def test_fresher_items_rank_higher(self, policy):
+        assert policy.priority(NOW - timedelta(minutes=5), now=NOW) > \
+            policy.priority(NOW - timedelta(hours=5), now=NOW)
+
+    def test_priority_is_time_independent(self, policy):
+        older, newer = NOW - timedelta(hours=3), NOW - timedelta(hours=1)
+        later = NOW + timedelta(days=2)
+        assert policy.priority(older, now=NOW) < policy.priority(newer, now=NOW)
+        assert policy.priority(older, now=later) == policy.priority(older, now=NOW)
+
+    def test_source_weight_is_worth_log_weight_tau(self, policy):
+        published = NOW - timedelta(hours=2)
+        boost = policy.priority(published, "www.reuters.com", now=NOW) - policy.priority(published, "example.com", now=NOW)
+        assert boost == pytest.approx(0.6931, abs=1e-3)
+        assert policy.source_weight("uk.reuters.com") == 2
+        assert policy.source_weight("bad") == 1.0
+
+    def test_retries_queue_behind_fresh_work(self, policy):
+        published = NOW - timedelta(hours=1)
+        assert policy.priority(published, attempts=2, now=NOW) == \
+            pytest.approx(policy.priority(published, now=NOW) - 1.0)
+
+    def test_future_and_naive_dates(self, policy):
+        assert policy.priority(NOW + timedelta(days=3), now=NOW) == policy.priority(NOW, now=NOW)
+        assert policy.priority(NOW.replace(tzinfo=None), now=NOW) == policy.priority(NOW, now=NOW)
+
+    def test_undated_items_take_a_neutral_age_from_first_seen(self, policy):
+        seen = NOW - timedelta(hours=2)
+        assert policy.priority(None, now=NOW, first_seen=seen) == \
+            pytest.approx(policy.priority(seen - timedelta(hours=24), now=NOW))
+        assert policy.priority(None, now=NOW) == pytest.approx(policy.priority(NOW - timedelta(hours=24), now=NOW))
+        # Fresh dated news stays ahead of an undated item seen at the same time
+        assert policy.priority(NOW - timedelta(hours=1), now=NOW) > policy.priority(None, now=NOW)
+        assert policy.priority(None, now=NOW, first_seen=seen.replace(tzinfo=None)) == \
+            policy.priority(None, now=NOW, first_seen=seen)
+
+    def test_split_reserves_aged_share(self, policy):
+        assert policy.split(50) == (5, 45)
+        assert policy.split(5) == (1, 4)
+        assert policy.split(1) == (0, 1)
+
+
+def drain(policy, backlog, arrivals_per_tick, capacity, ticks, mode):
+    """
+    Minute-by-minute drain of a pending queue.
+
+    mode: 'fifo' (old behaviour), 'priority' (no starvation lane) or
+    'guarded' (priority plus the aged lane, as get_pending_articles does).
+    Returns ({item: processed_minute}, items).
+    """
+    items = list(backlog)
+    pending = set(range(len(items)))
+    done = {}
+    for tick in range(ticks):
+        now = NOW + timedelta(minutes=tick)
+        for _ in range(arrivals_per_tick):
+            items.append({'published': now, 'created': now, 'fresh': True,
+                          'priority': policy.priority(now, now=now)})
+            pending.add(len(items) - 1)
+
+        batch = []
+        if mode == 'fifo':
+            batch = sorted(pending, key=lambda i: (items[i]['created'], i))[:capacity]
+        else:
+            if mode == 'guarded':
+                aged_limit, _ = policy.split(capacity)
+                cutoff = now - timedelta(hours=policy.max_wait_hours)
+                aged = sorted((i for i in pending if items[i]['created'] < cutoff),
+                              key=lambda i: (items[i]['created'], i))
+                batch = aged[:aged_limit]
+            rest = sorted((i for i in pending if i not in batch),
+                          key=lambda i: (-items[i]['priority'], i))
+            batch += rest[:capacity - len(batch)]
+
+        for i in batch:
+            pending.discard(i)
+            done[i] = now
+    return done, items
+
+
+def outage_backlog(policy, count, hours):
+    """Items published/queued over the `hours` before NOW (pipeline was down)"""
+    out = []
+    for n in range(count):
+        published = NOW - timedelta(hours=hours) + timedelta(seconds=n * hours * 3600 / count)
+        out.append({'published': published, 'created': published, 'fresh': False,
+                    'priority': policy.priority(published, now=NOW)})
+    return out
+
+
+def fresh_latencies(done, items, arrived_before):
+    """Minutes from publish to processed for fresh items that arrived during the drain"""
+    return [
+        (done[i] - item['published']).total_seconds() / 60
+        for i, item in enumerate(items)
+        if item['fresh'] and item['published'] < arrived_before and i in done
+    ]
+
+
+def test_priority_drain_makes_fresh_items_searchable_sooner(policy):
+    backlog = outage_backlog(policy, 3000, hours=12)
+    window = NOW + timedelta(minutes=100)
+
+    fifo_done, fifo_items = drain(policy, backlog, arrivals_per_tick=5, capacity=25, ticks=200, mode='fifo')
+    prio_done, prio_items = drain(policy, backlog, arrivals_per_tick=5, capacity=25, ticks=200, mode='guarded')
+
+    fifo_median = statistics.median(fresh_latencies(fifo_done, fifo_items, window))
+    prio_median = statistics.median(fresh_latencies(prio_done, prio_items, window))
+
+    # FIFO: fresh news waits behind the outage backlog (~80 min median);
+    # priority: fresh items are processed within the minute they arrive
+    assert fifo_median > 60
+    assert prio_median <= 1
+    # Same throughput: both drain the same number of items
+    assert len(prio_done) == len(fifo_done)
+
+
+def test_starvation_guard_bounds_wait_for_old_items(policy):
+    # Arrivals match capacity: pure priority never reaches the old backlog
+    backlog = outage_backlog(policy, 200, hours=8)
+    ticks = 60
+
+    starved, _ = drain(policy, backlog, arrivals_per_tick=20, capacity=20, ticks=ticks, mode='priority')
+    guarded, _ = drain(policy, backlog, arrivals_per_tick=20, capacity=20, ticks=ticks, mode='guarded')
+
+    assert not any(i in starved for i in range(len(backlog)))
+    # Everything that passed BACKLOG_MAX_WAIT_HOURS during the run got served
+    last_cutoff = NOW + timedelta(minutes=ticks - 1) - timedelta(hours=policy.max_wait_hours)
+    overdue = [i for i, item in enumerate(backlog) if item['created'] < last_cutoff]
+    assert overdue and all(i in guarded for i in overdue)
@@ -0,0 +1,121 @@
+"""
+Unit tests for poller backpressure from downstream queue depths
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from rss.poller import RSSPoller
+from services.backpressure import (
+    BackpressureController, get_throttle_state,
+    STATE_NORMAL, STATE_THROTTLED, STATE_PAUSED,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+class FakeDb:
+    """Config table plus settable stage depths"""
+
+    def __init__(self):
+        self.config = {}
+        self.depths = {'raw_pending': 0, 'chunking_pending': 0, 'fts_pending': 0, 'embedding_pending': 0}
+
+    def get_config(self, key):
+        return self.config.get(key)
+
+    def set_config(self, key, value):
+        self.config[key] = value
+
+    def get_stage_backlog(self, cap):
+        return {k: min(v, cap) for k, v in self.depths.items()}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setenv("BACKPRESSURE_RAW_PENDING_SOFT", "100")
+    monkeypatch.setenv("BACKPRESSURE_RAW_PENDING_HARD", "500")
+    monkeypatch.setenv("BACKPRESSURE_RESUME_RATIO", "0.5")
+    monkeypatch.setenv("BACKPRESSURE_THROTTLE_EVERY", "4")
+    monkeypatch.setenv("BACKLOG_SOURCE_WEIGHTS", "wire.example=2")
+    return FakeDb()
+
+
+def run(db, raw_pending):
+    """One poll run (each run is a fresh process, so a fresh controller)"""
+    db.depths['raw_pending'] = raw_pending
+    controller = BackpressureController(db)
+    controller.evaluate()
+    return controller
+
+
+def feeds():
+    return [
+        {'id': 1, 'url': "https://wire.example/rss", 'last_entry_date': None},
+        {'id': 2, 'url': "https://hot.example/rss", 'last_entry_date': str(NOW - timedelta(hours=1))},
+    ] + [
+        {'id': i, 'url': f"https://slow{i}.example/rss", 'last_entry_date': str(NOW - timedelta(days=3))}
+        for i in range(3, 11)
+    ]
+
+
+def test_states_follow_queue_depth_with_hysteresis(db):
+    assert run(db, 10).state == STATE_NORMAL
+    assert run(db, 150).state == STATE_THROTTLED
+    assert run(db, 900).state == STATE_PAUSED
+    # Below hard but above soft: back to throttled, not straight to normal
+    assert run(db, 200).state == STATE_THROTTLED
+    # Under soft but above the resume mark: stay throttled while draining
+    controller = run(db, 80)
+    assert controller.state == STATE_THROTTLED
+    assert controller.reason.startswith("draining")
+    # Drained: resumes automatically
+    assert run(db, 40).state == STATE_NORMAL
+
+
+def test_paused_polls_only_high_priority_feeds(db):
+    controller = run(db, 900)
+    selected, deferred = controller.filter_feeds(feeds())
+
+    assert [f['id'] for f in selected] == [1, 2]
+    assert deferred == 8
+
+
+def test_throttled_rotates_low_priority_feeds(db):
+    polled = set()
+    for _ in range(4):
+        controller = run(db, 150)
+        selected, deferred = controller.filter_feeds(feeds())
+        assert {1, 2} <= {f['id'] for f in selected}
+        assert deferred == 6
+        polled |= {f['id'] for f in selected}
+
+    # Every low-priority feed got one poll within throttle_every runs
+    assert polled == set(range(1, 11))
+
+
+def test_depth_check_failure_polls_normally(db):
+    db.get_stage_backlog = MagicMock(side_effect=RuntimeError("statement timeout"))
+    controller = BackpressureController(db)
+
+    assert controller.evaluate() == STATE_NORMAL
+    assert controller.filter_feeds(feeds())[1] == 0
+
+
+def test_poller_reports_throttle_state(db):
+    run(db, 900)
+    db.depths['raw_pending'] = 900
+    db.get_active_feeds = MagicMock(return_value=feeds()[2:])
+    db.log_diagnostics = MagicMock()
+    poller = RSSPoller(db)
+    poller.http_client = MagicMock()
+
+    stats = poller.poll_active_feeds()
+
+    assert stats['feeds_polled'] == 0
+    assert stats['throttle']['state'] == STATE_PAUSED
+    assert stats['throttle']['feeds_deferred'] == 8
+    poller.http_client.get_with_conditional_headers.assert_not_called()
+    assert get_throttle_state(db)['state'] == STATE_PAUSED
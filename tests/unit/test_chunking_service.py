@@ -0,0 +1,237 @@
+"""
+Unit tests for ChunkingService concurrency and the deterministic fast path
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from local_llm_chunker import LocalLLMChunker
+from services.chunking_service import ChunkingService
+
+
+LONG_TEXT = "\n\n".join(
+    " ".join(f"Sentence {p}-{i} carries some reporting detail." for i in range(25))
+    for p in range(8)
+)
+
+
+def make_article(article_id, text=LONG_TEXT, source="example.com"):
+    return {
+        'article_id': article_id,
+        'clean_text': text,
+        'title_norm': f"Title {article_id}",
+        'source': source,
+        'language': 'en',
+        'url': f"https://{source}/{article_id}",
+        'processing_version': 1,
+    }
+
+
+@pytest.fixture
+def chunker(monkeypatch):
+    monkeypatch.setenv("CHUNK_STRATEGY", "auto")
+    monkeypatch.setenv("CHUNK_TARGET_WORDS", "120")
+    return LocalLLMChunker()
+
+
+class TestStrategyPolicy:
+
+    def test_short_article_uses_fast_path(self, chunker):
+        assert chunker.select_strategy("word " * 100, {}) == "deterministic"
+
+    def test_wire_source_uses_fast_path(self, chunker):
+        assert chunker.select_strategy(LONG_TEXT, {'source': 'www.reuters.com'}) == "deterministic"
+
+    def test_wire_dateline_uses_fast_path(self, chunker):
+        text = "WASHINGTON (AP) — " + LONG_TEXT
+        assert chunker.select_strategy(text, {'source': 'example.com'}) == "deterministic"
+
+    def test_long_original_reporting_uses_llm(self, chunker):
+        assert chunker.select_strategy(LONG_TEXT, {'source': 'example.com'}) == "llm"
+
+    def test_forced_strategy(self, monkeypatch):
+        monkeypatch.setenv("CHUNK_STRATEGY", "llm")
+        assert LocalLLMChunker().select_strategy("word " * 10, {}) == "llm"
+
+
+class TestDeterministicPacking:
+
+    def test_chunks_respect_target_and_keep_all_words(self, chunker):
+        chunks = chunker.create_chunks_deterministic(LONG_TEXT, {})
+
+        assert len(chunks) > 1
+        assert all(c['word_count_chunk'] <= 120 for c in chunks[:-1])
+        assert sum(c['word_count_chunk'] for c in chunks) == len(LONG_TEXT.split())
+        assert [c['chunk_index'] for c in chunks] == list(range(len(chunks)))
+        assert all(c['chunking_method'] == 'deterministic_packing' for c in chunks)
+
+    def test_single_wall_of_text_is_split_at_sentences(self, chunker):
+        text = LONG_TEXT.replace("\n\n", " ")
+        chunks = chunker.create_chunks_deterministic(text, {})
+
+        assert len(chunks) > 1
+        assert all(c['text'].endswith('.') for c in chunks)
+
+    def test_deterministic_output_is_stable(self, chunker):
+        assert chunker.create_chunks_deterministic(LONG_TEXT, {}) == \
+            chunker.create_chunks_deterministic(LONG_TEXT, {})
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_bounded_by_semaphore(monkeypatch, chunker):
+    monkeypatch.setenv("CHUNK_LLM_CONCURRENCY", "2")
+    db = MagicMock()
+    db.get_articles_ready_for_chunking.return_value = [make_article(f"a{i}") for i in range(6)]
+    service = ChunkingService(db_client=db)
+    service.chunker = chunker
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_llm(text, metadata):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return chunker.create_chunks_deterministic(text, metadata)
+
+    chunker.create_chunks = fake_llm
+
+    stats = await service.process_pending_chunks(batch_size=6)
+
+    assert stats['successful'] == 6
+    assert stats['llm_chunked'] == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_llm(chunker):
+    db = MagicMock()
+    db.get_articles_ready_for_chunking.return_value = [
+        make_article("wire", source="apnews.com"),
+        make_article("short", text="Short news item with enough characters to chunk. " * 5),
+    ]
+    service = ChunkingService(db_client=db)
+    service.chunker = chunker
+
+    async def fail_llm(text, metadata):
+        raise AssertionError("LLM should not be called on the fast path")
+
+    chunker.create_chunks = fail_llm
+
+    stats = await service.process_pending_chunks(batch_size=2)
+
+    assert stats['successful'] == 2
+    assert stats['fast_path_chunked'] == 2
+    assert stats['llm_chunked'] == 0
+
+
+@pytest.mark.asyncio
+async def test_pass_is_written_in_one_batch(chunker):
+    db = MagicMock()
+    articles = [make_article(f"b{i}", source="apnews.com") for i in range(3)]
+    for i, article in enumerate(articles):
+        article['index_id'] = 100 + i
+    db.get_articles_ready_for_chunking.return_value = articles
+    service = ChunkingService(db_client=db)
+    service.chunker = chunker
+
+    stats = await service.process_pending_chunks(batch_size=3)
+
+    db.upsert_article_chunks.assert_not_called()
+    db.mark_chunking_completed.assert_not_called()
+    db.upsert_article_chunks_batch.assert_called_once()
+    batch = db.upsert_article_chunks_batch.call_args.args[0]
+    assert [item['index_id'] for item in batch] == [100, 101, 102]
+    assert stats['successful'] == 3
+    db.notify_pipeline.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_write_counts_as_errors(chunker):
+    db = MagicMock()
+    db.get_articles_ready_for_chunking.return_value = [make_article("c0", source="apnews.com")]
+    db.upsert_article_chunks_batch.side_effect = RuntimeError("deadlock detected")
+    service = ChunkingService(db_client=db)
+    service.chunker = chunker
+
+    stats = await service.process_pending_chunks(batch_size=1)
+
+    assert stats['successful'] == 0
+    assert stats['errors'] == 1
+    db.notify_pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_bisected_to_the_bad_article(chunker):
+    db = MagicMock()
+    articles = [make_article(f"d{i}", source="apnews.com") for i in range(5)]
+    for i, article in enumerate(articles):
+        article['index_id'] = 200 + i
+    db.get_articles_ready_for_chunking.return_value = articles
+
+    def upsert(batch):
+        if any(item['article_id'] == "d3" for item in batch):
+            raise RuntimeError("value too long for type character varying")
+        written.extend(item['article_id'] for item in batch)
+
+    written = []
+    db.upsert_article_chunks_batch.side_effect = upsert
+    service = ChunkingService(db_client=db)
+    service.chunker = chunker
+
+    stats = await service.process_pending_chunks(batch_size=5)
+
+    assert sorted(written) == ["d0", "d1", "d2", "d4"]
+    assert stats['successful'] == 4
+    assert stats['errors'] == 1
+    assert [d['article_id'] for d in stats['error_details']] == ["d3"]
+    db.record_chunking_failures.assert_called_once_with([203])
+    db.notify_pipeline.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_database_error_is_not_bisected(chunker):
+    import psycopg2
+
+    db = MagicMock()
+    db.get_articles_ready_for_chunking.return_value = [
+        make_article(f"e{i}", source="apnews.com") for i in range(5)
+    ]
+    db.upsert_article_chunks_batch.side_effect = psycopg2.OperationalError("server closed the connection")
+    service = ChunkingService(db_client=db)
+    service.chunker = chunker
+
+    stats = await service.process_pending_chunks(batch_size=5)
+
+    db.upsert_article_chunks_batch.assert_called_once()
+    assert stats['successful'] == 0
+    assert stats['errors'] == 5
+
+
+def test_duplicate_article_key_is_still_marked_chunked(monkeypatch):
+    from contextlib import contextmanager
+    import psycopg2.extras
+    from pg_client_new import PgClient
+
+    cur = MagicMock()
+
+    @contextmanager
+    def transaction():
+        yield cur
+
+    client = PgClient.__new__(PgClient)
+    client._transaction = transaction
+    monkeypatch.setattr(psycopg2.extras, "execute_values", MagicMock())
+    chunk = {'chunk_index': 0, 'text': "Body.", 'word_count_chunk': 1, 'char_start': 0,
+             'char_end': 5, 'url': "https://example.com/f", 'title_norm': "F",
+             'source_domain': "example.com", 'language': 'en'}
+    items = [{'article_id': "f", 'processing_version': 1, 'chunks': [chunk], 'index_id': n}
+             for n in (300, 301)]
+
+    client.upsert_article_chunks_batch(items)
+
+    assert cur.execute.call_args.args[1] == ([300, 301],)
@@ -190,3 +190,38 @@ class TestRunCompetitorNews:
             assert 0.0 <= overlap["overlap_score"] <= 1.0
             assert len(overlap["domain"]) > 0
             assert len(overlap["topic"]) > 0
+
+    async def test_competitors_from_sql_aggregates(self):
+        """Test domain counts and topics taken from share-of-voice aggregates"""
+        docs = [
+            {
+                "article_id": "art-1",
+                "title": "AI Article",
+                "url": "https://techcrunch.com/ai",
+                "date": "2025-01-01",
+                "content": "AI ML",
+            },
+        ]
+        aggregates = {
+            "total": 100,
+            "domain_count": 4,
+            "domains": [
+                {"domain": "techcrunch.com", "articles": 40, "share": 0.4,
+                 "terms": ["chips", "model", "robots", "funding", "startup", "agents"]},
+                {"domain": "wired.com", "articles": 30, "share": 0.3,
+                 "terms": ["chips", "model", "policy", "privacy"]},
+                {"domain": "coindesk.com", "articles": 5, "share": 0.05, "terms": ["token"]},
+            ],
+        }
+        result = await run_competitor_news(
+            docs, domains=None, niche="AI", correlation_id="test-comp-5", aggregates=aggregates
+        )
+
+        assert result["success"] is True
+        assert result["top_domains"] == ["techcrunch.com", "wired.com", "coindesk.com"]
+        stances = {p["domain"]: p["stance"] for p in result["positioning"]}
+        assert stances == {"techcrunch.com": "leader", "wired.com": "fast_follower", "coindesk.com": "niche"}
+        # Average coverage is over all matching domains (100 / 4)
+        deltas = {d["domain"]: d["delta"] for d in result["sentiment_delta"]}
+        assert deltas["techcrunch.com"] == pytest.approx(0.6)
+        assert {o["topic"] for o in result["overlap_matrix"]} == {"chips", "model"}
@@ -0,0 +1,64 @@
+"""
+Unit tests for ingest-time entity extraction (GraphRAG entity index)
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.nlp.ner_service import Entity, normalize_entity_name
+from services.entity_index_service import EntityIndexService
+
+
+class FakeNER:
+    def __init__(self, entities):
+        self.entities = entities
+        self.calls = 0
+
+    async def extract_entities_batch(self, texts, lang="en", strategy=None):
+        self.calls += 1
+        return [self.entities for _ in texts]
+
+
+def test_normalize_entity_name():
+    assert normalize_entity_name("The  OpenAI,") == "openai"
+    assert normalize_entity_name("Google's") == "google"
+    assert normalize_entity_name('"Sam Altman"') == "sam altman"
+
+
+@pytest.mark.asyncio
+async def test_mentions_are_aggregated_by_normalized_name():
+    ner = FakeNER([
+        Entity("OpenAI", "ORGANIZATION", 0, 6),
+        Entity("the OpenAI", "ORGANIZATION", 10, 20),
+        Entity("Sam Altman", "PERSON", 30, 40),
+        Entity("Tuesday", "DATE", 50, 57),
+    ])
+    service = EntityIndexService(db_client=MagicMock(), ner_service=ner)
+
+    entities = await service.extract_article_entities({'title': 'T', 'clean_text': 'body'})
+
+    assert entities == [
+        {'norm': 'openai', 'name': 'OpenAI', 'label': 'organization', 'mentions': 2},
+        {'norm': 'sam altman', 'name': 'Sam Altman', 'label': 'person', 'mentions': 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_saved_in_one_call():
+    db = MagicMock()
+    db.get_articles_pending_entities.return_value = [
+        {'index_id': 1, 'article_id': 'a1', 'title': 'OpenAI news', 'clean_text': 'text', 'language': 'en'},
+        {'index_id': 2, 'article_id': 'a2', 'title': 'More', 'clean_text': 'text', 'language': 'en'},
+    ]
+    db.save_article_entities.return_value = {'postings': 2}
+    ner = FakeNER([Entity("OpenAI", "ORG", 0, 6)])
+    service = EntityIndexService(db_client=db, ner_service=ner)
+
+    stats = await service.process_pending(batch_size=10)
+
+    db.save_article_entities.assert_called_once()
+    items = db.save_article_entities.call_args.args[0]
+    assert [item['index_id'] for item in items] == [1, 2]
+    assert stats['successful'] == 2
+    assert ner.calls == 1
@@ -0,0 +1,293 @@
+"""
+Unit tests for the per-host politeness scheduler, including a multi-host
+stand-in server that rate-limits per Host header
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from net.http import HttpClient
+from net.resolver import CachingResolver
+from net.scheduler import HostScheduler, parse_retry_after
+from worker import ArticleWorker
+
+PAGE = b"<html><body>" + b"<p>news</p>" * 50 + b"</body></html>"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptivePacing:
+
+    def test_throttle_backs_off_and_honours_retry_after(self):
+        clock = FakeClock()
+        scheduler = HostScheduler(per_host=4, min_interval=0.2, max_interval=30, clock=clock)
+
+        scheduler.observe("a.test", 429, 0.1, retry_after="10")
+
+        st = scheduler._hosts["a.test"]
+        assert st.interval == 0.4
+        assert st.concurrency == 1
+        assert st.next_allowed == clock.now + 10
+        assert scheduler.get_stats()['throttled'] == 1
+
+    def test_fast_successes_recover_towards_minimum(self):
+        scheduler = HostScheduler(per_host=3, min_interval=0.2, clock=FakeClock(), recover_after=2)
+        scheduler.observe("a.test", 429, 0.1)
+        scheduler.observe("a.test", 429, 0.1)
+        assert scheduler._hosts["a.test"].interval == 0.8
+
+        for _ in range(6):
+            scheduler.observe("a.test", 200, 0.1)
+
+        st = scheduler._hosts["a.test"]
+        assert st.interval == pytest.approx(0.8 * 0.75 ** 3)
+        assert st.concurrency == 3
+
+    def test_slow_responses_widen_spacing(self):
+        scheduler = HostScheduler(min_interval=0.2, slow_latency=2, clock=FakeClock())
+        scheduler.observe("slow.test", 200, 5.0)
+        assert scheduler._hosts["slow.test"].interval == pytest.approx(0.3)
+        assert "slow.test" in scheduler.get_stats()['adapted_hosts']
+
+    def test_parse_retry_after(self):
+        now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        assert parse_retry_after("120") == 120
+        assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now=now) == 30
+        assert parse_retry_after("garbage") is None
+        assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_slots_enforce_per_host_concurrency_and_spacing():
+    scheduler = HostScheduler(max_concurrency=10, per_host=2, min_interval=0.05)
+    active = Counter()
+    peak = Counter()
+    starts = []
+
+    async def fetch(host):
+        async with scheduler.slot(host):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            if host == "a.test":
+                starts.append(time.monotonic())
+            await asyncio.sleep(0.02)
+            active[host] -= 1
+
+    await asyncio.gather(*(fetch("a.test") for _ in range(6)), *(fetch("b.test") for _ in range(2)))
+
+    assert peak["a.test"] <= 2
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045
+
+
+@pytest.fixture
+def standin():
+    """One server for many hosts: 429 when a Host has more than 2 requests in flight"""
+    lock = threading.Lock()
+    in_flight = Counter()
+    statuses = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            host = self.headers.get("Host", "").split(":")[0]
+            with lock:
+                in_flight[host] += 1
+                over = in_flight[host] > 2
+            try:
+                time.sleep(0.05)
+                status = 429 if over else 200
+                statuses[status] += 1
+                body = b"slow down" if over else PAGE
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with lock:
+                    in_flight[host] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1], statuses
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def worker(monkeypatch, tmp_path):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("net.resolver.is_blocked_ip", lambda ip: ip != "127.0.0.1")
+    monkeypatch.setenv("FETCH_PER_HOST_CONCURRENCY", "2")
+    monkeypatch.setenv("FETCH_MIN_INTERVAL", "0")
+    instance = ArticleWorker(MagicMock(), max_workers=8)
+    instance.http_client.close()
+    instance.http_client = HttpClient(resolver=CachingResolver(resolve_fn=lambda host: (["127.0.0.1"], None)))
+    instance.http_client.rate_observer = instance.scheduler.observe
+    yield instance
+    instance.close()
+
+
+def burst_urls(port):
+    # Queue order as pulled from the DB: a big publisher burst ahead of everyone else
+    urls = [f"http://big.test:{port}/a{i}" for i in range(16)]
+    for host in ("b.test", "c.test", "d.test"):
+        urls += [f"http://{host}:{port}/a{i}" for i in range(3)]
+    return urls
+
+
+@pytest.mark.asyncio
+async def test_unscheduled_burst_triggers_rate_limits(standin, worker):
+    port, statuses = standin
+    loop = asyncio.get_running_loop()
+    client = worker.http_client
+    client.rate_observer = None
+
+    # Queue-order fan-out with only a global limit (what the worker did before)
+    await asyncio.gather(*(
+        loop.run_in_executor(worker._fetch_executor, client.get, url)
+        for url in burst_urls(port)
+    ))
+
+    assert statuses[429] > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduled_burst_interleaves_hosts_without_rate_limits(standin, worker):
+    port, statuses = standin
+    finished = []
+
+    async def fetch(url):
+        response, _, _ = await worker._fetch(url)
+        finished.append(url.split("/")[2].split(":")[0])
+        return response
+
+    responses = await asyncio.gather(*(fetch(url) for url in burst_urls(port)))
+
+    assert all(r is not None and r.status_code == 200 for r in responses)
+    assert statuses[429] == 0
+    # Small publishers are not stuck behind the big burst
+    last_small = max(i for i, host in enumerate(finished) if host != "big.test")
+    assert last_small < len(finished) - 4
+    assert worker.scheduler.get_stats()['hosts'] == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_left_to_scheduler(monkeypatch, tmp_path):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("net.resolver.is_blocked_ip", lambda ip: ip != "127.0.0.1")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(429)
+            self.send_header("Retry-After", "30")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    client = HttpClient(resolver=CachingResolver(resolve_fn=lambda host: (["127.0.0.1"], None)))
+    scheduler = HostScheduler(min_interval=0)
+    client.rate_observer = scheduler.observe
+    try:
+        started = time.monotonic()
+        response, error = client.get(f"http://limited.test:{httpd.server_address[1]}/")
+        assert time.monotonic() - started < 5
+    finally:
+        client.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert response is None and "429" in error
+    st = scheduler._hosts["limited.test"]
+    assert st.throttled == 1
+    assert st.next_allowed - time.monotonic() > 20
+
+
+def throttling_server(throttled_requests):
+    """Answers 429 with Retry-After: 1 to the first throttled_requests requests, then 200"""
+    served = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            served['requests'] += 1
+            if served['requests'] <= throttled_requests:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, served
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_429_after_retry_after(worker):
+    httpd, served = throttling_server(1)
+    url = f"http://limited.test:{httpd.server_address[1]}/story"
+    try:
+        started = time.monotonic()
+        response, final_url, _ = await worker._fetch(url)
+        elapsed = time.monotonic() - started
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert response is not None and response.status_code == 200
+    assert served['requests'] == 2
+    assert elapsed >= 0.9
+    # Nothing left for the retry queue to refetch
+    assert worker.http_client.retry_queue.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_still_throttled_article_goes_back_to_pending(worker):
+    httpd, served = throttling_server(2)
+    url = f"http://limited.test:{httpd.server_address[1]}/story"
+    try:
+        result = await worker._process_single_article({'id': 7, 'url': url})
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert served['requests'] == 2
+    assert result['status'] == 'pending'
+    worker.db.update_article_status.assert_called_with(7, 'pending', result['error'])
+    assert worker.http_client.retry_queue.size() == 0
@@ -0,0 +1,110 @@
+"""
+Unit tests for the compressed, content-addressed fulltext store
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import utils.fulltext as fulltext
+from pg_client_new import PgClient
+from utils.fulltext import CODEC_RAW, CODEC_ZLIB, decode_fulltext, encode_fulltext, fulltext_key
+from utils.text import compute_text_hash
+
+BODY = "Officials said on Tuesday that talks would resume next week. " * 60
+
+
+class TestCodec:
+
+    def test_round_trip_compresses(self):
+        codec, payload = encode_fulltext(BODY)
+        assert codec != CODEC_RAW
+        assert len(payload) < len(BODY) / 5
+        assert decode_fulltext(codec, payload) == BODY
+
+    def test_short_bodies_stored_raw(self):
+        assert encode_fulltext("Brief.") == (CODEC_RAW, b"Brief.")
+        assert decode_fulltext(CODEC_RAW, memoryview(b"Brief.")) == "Brief."
+
+    def test_zlib_fallback_without_zstandard(self, monkeypatch):
+        monkeypatch.setattr(fulltext, "zstd", None)
+        codec, payload = encode_fulltext(BODY)
+        assert codec == CODEC_ZLIB
+        assert decode_fulltext(codec, payload) == BODY
+        with pytest.raises(RuntimeError):
+            decode_fulltext("zstd", b"\x28\xb5\x2f\xfd")
+
+    def test_key_is_the_text_hash(self):
+        assert fulltext_key(BODY) == compute_text_hash(BODY)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("FULLTEXT_STORE", "true")
+    instance = PgClient.__new__(PgClient)
+    instance.use_fulltext_store = True
+    return instance
+
+
+def test_offload_moves_body_out_of_the_row(client):
+    cur = MagicMock()
+    data = {'full_text': BODY, 'text_hash': compute_text_hash(BODY)}
+
+    client._offload_fulltext(cur, data, 'full_text')
+
+    assert data['full_text'] is None
+    sql, params = cur.execute.call_args[0]
+    assert "ON CONFLICT (text_hash) DO NOTHING" in sql
+    assert params[0] == data['text_hash']
+    assert decode_fulltext(params[1], params[2].adapted) == BODY
+
+
+def test_offload_keeps_body_inline_when_hash_is_not_its_address(client):
+    cur = MagicMock()
+    data = {'clean_text': BODY, 'text_hash': "legacy-hash"}
+
+    client._offload_fulltext(cur, data, 'clean_text')
+
+    assert data['clean_text'] == BODY
+    cur.execute.assert_not_called()
+
+
+def test_offload_disabled(client):
+    client.use_fulltext_store = False
+    data = {'full_text': BODY}
+    client._offload_fulltext(MagicMock(), data, 'full_text')
+    assert data['full_text'] == BODY
+
+
+def test_hydrate_fills_only_missing_bodies(client):
+    key = compute_text_hash(BODY)
+    client.get_fulltexts = MagicMock(return_value={key: BODY})
+    rows = [
+        {'text_hash': key, 'clean_text': ''},
+        {'text_hash': 'other', 'clean_text': 'inline body'},
+        {'text_hash': None, 'clean_text': ''},
+    ]
+
+    client.hydrate_fulltext(rows)
+
+    assert [r['clean_text'] for r in rows] == [BODY, 'inline body', '']
+    client.get_fulltexts.assert_called_once_with([key])
+
+
+def test_whitespace_variant_of_a_stored_body_stays_inline(client):
+    stored = "\n\n".join(["Officials said on Tuesday that talks would resume next week."] * 60)
+    flattened = " ".join(["Officials said on Tuesday that talks would resume next week."] * 60)
+    assert fulltext_key(stored) == fulltext_key(flattened)
+    cur = MagicMock()
+    # Key already taken (no RETURNING row), by the paragraphed body
+    cur.fetchone.side_effect = [None, encode_fulltext(stored)]
+    data = {'clean_text': flattened, 'text_hash': fulltext_key(flattened)}
+
+    client._offload_fulltext(cur, data, 'clean_text')
+
+    assert data['clean_text'] == flattened
+
+    cur.fetchone.side_effect = [None, encode_fulltext(stored)]
+    data = {'clean_text': stored, 'text_hash': fulltext_key(stored)}
+    client._offload_fulltext(cur, data, 'clean_text')
+    assert data['clean_text'] is None
@@ -207,3 +207,91 @@ async def test_graph_builder_with_special_characters(graph_builder):
 
     # Should handle special characters gracefully
     assert len(graph["nodes"]) > 0
+
+
+class FakeEntityIndex:
+    """Entity index stub returning fixed postings"""
+
+    def __init__(self, postings, entities, pairs=None):
+        self.result = {"postings": postings, "entities": entities, "pairs": pairs or {}}
+        self.calls = []
+
+    async def lookup(self, article_ids):
+        self.calls.append(list(article_ids))
+        return self.result
+
+
+INDEX_ENTITIES = {
+    "openai": {"name": "OpenAI", "type": "organization", "doc_freq": 40},
+    "microsoft": {"name": "Microsoft", "type": "organization", "doc_freq": 30},
+    "google": {"name": "Google", "type": "organization", "doc_freq": 50},
+    "sam altman": {"name": "Sam Altman", "type": "person", "doc_freq": 10},
+}
+
+
+class TestGraphBuilderFromIndex:
+    """GraphBuilder backed by the persistent entity index"""
+
+    @pytest.mark.asyncio
+    async def test_fully_indexed_docs_skip_ner(self, sample_docs):
+        index = FakeEntityIndex(
+            postings={
+                "doc1": ["openai", "sam altman"],
+                "doc2": ["google"],
+                "doc3": ["microsoft", "openai"],
+            },
+            entities=INDEX_ENTITIES,
+            pairs={("microsoft", "openai"): 12},
+        )
+        builder = GraphBuilder(model_router=MagicMock(), entity_index=index)
+        builder.ner_service = MagicMock()
+        builder.ner_service.extract_entities = AsyncMock(side_effect=AssertionError("NER must not run"))
+
+        graph = await builder.build_graph(sample_docs, max_nodes=50, max_edges=100)
+
+        assert index.calls == [["doc1", "doc2", "doc3"]]
+        assert graph["metadata"]["entity_source"] == "index"
+        labels = {n["label"]: n for n in graph["nodes"] if n["type"] == "entity"}
+        assert labels["OpenAI"]["frequency"] == 2
+        assert labels["OpenAI"]["entity_type"] == "organization"
+
+    @pytest.mark.asyncio
+    async def test_index_relations_carry_corpus_counts(self, sample_docs):
+        index = FakeEntityIndex(
+            postings={"doc1": ["openai", "sam altman"], "doc2": [], "doc3": ["microsoft", "openai"]},
+            entities=INDEX_ENTITIES,
+            pairs={("microsoft", "openai"): 12},
+        )
+        builder = GraphBuilder(model_router=MagicMock(), use_advanced_ner=False, entity_index=index)
+
+        _, relations = builder._graph_inputs_from_index(sample_docs, index.result)
+
+        by_pair = {(r["src"], r["tgt"]): r for r in relations}
+        assert by_pair[("Microsoft", "OpenAI")]["corpus_count"] == 12
+        assert by_pair[("Microsoft", "OpenAI")]["type"] == "relates_to"
+        assert by_pair[("OpenAI", "Sam Altman")]["doc_ids"] == ["doc1"]
+        # Tie on local weight is broken by corpus co-occurrence
+        assert relations[0]["src"] == "Microsoft"
+
+    @pytest.mark.asyncio
+    async def test_unindexed_docs_fall_back_to_ner(self, sample_docs):
+        index = FakeEntityIndex(postings={"doc1": ["openai"]}, entities=INDEX_ENTITIES)
+        builder = GraphBuilder(model_router=MagicMock(), use_advanced_ner=False, entity_index=index)
+
+        graph = await builder.build_graph(sample_docs, max_nodes=50, max_edges=100)
+
+        assert graph["metadata"]["entity_source"] == "mixed"
+        labels = [n["label"] for n in graph["nodes"] if n["type"] == "entity"]
+        assert "OpenAI" in labels
+        assert any("Google" in label for label in labels)
+
+    @pytest.mark.asyncio
+    async def test_index_failure_falls_back_to_ner(self, sample_docs):
+        index = MagicMock()
+        index.lookup = AsyncMock(side_effect=RuntimeError("relation does not exist"))
+        builder = GraphBuilder(model_router=MagicMock(), use_advanced_ner=False, entity_index=index)
+
+        graph = await builder.build_graph(sample_docs, max_nodes=50, max_edges=100)
+
+        assert graph["metadata"]["entity_source"] == "ner"
+        assert len(graph["nodes"]) > 0
@@ -0,0 +1,112 @@
+"""
+Unit tests for the in-process hot tier (parsing, ranking, memory budget,
+one shared tier per process)
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+
+import services.hot_tier as hot_tier_module
+from services.hot_tier import (
+    HotChunk, HotChunkTier, get_hot_tier, parse_and_tsquery, parse_tsvector, rank_cd, ts_config_for,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+class TestParsing:
+
+    def test_tsvector_positions_and_weights(self):
+        lexemes = parse_tsvector("'brien':12 'o''neil':3A 'war':5,10B 'stripped'")
+        assert lexemes == {
+            'brien': [(12, 0)], "o'neil": [(3, 3)], 'war': [(5, 0), (10, 2)], 'stripped': [],
+        }
+
+    def test_only_plain_and_queries_are_supported(self):
+        assert parse_and_tsquery("'well-known' & 'well' & 'known' & 'well'") == ['well-known', 'well', 'known']
+        assert parse_and_tsquery("") == []
+        assert parse_and_tsquery("'war' | 'peace'") is None
+        assert parse_and_tsquery("'new' <-> 'york'") is None
+        assert parse_and_tsquery("'pre':*") is None
+
+    def test_language_configs_mirror_sql(self):
+        assert ts_config_for('ru-RU') == 'pg_catalog.russian'
+        assert ts_config_for('EN') == 'pg_catalog.english'
+        assert ts_config_for(None) == 'pg_catalog.simple'
+
+
+class TestRankCd:
+    # Expected values from Postgres 16 ts_rank_cd on the same tsvector/tsquery
+
+    def test_single_term_sums_occurrences(self):
+        assert rank_cd(parse_tsvector("'war':5,10"), ['war']) == 0.2
+
+    def test_adjacent_terms_outrank_distant_ones(self):
+        near = rank_cd(parse_tsvector("'oil':3 'price':4"), ['oil', 'price'])
+        far = rank_cd(parse_tsvector("'oil':3 'price':40"), ['oil', 'price'])
+        assert near == 0.1
+        assert far == 0.0027027028
+
+    def test_weights(self):
+        assert rank_cd(parse_tsvector("'oil':1A 'price':2"), ['oil', 'price']) == 0.18181819
+
+    def test_missing_term_scores_zero(self):
+        assert rank_cd(parse_tsvector("'oil':1"), ['oil', 'gas']) == 0.0
+
+
+def chunk(chunk_id, hours_old, text="x" * 1000):
+    c = HotChunk(
+        id=chunk_id, article_id=f"a{chunk_id}", chunk_index=0, text=text, url="u", title_norm="t",
+        source_domain="example.com", published_at=NOW - timedelta(hours=hours_old),
+        ts_config='pg_catalog.english', lexemes={'war': [(1, 0)]},
+        vector=np.ones(16, dtype=np.float32),
+    )
+    c.nbytes = 2000
+    return c
+
+
+def test_budget_evicts_oldest_and_narrows_coverage():
+    tier = HotChunkTier(db=None, hours=72, max_bytes=5 * 2000)
+    for n, age in enumerate([1, 5, 10, 30, 50, 60, 70]):
+        tier._put(chunk(n, age))
+    tier._refreshed_at = NOW
+
+    tier._evict(NOW - timedelta(hours=72))
+
+    assert sorted(tier._chunks) == [0, 1, 2, 3, 4]
+    assert tier.bytes_used == 5 * 2000
+    assert not tier.covers(NOW - timedelta(hours=24))  # never refreshed
+    tier._window_start = NOW - timedelta(hours=72)
+    assert tier.covers(NOW - timedelta(hours=24))
+    assert not tier.covers(NOW - timedelta(hours=65))
+    # Chunks older than the eviction boundary are not re-admitted
+    tier._put(chunk(9, 61))
+    assert 9 not in tier._chunks
+    assert tier._postings['war'] == {0, 1, 2, 3, 4}
+
+
+def test_stale_tier_does_not_answer():
+    tier = HotChunkTier(db=None, hours=72, refresh_seconds=10)
+    tier._window_start = NOW - timedelta(hours=72)
+    tier._refreshed_at = NOW - timedelta(minutes=5)
+    assert not tier.covers(NOW - timedelta(hours=24))
+    assert tier.search_vectors([1.0] * 16, 24, 5) is None
+
+
+def test_one_tier_per_process(monkeypatch):
+    monkeypatch.setattr(hot_tier_module, "_shared_tier", None)
+    monkeypatch.setattr(HotChunkTier, "start", lambda self: None)
+    client = MagicMock()
+    monkeypatch.setattr("pg_client_new.PgClient", client)
+
+    monkeypatch.setenv("HOT_TIER_ENABLED", "false")
+    assert get_hot_tier() is None
+
+    monkeypatch.setenv("HOT_TIER_ENABLED", "true")
+    monkeypatch.setenv("HOT_TIER_MAX_MB", "64")
+    tier = get_hot_tier()
+    assert get_hot_tier() is tier
+    assert tier.max_bytes == 64 * 1024 * 1024
+    client.assert_called_once()
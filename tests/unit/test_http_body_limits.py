@@ -0,0 +1,134 @@
+"""
+Unit tests for streaming body caps and early content-type aborts,
+against a local HTTP stand-in
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from net.http import HttpClient
+from net.resolver import CachingResolver
+
+HTML = b"<html><body>" + b"<p>news</p>" * 100 + b"</body></html>"
+
+ROUTES = {
+    "/ok": ("text/html; charset=utf-8", HTML, True),
+    "/huge": ("text/html", b"<html>" + b"x" * 300_000, False),  # no Content-Length
+    "/huge-declared": ("text/html", b"<html>" + b"x" * 300_000, True),
+    "/video": ("video/mp4", b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 200_000, True),
+    "/pdf-as-html": ("text/html", b"%PDF-1.7\n" + b"\x00" * 50_000, True),
+    "/feed": ("application/rss+xml", b"<?xml version='1.0'?><rss></rss>", True),
+}
+
+
+@pytest.fixture
+def server():
+    sent = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            content_type, body, with_length = ROUTES[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            if with_length:
+                self.send_header("Content-Length", str(len(body)))
+            else:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            written = 0
+            try:
+                for i in range(0, len(body), 16384):
+                    self.wfile.write(body[i:i + 16384])
+                    written += len(body[i:i + 16384])
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            sent[self.path] = written
+            if not with_length:
+                self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1], sent
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HTTP_MAX_BODY_BYTES", "100000")
+    monkeypatch.setenv("HTTP_MAX_BODY_BYTES_OVERRIDES", "bigpages.test=1000000")
+    # Local stand-in: stub DNS to loopback and let the SSRF guard allow it
+    monkeypatch.setattr("net.resolver.is_blocked_ip", lambda ip: ip != "127.0.0.1")
+    resolver = CachingResolver(resolve_fn=lambda host: (["127.0.0.1"], None))
+    http = HttpClient(resolver=resolver)
+    yield http
+    http.close()
+
+
+def test_html_page_is_read(server, client):
+    port, _ = server
+    response, _ = client.get(f"http://news.test:{port}/ok", expect_html=True)
+
+    assert response is not None
+    assert response.content == HTML
+    assert "news" in response.text
+
+
+def test_streamed_body_stops_at_ceiling(server, client):
+    port, _ = server
+    response, error = client.get(f"http://news.test:{port}/huge", expect_html=True)
+
+    assert response is None
+    assert "exceeds 100000 bytes" in error
+    assert client.get_fetch_stats()["aborted_too_large"] == 1
+
+
+def test_declared_length_over_ceiling_is_not_read(server, client):
+    port, _ = server
+    response, error = client.get(f"http://news.test:{port}/huge-declared")
+
+    assert response is None
+    assert "too large" in error
+
+
+def test_per_domain_override_raises_ceiling(server, client):
+    port, _ = server
+    response, _ = client.get(f"http://www.bigpages.test:{port}/huge", expect_html=True)
+
+    assert response is not None
+    assert len(response.content) == 300_006
+
+
+def test_non_html_content_type_aborts_before_body(server, client):
+    port, _ = server
+    response, error = client.get(f"http://news.test:{port}/video", expect_html=True)
+
+    assert response is None
+    assert "Unsupported content type video/mp4" in error
+    assert client.get_fetch_stats()["aborted_content_type"] == 1
+
+
+def test_mislabelled_binary_is_sniffed(server, client):
+    port, _ = server
+    response, error = client.get(f"http://news.test:{port}/pdf-as-html", expect_html=True)
+
+    assert response is None
+    assert "Binary body labelled text/html" in error
+    assert client.get_fetch_stats()["aborted_sniffed"] == 1
+
+
+def test_feeds_are_not_subject_to_html_check(server, client):
+    port, _ = server
+    response, _ = client.get(f"http://news.test:{port}/feed")
+
+    assert response is not None
+    assert b"<rss>" in response.content
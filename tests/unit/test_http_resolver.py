@@ -0,0 +1,161 @@
+"""
+Unit tests for the caching resolver and IP-pinned SSRF guard
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from net.http import HttpClient
+from net.resolver import BlockedAddressError, CachingResolver, is_blocked_ip
+
+
+class StubResolver:
+    """host -> ips table; counts lookups"""
+
+    def __init__(self, table, delay=0.0):
+        self.table = table
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, host):
+        self.calls.append(host)
+        if self.delay:
+            time.sleep(self.delay)
+        if host not in self.table:
+            raise socket.gaierror(socket.EAI_NONAME, "NXDOMAIN")
+        return self.table[host], None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def local_server():
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.headers.get("Host"))
+            body = b"<html>ok</html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1], seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_positive_and_negative_results_are_cached_until_ttl():
+    stub = StubResolver({"news.example": ["93.184.216.34"]})
+    clock = FakeClock()
+    resolver = CachingResolver(resolve_fn=stub, ttl=60, negative_ttl=5, clock=clock)
+
+    assert resolver.resolve("news.example") == ["93.184.216.34"]
+    assert resolver.resolve("NEWS.example.") == ["93.184.216.34"]
+    with pytest.raises(socket.gaierror):
+        resolver.resolve("gone.example")
+    with pytest.raises(socket.gaierror):
+        resolver.resolve("gone.example")
+    assert stub.calls == ["news.example", "gone.example"]
+    assert resolver.negative_hits == 1
+
+    clock.now += 10  # negative entry expired, positive still fresh
+    with pytest.raises(socket.gaierror):
+        resolver.resolve("gone.example")
+    resolver.resolve("news.example")
+    assert stub.calls == ["news.example", "gone.example", "gone.example"]
+
+    clock.now += 60
+    resolver.resolve("news.example")
+    assert stub.calls.count("news.example") == 2
+
+
+def test_record_ttl_shortens_cache_lifetime():
+    clock = FakeClock()
+    calls = []
+
+    def resolve(host):
+        calls.append(host)
+        return ["93.184.216.34"], 2
+
+    resolver = CachingResolver(resolve_fn=resolve, ttl=300, clock=clock)
+    resolver.resolve("short.example")
+    clock.now += 3
+    resolver.resolve("short.example")
+    assert len(calls) == 2
+
+
+def test_concurrent_lookups_share_one_resolution():
+    stub = StubResolver({"slow.example": ["93.184.216.34"]}, delay=0.1)
+    resolver = CachingResolver(resolve_fn=stub)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(resolver.resolve("slow.example")))
+               for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 10
+    assert stub.calls == ["slow.example"]
+
+
+def test_private_addresses_are_blocked():
+    stub = StubResolver({"internal.example": ["93.184.216.34", "10.0.0.5"]})
+    resolver = CachingResolver(resolve_fn=stub)
+
+    with pytest.raises(BlockedAddressError):
+        resolver.validated_ips("internal.example")
+    assert is_blocked_ip("::ffff:127.0.0.1")
+    assert is_blocked_ip("169.254.169.254")
+    assert not is_blocked_ip("93.184.216.34")
+
+
+def test_client_blocks_private_host_without_connecting(tmp_path, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.chdir(tmp_path)
+    stub = StubResolver({"intranet.example": ["192.168.1.10"]})
+    client = HttpClient(resolver=CachingResolver(resolve_fn=stub))
+
+    response, error = client.get("http://intranet.example/admin")
+
+    assert response is None
+    assert error == "Blocked host: intranet.example"
+
+
+def test_client_connects_to_the_validated_ip(local_server, tmp_path, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.chdir(tmp_path)
+    port, seen = local_server
+    # "publisher.test" does not exist in real DNS; only the stub knows it
+    stub = StubResolver({"publisher.test": ["127.0.0.1"]})
+    client = HttpClient(resolver=CachingResolver(resolve_fn=stub))
+    # Allow loopback for the local stand-in server only
+    monkeypatch.setattr("net.resolver.is_blocked_ip", lambda ip: ip != "127.0.0.1")
+
+    response, final_url = client.get(f"http://publisher.test:{port}/story")
+    client.get(f"http://publisher.test:{port}/other")
+
+    assert response is not None and response.status_code == 200
+    assert seen == [f"publisher.test:{port}", f"publisher.test:{port}"]
+    assert stub.calls == ["publisher.test"]
+    client.close()
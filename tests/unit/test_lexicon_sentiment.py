@@ -0,0 +1,123 @@
+"""
+Unit tests for ingest-time lexicon sentiment: scoring, per-article rollup
+sums and /analyze sentiment answered from the rollups
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.agents.sentiment_emotion import run_sentiment_emotion, sentiment_trend
+from pg_client_new import PgClient
+from utils.sentiment import score_sentiment, word_valence
+
+
+def test_score_sign_and_range():
+    assert score_sentiment("", "Oil prices plunge as recession fears grow") < -0.3
+    assert score_sentiment("", "Stocks rally on strong earnings") > 0.3
+    assert score_sentiment("", "Council meets on Tuesday") == 0.0
+    assert score_sentiment("", "") is None
+    assert -1.0 <= score_sentiment(" ".join(["disaster"] * 500), "Worst crash") <= 1.0
+
+
+def test_negation_and_modifiers():
+    assert score_sentiment("", "Talks failed") < 0
+    assert score_sentiment("", "Talks have not failed") > 0
+    assert score_sentiment("", "Talks didn't fail") > 0
+    assert score_sentiment("", "A very bad week") < score_sentiment("", "A bad week")
+    assert score_sentiment("", "A slight drop in prices") > score_sentiment("", "A sharp drop in prices")
+
+
+def test_russian_stems():
+    assert word_valence("кризиса") == word_valence("кризис") < 0
+    assert word_valence("прибыли") > 0
+    assert score_sentiment("", "Не ожидается падения рынка") > 0
+    assert score_sentiment("", "Кризис в экономике усиливается") < 0
+
+
+def test_headline_weighs_more_and_body_is_capped():
+    body = "The company reported steady results. " * 10
+    assert score_sentiment(body, "Company posts record losses") < score_sentiment(body + " losses", "Company update")
+    # Only the first max_words of the body count
+    assert score_sentiment("report " * 400 + "disaster", "", max_words=400) == 0.0
+
+
+def test_sentiment_rollup_sums_follow_counted_rows():
+    published = datetime(2025, 3, 1, 9, 20, tzinfo=timezone.utc)
+    hour = published.replace(minute=0)
+    articles = [
+        {"index_id": 1, "article_id": "a1", "published_at": published, "source": "wire.com",
+         "keywords": ["oil"], "sentiment": -0.5},
+        {"index_id": 2, "article_id": "a2", "published_at": published, "source": "wire.com",
+         "keywords": ["oil"], "sentiment": 0.25},
+        # Stored before ingest-time scoring: counted, not scored
+        {"index_id": 3, "article_id": "a3", "published_at": published, "source": "wire.com",
+         "keywords": ["oil"], "sentiment": None},
+        # Already indexed: nothing added
+        {"index_id": 4, "article_id": "a4", "published_at": published, "source": "wire.com",
+         "keywords": ["oil"], "sentiment": 0.9},
+    ]
+    postings = [("a1", "opec"), ("a3", "opec")]
+
+    counts = PgClient._volume_rollup_counts(articles, {1, 2, 3}, postings)
+    sums = PgClient._sentiment_rollup_sums(articles, {1, 2, 3}, postings)
+    assert counts[("keyword", "oil", hour)] == 3
+    assert sums[("keyword", "oil", hour)] == (2, pytest.approx(-0.25))
+    assert sums[("source", "wire.com", hour)] == (2, pytest.approx(-0.25))
+    assert counts[("entity", "opec", hour)] == 2
+    assert sums[("entity", "opec", hour)] == (1, -0.5)
+
+
+def test_trend_timeline_uses_trailing_windows():
+    # 72 hours: negative two days ago, positive in the last 24h
+    scored = [1] * 72
+    sums = [-0.5] * 48 + [0.5] * 24
+    trend = sentiment_trend({"kind": "keyword", "term": "oil", "scored": scored, "sentiment": sums})
+
+    assert trend["overall"] == pytest.approx(-0.167, abs=1e-3)
+    assert trend["n_docs"] == 72
+    assert [t["window"] for t in trend["timeline"]] == ["6h", "12h", "24h", "3d"]
+    assert trend["timeline"][2] == {"window": "24h", "score": 0.5, "n_docs": 24}
+    assert sentiment_trend({"kind": "keyword", "term": "oil", "scored": [0, 1, 1], "sentiment": [0, 1, 1]}) is None
+
+
+def _docs(n):
+    return [{"article_id": f"art-{i}", "title": f"Story {i}", "snippet": "text", "url": f"https://x.com/{i}",
+             "date": "2025-03-01"} for i in range(n)]
+
+
+SERIES = {"kind": "keyword", "term": "oil", "hourly": [2] * 24, "scored": [2] * 24, "sentiment": [-0.8] * 24}
+
+
+class TestSentimentFromRollups:
+
+    async def test_rollups_answer_without_the_llm(self):
+        with patch("core.ai_models.model_manager.ModelManager") as manager:
+            result = await run_sentiment_emotion(_docs(3), "test-sent-1", series=SERIES, explain=False)
+        manager.assert_not_called()
+        assert result["success"] is True
+        assert result["model_used"] == "lexicon"
+        assert result["overall"] == pytest.approx(-0.4)
+        assert result["timeline"][-1] == {"window": "24h", "score": -0.4, "n_docs": 48}
+        assert result["aspects"] == []
+
+    async def test_explanation_keeps_the_rollup_score(self):
+        output = ('{"overall": 0.6, "emotions": {"joy": 0.1, "fear": 0.7, "anger": 0.1, "sadness": 0.1, '
+                  '"surprise": 0.0}, "aspects": [], "timeline": []}')
+        with patch("core.ai_models.model_manager.ModelManager") as manager:
+            manager.return_value.invoke_model = AsyncMock(return_value=(output, []))
+            manager.return_value.budget_tracker.invocations = []
+            result = await run_sentiment_emotion(_docs(3), "test-sent-2", series=SERIES, explain=True)
+        prompt = manager.return_value.invoke_model.call_args.kwargs["prompt"]
+        assert "LEXICON SENTIMENT over all 48 matching articles" in prompt
+        assert result["overall"] == pytest.approx(-0.4)
+        assert result["emotions"]["fear"] == 0.7
+
+    async def test_llm_failure_falls_back_to_rollups(self):
+        with patch("core.ai_models.model_manager.ModelManager") as manager:
+            manager.return_value.invoke_model = AsyncMock(side_effect=RuntimeError("budget exhausted"))
+            result = await run_sentiment_emotion(_docs(3), "test-sent-3", series=SERIES, explain=True)
+        assert result["success"] is True
+        assert result["model_used"] == "lexicon"
+        assert "budget exhausted" in result["warnings"][0]
@@ -0,0 +1,150 @@
+"""
+Unit tests for the ingest-time near-duplicate gate (MinHash + LSH bands)
+"""
+
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from parser.extract import ParsedArticle
+from services.pipeline_events import CHANNEL_CHUNKING_READY
+from utils.text import compute_minhash, minhash_bands, minhash_similarity, MINHASH_BANDS
+from worker import ArticleWorker
+
+_rng = random.Random(7)
+_VOCAB = [f"word{i}" for i in range(2000)]
+_WEIGHTS = [1 / (i + 1) for i in range(2000)]
+
+
+def words(n):
+    return _rng.choices(_VOCAB, _WEIGHTS, k=n)
+
+
+def wire_story(n=400):
+    return words(n)
+
+
+def syndicated_copy(story):
+    """Same wire text with a different dateline/byline lead and footer, plus a small edit"""
+    copy = words(6) + story[6:-8] + words(8)
+    copy[200] = "edited"
+    return copy
+
+
+class TestMinHash:
+
+    def test_syndicated_copies_score_high_unrelated_low(self):
+        story = wire_story()
+        original = compute_minhash(' '.join(story))
+        copy = compute_minhash(' '.join(syndicated_copy(story)))
+        unrelated = compute_minhash(' '.join(wire_story()))
+
+        assert minhash_similarity(original, copy) >= 0.8
+        assert minhash_similarity(original, unrelated) < 0.2
+
+    def test_copies_share_a_band_unrelated_do_not(self):
+        story = wire_story()
+        original = minhash_bands(compute_minhash(' '.join(story)))
+        copy = minhash_bands(compute_minhash(' '.join(syndicated_copy(story))))
+        unrelated = minhash_bands(compute_minhash(' '.join(wire_story())))
+
+        assert len(original) == MINHASH_BANDS
+        assert any(a == b for a, b in zip(original, copy))
+        assert not any(a == b for a, b in zip(original, unrelated))
+        assert all(-(1 << 63) <= key < (1 << 63) for key in original)
+
+    def test_signature_is_stable_and_case_insensitive(self):
+        text = ' '.join(wire_story(50))
+        assert compute_minhash(text) == compute_minhash(text.upper())
+        assert compute_minhash("too short") is None
+
+
+class FakeIndexDb:
+    """articles_index rows plus the band table, in memory"""
+
+    def __init__(self):
+        self.rows = {}
+        self.bands = {}
+
+    def upsert_article_index(self, data):
+        index_id = len(self.rows) + 1
+        self.rows[index_id] = data
+        return index_id
+
+    def find_near_duplicate(self, signature, bands, threshold, window_hours):
+        candidates = {i for band, key in enumerate(bands) for i in self.bands.get((band, key), ())}
+        scored = [(minhash_similarity(signature, self.rows[i]['minhash']), i) for i in candidates]
+        scored = [(sim, i) for sim, i in scored if sim >= threshold]
+        if not scored:
+            return None
+        sim, index_id = max(scored)
+        return {'id': index_id, 'article_id': self.rows[index_id]['article_id'], 'similarity': sim}
+
+    def add_near_duplicate_bands(self, index_id, bands):
+        for band, key in enumerate(bands):
+            self.bands.setdefault((band, key), set()).add(index_id)
+
+
+@pytest.fixture
+def worker(monkeypatch, tmp_path):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.chdir(tmp_path)
+    db = MagicMock()
+    index = FakeIndexDb()
+    for name in ('upsert_article_index', 'find_near_duplicate', 'add_near_duplicate_bands'):
+        setattr(db, name, getattr(index, name))
+    db.check_duplicate_by_text_hash.return_value = None
+    instance = ArticleWorker(db)
+
+    async def fetch(url):
+        return MagicMock(text="<html></html>", headers={}), url, False
+    instance._fetch = fetch
+    yield instance, db, index
+    instance.close()
+
+
+def extracted(n, text):
+    return ParsedArticle(
+        url=f"https://site{n}.example/a", url_hash=f"u{n}", source=f"site{n}.example",
+        title="Wire story", full_text=text, text_hash=f"t{n}",
+        word_count=len(text.split()), status='stored'
+    )
+
+
+@pytest.mark.asyncio
+async def test_syndicated_copies_skip_chunking_and_report_savings(worker, monkeypatch):
+    instance, db, index = worker
+    story = wire_story()
+    texts = [' '.join(story)] + [' '.join(syndicated_copy(story)) for _ in range(3)] + [' '.join(wire_story())]
+    parsed = iter(extracted(n, text) for n, text in enumerate(texts))
+    monkeypatch.setattr("worker.extract_all", lambda **kwargs: next(parsed))
+    db.get_pending_articles.return_value = [
+        {'id': n, 'url': f"https://site{n}.example/a"} for n in range(len(texts))
+    ]
+
+    stats = await instance.process_pending_articles()
+
+    rows = list(index.rows.values())
+    assert [r['ready_for_chunking'] for r in rows] == [True, False, False, False, True]
+    assert [r['duplicate_of'] for r in rows] == [None, 1, 1, 1, None]
+    # Only canonical rows are banded, so copies always link to the original
+    assert {i for ids in index.bands.values() for i in ids} == {1, 5}
+    assert stats['successful'] == 5
+    assert stats['near_duplicates'] == 3
+    assert stats['compute_saved'] == pytest.approx(3 / 5, abs=0.02)
+    db.notify_pipeline.assert_called_once_with(CHANNEL_CHUNKING_READY, 2)
+
+
+@pytest.mark.asyncio
+async def test_short_texts_bypass_the_gate(worker, monkeypatch):
+    instance, db, index = worker
+    text = ' '.join(wire_story(30))
+    parsed = iter([extracted(1, text), extracted(2, text + " x")])
+    monkeypatch.setattr("worker.extract_all", lambda **kwargs: next(parsed))
+
+    for n in (1, 2):
+        result = await instance._process_single_article({'id': n, 'url': f"https://site{n}.example/a"})
+        assert result['status'] == 'stored'
+
+    assert all(r['ready_for_chunking'] and r['minhash'] is None for r in index.rows.values())
@@ -185,3 +185,68 @@ async def test_entity_positions(ner_service):
         extracted = text[entity.start:entity.end]
         # Should match entity text (or be close due to tokenization)
         assert len(extracted) > 0
+
+
+class FakeSpacyDoc:
+    def __init__(self, text):
+        self.ents = [FakeSpan(word) for word in text.split() if word[:1].isupper()]
+
+
+class FakeSpan:
+    def __init__(self, text):
+        self.text = text
+        self.label_ = "ORG"
+        self.start_char = 0
+        self.end_char = len(text)
+
+
+class FakeNlp:
+    """Stands in for a spaCy Language: records pipe() batches"""
+
+    def __init__(self):
+        self.batches = []
+
+    def pipe(self, texts, batch_size=32):
+        texts = list(texts)
+        self.batches.append(texts)
+        return [FakeSpacyDoc(t) for t in texts]
+
+
+@pytest.fixture
+def spacy_ner(monkeypatch):
+    monkeypatch.setenv("NER_CACHE_SIZE", "2")
+    service = NERService(model_router=None, prefer_strategy=NERStrategy.SPACY)
+    service._spacy_nlp = FakeNlp()
+    service._spacy_available = True
+    return service
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_single_pipe_call(spacy_ner):
+    results = await spacy_ner.extract_entities_batch(["OpenAI and Google", "Microsoft news", "OpenAI and Google"])
+
+    assert [[e.text for e in r] for r in results] == [["OpenAI", "Google"], ["Microsoft"], ["OpenAI", "Google"]]
+    # Duplicate text is extracted once
+    assert spacy_ner._spacy_nlp.batches == [["OpenAI and Google", "Microsoft news"]]
+    assert results[0][0].label == "ORGANIZATION"
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_skip_spacy_and_evict_lru(spacy_ner):
+    await spacy_ner.extract_entities("Alpha one")
+    await spacy_ner.extract_entities("Beta two")
+    await spacy_ner.extract_entities("Alpha one")
+    assert len(spacy_ner._spacy_nlp.batches) == 2
+    assert spacy_ner.cache_hits == 1
+
+    await spacy_ner.extract_entities("Gamma three")  # evicts "Beta two"
+    await spacy_ner.extract_entities("Beta two")
+    assert len(spacy_ner._spacy_nlp.batches) == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_falls_back_to_regex_without_spacy(ner_service):
+    results = await ner_service.extract_entities_batch(["OpenAI and Microsoft", ""])
+
+    assert any(e.text == "OpenAI" for e in results[0])
+    assert results[1] == []
@@ -0,0 +1,99 @@
+"""
+Unit tests for the pipeline LISTEN/NOTIFY bus
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from services.pipeline_events import PipelineListener, CHANNEL_CHUNKS_CREATED
+
+
+class FakeListenConnection:
+    """Stands in for a psycopg2 connection: readable fd + notifies list"""
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self.notifies = []
+        self.executed = []
+        self.closed = False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            def execute(self, sql):
+                conn.executed.append(sql)
+
+            def close(self):
+                pass
+
+        return _Cur()
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def poll(self):
+        try:
+            while self._reader.recv(1024):
+                self.notifies.append(object())
+        except BlockingIOError:
+            pass
+
+    def send_notify(self):
+        self._writer.send(b"x")
+
+    def close(self):
+        self.closed = True
+        self._reader.close()
+        self._writer.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_wakes_on_notification():
+    conn = FakeListenConnection()
+    listener = PipelineListener(None, [CHANNEL_CHUNKS_CREATED], connection=conn)
+
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.05, conn.send_notify)
+
+    started = time.monotonic()
+    woke = await listener.wait(5)
+
+    assert woke is True
+    assert time.monotonic() - started < 1
+    assert conn.executed == [f"LISTEN {CHANNEL_CHUNKS_CREATED}"]
+    assert listener.notifications_received == 1
+    listener.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_buffered_notification_immediately():
+    conn = FakeListenConnection()
+    listener = PipelineListener(None, [CHANNEL_CHUNKS_CREATED], connection=conn)
+    conn.send_notify()
+    await asyncio.sleep(0.01)
+
+    assert await listener.wait(5) is True
+    listener.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_without_notification():
+    conn = FakeListenConnection()
+    listener = PipelineListener(None, [CHANNEL_CHUNKS_CREATED], connection=conn)
+
+    assert await listener.wait(0.05) is False
+    listener.close()
+
+
+@pytest.mark.asyncio
+async def test_disabled_listener_falls_back_to_sleep(monkeypatch):
+    monkeypatch.setenv("PIPELINE_NOTIFY", "false")
+    listener = PipelineListener("postgresql://unused", [CHANNEL_CHUNKS_CREATED])
+
+    assert listener.enabled is False
+    assert await listener.wait(0.01) is False
@@ -0,0 +1,144 @@
+"""
+Unit tests for the SQLite-backed RetryQueue
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+from net.http import HttpClient, RetryQueue
+from net.resolver import CachingResolver
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("RETRY_QUEUE_DB", raising=False)
+    return RetryQueue(queue_file=str(tmp_path / "retry_queue.json"))
+
+
+def make_due(queue, url, minutes_ago=1):
+    due = (datetime.now() - timedelta(minutes=minutes_ago)).timestamp()
+    queue._conn().execute("UPDATE retry_queue SET next_retry = ? WHERE url = ?", (due, url))
+
+
+def test_add_is_not_due_until_backoff(queue):
+    queue.add("https://a.example/1", {"X": "1"}, "timeout", {"feed_id": 7})
+
+    assert queue.size() == 1
+    assert queue.get_ready_items() == []
+
+
+def test_ready_items_come_back_in_due_order_and_are_claimed(queue):
+    for i in range(3):
+        queue.add(f"https://a.example/{i}", {}, "timeout")
+        make_due(queue, f"https://a.example/{i}", minutes_ago=10 - i)
+
+    items = queue.get_ready_items(limit=2)
+
+    assert [item.url for item in items] == ["https://a.example/0", "https://a.example/1"]
+    # A second flusher does not get the same URLs while they are claimed
+    assert [item.url for item in queue.get_ready_items(limit=5)] == ["https://a.example/2"]
+    assert queue.get_ready_items(limit=5) == []
+
+
+def test_update_attempt_backs_off_then_gives_up(queue):
+    queue.add("https://a.example/x", {}, "500", max_attempts=2)
+
+    assert queue.update_attempt("https://a.example/x") is True
+    assert queue.update_attempt("https://a.example/x") is False
+    assert queue.size() == 0
+
+
+def test_add_keeps_attempt_of_queued_url(queue):
+    queue.add("https://a.example/x", {}, "500", max_attempts=3)
+    assert queue.update_attempt("https://a.example/x") is True
+
+    # A failed retry re-enqueues the same URL before its attempt is bumped
+    queue.add("https://a.example/x", {}, "503")
+    make_due(queue, "https://a.example/x")
+
+    [item] = queue.get_ready_items()
+    assert (item.attempt, item.max_attempts, item.error) == (2, 3, "503")
+
+
+def test_process_retry_queue_gives_up_on_dead_url(tmp_path, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("RETRY_QUEUE_DB", raising=False)
+    monkeypatch.chdir(tmp_path)
+    http = HttpClient(resolver=CachingResolver(resolve_fn=lambda host: (["93.184.216.34"], None)))
+    calls = []
+
+    def refuse(url, **kwargs):
+        calls.append(url)
+        raise requests.exceptions.ConnectionError("connection refused")
+
+    monkeypatch.setattr(http.session, "get", refuse)
+    url = "https://dead.example/story"
+
+    assert http.get(url)[0] is None
+    for _ in range(20):
+        if http.retry_queue.size() == 0:
+            break
+        make_due(http.retry_queue, url)
+        assert http.process_retry_queue() == 0
+
+    assert http.retry_queue.size() == 0
+    # The first fetch plus one retry per attempt up to max_attempts
+    assert len(calls) == 1 + 5
+    http.close()
+
+
+def test_remove(queue):
+    queue.add("https://a.example/x", {}, "500")
+    queue.remove("https://a.example/x")
+    assert queue.size() == 0
+
+
+def test_second_instance_sees_same_queue(queue):
+    queue.add("https://a.example/x", {"A": "b"}, "500", {"k": "v"})
+    make_due(queue, "https://a.example/x")
+
+    other = RetryQueue(queue_file=queue.queue_file)
+    [item] = other.get_ready_items()
+
+    assert item.headers == {"A": "b"}
+    assert item.context == {"k": "v"}
+
+
+def test_legacy_json_file_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("RETRY_QUEUE_DB", raising=False)
+    json_path = tmp_path / "retry_queue.json"
+    past = (datetime.now() - timedelta(minutes=5)).isoformat()
+    json_path.write_text(json.dumps([
+        {"url": "https://old.example/1", "headers": {}, "attempt": 2, "next_retry": past,
+         "max_attempts": 5, "error": "timeout", "context": {"feed_id": 1}},
+    ]))
+
+    queue = RetryQueue(queue_file=str(json_path))
+
+    assert not json_path.exists()
+    assert (tmp_path / "retry_queue.json.migrated").exists()
+    [item] = queue.get_ready_items()
+    assert item.url == "https://old.example/1"
+    assert item.attempt == 2
+    assert item.context == {"feed_id": 1}
+
+
+def test_unreadable_legacy_file_is_left_in_place(tmp_path, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("RETRY_QUEUE_DB", raising=False)
+    json_path = tmp_path / "retry_queue.json"
+    json_path.write_text('[{"url": "https://old.example/1", "headers": {}')
+
+    queue = RetryQueue(queue_file=str(json_path))
+
+    assert json_path.exists()
+    assert not (tmp_path / "retry_queue.json.migrated").exists()
+    assert queue.size() == 0
+    # Still usable for new items
+    queue.add("https://a.example/x", {}, "500")
+    assert queue.size() == 1
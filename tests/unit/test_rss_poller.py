@@ -0,0 +1,158 @@
+"""
+Unit tests for RSSPoller body-fingerprint short-circuit and entry watermark
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+import rss.poller as poller_module
+from rss.poller import RSSPoller, feed_fingerprint, parse_watermark
+
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def make_rss(items, build_date="Mon, 01 Jan 2024 00:00:00 GMT"):
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{title}</link>"
+        f"<pubDate>{format_datetime(published)}</pubDate></item>"
+        for title, published in items
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>Example</title>'
+        f"<lastBuildDate>{build_date}</lastBuildDate>{body}</channel></rss>"
+    ).encode()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+        self.headers = {}
+
+
+@pytest.fixture
+def poller():
+    db = MagicMock()
+    db.check_duplicate_by_url_hash.return_value = False
+    db.insert_raw_article.return_value = 1
+    instance = RSSPoller(db)
+    instance.http_client = MagicMock()
+    return instance
+
+
+def serve(poller, content):
+    poller.http_client.get_with_conditional_headers.return_value = (
+        FakeResponse(content), "https://example.com/feed", False
+    )
+
+
+def test_fingerprint_ignores_last_build_date():
+    items = [("a", NOW)]
+    assert feed_fingerprint(make_rss(items, "Mon, 01 Jan 2024 00:00:00 GMT")) == \
+        feed_fingerprint(make_rss(items, "Tue, 02 Jan 2024 00:00:00 GMT"))
+    assert feed_fingerprint(make_rss(items)) != feed_fingerprint(make_rss([("b", NOW)]))
+
+
+def test_parse_watermark_accepts_stored_text():
+    assert parse_watermark("2024-01-01 12:00:00+00:00") == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    assert parse_watermark("2024-01-01 12:00:00").tzinfo is not None
+    assert parse_watermark("") is None
+    assert parse_watermark("not a date") is None
+
+
+def test_unchanged_body_skips_parsing(poller, monkeypatch):
+    content = make_rss([("a", NOW)])
+    serve(poller, content)
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("feedparser should not run for an unchanged body")
+
+    monkeypatch.setattr(poller_module.feedparser, "parse", fail_parse)
+    feed = {'id': 1, 'url': "https://example.com/feed", 'content_fingerprint': feed_fingerprint(content)}
+
+    stats = poller._poll_single_feed(feed)
+
+    assert stats['success'] and stats['cached'] and stats['unchanged']
+    poller.db.check_duplicate_by_url_hash.assert_not_called()
+    poller.db.update_feed.assert_called_once()
+
+
+def test_changed_body_stores_fingerprint_and_watermark(poller):
+    newest = NOW - timedelta(minutes=5)
+    content = make_rss([("a", newest), ("b", NOW - timedelta(hours=1))])
+    serve(poller, content)
+
+    stats = poller._poll_single_feed({'id': 1, 'url': "https://example.com/feed"})
+
+    assert stats['success'] and not stats['unchanged']
+    assert stats['new_articles'] == 2
+    updates = poller.db.update_feed.call_args.kwargs
+    assert updates['content_fingerprint'] == feed_fingerprint(content)
+    assert updates['last_entry_date'] == newest
+
+
+def test_entries_below_watermark_skip_db_lookups(poller, monkeypatch):
+    monkeypatch.setattr(poller, "watermark_grace", timedelta(hours=1))
+    watermark = NOW - timedelta(hours=2)
+    content = make_rss([
+        ("fresh", NOW - timedelta(minutes=10)),
+        ("within-grace", watermark - timedelta(minutes=30)),
+        ("old1", watermark - timedelta(days=1)),
+        ("old2", watermark - timedelta(days=2)),
+    ])
+    serve(poller, content)
+    feed = {'id': 1, 'url': "https://example.com/feed", 'last_entry_date': str(watermark)}
+
+    stats = poller._poll_single_feed(feed)
+
+    assert stats['skipped_by_watermark'] == 2
+    assert stats['new_articles'] == 2
+    assert poller.db.check_duplicate_by_url_hash.call_count == 2
+
+
+def test_future_dated_entry_does_not_advance_watermark(poller):
+    current = NOW - timedelta(minutes=30)
+    content = make_rss([("future", NOW + timedelta(days=30)), ("current", current)])
+    serve(poller, content)
+
+    poller._poll_single_feed({'id': 1, 'url': "https://example.com/feed"})
+
+    assert poller.db.update_feed.call_args.kwargs['last_entry_date'] == current
+
+
+def test_failed_entry_keeps_fingerprint_and_watermark(poller, monkeypatch):
+    content = make_rss([("a", NOW - timedelta(minutes=5)), ("b", NOW - timedelta(hours=1))])
+    serve(poller, content)
+    poller.http_client.get_with_conditional_headers.return_value[0].headers = {'ETag': '"v2"'}
+    process = poller._process_feed_entry
+
+    def flaky(entry, feed, feed_url):
+        if entry.get('title') == "a":
+            raise RuntimeError("insert failed")
+        return process(entry, feed, feed_url)
+
+    monkeypatch.setattr(poller, "_process_feed_entry", flaky)
+
+    stats = poller._poll_single_feed({'id': 1, 'url': "https://example.com/feed"})
+
+    assert stats['success'] and stats['failed_entries'] == 1
+    assert stats['new_articles'] == 1
+    # Next poll fetches and parses the same body again
+    poller.db.update_feed.assert_not_called()
+
+
+def test_insert_failure_keeps_fingerprint_and_watermark(poller):
+    content = make_rss([("a", NOW - timedelta(minutes=5)), ("b", NOW - timedelta(hours=1))])
+    serve(poller, content)
+    poller.db.insert_raw_article.side_effect = [RuntimeError("could not serialize access"), 2]
+    watermark = NOW - timedelta(hours=3)
+    feed = {'id': 1, 'url': "https://example.com/feed", 'last_entry_date': str(watermark),
+            'content_fingerprint': "previous"}
+
+    stats = poller._poll_single_feed(feed)
+
+    assert stats['failed_entries'] == 1 and stats['new_articles'] == 1
+    poller.db.update_feed.assert_not_called()
@@ -0,0 +1,165 @@
+"""
+Unit tests for the online trend clusterer (assignment, aging, split, merge)
+and the service's recovery from a failed save
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from services.trend_cluster_service import OnlineClusterer, TrendClusterService
+
+DIMS = 32
+
+
+def unit(v):
+    return v / np.linalg.norm(v)
+
+
+def topic_vectors(rng, center, count, noise=0.05):
+    return center + noise * rng.standard_normal((count, DIMS))
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+@pytest.fixture
+def centers(rng):
+    # Orthogonal-ish topics: pairwise cosine near 0
+    return np.linalg.qr(rng.standard_normal((DIMS, DIMS)))[0][:4]
+
+
+def test_articles_join_their_topic_and_outliers_open_new_clusters(rng, centers):
+    clusterer = OnlineClusterer(assign_similarity=0.7, min_size=3)
+    ids_a = {clusterer.assign(v) for v in topic_vectors(rng, centers[0], 10)}
+    ids_b = {clusterer.assign(v) for v in topic_vectors(rng, centers[1], 10)}
+
+    assert len(ids_a) == 1 and len(ids_b) == 1 and ids_a != ids_b
+    assert all(cid < 0 for cid in ids_a | ids_b)  # temporary until saved
+    (a,) = ids_a
+    assert clusterer.clusters[a].size == 10
+    assert float(unit(clusterer.clusters[a].centroid) @ centers[0]) > 0.95
+
+    outlier = clusterer.assign(centers[2])
+    assert outlier not in ids_a | ids_b and clusterer.clusters[outlier].size == 1
+
+
+def test_aging_out_subtracts_members_and_frees_rows(rng, centers):
+    clusterer = OnlineClusterer(min_size=3)
+    vectors = topic_vectors(rng, centers[0], 4)
+    cid = None
+    for v in vectors:
+        cid = clusterer.assign(v)
+    clusterer.rename({cid: 11})
+    clusterer.clusters[11].dirty = False
+
+    for v in vectors[:3]:
+        clusterer.remove(11, v)
+    remaining = clusterer.clusters[11]
+    assert remaining.size == 1 and remaining.dirty
+    np.testing.assert_allclose(remaining.total, vectors[3] / np.linalg.norm(vectors[3]), atol=1e-9)
+
+    clusterer.remove(11, vectors[3])
+    assert 11 not in clusterer.clusters and clusterer.deleted == {11}
+    # The zeroed row is reused by the next cluster
+    new = clusterer.assign(centers[1])
+    assert clusterer._row_of[new] == 0
+
+
+def test_split_separates_two_topics_and_keeps_id_on_bigger_half(rng, centers):
+    clusterer = OnlineClusterer(assign_similarity=0.7, min_size=3)
+    mixed = np.vstack([topic_vectors(rng, centers[0], 8), topic_vectors(rng, centers[1], 5)])
+    clusterer.add_cluster(5, np.zeros(DIMS), 0)
+    clusterer.recenter(5, mixed)
+
+    new_id, moved = clusterer.split(5, mixed)
+
+    assert moved.tolist() == [False] * 8 + [True] * 5
+    assert clusterer.clusters[5].size == 8 and clusterer.clusters[new_id].size == 5
+    assert float(unit(clusterer.clusters[new_id].centroid) @ centers[1]) > 0.95
+
+
+def test_split_leaves_a_single_topic_alone(rng, centers):
+    clusterer = OnlineClusterer(assign_similarity=0.7, min_size=3)
+    vectors = topic_vectors(rng, centers[0], 20)
+    clusterer.add_cluster(5, np.zeros(DIMS), 0)
+    clusterer.recenter(5, vectors)
+    assert clusterer.split(5, vectors) is None
+    assert list(clusterer.clusters) == [5]
+
+
+def test_converged_clusters_merge_into_the_bigger_one(rng, centers):
+    clusterer = OnlineClusterer(assign_similarity=0.99, merge_similarity=0.9, min_size=3)
+    near = centers[0] + 0.2 * centers[1]
+    clusterer.add_cluster(3, centers[0] / np.linalg.norm(centers[0]), 10)
+    clusterer.add_cluster(4, near / np.linalg.norm(near), 4)
+    clusterer.add_cluster(6, centers[2], 7)
+    clusterer.clusters[4].changed = True
+
+    merged = clusterer.merge_close()
+
+    assert merged == {4: 3}
+    assert clusterer.clusters[3].size == 14 and clusterer.deleted == {4}
+    assert set(clusterer.clusters) == {3, 6}
+    # Nothing changed since: no further merges
+    for cluster in clusterer.clusters.values():
+        cluster.changed = False
+    assert clusterer.merge_close() == {}
+
+
+def test_freed_rows_never_merge_even_with_a_negative_threshold(centers):
+    clusterer = OnlineClusterer(assign_similarity=0.99, merge_similarity=-0.5, min_size=3)
+    for cid, center in zip((1, 2, 3), centers):
+        clusterer.add_cluster(cid, center, 1)
+    clusterer.remove(2, centers[1])
+    clusterer.clusters[1].changed = True
+
+    merged = clusterer.merge_close()
+
+    assert merged == {3: 1}
+    assert set(clusterer.clusters) == {1} and clusterer.clusters[1].size == 2
+
+
+def test_merge_chains_resolve_to_the_survivor(centers):
+    clusterer = OnlineClusterer(assign_similarity=0.99, merge_similarity=0.9, min_size=3)
+    base = centers[0]
+    for cid, (size, tilt) in {1: (2, 0.0), 2: (5, 0.25), 3: (20, 0.5)}.items():
+        v = base + tilt * centers[1]
+        clusterer.add_cluster(cid, v / np.linalg.norm(v), size)
+        clusterer.clusters[cid].changed = True
+
+    merged = clusterer.merge_close()
+
+    assert set(clusterer.clusters) == {3}
+    assert merged == {1: 3, 2: 3}
+    assert clusterer.clusters[3].size == 27
+
+
+def test_failed_save_reloads_clusters_from_the_database(centers):
+    stored = centers[0].astype(np.float32)
+    db = MagicMock()
+    db.load_trend_clusters.return_value = [
+        {'id': 11, 'centroid': stored.tobytes(), 'size': 4, 'label': None, 'keywords': []}]
+    db.get_expired_trend_members.return_value = []
+    db.get_trend_members_without_terms.return_value = []
+    db.get_articles_pending_trend_clustering.return_value = [{'article_id': 'a1', 'chunk_id': 1}]
+    db.load_embeddings.return_value = (stored[None, :], [True])
+    db.get_trend_articles.return_value = {}
+    db.save_trend_state.side_effect = [RuntimeError("connection lost"), {}]
+    service = TrendClusterService(db, OnlineClusterer(min_size=3))
+    service.maintenance_seconds = float('inf')
+
+    with pytest.raises(RuntimeError):
+        service.update()
+    assert service.clusterer.clusters == {} and not service._loaded
+    assert service.clusterer.min_size == 3
+
+    service.update()
+    # The article counted once: assigned again on top of the stored cluster
+    assert db.load_trend_clusters.call_count == 2
+    assert service.clusterer.clusters[11].size == 5
+    [dirty, *_] = db.save_trend_state.call_args.args
+    assert [c['size'] for c in dirty] == [5]
@@ -0,0 +1,26 @@
+"""
+Unit tests for trend label terms (article_terms, rank_terms)
+"""
+
+from services.trends_service import article_terms, rank_terms
+
+
+def test_article_terms_match_the_tfidf_tokens():
+    terms = article_terms("The oil prices rose. Oil output cut")
+    assert terms.count("oil") == 2
+    assert "oil prices" in terms and "the" not in terms
+    assert article_terms("") == []
+
+
+def test_rank_terms_weighs_cluster_counts_by_window_idf():
+    counts = {"oil": 4, "news": 6, "opec": 2}
+    # "news" is in most articles of the window, "opec" in few
+    df = {"oil": 10, "news": 90, "opec": 3}
+    assert rank_terms(counts, df, docs=100) == ["oil", "opec", "news"]
+    assert rank_terms(counts, df, docs=100, topk=1) == ["oil"]
+
+
+def test_rank_terms_ties_and_unknown_terms():
+    # Unknown terms count as unseen (highest IDF); equal scores order by term
+    assert rank_terms({"b": 1, "a": 1, "c": 1}, {"c": 5}, docs=10) == ["a", "b", "c"]
+    assert rank_terms({}, {}, docs=0) == []
@@ -0,0 +1,88 @@
+"""
+Unit tests for decoding COPY BINARY embedding streams (utils/vectors.py)
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from utils.vectors import (
+    COPY_SIGNATURE, FORMAT_TEXT, FORMAT_VECTOR, VectorCopySink, parse_vector_text,
+)
+
+
+def copy_stream(rows, fmt=FORMAT_VECTOR):
+    """What Postgres sends for COPY (SELECT id, vec ...) TO STDOUT (FORMAT binary)"""
+    out = COPY_SIGNATURE + struct.pack('!ii', 0, 0)
+    for chunk_id, vector in rows:
+        out += struct.pack('!hiq', 2, 8, chunk_id)
+        if vector is None:
+            out += struct.pack('!i', -1)
+            continue
+        if fmt == FORMAT_VECTOR:
+            field = struct.pack('!HH', len(vector), 0) + np.asarray(vector, dtype='>f4').tobytes()
+        else:
+            field = ('[' + ','.join(repr(float(x)) for x in vector) + ']').encode()
+        out += struct.pack('!i', len(field)) + field
+    return out + struct.pack('!h', -1)
+
+
+def make_sink(ids, fmt=FORMAT_VECTOR):
+    positions = {}
+    for row, chunk_id in enumerate(ids):
+        positions.setdefault(chunk_id, []).append(row)
+    return VectorCopySink(positions, lambda dims: np.zeros((len(ids), dims), dtype=np.float32), fmt=fmt)
+
+
+def feed(sink, data, step):
+    sink.begin()
+    for start in range(0, len(data), step):
+        sink.write(data[start:start + step])
+
+
+@pytest.mark.parametrize("step", [1, 7, 64, 1 << 20])
+def test_vectors_land_in_their_rows_whatever_the_write_sizes(step):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((5, 12)).astype(np.float32)
+    sink = make_sink([30, 10, 50, 20, 40])
+    feed(sink, copy_stream([(10, vectors[0]), (20, vectors[1]), (30, vectors[2]),
+                            (40, vectors[3]), (50, vectors[4])]), step)
+
+    assert sink.out.dtype == np.float32 and sink.out.shape == (5, 12)
+    np.testing.assert_array_equal(sink.out, vectors[[2, 0, 4, 1, 3]])
+    assert sink.found.all() and sink.rows == 5
+
+
+def test_missing_null_and_mismatched_vectors_are_not_found():
+    sink = make_sink([1, 2, 3, 4])
+    feed(sink, copy_stream([(1, [1.0, 2.0]), (2, None), (4, [1.0, 2.0, 3.0])]), 5)
+
+    assert sink.found.tolist() == [True, False, False, False]
+    assert sink.skipped == 1
+    assert sink.out[3].tolist() == [0.0, 0.0]
+
+
+def test_batches_share_one_matrix_and_repeated_ids_fill_every_row():
+    sink = make_sink([1, 2, 1])
+    feed(sink, copy_stream([(1, [0.5, -1.0])]), 3)
+    feed(sink, copy_stream([(2, [2.0, 3.0])]), 3)
+
+    assert sink.out.tolist() == [[0.5, -1.0], [2.0, 3.0], [0.5, -1.0]]
+    assert sink.found.all()
+
+
+def test_text_embeddings():
+    sink = make_sink([7, 8], fmt=FORMAT_TEXT)
+    feed(sink, copy_stream([(7, [0.25, 1e-3, -2.0]), (8, [1.0, 2.0, 3.0])], fmt=FORMAT_TEXT), 11)
+
+    np.testing.assert_array_equal(sink.out, np.array([[0.25, 1e-3, -2.0], [1.0, 2.0, 3.0]], dtype=np.float32))
+    assert parse_vector_text(b'[0.5, 1, -2e-2]').tolist() == pytest.approx([0.5, 1.0, -0.02])
+    with pytest.raises(ValueError):
+        parse_vector_text(b'[0.5, nope]')
+
+
+def test_rejects_non_binary_stream():
+    sink = make_sink([1])
+    with pytest.raises(ValueError):
+        sink.write(b'1\t[0.1,0.2]\n' * 2)
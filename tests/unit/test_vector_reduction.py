@@ -0,0 +1,82 @@
+"""
+Unit tests for the clustering reduction stage (utils.reduction)
+"""
+
+import numpy as np
+import pytest
+from sklearn.cluster import DBSCAN
+from sklearn.metrics import adjusted_rand_score
+
+from utils.reduction import VectorReducer
+
+DIMS = 1024
+
+
+def topics(seed=0, count=600, n_topics=12):
+    rng = np.random.default_rng(seed)
+    scale = (1 + np.arange(DIMS) / 64) ** -0.5
+    centers = rng.standard_normal((n_topics, DIMS)) * scale
+    labels = rng.integers(0, n_topics, count)
+    X = centers[labels] + 0.5 * rng.standard_normal((count, DIMS)) * scale
+    return (X / np.linalg.norm(X, axis=1, keepdims=True)).astype(np.float32), labels
+
+
+def test_random_projection_is_seeded_and_keeps_cosines(tmp_path):
+    X, _ = topics()
+    first = VectorReducer('random', 128, seed=3, cache_dir=str(tmp_path)).transform(X)
+    again = VectorReducer('random', 128, seed=3, cache_dir=str(tmp_path)).transform(X)
+    other = VectorReducer('random', 128, seed=4, cache_dir=str(tmp_path)).transform(X)
+
+    assert first.shape == (len(X), 128) and first.dtype == np.float32
+    np.testing.assert_array_equal(first, again)
+    assert not np.array_equal(first, other)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-5)
+    assert np.abs((first @ first.T) - (X @ X.T)).mean() < 0.1
+    # Nothing written for a projection every run rebuilds from the seed
+    assert not list(tmp_path.iterdir())
+
+
+def test_pca_is_fitted_once_and_reused_from_the_cache(tmp_path, monkeypatch):
+    X, _ = topics()
+    reducer = VectorReducer('pca', 32, cache_dir=str(tmp_path), fit_sample=400)
+    reduced = reducer.transform(X)
+    assert reduced.shape == (len(X), 32)
+    assert [p.name for p in tmp_path.iterdir()] == [f"pca-{DIMS}x32-seed42.npz"]
+
+    def refit(self, X):
+        raise AssertionError("refitted")
+
+    monkeypatch.setattr(VectorReducer, '_fit_pca', refit)
+    # Same process and a later run both reuse the fitted projection
+    np.testing.assert_array_equal(reducer.transform(X), reduced)
+    np.testing.assert_allclose(VectorReducer('pca', 32, cache_dir=str(tmp_path)).transform(X), reduced)
+
+
+def test_pca_refits_when_the_cache_is_old(tmp_path):
+    X, _ = topics()
+    VectorReducer('pca', 32, cache_dir=str(tmp_path)).transform(X)
+    path = tmp_path / f"pca-{DIMS}x32-seed42.npz"
+    fitted_at = float(np.load(path)['fitted_at'])
+
+    VectorReducer('pca', 32, cache_dir=str(tmp_path), refit_hours=0).transform(X)
+    assert float(np.load(path)['fitted_at']) > fitted_at
+
+
+@pytest.mark.parametrize("method, components, rows", [
+    ('none', 32, 100),
+    ('random', DIMS, 100),   # nothing to reduce
+    ('pca', 32, 20),         # too few rows to fit
+])
+def test_pass_through(tmp_path, method, components, rows):
+    X, _ = topics(count=rows)
+    np.testing.assert_array_equal(VectorReducer(method, components, cache_dir=str(tmp_path)).transform(X), X)
+
+
+@pytest.mark.parametrize("method", ['random', 'pca'])
+def test_density_clusters_agree_with_unreduced_vectors(tmp_path, method):
+    X, _ = topics(seed=5)
+    baseline = DBSCAN(eps=0.3, min_samples=5, metric="cosine").fit_predict(X)
+    reduced = VectorReducer(method, 64, cache_dir=str(tmp_path)).transform(X)
+    labels = DBSCAN(eps=0.3, min_samples=5, metric="cosine").fit_predict(reduced)
+    assert len(set(baseline)) > 5
+    assert adjusted_rand_score(baseline, labels) > 0.9
@@ -0,0 +1,112 @@
+"""
+Unit tests for the hourly volume rollups: headline keywords, per-article
+rollup counts, topic candidates and the volume-driven forecast
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.agents.trend_forecaster import bucket_series, run_trend_forecaster, volume_signal
+from core.history.volume_rollups import topic_candidates
+from pg_client_new import PgClient
+from utils.text import rollup_terms
+
+
+def test_rollup_terms_are_distinct_unigrams_and_bigrams():
+    assert rollup_terms("Oil prices rise in Asia") == [
+        "oil", "prices", "rise", "asia", "oil prices", "prices rise", "rise asia",
+    ]
+    # Stop words and numbers drop out before bigrams are formed
+    assert rollup_terms("The Fed cuts rates by 25 points") == [
+        "fed", "cuts", "rates", "points", "fed cuts", "cuts rates", "rates points",
+    ]
+    assert rollup_terms("Oil, oil and OIL") == ["oil", "oil oil"]
+    assert rollup_terms("") == []
+    assert len(rollup_terms(" ".join(f"word{i}" for i in range(100)), max_terms=10)) == 10
+
+
+def test_topic_candidates():
+    assert topic_candidates("The OpenAI") == [("entity", "openai"), ("keyword", "openai")]
+    assert topic_candidates("Oil prices") == [("entity", "oil prices"), ("keyword", "oil prices")]
+    assert topic_candidates("Federal Reserve rate cut") == [
+        ("entity", "federal reserve rate cut"),
+        ("keyword", "federal reserve"), ("keyword", "reserve rate"), ("keyword", "rate cut"),
+    ]
+    assert topic_candidates("") == []
+
+
+def test_volume_rollup_counts_only_count_new_articles_and_postings():
+    published = datetime(2025, 3, 1, 14, 35, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    hour = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+    articles = [
+        {"index_id": 1, "article_id": "a1", "published_at": published, "source": "example.com",
+         "keywords": ["oil", "oil prices", "oil"]},
+        {"index_id": 2, "article_id": "a2", "published_at": published, "source": "example.com",
+         "keywords": ["oil"]},
+        # Already indexed: keywords and source were counted the first time
+        {"index_id": 3, "article_id": "a3", "published_at": published, "source": "example.com",
+         "keywords": ["oil"]},
+        {"index_id": 4, "article_id": "a4", "published_at": None, "source": "example.com",
+         "keywords": ["oil"]},
+    ]
+    postings = [("a1", "opec"), ("a2", "opec"), ("a3", "opec"), ("a4", "opec")]
+
+    counts = PgClient._volume_rollup_counts(articles, {1, 2, 4}, postings)
+    assert counts == {
+        ("keyword", "oil", hour): 2,
+        ("keyword", "oil prices", hour): 1,
+        ("source", "example.com", hour): 2,
+        ("entity", "opec", hour): 3,
+    }
+
+
+def test_bucket_series_ends_at_the_last_hour():
+    assert bucket_series([1, 2, 3, 4, 5, 6, 7], 3) == [9, 18]
+    assert bucket_series([1, 2, 3], 1) == [1, 2, 3]
+    assert bucket_series([], 24) == []
+
+
+@pytest.mark.parametrize("hourly, sign", [
+    ([1] * 24 + [2] * 24 + [4] * 24, 1),
+    ([4] * 24 + [2] * 24 + [1] * 24, -1),
+    ([2] * 72, 0),
+])
+def test_volume_signal_change_is_relative(hourly, sign):
+    _, change, periods = volume_signal(hourly, "1d")
+    assert len(periods) == 24
+    assert (change > 0.2) - (change < -0.2) == sign
+    # Ten times the volume, same relative change
+    assert volume_signal([10 * v for v in hourly], "1d")[1] == pytest.approx(change)
+
+
+def _docs(n):
+    return [
+        {"article_id": f"art-{i}", "url": f"https://example.com/{i}", "date": "2025-01-01"}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+class TestVolumeForecast:
+    async def test_rising_volume_drives_the_forecast(self):
+        volume = {"kind": "entity", "term": "opec", "hourly": [0] * 200 + [1] * 100 + [3] * 36}
+        # Two retrieved docs would not be enough on their own
+        result = await run_trend_forecaster(_docs(2), "OPEC", "1w", "test-vol-1", volume=volume)
+
+        item = result["forecast"][0]
+        assert result["success"] is True
+        assert item["direction"] == "up"
+        assert item["drivers"][0]["signal"] == "volume_trend"
+        assert item["drivers"][0]["evidence_ref"]["article_id"] == "art-0"
+        assert item["confidence_interval"][1] > 0.6
+
+    async def test_falling_volume(self):
+        volume = {"kind": "keyword", "term": "oil prices", "hourly": [5] * 24 + [2] * 24 + [0] * 24}
+        result = await run_trend_forecaster(_docs(12), "oil prices", "1d", "test-vol-2", volume=volume)
+        assert result["forecast"][0]["direction"] == "down"
+
+    async def test_sparse_volume_falls_back_to_document_dates(self):
+        volume = {"kind": "entity", "term": "opec", "hourly": [0] * 70 + [1, 1]}
+        result = await run_trend_forecaster(_docs(1), "OPEC", "1d", "test-vol-3", volume=volume)
+        assert result["forecast"][0]["drivers"][0]["signal"] == "insufficient_data"
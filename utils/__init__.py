@@ -10,7 +10,7 @@ from typing import Optional
 import pytz
 
 from .url import normalize_url, canonicalize_url, extract_domain, remove_tracking_params
-from .text import compute_text_hash, compute_word_count, estimate_reading_time, normalize_text
+from .text import compute_text_hash, compute_word_count, estimate_reading_time, normalize_text, compute_minhash, minhash_similarity
 
 __all__ = [
     'normalize_url',
@@ -21,6 +21,8 @@ __all__ = [
     'compute_word_count', 
     'estimate_reading_time',
     'normalize_text',
+    'compute_minhash',
+    'minhash_similarity',
     # Legacy functions for backward compatibility
     'now_local_iso',
     'json_dumps',
@@ -0,0 +1,59 @@
+"""
+Compressed, content-addressed article bodies
+
+Bodies are keyed by compute_text_hash (the same hash that already identifies
+article text in raw.text_hash / articles_index.text_hash), so a syndicated body
+stored by many rows is kept once. zstd is used when the zstandard package is
+installed, zlib otherwise; the codec is stored per body so either can be read
+back. Very short bodies are stored as-is.
+"""
+
+import os
+import zlib
+from typing import Optional, Tuple
+
+from .text import compute_text_hash
+
+try:
+    import zstandard as zstd
+except ImportError:  # zlib fallback; zstd bodies then need the package to read
+    zstd = None
+
+CODEC_RAW = 'raw'
+CODEC_ZLIB = 'zlib'
+CODEC_ZSTD = 'zstd'
+
+# Below this many bytes compression framing costs more than it saves
+_MIN_COMPRESS_BYTES = 256
+
+_ZSTD_LEVEL = int(os.getenv('FULLTEXT_ZSTD_LEVEL', '6'))
+_ZLIB_LEVEL = 6
+
+
+def fulltext_key(text: str) -> str:
+    """Content address of a body ('' for empty text)"""
+    return compute_text_hash(text)
+
+
+def encode_fulltext(text: str) -> Tuple[str, bytes]:
+    """(codec, payload) for a body"""
+    data = (text or '').encode('utf-8')
+    if len(data) < _MIN_COMPRESS_BYTES:
+        return CODEC_RAW, data
+    if zstd is not None:
+        return CODEC_ZSTD, zstd.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, _ZLIB_LEVEL)
+
+
+def decode_fulltext(codec: str, payload: Optional[bytes]) -> str:
+    """Body text from a stored (codec, payload)"""
+    if payload is None:
+        return ''
+    data = bytes(payload)
+    if codec == CODEC_ZSTD:
+        if zstd is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed fulltext")
+        return zstd.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode('utf-8')
+    return data.decode('utf-8')
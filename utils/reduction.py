@@ -0,0 +1,146 @@
+"""
+Dimensionality reduction ahead of density clustering
+
+(H)DBSCAN over raw 3072-dim embeddings spends nearly all its time in distance
+computations, and density estimates flatten out in that many dimensions.
+VectorReducer projects unit-normalized embeddings to a few dozen/hundred dims:
+
+- 'random': seeded sparse random projection (entries +-sqrt(s/k) with
+  probability 1/(2s) each, s = sqrt(dims), zero otherwise). The matrix depends
+  only on (dims, components, seed), so every run rebuilds the same one.
+- 'pca': PCA fitted on a sample of the first matrix it is given, saved to
+  cache_dir and reused (across runs too) until refit_hours old.
+- 'none': pass-through.
+
+Reduced rows are L2-normalized again, so cosine and euclidean clustering agree
+on them.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('random', 'pca', 'none')
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def sparse_random_projection(dims: int, components: int, seed: int) -> np.ndarray:
+    """(dims, components) float32 sparse random projection matrix, stored dense"""
+    rng = np.random.default_rng(seed)
+    density = 1.0 / np.sqrt(dims)
+    nonzero = rng.random((dims, components)) < density
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(dims, components))
+    return (nonzero * signs * np.float32(np.sqrt(1.0 / (density * components)))).astype(np.float32)
+
+
+class VectorReducer:
+    """Reduce embedding matrices before clustering; one projection per input dimension"""
+
+    def __init__(self, method: Optional[str] = None, components: Optional[int] = None,
+                 seed: Optional[int] = None, cache_dir: Optional[str] = None,
+                 refit_hours: Optional[float] = None, fit_sample: Optional[int] = None):
+        self.method = (method or os.getenv("CLUSTER_REDUCTION", "random")).lower()
+        if self.method not in METHODS:
+            logger.warning(f"Unknown CLUSTER_REDUCTION={self.method!r}, clustering unreduced vectors")
+            self.method = 'none'
+        self.components = components or int(os.getenv("CLUSTER_REDUCTION_DIMS", "128"))
+        self.seed = seed if seed is not None else int(os.getenv("CLUSTER_REDUCTION_SEED", "42"))
+        self.cache_dir = cache_dir or os.getenv("CLUSTER_REDUCTION_CACHE_DIR", "storage/reduction")
+        self.refit_hours = refit_hours if refit_hours is not None else float(
+            os.getenv("CLUSTER_REDUCTION_REFIT_HOURS", "168"))
+        self.fit_sample = fit_sample or int(os.getenv("CLUSTER_REDUCTION_FIT_SAMPLE", "5000"))
+        # dims -> (projection, mean or None, fitted_at)
+        self._projections: Dict[int, Tuple[np.ndarray, Optional[np.ndarray], float]] = {}
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """(n, dims) -> (n, components) float32 unit rows; unreduced when disabled,
+        when dims <= components or while PCA has too few rows to fit"""
+        X = np.asarray(embeddings, dtype=np.float32)
+        if self.method == 'none' or X.ndim != 2 or X.shape[1] <= self.components:
+            return X
+        projection = self._projection(X)
+        if projection is None:
+            return X
+        W, mean, _ = projection
+        # (unit(x) - mean) @ W, without a normalized copy of the full-width matrix
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        reduced = (X @ W) / norms
+        if mean is not None:
+            reduced -= mean @ W
+        return _unit_rows(reduced)
+
+    def _cache_path(self, dims: int) -> str:
+        return os.path.join(self.cache_dir, f"{self.method}-{dims}x{self.components}-seed{self.seed}.npz")
+
+    def _fresh(self, fitted_at: float) -> bool:
+        return self.method == 'random' or time.time() - fitted_at < self.refit_hours * 3600
+
+    def _projection(self, X: np.ndarray) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], float]]:
+        dims = X.shape[1]
+        cached = self._projections.get(dims)
+        if cached is not None and self._fresh(cached[2]):
+            return cached
+
+        if self.method == 'random':
+            cached = (sparse_random_projection(dims, self.components, self.seed), None, time.time())
+        else:
+            cached = self._load(dims) or self._fit_pca(X)
+            if cached is None:
+                return None
+        self._projections[dims] = cached
+        return cached
+
+    def _load(self, dims: int) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], float]]:
+        path = self._cache_path(dims)
+        try:
+            with np.load(path) as data:
+                W, mean, fitted_at = data['projection'], data['mean'], float(data['fitted_at'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable reduction cache {path}: {e}")
+            return None
+        if W.shape != (dims, self.components) or not self._fresh(fitted_at):
+            return None
+        logger.info(f"Loaded {self.method} reduction {dims}->{self.components} from {path}")
+        return W, mean, fitted_at
+
+    def _fit_pca(self, X: np.ndarray) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], float]]:
+        from sklearn.decomposition import PCA
+
+        if len(X) <= self.components:
+            logger.info(f"PCA reduction needs more than {self.components} rows (got {len(X)}), "
+                        f"clustering unreduced vectors")
+            return None
+        rng = np.random.default_rng(self.seed)
+        sample = X if len(X) <= self.fit_sample else X[rng.choice(len(X), self.fit_sample, replace=False)]
+        started = time.time()
+        pca = PCA(n_components=self.components, svd_solver='randomized', random_state=self.seed)
+        pca.fit(_unit_rows(sample))
+        W = pca.components_.T.astype(np.float32)
+        mean = pca.mean_.astype(np.float32)
+        fitted_at = time.time()
+        logger.info(f"Fitted PCA {X.shape[1]}->{self.components} on {len(sample)} rows in "
+                    f"{fitted_at - started:.1f}s, explained variance "
+                    f"{float(pca.explained_variance_ratio_.sum()):.2f}")
+
+        path = self._cache_path(X.shape[1])
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.tmp.npz"
+            np.savez(tmp, projection=W, mean=mean, fitted_at=np.float64(fitted_at))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not save reduction cache {path}: {e}")
+        return W, mean, fitted_at
@@ -0,0 +1,171 @@
+"""
+Lexicon sentiment scoring
+
+A deterministic, rule-based score computed once per article at ingest
+(worker.py) and summed into the hourly volume rollups, so sentiment trends
+are served from SQL without calling an LLM. English words are matched
+exactly, Russian ones by stem. A preceding negator flips a word, boosters
+and dampeners scale it; the sum is squashed into [-1, 1].
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Words of the body scored after the headline: the lede carries the tone and
+# the cost stays flat for long articles
+SENTIMENT_MAX_WORDS = 400
+# Headline words count this many times
+SENTIMENT_TITLE_WEIGHT = 2.0
+# Squashing constant: a sum of +-S maps to S / sqrt(S^2 + alpha)
+SENTIMENT_ALPHA = 15.0
+# Negators and modifiers apply to a sentiment word this many tokens later
+SENTIMENT_SCOPE = 3
+
+_NEGATION_FACTOR = -0.74
+
+_TOKEN = re.compile(r"[^\W\d_]+", re.UNICODE)
+_CONTRACTION = re.compile(r"n['’]t\b")
+
+EN_LEXICON = {
+    # positive
+    'gain': 1.5, 'gains': 1.5, 'gained': 1.5, 'rise': 1.0, 'rises': 1.0, 'rose': 1.0,
+    'growth': 1.5, 'grow': 1.2, 'grows': 1.2, 'grew': 1.2, 'surge': 1.8, 'surges': 1.8,
+    'surged': 1.8, 'rally': 1.8, 'rallies': 1.8, 'rebound': 1.5, 'recovery': 1.6,
+    'recover': 1.4, 'recovers': 1.4, 'boost': 1.6, 'boosts': 1.6, 'improve': 1.6,
+    'improves': 1.6, 'improved': 1.6, 'improvement': 1.6, 'success': 2.2, 'successful': 2.2,
+    'win': 2.0, 'wins': 2.0, 'won': 2.0, 'victory': 2.3, 'profit': 1.6,
+    'profits': 1.6, 'strong': 1.5, 'stronger': 1.5, 'robust': 1.6, 'positive': 1.8,
+    'optimism': 2.0, 'optimistic': 2.0, 'confidence': 1.6, 'confident': 1.6, 'hope': 1.6,
+    'hopes': 1.6, 'good': 1.9, 'better': 1.7, 'best': 2.2, 'great': 2.5, 'excellent': 2.8,
+    'benefit': 1.5, 'benefits': 1.5, 'agreement': 1.2, 'deal': 0.8, 'peace': 2.0,
+    'ceasefire': 1.2, 'breakthrough': 2.2, 'innovation': 1.6, 'innovative': 1.6,
+    'support': 1.3, 'supports': 1.3, 'welcome': 1.8, 'welcomed': 1.8, 'praise': 2.1,
+    'praised': 2.1, 'safe': 1.6, 'secure': 1.4, 'stable': 1.2, 'stability': 1.2,
+    'upgrade': 1.4, 'upgraded': 1.4, 'approve': 1.4, 'approved': 1.4, 'launch': 0.8,
+    'celebrate': 2.4, 'celebrates': 2.4, 'thrive': 2.2, 'healthy': 1.7, 'resolve': 1.4,
+    'resolved': 1.4, 'rescue': 1.5, 'rescued': 1.5, 'award': 1.9,
+    # negative
+    'fall': -1.0, 'falls': -1.0, 'fell': -1.0, 'drop': -1.1, 'drops': -1.1, 'dropped': -1.1,
+    'decline': -1.3, 'declines': -1.3, 'declined': -1.3, 'plunge': -2.0, 'plunges': -2.0,
+    'plunged': -2.0, 'slump': -1.9, 'crash': -2.5, 'crashes': -2.5, 'loss': -1.6,
+    'losses': -1.6, 'lose': -1.5, 'loses': -1.5, 'lost': -1.5, 'weak': -1.4, 'weaker': -1.4,
+    'crisis': -2.3, 'recession': -2.2, 'inflation': -1.0, 'debt': -1.0, 'default': -1.8,
+    'bankruptcy': -2.4, 'bankrupt': -2.4, 'layoffs': -2.0, 'cuts': -1.0, 'fear': -2.0,
+    'fears': -2.0, 'worry': -1.7, 'worries': -1.7, 'concern': -1.3, 'concerns': -1.3,
+    'risk': -1.2, 'risks': -1.2, 'threat': -2.0, 'threats': -2.0, 'threaten': -2.0,
+    'threatens': -2.0, 'war': -2.9, 'attack': -2.5, 'attacks': -2.5, 'killed': -3.0,
+    'kill': -3.0, 'kills': -3.0, 'dead': -3.0, 'death': -2.9, 'deaths': -2.9, 'injured': -2.2,
+    'violence': -2.8, 'conflict': -2.0, 'protest': -1.2, 'protests': -1.2, 'strike': -1.0,
+    'scandal': -2.2, 'fraud': -2.6, 'corruption': -2.5, 'sanctions': -1.4, 'ban': -1.3,
+    'banned': -1.3, 'fail': -2.0, 'fails': -2.0, 'failed': -2.0, 'failure': -2.2,
+    'bad': -2.5, 'worse': -2.1, 'worst': -3.1, 'poor': -2.1, 'negative': -1.9,
+    'disaster': -3.1, 'catastrophe': -3.2, 'collapse': -2.6, 'collapsed': -2.6,
+    'warning': -1.4, 'warns': -1.4, 'warned': -1.4, 'accused': -1.8, 'lawsuit': -1.3,
+    'investigation': -0.9, 'outage': -1.6, 'breach': -2.0, 'hack': -1.8, 'hacked': -1.8,
+    'delay': -1.0, 'delayed': -1.0, 'shortage': -1.7, 'uncertainty': -1.4, 'volatile': -1.2,
+    'criticism': -1.6, 'criticized': -1.6, 'condemn': -2.2, 'condemned': -2.2,
+    'downgrade': -1.6, 'downgraded': -1.6, 'fined': -1.6, 'emergency': -1.8,
+}
+
+# Stems: a word matches when it is the stem plus at most _RU_MAX_ENDING letters
+RU_STEMS = {
+    # positive
+    'рост': 1.3, 'выросл': 1.2, 'вырос': 1.2, 'растет': 1.0, 'увелич': 0.9, 'подъем': 1.2,
+    'прибыл': 1.6, 'успех': 2.2, 'успешн': 2.2, 'побед': 2.2, 'улучш': 1.6,
+    'восстанов': 1.3, 'поддержк': 1.3, 'поддерж': 1.2, 'соглашен': 1.2,
+    'перемири': 1.2, 'прорыв': 2.0, 'инновац': 1.5, 'стабильн': 1.2,
+    'надежн': 1.4, 'хорош': 1.9, 'лучш': 1.8, 'отличн': 2.6, 'позитивн': 1.8,
+    'оптимизм': 2.0, 'оптимистич': 2.0, 'надежд': 1.5, 'уверенн': 1.5, 'выгод': 1.4,
+    'одобр': 1.4, 'безопасн': 1.5, 'спас': 1.5, 'праздн': 2.0, 'наград': 1.8, 'укрепл': 1.3,
+    # negative
+    'падени': -1.4, 'упал': -1.2, 'снижен': -1.0, 'сниз': -1.0, 'обвал': -2.3,
+    'кризис': -2.3, 'рецесси': -2.2, 'инфляц': -1.0, 'дефолт': -1.8,
+    'банкротств': -2.4, 'убыт': -1.6, 'потер': -1.5, 'сокращен': -1.3, 'увольнен': -1.8,
+    'страх': -2.0, 'опасен': -1.6, 'опасн': -1.6, 'угроз': -2.0, 'риск': -1.2,
+    'войн': -2.9, 'атак': -2.4, 'удар': -1.8, 'взрыв': -2.5, 'погиб': -3.0, 'убит': -3.0,
+    'жертв': -2.6, 'ранен': -2.2, 'насили': -2.8, 'конфликт': -2.0, 'протест': -1.2,
+    'забастовк': -1.2, 'скандал': -2.2, 'мошенничеств': -2.6, 'коррупц': -2.5,
+    'санкц': -1.4, 'запрет': -1.3, 'провал': -2.2, 'неудач': -2.0, 'плох': -2.3,
+    'хуж': -2.1, 'негативн': -1.9, 'катастроф': -3.1, 'авари': -2.4, 'крах': -2.6,
+    'обрушен': -2.3, 'обруш': -2.2, 'предупрежд': -1.3, 'обвинен': -1.8, 'обвин': -1.7,
+    'расследован': -0.9, 'утечк': -1.8, 'взлом': -1.8,
+    'задержк': -1.0, 'дефицит': -1.7, 'неопределенн': -1.4, 'критик': -1.5, 'осужд': -2.0,
+    'штраф': -1.5, 'тревог': -1.8, 'паник': -2.3, 'беспокойств': -1.6,
+}
+_RU_MAX_ENDING = 4
+_RU_MIN_STEM = 3
+
+NEGATORS = frozenset({
+    'not', 'no', 'never', 'without', 'nor', 'neither', 'hardly', 'cannot', 'nobody', 'nothing',
+    'не', 'нет', 'ни', 'без', 'никогда', 'ничуть',
+})
+
+MODIFIERS = {
+    'very': 1.3, 'extremely': 1.5, 'highly': 1.3, 'deeply': 1.3, 'sharply': 1.4, 'sharp': 1.4,
+    'strongly': 1.3, 'significantly': 1.3, 'massive': 1.4, 'huge': 1.3, 'record': 1.2,
+    'slightly': 0.6, 'slight': 0.6, 'somewhat': 0.7, 'marginally': 0.6, 'barely': 0.6, 'modest': 0.7,
+    'очень': 1.3, 'крайне': 1.5, 'резко': 1.4, 'сильно': 1.3, 'весьма': 1.2,
+    'чрезвычайно': 1.5, 'значительно': 1.3, 'рекордно': 1.4,
+    'слегка': 0.6, 'немного': 0.7, 'незначительно': 0.6,
+}
+
+
+@lru_cache(maxsize=65536)
+def word_valence(word: str) -> float:
+    """Valence of one casefolded word (0.0 when it is not in the lexicon)"""
+    valence = EN_LEXICON.get(word)
+    if valence is not None:
+        return valence
+    if word.isascii():
+        return 0.0
+    word = word.replace('ё', 'е')
+    for cut in range(0, _RU_MAX_ENDING + 1):
+        stem = word[:len(word) - cut] if cut else word
+        if len(stem) < _RU_MIN_STEM:
+            break
+        valence = RU_STEMS.get(stem)
+        if valence is not None:
+            return valence
+    return 0.0
+
+
+def _tokens(text: str, limit: Optional[int] = None):
+    text = text or ''
+    if limit is not None:
+        # Generous character bound so long bodies are never tokenized in full
+        text = text[:limit * 16]
+    tokens = _TOKEN.findall(_CONTRACTION.sub(' not', text.casefold()))
+    return tokens[:limit] if limit is not None else tokens
+
+
+def _valence_sum(tokens) -> float:
+    total = 0.0
+    for i, token in enumerate(tokens):
+        valence = word_valence(token)
+        if not valence:
+            continue
+        for prev in tokens[max(0, i - SENTIMENT_SCOPE):i]:
+            if prev in NEGATORS:
+                valence *= _NEGATION_FACTOR
+            else:
+                valence *= MODIFIERS.get(prev, 1.0)
+        total += valence
+    return total
+
+
+def score_sentiment(text: str, title: str = '', max_words: int = SENTIMENT_MAX_WORDS) -> Optional[float]:
+    """
+    Sentiment of an article in [-1, 1] from its headline and the first
+    `max_words` words of its body (headline "Oil prices plunge" -> -0.72)
+
+    Returns None when there are no words to score; 0.0 means no sentiment
+    words were found (or they cancel out)
+    """
+    title_tokens = _tokens(title)
+    body_tokens = _tokens(text, max_words)
+    if not title_tokens and not body_tokens:
+        return None
+    total = SENTIMENT_TITLE_WEIGHT * _valence_sum(title_tokens) + _valence_sum(body_tokens)
+    return round(total / math.sqrt(total * total + SENTIMENT_ALPHA), 4)
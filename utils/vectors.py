@@ -0,0 +1,135 @@
+"""
+Decoding embeddings streamed out of Postgres with COPY ... (FORMAT binary)
+
+Rows are (id int8, embedding) pairs. A pgvector column arrives in its binary
+send format (uint16 dims, uint16 unused, dims x big-endian float4) and is copied
+straight into a preallocated float32 matrix; a TEXT column ('[0.1,0.2,...]' as
+written by update_chunk_embedding) is parsed by NumPy without building Python
+float lists. Nothing is decoded per component in Python either way.
+"""
+
+import struct
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+
+FORMAT_VECTOR = 'vector'
+FORMAT_TEXT = 'text'
+
+_HEADER = struct.Struct('!11sii')
+_FIELD_COUNT = struct.Struct('!h')
+_FIELD_LEN = struct.Struct('!i')
+_INT8 = struct.Struct('!q')
+_VECTOR_HEAD = struct.Struct('!HH')
+
+_BE_FLOAT4 = np.dtype('>f4')
+
+
+def parse_vector_text(data: bytes) -> np.ndarray:
+    """float32 array from '[0.1,0.2]' / JSON array text"""
+    text = bytes(data).decode('ascii').strip()
+    if text.startswith('[') and text.endswith(']'):
+        text = text[1:-1]
+    if not text:
+        return np.empty(0, dtype=np.float32)
+    return np.array(text.split(','), dtype=np.float32)
+
+
+class VectorCopySink:
+    """File-like target for cursor.copy_expert(COPY (SELECT id, vec ...) TO STDOUT (FORMAT binary))
+
+    positions maps a chunk id to the output row(s) it fills. The output matrix is
+    created by allocate(dims) when the first vector arrives, so callers can pick
+    memory (np.empty) or a memory-mapped file. Vectors whose dimension differs
+    from the first one are counted in skipped and left unfilled.
+    """
+
+    def __init__(self, positions: Dict[int, List[int]], allocate: Callable[[int], np.ndarray],
+                 fmt: str = FORMAT_VECTOR, out: Optional[np.ndarray] = None,
+                 found: Optional[np.ndarray] = None):
+        self.positions = positions
+        self.allocate = allocate
+        self.fmt = fmt
+        self.out = out
+        self.found = found
+        self.rows = 0
+        self.skipped = 0
+        self._buf = bytearray()
+        self._in_header = True
+        self._done = False
+
+    def begin(self):
+        """Expect a new COPY stream (header first); the output matrix is kept"""
+        self._buf.clear()
+        self._in_header = True
+        self._done = False
+
+    def write(self, data) -> int:
+        self._buf += data
+        consumed = self._parse()
+        if consumed:
+            del self._buf[:consumed]
+        return len(data)
+
+    def _parse(self) -> int:
+        buf = self._buf
+        pos = 0
+        if self._in_header:
+            if len(buf) < _HEADER.size:
+                return 0
+            signature, _flags, ext_len = _HEADER.unpack_from(buf, 0)
+            if signature != COPY_SIGNATURE:
+                raise ValueError("Not a binary COPY stream")
+            if len(buf) < _HEADER.size + ext_len:
+                return 0
+            pos = _HEADER.size + ext_len
+            self._in_header = False
+
+        size = len(buf)
+        while not self._done and pos + _FIELD_COUNT.size <= size:
+            (fields,) = _FIELD_COUNT.unpack_from(buf, pos)
+            if fields == -1:
+                self._done = True
+                pos += _FIELD_COUNT.size
+                break
+            if fields != 2:
+                raise ValueError(f"Expected (id, embedding) rows, got {fields} columns")
+            # id field: length + 8 bytes
+            start = pos + _FIELD_COUNT.size
+            if start + _FIELD_LEN.size + _INT8.size + _FIELD_LEN.size > size:
+                break
+            (chunk_id,) = _INT8.unpack_from(buf, start + _FIELD_LEN.size)
+            vec_at = start + _FIELD_LEN.size + _INT8.size
+            (vec_len,) = _FIELD_LEN.unpack_from(buf, vec_at)
+            vec_at += _FIELD_LEN.size
+            end = vec_at + max(vec_len, 0)
+            if end > size:
+                break
+            if vec_len >= 0:
+                self._store(chunk_id, buf[vec_at:end])
+            pos = end
+        return pos
+
+    def _store(self, chunk_id: int, field: bytearray):
+        if self.fmt == FORMAT_VECTOR:
+            dims, _unused = _VECTOR_HEAD.unpack_from(field, 0)
+            vector = np.frombuffer(field, dtype=_BE_FLOAT4, count=dims, offset=_VECTOR_HEAD.size)
+        else:
+            try:
+                vector = parse_vector_text(field)
+            except (ValueError, UnicodeDecodeError):
+                self.skipped += 1
+                return
+        if self.out is None:
+            self.out = self.allocate(len(vector))
+            self.found = np.zeros(self.out.shape[0], dtype=bool)
+        if len(vector) != self.out.shape[1]:
+            self.skipped += 1
+            return
+        for row in self.positions.get(chunk_id, ()):
+            # Assignment converts big-endian float4 to native float32 in one pass
+            self.out[row] = vector
+            self.found[row] = True
+        self.rows += 1
@@ -7,14 +7,19 @@ import logging
 import uuid
 import asyncio
 import concurrent.futures
+import functools
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
+from urllib.parse import urlparse
 
-from net.http import HttpClient
+from net.http import HttpClient, is_rate_limited
+from net.scheduler import HostScheduler
 from parser.extract import extract_all, ParsedArticle
-from utils.text import compute_text_hash, compute_word_count, estimate_reading_time
+from utils.text import compute_text_hash, compute_word_count, estimate_reading_time, compute_minhash, minhash_bands
+from utils.sentiment import score_sentiment
 from utils.url import normalize_url, extract_domain
 from pg_client_new import PgClient
+from services.pipeline_events import CHANNEL_CHUNKING_READY
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +32,20 @@ class ArticleWorker:
         self.batch_size = batch_size
         self.max_workers = max_workers
         self.http_client = HttpClient()
+        # Fetches run on threads, paced per host; responses adapt each host's rate
+        self.scheduler = HostScheduler(max_concurrency=max_workers)
+        self.http_client.rate_observer = self.scheduler.observe
+        self._fetch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='fetch'
+        )
+        # Near-duplicate gate: syndicated copies are linked to a canonical article
+        # and never queued for chunking/embedding
+        self.near_dup_enabled = os.getenv('NEAR_DUP_GATE', 'true').lower() == 'true'
+        self.near_dup_threshold = float(os.getenv('NEAR_DUP_THRESHOLD', '0.8'))
+        self.near_dup_window_hours = float(os.getenv('NEAR_DUP_WINDOW_HOURS', '72'))
+        self.near_dup_min_words = int(os.getenv('NEAR_DUP_MIN_WORDS', '50'))
+        # Lexicon sentiment stored with the index row, rolled up for sentiment trends
+        self.sentiment_enabled = os.getenv('INGEST_SENTIMENT', 'true').lower() == 'true'
         
     async def process_pending_articles(self) -> Dict[str, Any]:
         """
@@ -42,6 +61,9 @@ class ArticleWorker:
             return {'articles_processed': 0, 'successful': 0, 'errors': 0, 'duplicates': 0}
         
         logger.info(f"Processing {len(articles)} pending articles")
+
+        # Warm the DNS cache for all publisher hosts in parallel
+        self.http_client.resolver.prefetch(urlparse(a['url']).hostname for a in articles)
         
         stats = {
             'articles_processed': 0,
@@ -49,6 +71,10 @@ class ArticleWorker:
             'duplicates': 0,
             'errors': 0,
             'partial': 0,
+            'deferred': 0,
+            'near_duplicates': 0,
+            'words_indexed': 0,
+            'words_skipped': 0,
             'error_details': []
         }
         
@@ -64,12 +90,21 @@ class ArticleWorker:
             try:
                 result = await task
 
+                if result.get('near_duplicate_of'):
+                    stats['near_duplicates'] += 1
+                    stats['words_skipped'] += result.get('word_count', 0)
+                elif result['status'] == 'stored':
+                    stats['words_indexed'] += result.get('word_count', 0)
+
                 if result['status'] == 'stored':
                     stats['successful'] += 1
                 elif result['status'] == 'duplicate':
                     stats['duplicates'] += 1
                 elif result['status'] == 'partial':
                     stats['partial'] += 1
+                elif result['status'] == 'pending':
+                    # Rate limited; refetched by a later batch
+                    stats['deferred'] += 1
                 else:
                     stats['errors'] += 1
                     if result.get('error'):
@@ -95,20 +130,55 @@ class ArticleWorker:
                 except Exception as update_e:
                     logger.error(f"Failed to update error status for article {article['id']}: {update_e}")
 
+        # Share of chunking/embedding input the near-duplicate gate kept out of the pipeline
+        total_words = stats['words_indexed'] + stats['words_skipped']
+        stats['compute_saved'] = round(stats['words_skipped'] / total_words, 4) if total_words else 0.0
+
         logger.info(f"Processing complete: {stats['successful']}/{stats['articles_processed']} successful, "
-                   f"{stats['duplicates']} duplicates, {stats['errors']} errors")
+                   f"{stats['duplicates']} duplicates, {stats['near_duplicates']} near-duplicates "
+                   f"({stats['compute_saved']:.1%} of text skipped), {stats['errors']} errors")
+
+        if self.near_dup_enabled:
+            self.db.prune_near_duplicate_bands(self.near_dup_window_hours)
+
+        # Stored articles are now ready_for_chunking; wake the chunking stage
+        ready_count = stats['successful'] - stats['near_duplicates']
+        if ready_count > 0:
+            self.db.notify_pipeline(CHANNEL_CHUNKING_READY, ready_count)
 
         # Log to diagnostics
         self.db.log_diagnostics(
             level='INFO',
             component='worker',
             message=f"Processed {stats['articles_processed']} articles",
-            details={**stats, 'batch_id': str(uuid.uuid4())}
+            details={**stats, 'fetch': self.http_client.get_fetch_stats(),
+                     'scheduler': self.scheduler.get_stats(), 'batch_id': str(uuid.uuid4())}
         )
 
         return stats
 
 
+    async def _fetch(self, url: str):
+        """Fetch on a worker thread once the URL's host grants a politeness slot.
+        A 429 is retried once: the slot is released, and re-acquiring it waits
+        out the Retry-After the scheduler recorded for the host.
+        """
+        host = (urlparse(url).hostname or '').lower()
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            async with self.scheduler.slot(host):
+                result = await loop.run_in_executor(
+                    self._fetch_executor,
+                    functools.partial(self.http_client.get_with_conditional_headers, url, expect_html=True)
+                )
+            if result[0] is not None or not is_rate_limited(result[1]):
+                break
+        if attempt:
+            # The worker owns this URL's retry (now or back in pending); a retry
+            # queue fetch would only hit the throttled host without storing anything
+            self.http_client.retry_queue.remove(url)
+        return result
+
     async def _process_single_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """Process a single article"""
         result = {
@@ -126,13 +196,17 @@ class ArticleWorker:
             self.db.update_article_status(article_id, 'processing')
             
             # Fetch HTML content
-            response, final_url, was_cached = self.http_client.get_with_conditional_headers(
-                article_url
-            )
+            response, final_url, was_cached = await self._fetch(article_url)
             
             if response is None:
-                result['error'] = f"Failed to fetch {article_url}"
-                self.db.update_article_status(article_id, 'error', result['error'])
+                # final_url carries the client's error (e.g. non-HTML or oversized body)
+                result['error'] = final_url or f"Failed to fetch {article_url}"
+                if is_rate_limited(result['error']):
+                    # Still throttled after the Retry-After wait: back to the queue
+                    result['status'] = 'pending'
+                    self.db.update_article_status(article_id, 'pending', result['error'])
+                else:
+                    self.db.update_article_status(article_id, 'error', result['error'])
                 return result
 
             # Skip Google News aggregator entries
@@ -214,6 +288,20 @@ class ArticleWorker:
                 # Determine readiness for chunking: must have full_text and not be duplicate
                 has_text = bool(parsed_article.full_text)
                 ready = has_text
+                signature = self._near_dup_signature(parsed_article) if has_text else None
+                bands = minhash_bands(signature) if signature else None
+                match = None
+                if signature:
+                    match = self.db.find_near_duplicate(
+                        signature, bands, self.near_dup_threshold, self.near_dup_window_hours
+                    )
+                if match:
+                    # Syndicated copy: link it, never chunk or embed it
+                    ready = False
+                    result['near_duplicate_of'] = match['id']
+                    logger.debug(f"Article is near-duplicate of index row {match['id']} "
+                                 f"(similarity {match['similarity']:.2f}): {article_url}")
+                result['word_count'] = parsed_article.word_count or 0
                 index_data = {
                     'url_hash': parsed_article.url_hash,
                     'text_hash': parsed_article.text_hash,
@@ -229,11 +317,18 @@ class ArticleWorker:
                     'category': parsed_article.section or article.get('section'),
                     'tags_norm': parsed_article.keywords or [],
                     'published_at': parsed_article.published_at or article.get('published_at'),
+                    'first_seen': article.get('created_at'),
                     'processing_version': int(1),
-                    'ready_for_chunking': bool(ready)
+                    'ready_for_chunking': bool(ready),
+                    'minhash': signature,
+                    'duplicate_of': match['id'] if match else None,
+                    'near_dup_similarity': match['similarity'] if match else None,
                 }
+                index_data['sentiment'] = self._sentiment(index_data['clean_text'], index_data['title_norm'])
                 try:
-                    self.db.upsert_article_index(index_data)
+                    index_id = self.db.upsert_article_index(index_data)
+                    if signature and not match and index_id:
+                        self.db.add_near_duplicate_bands(index_id, bands)
                 except Exception as e:
                     # Handle duplicate constraint violations gracefully
                     if 'duplicate key value' in str(e) or 'already exists' in str(e):
@@ -264,8 +359,21 @@ class ArticleWorker:
         
         return result
 
+    def _near_dup_signature(self, parsed_article: ParsedArticle) -> Optional[List[int]]:
+        """MinHash signature for the near-duplicate gate (None for short or gated-off texts)"""
+        if not self.near_dup_enabled or (parsed_article.word_count or 0) < self.near_dup_min_words:
+            return None
+        return compute_minhash(parsed_article.full_text)
+
+    def _sentiment(self, text: str, title: str) -> Optional[float]:
+        """Lexicon sentiment of the headline and lede (None when disabled or empty)"""
+        if not self.sentiment_enabled:
+            return None
+        return score_sentiment(text, title)
+
     def close(self):
         """Clean up resources"""
+        self._fetch_executor.shutdown(wait=False)
         if self.http_client:
             self.http_client.close()
 
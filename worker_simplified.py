@@ -16,6 +16,7 @@ from parser.extract import extract_all, ParsedArticle
 from utils.text import compute_text_hash, compute_word_count, estimate_reading_time
 from utils.url import normalize_url, extract_domain
 from pg_client_new import PgClient
+from services.pipeline_events import CHANNEL_CHUNKING_READY
 
 logger = logging.getLogger(__name__)
 
@@ -103,12 +104,16 @@ class SimplifiedArticleWorker:
         logger.info(f"Processing complete: {stats['successful']}/{stats['articles_processed']} successful, "
                    f"{stats['duplicates']} duplicates, {stats['errors']} errors")
 
+        # Stored articles are now ready_for_chunking; wake the chunking stage
+        if stats['successful'] > 0:
+            self.db.notify_pipeline(CHANNEL_CHUNKING_READY, stats['successful'])
+
         # Log to diagnostics
         self.db.log_diagnostics(
             level='INFO',
             component='simplified_worker',
             message=f"Processed {stats['articles_processed']} articles (no chunking/FTS/embeddings)",
-            details={**stats, 'batch_id': str(uuid.uuid4())}
+            details={**stats, 'fetch': self.http_client.get_fetch_stats(), 'batch_id': str(uuid.uuid4())}
         )
 
         return stats
@@ -131,11 +136,12 @@ class SimplifiedArticleWorker:
 
             # Fetch HTML content
             response, final_url, was_cached = self.http_client.get_with_conditional_headers(
-                article_url
+                article_url, expect_html=True
             )
 
             if response is None:
-                result['error'] = f"Failed to fetch {article_url}"
+                # final_url carries the client's error (e.g. non-HTML or oversized body)
+                result['error'] = final_url or f"Failed to fetch {article_url}"
                 self.db.update_article_status(article_id, 'error', result['error'])
                 return result
 
@@ -216,6 +222,7 @@ class SimplifiedArticleWorker:
                     'category': parsed_article.section or article.get('section'),
                     'tags_norm': parsed_article.keywords or [],
                     'published_at': parsed_article.published_at or article.get('published_at'),
+                    'first_seen': article.get('created_at'),
                     'processing_version': int(1),
                     'ready_for_chunking': bool(ready)
                 }